@@ -0,0 +1,258 @@
+"""
+Resident Model Pool
+Keeps loaded generation models (TTS, MusicGen, ...) in memory between MCP tool
+calls so each request pays the checkpoint load only once.
+
+- One instance per model key, shared by concurrent requests
+- Per-model lock: the first caller loads, later callers wait and reuse it;
+  inference on a given model is serialized (torch models are not thread-safe)
+- LRU eviction once resident size exceeds GENERATION_MODEL_POOL_MB
+- Idle unloading after GENERATION_MODEL_IDLE_SECONDS without use
+
+Models are loaded and used from executor threads, so all locking is
+``threading``-based.
+"""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RESIDENT_MB = float(os.getenv("GENERATION_MODEL_POOL_MB", "16384"))
+DEFAULT_IDLE_TIMEOUT = float(os.getenv("GENERATION_MODEL_IDLE_SECONDS", "900"))
+
+
+@dataclass
+class _ResidentModel:
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    model: Any = None
+    size_mb: float = 0.0
+    users: int = 0
+    last_used: float = 0.0
+    unloader: Callable[[Any], None] | None = None
+
+
+def estimate_model_mb(model: Any) -> float:
+    """Best-effort resident size of a torch-style model (sum of parameter bytes)."""
+    params = getattr(model, "parameters", None)
+    if not callable(params):
+        return 0.0
+    try:
+        total = sum(p.numel() * p.element_size() for p in params())
+    except Exception:
+        return 0.0
+    return total / (1024 * 1024)
+
+
+def _release_accelerator_memory() -> None:
+    """Return freed tensors to the OS/driver if torch is already loaded."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return
+    try:
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        mps = getattr(torch, "mps", None)
+        if mps is not None and torch.backends.mps.is_available():
+            mps.empty_cache()
+    except Exception as e:
+        logger.debug("Accelerator cache release failed: %s", e)
+
+
+class ResidentModelPool:
+    """Process-wide LRU pool of loaded models with a memory budget.
+
+    Args:
+        max_resident_mb: Budget for all resident models; ``0`` disables the limit.
+            A single model larger than the budget is still loaded, alone.
+        idle_timeout: Seconds after last use before a model is unloaded;
+            ``0`` keeps models until evicted.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        max_resident_mb: float = DEFAULT_MAX_RESIDENT_MB,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_resident_mb = max_resident_mb
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._models: OrderedDict[str, _ResidentModel] = OrderedDict()
+        self._reaper: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @contextmanager
+    def use(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        size_mb: float | None = None,
+        unloader: Callable[[Any], None] | None = None,
+    ) -> Iterator[Any]:
+        """Yield the resident model for *key*, loading it with *loader* if needed.
+
+        The model's lock is held for the duration of the ``with`` block.
+        *size_mb* overrides :func:`estimate_model_mb`; *unloader* is called with
+        the model when it is evicted.
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                entry = _ResidentModel(unloader=unloader)
+                self._models[key] = entry
+            self._models.move_to_end(key)
+            entry.users += 1
+        try:
+            with entry.lock:
+                if entry.model is None:
+                    logger.info("Loading model %s", key)
+                    start = time.perf_counter()
+                    entry.model = loader()
+                    entry.size_mb = (
+                        size_mb if size_mb is not None else estimate_model_mb(entry.model)
+                    )
+                    self.loads += 1
+                    logger.info(
+                        "Loaded model %s in %.1fs (%.0f MB)",
+                        key,
+                        time.perf_counter() - start,
+                        entry.size_mb,
+                    )
+                    self._enforce_budget(keep=key)
+                else:
+                    self.hits += 1
+                yield entry.model
+        finally:
+            with self._lock:
+                entry.users -= 1
+                entry.last_used = self._clock()
+                if entry.model is None and entry.users == 0 and self._models.get(key) is entry:
+                    del self._models[key]  # loader failed; don't cache the empty slot
+        # Models that were in use during a load may have pushed the pool over budget
+        self._enforce_budget()
+        self._start_reaper()
+
+    def stats(self) -> dict[str, Any]:
+        """Resident models and load/hit/eviction counters."""
+        with self._lock:
+            resident = {
+                k: round(e.size_mb, 1) for k, e in self._models.items() if e.model is not None
+            }
+        return {
+            "resident": resident,
+            "resident_mb": round(sum(resident.values()), 1),
+            "max_resident_mb": self.max_resident_mb,
+            "loads": self.loads,
+            "hits": self.hits,
+            "evictions": self.evictions,
+        }
+
+    def evict_idle(self) -> list[str]:
+        """Unload models unused for longer than ``idle_timeout``. Returns evicted keys."""
+        if self.idle_timeout <= 0:
+            return []
+        now = self._clock()
+        with self._lock:
+            idle = [
+                k
+                for k, e in self._models.items()
+                if e.model is not None and e.users == 0 and now - e.last_used >= self.idle_timeout
+            ]
+            victims = [(k, self._models.pop(k)) for k in idle]
+        self._unload(victims, reason="idle")
+        return idle
+
+    def clear(self) -> None:
+        """Unload every model that is not currently in use."""
+        with self._lock:
+            keys = [k for k, e in self._models.items() if e.users == 0]
+            victims = [(k, self._models.pop(k)) for k in keys]
+        self._unload(victims, reason="clear")
+
+    def close(self) -> None:
+        """Stop the idle reaper and unload all idle models."""
+        self._stop.set()
+        self.clear()
+
+    def _enforce_budget(self, keep: str | None = None) -> None:
+        if self.max_resident_mb <= 0:
+            return
+        with self._lock:
+            total = sum(e.size_mb for e in self._models.values() if e.model is not None)
+            victims = []
+            for k, e in list(self._models.items()):  # least recently used first
+                if total <= self.max_resident_mb:
+                    break
+                if k == keep or e.users or e.model is None:
+                    continue
+                victims.append((k, self._models.pop(k)))
+                total -= e.size_mb
+        if total > self.max_resident_mb:
+            logger.warning(
+                "Resident models use %.0f MB (budget %.0f MB); remaining models are in use",
+                total,
+                self.max_resident_mb,
+            )
+        self._unload(victims, reason="memory budget")
+
+    def _unload(self, victims: list[tuple[str, _ResidentModel]], reason: str) -> None:
+        if not victims:
+            return
+        for key, entry in victims:
+            logger.info("Unloading model %s (%s)", key, reason)
+            if entry.unloader is not None:
+                try:
+                    entry.unloader(entry.model)
+                except Exception as e:
+                    logger.warning("Unloader for %s failed: %s", key, e)
+            entry.model = None
+            self.evictions += 1
+        _release_accelerator_memory()
+
+    def _start_reaper(self) -> None:
+        if self.idle_timeout <= 0 or self._reaper is not None or self._stop.is_set():
+            return
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(
+                target=self._reap_loop, name="model-pool-reaper", daemon=True
+            )
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        interval = max(1.0, min(60.0, self.idle_timeout / 4))
+        while not self._stop.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.warning("Idle model reaper error: %s", e)
+
+
+_pool: ResidentModelPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> ResidentModelPool:
+    """Return the process-wide pool shared by every generation server in this process."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ResidentModelPool()
+        return _pool
@@ -15,6 +15,7 @@ from pathlib import Path
 
 from starlette.responses import JSONResponse
 
+from portal_mcp.generation.model_pool import get_model_pool
 from portal_mcp.mcp_server.fastmcp import FastMCP
 
 mcp = FastMCP("music-generation")
@@ -22,7 +23,7 @@ mcp = FastMCP("music-generation")
 
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request):
-    return JSONResponse({"status": "ok", "service": "music-mcp"})
+    return JSONResponse({"status": "ok", "service": "music-mcp", "models": get_model_pool().stats()})
 
 
 # Tool manifest for discovery
@@ -64,6 +65,16 @@ logger = logging.getLogger(__name__)
 OUTPUT_DIR = Path(os.getenv("GENERATED_FILES_DIR", "data/generated"))
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Approximate fp32 resident size; MusicGen wraps several modules, so parameters can't be summed
+MUSICGEN_SIZE_MB = {"small": 1200, "medium": 6000, "large": 13000}
+
+
+def _load_musicgen(model_name: str):
+    """Load a MusicGen checkpoint (called once per process by the model pool)."""
+    from audiocraft.models import MusicGen
+
+    return MusicGen.get_pretrained(model_name)
+
 
 def _check_audiocraft() -> tuple[bool, str]:
     try:
@@ -131,24 +142,27 @@ def _generate_sync(
     try:
         import torch
         import torchaudio
-        from audiocraft.models import MusicGen
 
         model_name = f"facebook/musicgen-{model_size}"
-        logger.info("Loading MusicGen %s", model_name)
-        model = MusicGen.get_pretrained(model_name)
-        model.set_generation_params(
-            duration=duration,
-            top_k=top_k,
-            temperature=temperature,
-            cfg_coef=cfg_coef,
-        )
-
-        logger.info("Generating: %s", prompt[:80])
-        with torch.no_grad():
-            wav = model.generate([prompt])
-
-        sample_rate = model.sample_rate
-        audio_data = wav[0].cpu()
+        # Generation params are per-model state, so set and use them under the model lock
+        with get_model_pool().use(
+            model_name,
+            lambda: _load_musicgen(model_name),
+            size_mb=MUSICGEN_SIZE_MB[model_size],
+        ) as model:
+            model.set_generation_params(
+                duration=duration,
+                top_k=top_k,
+                temperature=temperature,
+                cfg_coef=cfg_coef,
+            )
+
+            logger.info("Generating: %s", prompt[:80])
+            with torch.no_grad():
+                wav = model.generate([prompt])
+
+            sample_rate = model.sample_rate
+            audio_data = wav[0].cpu()
 
         safe_name = "".join(c if c.isalnum() or c == "_" else "_" for c in prompt[:40]).strip("_")
         output_file = OUTPUT_DIR / f"music_{safe_name}_{int(duration)}s.wav"
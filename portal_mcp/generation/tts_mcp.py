@@ -14,6 +14,7 @@ from pathlib import Path
 
 from starlette.responses import JSONResponse
 
+from portal_mcp.generation.model_pool import get_model_pool
 from portal_mcp.mcp_server.fastmcp import FastMCP
 
 mcp = FastMCP("tts-generation")
@@ -21,7 +22,7 @@ mcp = FastMCP("tts-generation")
 
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request):
-    return JSONResponse({"status": "ok", "service": "tts-mcp"})
+    return JSONResponse({"status": "ok", "service": "tts-mcp", "models": get_model_pool().stats()})
 
 
 # Tool manifest for discovery
@@ -69,6 +70,8 @@ OUTPUT_DIR = Path(os.getenv("GENERATED_FILES_DIR", "data/generated"))
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 TTS_BACKEND = os.getenv("TTS_BACKEND", "fish_speech")  # "fish_speech" or "cosyvoice"
+FISH_SPEECH_MODEL = os.getenv("FISH_SPEECH_MODEL", "models/fish_speech/fish-speech-1.4")
+COSYVOICE_SIZE_MB = 1200  # 300M params, fp32; CosyVoice is not an nn.Module so it can't be measured
 
 # Fish Speech voice presets
 FISH_SPEECH_VOICES = {
@@ -92,6 +95,20 @@ COSYVOICE_SPEAKERS = {
 }
 
 
+def _load_fish_speech():
+    """Load the Fish Speech checkpoint (called once per process by the model pool)."""
+    from fish_speech.models import Text2Speech
+
+    return Text2Speech.load_from_checkpoint(checkpoint_path=FISH_SPEECH_MODEL, device="mps")
+
+
+def _load_cosyvoice(model_dir: str):
+    """Load a CosyVoice model directory (called once per process by the model pool)."""
+    from cosyvoice.cli.cosyvoice import CosyVoice
+
+    return CosyVoice(model_dir)
+
+
 def _check_fish_speech() -> tuple[bool, str]:
     """Check if Fish Speech is available."""
     try:
@@ -173,17 +190,11 @@ def _fish_speech_sync(
 ) -> dict:
     """Synchronous Fish Speech generation."""
     try:
-        from fish_speech.models import Text2Speech
         from fish_speech.utils import get_audio
 
-        logger.info("Loading Fish Speech model...")
-        tts = Text2Speech.load_from_checkpoint(
-            checkpoint_path="models/fish_speech/fish-speech-1.4",
-            device="mps",
-        )
-
-        logger.info("Generating speech for: %s", text[:50])
-        audio = tts.generate(text, speaker_id=voice, speed=speed)
+        with get_model_pool().use("fish_speech", _load_fish_speech) as tts:
+            logger.info("Generating speech for: %s", text[:50])
+            audio = tts.generate(text, speaker_id=voice, speed=speed)
 
         safe_name = "".join(c if c.isalnum() or c == "_" else "_" for c in text[:30]).strip("_")
         output_file = OUTPUT_DIR / f"tts_{safe_name}.{output_format}"
@@ -233,17 +244,17 @@ def _cosyvoice_sync(text: str, voice: str, output_format: str) -> dict:
     """Synchronous CosyVoice generation."""
     try:
         import torchaudio
-        from cosyvoice.cli.cosyvoice import CosyVoice
 
         output_file = OUTPUT_DIR / f"tts_{hash(text) % 10000}.wav"
 
-        logger.info("Loading CosyVoice model...")
-        cosyvoice = CosyVoice("pretrained_models/CosyVoice-300M-SFT")
-
-        logger.info("Generating speech for: %s", text[:50])
-        for output in cosyvoice.inference_sft(text, voice):
-            torchaudio.save(str(output_file), output["tts_speech"], 22050)
-            break
+        model_dir = "pretrained_models/CosyVoice-300M-SFT"
+        with get_model_pool().use(
+            model_dir, lambda: _load_cosyvoice(model_dir), size_mb=COSYVOICE_SIZE_MB
+        ) as cosyvoice:
+            logger.info("Generating speech for: %s", text[:50])
+            for output in cosyvoice.inference_sft(text, voice):
+                torchaudio.save(str(output_file), output["tts_speech"], 22050)
+                break
 
         if output_file.exists():
             return {
@@ -304,20 +315,14 @@ async def _clone_fish_speech(text: str, reference_audio_path: str) -> dict:
 def _fish_clone_sync(text: str, reference_audio_path: str) -> dict:
     """Synchronous Fish Speech voice cloning."""
     try:
-        from fish_speech.models import Text2Speech
         from fish_speech.utils import get_audio, load_audio
 
-        logger.info("Loading Fish Speech model for cloning...")
-        tts = Text2Speech.load_from_checkpoint(
-            checkpoint_path="models/fish_speech/fish-speech-1.4",
-            device="mps",
-        )
-
         # Load reference audio
         reference = load_audio(reference_audio_path, 32000)
 
-        logger.info("Cloning voice and generating: %s", text[:50])
-        audio = tts.generate(text, reference_audio=reference)
+        with get_model_pool().use("fish_speech", _load_fish_speech) as tts:
+            logger.info("Cloning voice and generating: %s", text[:50])
+            audio = tts.generate(text, reference_audio=reference)
 
         safe_name = f"clone_{hash(text) % 10000}"
         output_file = OUTPUT_DIR / f"{safe_name}.wav"
@@ -360,23 +365,23 @@ def _cosyvoice_clone_sync(text: str, reference_audio_path: str) -> dict:
     """Synchronous CosyVoice voice cloning."""
     try:
         import torchaudio
-        from cosyvoice.cli.cosyvoice import CosyVoice
 
         output_file = OUTPUT_DIR / f"clone_{hash(text) % 10000}.wav"
 
-        logger.info("Loading CosyVoice model for cloning...")
-        cosyvoice = CosyVoice("pretrained_models/CosyVoice-300M-ZeroShot")
-
         # Load reference audio
         reference, sr = torchaudio.load(reference_audio_path)
         if sr != 22050:
             import torchaudio.functional as F
             reference = F.resample(reference, sr, 22050)
 
-        logger.info("Cloning voice and generating: %s", text[:50])
-        for output in cosyvoice.inference_zero_shot(text, reference, "中文女"):
-            torchaudio.save(str(output_file), output["tts_speech"], 22050)
-            break
+        model_dir = "pretrained_models/CosyVoice-300M-ZeroShot"
+        with get_model_pool().use(
+            model_dir, lambda: _load_cosyvoice(model_dir), size_mb=COSYVOICE_SIZE_MB
+        ) as cosyvoice:
+            logger.info("Cloning voice and generating: %s", text[:50])
+            for output in cosyvoice.inference_zero_shot(text, reference, "中文女"):
+                torchaudio.save(str(output_file), output["tts_speech"], 22050)
+                break
 
         if output_file.exists():
             return {
@@ -412,7 +417,7 @@ async def list_voices() -> dict:
             return {
                 "backend": "fish_speech",
                 "voices": FISH_SPEECH_VOICES,
-                "note": "Fish Speech requires models at models/fish_speech/",
+                "note": f"Fish Speech requires models at {FISH_SPEECH_MODEL}",
             }
         else:
             # Show both with note
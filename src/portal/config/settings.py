@@ -247,6 +247,12 @@ class BackendsConfig(BaseModel):
         None,
         description="HuggingFace access token for pulling private models (optional)",
     )
+    health_probe_min_interval: float = Field(
+        5.0, gt=0, description="Fastest backend health probe interval in seconds"
+    )
+    health_probe_max_interval: float = Field(
+        60.0, gt=0, description="Slowest backend health probe interval for healthy backends"
+    )
 
     model_config = ConfigDict(extra="allow")
 
@@ -298,6 +304,12 @@ class ContextConfig(BaseModel):
     )
     persist_context: bool = Field(True, description="Persist context to SQLite")
     context_db_path: str = Field("data/context.db", description="Path to context database")
+    cache_sessions: int = Field(
+        256, ge=0, description="Recent conversations kept in memory (0 disables the cache)"
+    )
+    flush_interval: float = Field(
+        0.5, ge=0, description="Seconds between batched context writes (0 writes through)"
+    )
 
     model_config = ConfigDict(extra="allow")
 
@@ -455,13 +467,18 @@ class Settings(BaseSettings):
         return {
             "routing_strategy": "AUTO",
             "max_context_messages": self.context.max_context_messages,
+            "context_cache_sessions": self.context.cache_sessions,
+            "context_flush_interval": self.context.flush_interval,
             "ollama_base_url": self.backends.ollama_url,
             "mlx_url": self.backends.mlx_url,
             "enable_mlx": self.backends.enable_mlx,
+            "health_probe_min_interval": self.backends.health_probe_min_interval,
+            "health_probe_max_interval": self.backends.health_probe_max_interval,
             "circuit_breaker_enabled": True,
             "circuit_breaker_threshold": 3,
             "circuit_breaker_timeout": 60,
             "circuit_breaker_half_open_calls": 1,
+            "circuit_breaker_probe_delay": 15.0,
         }
 
 
@@ -21,15 +21,33 @@ from portal.observability.metrics import MCP_TOOL_USAGE
 
 # Import existing routing system
 from portal.routing import ExecutionEngine, IntelligentRouter, ModelRegistry
+from portal.routing.intelligent_router import RoutingDecision
+from portal.routing.model_backends import ToolCallChunk
 
 # Import new unified components
-from .context_manager import ContextManager
+from .context_assembler import (
+    DEFAULT_HISTORY_FETCH_LIMIT,
+    DEFAULT_OUTPUT_RESERVE,
+    ContextAssembler,
+)
+from .context_manager import ContextManager, ContextMessage
 from .event_bus import EventBus, EventEmitter, EventType
 from .exceptions import ModelNotAvailableError, PortalError, ToolExecutionError
-from .orchestrator import TaskOrchestrator
+from .orchestrator import DEFAULT_MAX_PARALLEL_STEPS, TaskOrchestrator
+from .planner import create_planner
 from .prompt_manager import PromptManager
 from .structured_logger import TraceContext, get_logger
-from .tool_schema_builder import build_tool_schemas
+from .tool_dispatcher import ToolCallScheduler
+from .tool_runtime import (
+    DEFAULT_TOOL_CPU_WORKERS,
+    DEFAULT_TOOL_IO_WORKERS,
+    DEFAULT_TOOL_MAX_TIMEOUT,
+    DEFAULT_TOOL_QUEUE_SIZE,
+    DEFAULT_TOOL_TIMEOUT,
+    ToolRuntime,
+)
+from .tool_schema_builder import DEFAULT_TOOL_SCHEMA_REFRESH_INTERVAL, ToolSchemaProvider
+from .tool_selector import DEFAULT_TOOL_SELECTION_TOP_K, ToolSelector, load_sentence_embedder
 from .types import IncomingMessage, InterfaceType, ProcessingResult
 
 if TYPE_CHECKING:
@@ -40,6 +58,9 @@ logger = get_logger("AgentCore")
 
 # Configuration constants (avoid magic numbers/strings scattered throughout)
 DEFAULT_MCP_TOOL_MAX_ROUNDS = 3
+DEFAULT_MCP_TOOL_MAX_CONCURRENCY = 4
+DEFAULT_MCP_TOOL_PER_TOOL_CONCURRENCY = 2
+DEFAULT_MCP_TOOL_TIMEOUT = 60.0
 HIGH_RISK_TOOLS = frozenset({"bash", "filesystem_write", "web_fetch"})
 
 
@@ -72,24 +93,70 @@ class AgentCore:
         self.prompt_manager = prompt_manager
         self.tool_registry = tool_registry
         self.confirmation_middleware = confirmation_middleware
+        # Tool schemas for function calling; refreshed in the background, never built per request
+        self.tool_schema_provider = ToolSchemaProvider(
+            tool_registry,
+            refresh_interval=float(
+                config.get("tool_schema_refresh_interval", DEFAULT_TOOL_SCHEMA_REFRESH_INTERVAL)
+            ),
+        )
+        # Attach only the schemas relevant to each request (top-k plus pinned tools)
+        self.tool_selector = ToolSelector(
+            top_k=int(config.get("tool_selection_top_k", DEFAULT_TOOL_SELECTION_TOP_K)),
+            pinned=config.get("tool_selection_pinned") or (),
+            embedder=load_sentence_embedder(config.get("tool_selection_embedding_model", "")),
+        )
         self.mcp_registry = mcp_registry
         self.memory_manager = memory_manager or MemoryManager()
         self._stats_lock = asyncio.Lock()
         self.hitl_middleware = self._init_hitl_middleware(config)
         self.events = EventEmitter(self.event_bus)
+        # Caps apply per model turn; HITL-gated tools are serialized within a
+        # turn only while approval is enabled (see _dispatch_mcp_tools)
+        self._tool_scheduler = ToolCallScheduler(
+            max_concurrency=int(
+                config.get("mcp_tool_max_concurrency", DEFAULT_MCP_TOOL_MAX_CONCURRENCY)
+            ),
+            per_tool_concurrency=int(
+                config.get("mcp_tool_per_tool_concurrency", DEFAULT_MCP_TOOL_PER_TOOL_CONCURRENCY)
+            ),
+            call_timeout=float(config.get("mcp_tool_timeout", DEFAULT_MCP_TOOL_TIMEOUT)),
+        )
+        # Local tools run off the event loop according to their execution mode
+        self.tool_runtime = ToolRuntime(
+            io_workers=int(config.get("tool_io_workers", DEFAULT_TOOL_IO_WORKERS)),
+            cpu_workers=int(config.get("tool_cpu_workers", DEFAULT_TOOL_CPU_WORKERS)),
+            queue_size=int(config.get("tool_queue_size", DEFAULT_TOOL_QUEUE_SIZE)),
+            default_timeout=float(config.get("tool_timeout", DEFAULT_TOOL_TIMEOUT)),
+            max_timeout=float(config.get("tool_max_timeout", DEFAULT_TOOL_MAX_TIMEOUT)),
+        )
+
+        # Packs history, memory and tool results to each model's context window
+        self.context_assembler = ContextAssembler(
+            context_manager,
+            summarizer=(
+                self._summarize_history if config.get("context_llm_summaries", True) else None
+            ),
+            output_reserve=int(config.get("context_output_reserve_tokens", DEFAULT_OUTPUT_RESERVE)),
+        )
+        self.history_fetch_limit = int(
+            config.get("context_history_fetch_limit", DEFAULT_HISTORY_FETCH_LIMIT)
+        )
 
         # Initialize orchestrator for multi-step tasks
+        self._planner = create_planner(model=config.get("orchestrator_planner_model") or None)
         self._orchestrator = TaskOrchestrator(
             llm_executor=self._call_llm,
             tool_executor=self._call_tool,
+            max_parallel_steps=int(
+                config.get("orchestrator_max_parallel_steps", DEFAULT_MAX_PARALLEL_STEPS)
+            ),
+            planner=self._planner,
         )
 
         loaded, failed = self.tool_registry.discover_and_load()
         self.stats = self._initial_stats()
 
-        # Build and cache tool schemas for OpenAI function-calling format
-        self._tool_schemas: list[dict[str, Any]] | None = None
-
         logger.info(
             "AgentCore initialized successfully",
             routing_strategy=router.strategy.value if hasattr(router, "strategy") else "unknown",
@@ -120,15 +187,31 @@ class AgentCore:
             "errors": 0,
         }
 
+    @property
+    def mcp_registry(self) -> Any | None:
+        return self._mcp_registry
+
+    @mcp_registry.setter
+    def mcp_registry(self, registry: Any | None) -> None:
+        self._mcp_registry = registry
+        self.tool_schema_provider.set_mcp_registry(registry)
+
     def get_tool_schemas(self) -> list[dict[str, Any]]:
-        """Get cached tool schemas for OpenAI function-calling format. Builds on first call."""
-        if self._tool_schemas is None:
-            self._tool_schemas = build_tool_schemas(
-                tool_registry=self.tool_registry,
-                mcp_registry=self.mcp_registry,
-            )
-            logger.info("Built tool schemas", count=len(self._tool_schemas))
-        return self._tool_schemas
+        """Get the current tool schemas for OpenAI function-calling format (no I/O)."""
+        return self.tool_schema_provider.get_schemas()
+
+    def select_tool_schemas(
+        self, query: str, decision: RoutingDecision | None = None
+    ) -> list[dict[str, Any]]:
+        """Get the tool schemas relevant to *query* and its routing category (no I/O)."""
+        category = decision.classification.category.value if decision else None
+        return self.tool_selector.select(
+            self.get_tool_schemas(),
+            query,
+            category=category,
+            version=self.tool_schema_provider.version,
+            tool_registry=self.tool_registry,
+        )
 
     def _is_multi_step(self, message: str) -> bool:
         """Detect ONLY explicitly structured multi-step requests.
@@ -157,7 +240,7 @@ class AgentCore:
     async def _call_llm(self, prompt: str) -> str:
         """Execute an LLM call for the orchestrator."""
         # Use the default model and generate a response
-        tools = self.get_tool_schemas()
+        tools = self.select_tool_schemas(prompt)
         response = await self.execution_engine.execute(
             query=prompt,
             messages=[{"role": "user", "content": prompt}],
@@ -171,9 +254,10 @@ class AgentCore:
         if not tool:
             raise ToolExecutionError(name, f"Tool not found: {name}")
 
-        # Execute the tool directly (bypass confirmation for orchestrator)
-        result = await tool.execute(args)
-        return result
+        # Planned steps run unattended, so tools that need confirmation are refused
+        if tool.metadata.requires_confirmation:
+            raise ToolExecutionError(name, f"Tool {name} requires confirmation")
+        return await self.tool_runtime.run(tool, args)
 
     async def process_message(
         self,
@@ -220,7 +304,7 @@ class AgentCore:
                     available_tools=available_tools,
                     chat_id=chat_id,
                     trace_id=trace_id,
-                    messages=context_history or None,
+                    history=context_history,
                     workspace_id=workspace_id,
                 )
                 await self._save_message(chat_id, "assistant", result.response, interface.value)
@@ -285,11 +369,19 @@ class AgentCore:
 
     async def _build_execution_context(
         self, chat_id: str, interface: InterfaceType, user_context: dict
-    ) -> tuple[str, list[str], list[dict]]:
-        """Build system prompt, tool list, and conversation history."""
+    ) -> tuple[str, list[str], list[ContextMessage]]:
+        """Build system prompt, tool list, and the history before the current message."""
         system_prompt = self._build_system_prompt(interface.value, user_context)
         available_tools = [t.metadata.name for t in self.tool_registry.get_all_tools()]
-        context_history = await self.context_manager.get_formatted_history(chat_id, format="openai")
+        # Every message the rolling summary does not cover yet, so the assembler
+        # folds each turn into the summary before it leaves the context
+        summary = await self.context_manager.get_summary(chat_id)
+        context_history = await self.context_manager.get_history_since(
+            chat_id, summary.through if summary else None, self.history_fetch_limit
+        )
+        # The current user message was just saved; it is sent (with memory) as the turn
+        if context_history and context_history[-1].role == "user":
+            context_history = context_history[:-1]
         return system_prompt, available_tools, context_history
 
     async def _finalize_result(
@@ -361,7 +453,8 @@ class AgentCore:
         )
 
         # Build and execute the plan
-        plan = self._orchestrator.build_plan(message)
+        tools = [t for t in self.tool_registry.get_tool_list() if not t["requires_confirmation"]]
+        plan = await self._orchestrator.build_plan_from_llm(message, tools)
         await self._orchestrator.execute(plan)
 
         # Collect results from all steps
@@ -432,17 +525,14 @@ class AgentCore:
             interface=interface, user_preferences=user_prefs
         )
 
-    async def _execute_with_routing(
+    async def _route_request(
         self,
         query: str,
-        system_prompt: str,
-        available_tools: list[str],
         chat_id: str,
         trace_id: str,
-        messages: list[dict[str, Any]] | None = None,
         workspace_id: str | None = None,
-    ):
-        """Route the query and execute it, emitting routing/generating events."""
+    ) -> RoutingDecision:
+        """Classify and route the query once; the decision is reused for every model call."""
         decision = await self.router.route(query, workspace_id=workspace_id)
         await self.event_bus.publish(
             EventType.ROUTING_DECISION,
@@ -459,13 +549,37 @@ class AgentCore:
             model=decision.model_id,
             complexity=decision.classification.complexity.value,
         )
+        return decision
+
+    async def _execute_with_routing(
+        self,
+        query: str,
+        system_prompt: str,
+        available_tools: list[str],
+        chat_id: str,
+        trace_id: str,
+        messages: list[dict[str, Any]] | None = None,
+        workspace_id: str | None = None,
+        routing_decision: RoutingDecision | None = None,
+    ):
+        """Execute the query on the routed model, emitting routing/generating events.
+
+        Routes the query only when no *routing_decision* is supplied by the caller.
+        """
+        decision = routing_decision or await self._route_request(
+            query, chat_id, trace_id, workspace_id
+        )
         await self.event_bus.publish(
             EventType.MODEL_GENERATING, chat_id, {"model": decision.model_id}, trace_id
         )
-        tools = self.get_tool_schemas()
+        tools = self.select_tool_schemas(query, decision)
         result = await self.execution_engine.execute(
-            query=query, system_prompt=system_prompt, messages=messages, workspace_id=workspace_id,
+            query=query,
+            system_prompt=system_prompt,
+            messages=messages,
+            workspace_id=workspace_id,
             tools=tools if tools else None,
+            routing_decision=decision,
         )
         if not result.success:
             raise ModelNotAvailableError(
@@ -492,41 +606,14 @@ class AgentCore:
         """Get list of available tools"""
         return self.tool_registry.get_tool_list()
 
-    async def _resolve_preflight_tools(
-        self,
-        query: str,
-        system_prompt: str,
-        messages: list[dict[str, Any]] | None,
-        chat_id: str,
-        trace_id: str,
-        max_rounds: int,
-    ) -> list[dict[str, str]]:
-        """Run up to max_rounds MCP tool loops before streaming. Returns tool-result messages."""
-        tool_messages: list[dict[str, str]] = []
-        if not self.mcp_registry:
-            return tool_messages
-
-        for _ in range(max_rounds):
-            loop_messages = messages if not tool_messages else (messages or []) + tool_messages
-            tools = self.get_tool_schemas()
-            preflight = await self.execution_engine.execute(
-                query=query,
-                system_prompt=system_prompt,
-                messages=loop_messages,
-                tools=tools if tools else None,
-            )
-            if not preflight.success:
-                break
-            tool_calls = preflight.tool_calls or []
-            if not tool_calls:
-                break
-            results = await self._dispatch_mcp_tools(tool_calls, chat_id, trace_id)
-            tool_messages.extend(self._format_tool_results_as_messages(results))
-
-        return tool_messages
-
     async def stream_response(self, incoming: IncomingMessage) -> AsyncIterator[str]:
-        """Yield response tokens; resolves any MCP tool calls before streaming."""
+        """Yield response tokens as they are generated, running MCP tool rounds inline.
+
+        Tool schemas are offered on the stream itself; text is forwarded
+        immediately and a tool round starts only when the model emits tool
+        calls, after which generation resumes with the tool results appended.
+        The final round is streamed without tools so it always ends in text.
+        """
         try:
             interface = InterfaceType(incoming.source) if incoming.source else InterfaceType.WEB
         except ValueError:
@@ -536,28 +623,40 @@ class AgentCore:
         query = incoming.text
         max_tool_rounds = int(self.config.get("mcp_tool_max_rounds", DEFAULT_MCP_TOOL_MAX_ROUNDS))
         messages = incoming.history if incoming.history else None
+        workspace_id = incoming.workspace_id if incoming.workspace_id else incoming.model
+        trace_id = f"stream-{incoming.id}"
 
-        tool_messages = await self._resolve_preflight_tools(
-            query=query,
-            system_prompt=system_prompt,
-            messages=messages,
-            chat_id=incoming.id,
-            trace_id=f"stream-{incoming.id}",
-            max_rounds=max_tool_rounds,
-        )
+        # One routing decision shared by every tool round and the final stream
+        decision = await self._route_request(query, incoming.id, trace_id, workspace_id)
+        tools = (self.select_tool_schemas(query, decision) or None) if self.mcp_registry else None
 
         collected_response = []
-        final_messages = (messages or []) + tool_messages if tool_messages else messages
-        workspace_id = incoming.workspace_id if incoming.workspace_id else incoming.model
+        current_messages = messages
 
-        async for token in self.execution_engine.generate_stream(
-            query=query,
-            system_prompt=system_prompt,
-            messages=final_messages,
-            workspace_id=workspace_id,
-        ):
-            collected_response.append(token)
-            yield token
+        for round_num in range(max_tool_rounds + 1):
+            round_tools = tools if round_num < max_tool_rounds else None
+            tool_calls: list[dict[str, Any]] = []
+
+            async for chunk in self.execution_engine.generate_stream(
+                query=query,
+                system_prompt=system_prompt,
+                messages=current_messages,
+                workspace_id=workspace_id,
+                tools=round_tools,
+                routing_decision=decision,
+            ):
+                if isinstance(chunk, ToolCallChunk):
+                    tool_calls.extend(chunk.tool_calls)
+                    continue
+                collected_response.append(chunk)
+                yield chunk
+
+            if not tool_calls:
+                break
+            results = await self._dispatch_mcp_tools(tool_calls, incoming.id, trace_id)
+            current_messages = (current_messages or []) + self._format_tool_results_as_messages(
+                results
+            )
 
         # Save completed response to context
         full_response = "".join(collected_response)
@@ -578,15 +677,38 @@ class AgentCore:
         trace_id: str,
         messages: list[dict[str, Any]] | None = None,
         workspace_id: str | None = None,
+        history: list[ContextMessage] | None = None,
     ) -> tuple[Any, list[dict[str, Any]]]:
-        """Execute model calls and iterate tool calls until a final answer is produced."""
+        """Execute model calls and iterate tool calls until a final answer is produced.
+
+        When *history* is given, each round's messages are assembled from it,
+        the query and the tool results so far, within the routed model's
+        context window; otherwise *messages* is sent as-is.
+        """
         collected_tool_results: list[dict[str, Any]] = []
         max_tool_rounds = int(self.config.get("mcp_tool_max_rounds", DEFAULT_MCP_TOOL_MAX_ROUNDS))
         current_messages = messages
+        turn: list[dict[str, Any]] = [{"role": "user", "content": query}]
+        # Route once so every round of the tool loop targets the same model
+        decision = await self._route_request(query, chat_id, trace_id, workspace_id)
+        context_window = self._context_window(decision)
+        if history is not None and context_window is None:
+            # Nothing to budget against; keep the fixed recent window
+            history = history[-self.context_manager.max_context_messages :]
 
         # Loop max_tool_rounds+1 times: first max_tool_rounds may dispatch tools,
         # the final round always returns the result without further dispatching.
         for round_num in range(max_tool_rounds + 1):
+            if history is not None:
+                # Only the first round folds trimmed history into the stored summary
+                current_messages = await self.context_assembler.assemble(
+                    chat_id,
+                    system_prompt,
+                    history,
+                    turn,
+                    context_window,
+                    summarize=round_num == 0,
+                )
             result = await self._execute_with_routing(
                 query=query,
                 system_prompt=system_prompt,
@@ -595,6 +717,7 @@ class AgentCore:
                 trace_id=trace_id,
                 messages=current_messages,
                 workspace_id=workspace_id,
+                routing_decision=decision,
             )
 
             tool_calls = result.tool_calls or []
@@ -604,10 +727,30 @@ class AgentCore:
             mcp_results = await self._dispatch_mcp_tools(tool_calls, chat_id, trace_id)
             collected_tool_results.extend(mcp_results)
             tool_msgs = self._format_tool_results_as_messages(mcp_results)
+            turn = turn + tool_msgs
             current_messages = (current_messages or []) + tool_msgs
 
         return result, collected_tool_results  # defensive; loop always returns inside
 
+    def _context_window(self, decision: RoutingDecision) -> int | None:
+        """Smallest context window among the routed model and its fallbacks."""
+        windows = []
+        for model_id in [decision.model_id, *decision.fallback_models]:
+            model = self.model_registry.get_model(model_id)
+            window = getattr(model, "context_window", None)
+            if isinstance(window, int) and window > 0:
+                windows.append(window)
+        return min(windows) if windows else None
+
+    async def _summarize_history(self, prompt: str, max_tokens: int) -> str:
+        """Summarize conversation history for the context assembler."""
+        result = await self.execution_engine.execute(
+            query=prompt, max_tokens=max_tokens, temperature=0.2
+        )
+        if not result.success:
+            raise ModelNotAvailableError(result.error or "Summarization failed")
+        return result.response
+
     def _format_tool_results_as_messages(
         self, tool_results: list[dict[str, Any]]
     ) -> list[dict[str, str]]:
@@ -645,18 +788,29 @@ class AgentCore:
         chat_id: str,
         trace_id: str,
     ) -> list[dict[str, Any]]:
-        """Dispatch tool-call requests to MCP registry, with HITL gating for high-risk tools."""
+        """Dispatch tool-call requests to MCP registry, with HITL gating for high-risk tools.
+
+        Independent calls run concurrently under the scheduler's caps; results
+        keep the order in which the model requested them.
+        """
         if not self.mcp_registry:
             return []
 
-        results = []
+        jobs = []
         for call in tool_calls:
             tool_name = call.get("tool") or call.get("name", "")
             if not tool_name:
                 continue
-            result = await self._dispatch_single_mcp_tool(call, tool_name, chat_id, trace_id)
-            results.append(result)
-        return results
+            jobs.append(
+                (
+                    tool_name,
+                    lambda call=call, tool_name=tool_name: self._dispatch_single_mcp_tool(
+                        call, tool_name, chat_id, trace_id
+                    ),
+                )
+            )
+        serialized = HIGH_RISK_TOOLS if self.hitl_middleware else ()
+        return await self._tool_scheduler.run(jobs, serialized_tools=serialized)
 
     async def _dispatch_single_mcp_tool(
         self,
@@ -737,7 +891,9 @@ class AgentCore:
         await self._gate_tool_confirmation(tool, tool_name, parameters, chat_id, user_id, trace_id)
 
         try:
-            return await tool.execute(parameters)
+            return await self.tool_runtime.run(tool, parameters)
+        except ToolExecutionError:
+            raise
         except Exception as e:
             logger.error("Tool execution error", tool=tool_name, error=str(e))
             raise ToolExecutionError(tool_name, str(e), details={"parameters": parameters})
@@ -773,12 +929,23 @@ class AgentCore:
             )
         logger.info("Tool execution approved", tool=tool_name, chat_id=chat_id)
 
+    async def start(self) -> None:
+        """Start background services (backend health monitoring, MCP tool discovery)."""
+        if hasattr(self.execution_engine, "start"):
+            await self.execution_engine.start()
+        await self.tool_schema_provider.start()
+
     async def cleanup(self) -> None:
-        """Release MCP and execution-engine resources."""
+        """Release MCP and execution-engine resources, flush history and queued events."""
         logger.info("Cleaning up AgentCore...")
+        await self.tool_schema_provider.stop()
+        await self._planner.close()
         if self.mcp_registry and hasattr(self.mcp_registry, "close"):
             await self.mcp_registry.close()
         await self.execution_engine.cleanup()
+        await self.context_manager.close()
+        await self.event_bus.close()
+        self.tool_runtime.shutdown()
         logger.info("AgentCore cleanup complete")
 
 
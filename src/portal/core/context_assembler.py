@@ -0,0 +1,232 @@
+"""
+Context Assembler - Token-budgeted prompt assembly
+==================================================
+
+Packs the system prompt, the current turn (user message with its memory block,
+plus any tool results) and as much recent conversation history as fits into
+the target model's ``context_window``, leaving room for the reply.
+
+History that no longer fits is folded into a rolling summary stored next to
+the conversation (``ContextManager.set_summary``). Summarization is
+incremental: only turns newer than the stored summary are folded in, and when
+trimming is needed the history is cut to a low-water mark so the summarizer
+runs once every few turns rather than on every message.
+
+Token counts are a local estimate (roughly one token per four characters of a
+word, one per punctuation mark); no tokenizer download is needed.
+"""
+
+import logging
+import math
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .context_manager import ContextManager, ContextMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_RESERVE = 1024  # tokens kept free for the model's reply
+DEFAULT_HISTORY_FETCH_LIMIT = 1000  # unsummarized messages read per turn (a safety cap)
+MESSAGE_OVERHEAD = 4  # role and separator tokens per chat message
+
+# Trimmed history is cut to this share of its budget, so the next few turns
+# fit without another summarization pass
+_LOW_WATER = 0.75
+# Share of the input budget the rolling summary may occupy
+_SUMMARY_SHARE = 0.125
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+SUMMARY_PROMPT = """Update the running summary of a conversation.
+Keep facts, decisions, names and open questions; drop small talk.
+Reply with the summary only, at most {max_words} words.
+
+Current summary:
+{summary}
+
+New messages:
+{transcript}"""
+
+# (prompt, max_tokens) -> summary text
+Summarizer = Callable[[str, int], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of *text* without a model tokenizer."""
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _PIECE_RE.findall(text))
+
+
+def message_tokens(message: dict[str, Any]) -> int:
+    return estimate_tokens(str(message.get("content") or "")) + MESSAGE_OVERHEAD
+
+
+def truncate_to_tokens(text: str, max_tokens: int, keep: str = "head") -> str:
+    """Cut *text* to about *max_tokens*, keeping its ``"head"`` or ``"tail"``."""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # Start near four characters per token and shrink until the estimate fits
+    chars = min(len(text), max_tokens * 4)
+    while chars > 0:
+        part = text[:chars] if keep == "head" else text[len(text) - chars :]
+        if estimate_tokens(part) + 1 <= max_tokens:
+            return f"{part} …" if keep == "head" else f"… {part}"
+        chars = int(chars * 0.9)
+    return ""
+
+
+class ContextAssembler:
+    """
+    Builds the chat-message list for one model call within a token budget.
+
+    Usage:
+        assembler = ContextAssembler(context_manager, summarizer=summarize)
+        messages = await assembler.assemble(chat_id, system_prompt, history, turn, 8192)
+    """
+
+    def __init__(
+        self,
+        context_manager: ContextManager,
+        summarizer: Summarizer | None = None,
+        output_reserve: int = DEFAULT_OUTPUT_RESERVE,
+    ) -> None:
+        """
+        Args:
+            context_manager: Store for conversation history and rolling summaries
+            summarizer: Async (prompt, max_tokens) -> summary; None keeps an
+                extractive summary built without a model call
+            output_reserve: Tokens kept free for the reply (capped at a quarter
+                of the context window)
+        """
+        self.context_manager = context_manager
+        self.summarizer = summarizer
+        self.output_reserve = output_reserve
+
+    def input_budget(self, context_window: int) -> int:
+        """Tokens available for the prompt on a model with *context_window*."""
+        return context_window - min(self.output_reserve, context_window // 4)
+
+    async def assemble(
+        self,
+        chat_id: str,
+        system_prompt: str,
+        history: list[ContextMessage],
+        turn: list[dict[str, Any]],
+        context_window: int | None,
+        summarize: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Return ``[system, *history, *turn]`` packed to fit *context_window*.
+
+        Args:
+            chat_id: Conversation whose rolling summary is read and updated
+            system_prompt: System prompt; the rolling summary is appended to it
+            history: Earlier messages, oldest first (excluding the current turn)
+            turn: Current user message and any tool results, always included
+                (truncated only if they alone exceed the budget)
+            context_window: Target model's window; None disables budgeting
+            summarize: Fold trimmed history into the stored summary. When
+                False, trimmed turns are only omitted from this call.
+        """
+        stored = await self.context_manager.get_summary(chat_id)
+        summary = stored.summary if stored else ""
+        if stored:
+            history = [m for m in history if m.timestamp > stored.through]
+        history_msgs = [{"role": m.role, "content": m.content} for m in history]
+
+        if context_window is None:
+            return [self._system_message(system_prompt, summary), *history_msgs, *turn]
+
+        budget = self.input_budget(context_window)
+        summary_budget = int(budget * _SUMMARY_SHARE)
+        system_tokens = estimate_tokens(system_prompt) + MESSAGE_OVERHEAD
+        turn = self._fit_turn(turn, budget - system_tokens - summary_budget)
+        available = budget - system_tokens - sum(message_tokens(m) for m in turn)
+
+        # Room for the summary is only set aside once there is one
+        keep = self._newest_that_fit(history_msgs, available - (summary_budget if summary else 0))
+        if keep < len(history_msgs) and summarize:
+            low_water = int((available - summary_budget) * _LOW_WATER)
+            keep = self._newest_that_fit(history_msgs, low_water)
+            dropped = history[: len(history) - keep]
+            summary = await self._fold(chat_id, summary, dropped, summary_budget)
+        elif keep < len(history_msgs):
+            logger.debug("Omitting %d history messages for %s", len(history) - keep, chat_id)
+
+        summary = truncate_to_tokens(summary, summary_budget, keep="tail")
+        kept = history_msgs[len(history_msgs) - keep :] if keep else []
+        return [self._system_message(system_prompt, summary), *kept, *turn]
+
+    @staticmethod
+    def _system_message(system_prompt: str, summary: str) -> dict[str, str]:
+        content = system_prompt
+        if summary:
+            content += f"\n\nSummary of the earlier conversation:\n{summary}"
+        return {"role": "system", "content": content}
+
+    @staticmethod
+    def _newest_that_fit(messages: list[dict[str, Any]], budget: int) -> int:
+        """Count how many of the newest *messages* fit in *budget* tokens."""
+        used = 0
+        for count, message in enumerate(reversed(messages)):
+            used += message_tokens(message)
+            if used > budget:
+                return count
+        return len(messages)
+
+    @staticmethod
+    def _fit_turn(turn: list[dict[str, Any]], budget: int) -> list[dict[str, Any]]:
+        """Truncate oversized messages of the current turn to share *budget*."""
+        if sum(message_tokens(m) for m in turn) <= budget or not turn:
+            return turn
+        share = max(budget // len(turn) - MESSAGE_OVERHEAD, 0)
+        fitted = []
+        for message in turn:
+            content = str(message.get("content") or "")
+            # The user's question ends the message (memory comes first); tool
+            # output leads with its most useful part
+            keep = "tail" if message.get("role") == "user" else "head"
+            fitted.append({**message, "content": truncate_to_tokens(content, share, keep=keep)})
+        return fitted
+
+    async def _fold(
+        self, chat_id: str, summary: str, dropped: list[ContextMessage], max_tokens: int
+    ) -> str:
+        """Fold *dropped* turns into *summary* and store it."""
+        if not dropped:
+            return summary
+        new_summary = ""
+        if self.summarizer is not None:
+            # Every dropped turn gets an equal share of the transcript, so long
+            # tool output cannot crowd out the rest
+            share = max(max_tokens * 4 // len(dropped), 16)
+            transcript = "\n".join(
+                f"{m.role}: {truncate_to_tokens(m.content, share)}" for m in dropped
+            )
+            prompt = SUMMARY_PROMPT.format(
+                max_words=max(int(max_tokens * 0.75), 20),
+                summary=summary or "(none)",
+                transcript=transcript,
+            )
+            try:
+                new_summary = (await self.summarizer(prompt, max_tokens)).strip()
+            except Exception as e:
+                logger.warning("History summarization failed for %s: %s", chat_id, e)
+        if not new_summary:
+            new_summary = self._extractive_summary(summary, dropped)
+        new_summary = truncate_to_tokens(new_summary, max_tokens, keep="tail")
+        await self.context_manager.set_summary(chat_id, new_summary, dropped[-1].timestamp)
+        logger.info("Folded %d messages into the summary of %s", len(dropped), chat_id)
+        return new_summary
+
+    @staticmethod
+    def _extractive_summary(summary: str, dropped: list[ContextMessage]) -> str:
+        """Fallback summary: the opening words of each dropped message."""
+        lines = [summary] if summary else []
+        for m in dropped:
+            words = m.content.split()
+            snippet = " ".join(words[:25]) + (" …" if len(words) > 25 else "")
+            lines.append(f"- {m.role}: {snippet}")
+        return "\n".join(lines)
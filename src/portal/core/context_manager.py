@@ -4,14 +4,21 @@ Context Manager - Unified conversation history across interfaces
 
 Ensures that users have consistent context whether they're using
 Telegram, Web, Slack, or any other interface.
+
+Recent conversations are served from an in-memory LRU; new messages are
+written behind in batches (one transaction per flush) and flushed durably
+on close() and at interpreter exit. Each conversation can also carry a
+rolling summary of turns that no longer fit a model's context window.
 """
 
 import asyncio
+import atexit
 import json
 import logging
 import os
 import sqlite3
-from dataclasses import asdict, dataclass
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -36,6 +43,27 @@ class ContextMessage:
         return asdict(self)
 
 
+@dataclass
+class ConversationSummary:
+    """Rolling summary of a conversation's messages up to *through* (a message timestamp)."""
+
+    summary: str
+    through: str
+
+
+@dataclass
+class _CachedSession:
+    """Most recent messages of one conversation, oldest first.
+
+    *complete* is True when the list holds the conversation's entire history,
+    so a request for more messages than are cached can still be answered
+    from memory.
+    """
+
+    messages: list[ContextMessage] = field(default_factory=list)
+    complete: bool = False
+
+
 class ContextManager:
     """
     Manages conversation context with persistent storage
@@ -45,24 +73,48 @@ class ContextManager:
     - Stores messages with timestamps and metadata
     - Supports context retrieval by chat_id
     - Handles context window limits
+    - Keeps the last *max_context_messages* of up to *max_cached_sessions*
+      conversations in memory (LRU), so per-turn reads skip SQLite
+    - Buffers inserts and commits them in one transaction every
+      *flush_interval* seconds (``flush_interval=0`` writes synchronously)
     """
 
     # Pruning configuration
     _PRUNE_INTERVAL = 100  # prune check every N inserts
+    # Flush early once this many messages are buffered
+    _MAX_PENDING = 200
 
-    def __init__(self, db_path: Path | None = None, max_context_messages: int = 50) -> None:
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        max_context_messages: int = 50,
+        max_cached_sessions: int = 256,
+        flush_interval: float = 0.5,
+    ) -> None:
         """
         Initialize context manager
 
         Args:
             db_path: Path to SQLite database (default: data/context.db)
             max_context_messages: Maximum messages to keep in context window
+            max_cached_sessions: Conversations kept in the in-memory LRU (0 disables)
+            flush_interval: Seconds between write-behind flushes (0 writes through)
         """
         self.db_path = db_path or Path("data") / "context.db"
         self.max_context_messages = max_context_messages
+        self.max_cached_sessions = max_cached_sessions
+        self.flush_interval = flush_interval
         self._max_age_days = int(os.getenv("PORTAL_CONTEXT_RETENTION_DAYS", "30"))
         self._insert_count = 0
 
+        self._sessions: OrderedDict[str, _CachedSession] = OrderedDict()
+        # chat_id -> summary (None: known to have none), most recently used last
+        self._summaries: OrderedDict[str, ConversationSummary | None] = OrderedDict()
+        self._pending: list[tuple[str, ContextMessage]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._flush_now = asyncio.Event()
+
         # Ensure data directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -72,6 +124,9 @@ class ContextManager:
         # Initialize database (synchronous; called from __init__)
         self._init_db()
 
+        # Last-chance flush if the process exits without close()
+        atexit.register(self._flush_pending_sync)
+
         logger.info("ContextManager initialized: %s", self.db_path)
 
     def _init_db(self) -> None:
@@ -93,28 +148,38 @@ class ContextManager:
             CREATE INDEX IF NOT EXISTS idx_chat_id
             ON conversations(chat_id, timestamp DESC)
         """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS conversation_summaries (
+                chat_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                through_timestamp TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
         conn.commit()
 
     # ------------------------------------------------------------------
     # Private sync helpers (called via asyncio.to_thread)
     # ------------------------------------------------------------------
 
-    def _sync_add_message(
-        self,
-        chat_id: str,
-        role: str,
-        content: str,
-        interface: str,
-        metadata: dict[str, Any],
-    ) -> None:
-        timestamp = datetime.now(tz=UTC).isoformat()
+    def _sync_add_messages(self, rows: list[tuple[str, ContextMessage]]) -> None:
         conn = self._pool.get()
-        conn.execute(
+        conn.executemany(
             """
             INSERT INTO conversations (chat_id, role, content, timestamp, interface, metadata)
             VALUES (?, ?, ?, ?, ?, ?)
         """,
-            (chat_id, role, content, timestamp, interface, json.dumps(metadata)),
+            [
+                (
+                    chat_id,
+                    msg.role,
+                    msg.content,
+                    msg.timestamp,
+                    msg.interface,
+                    json.dumps(msg.metadata),
+                )
+                for chat_id, msg in rows
+            ],
         )
         conn.commit()
 
@@ -123,6 +188,7 @@ class ContextManager:
         chat_id: str,
         limit: int,
         include_system: bool,
+        after: str | None = None,
     ) -> list[ContextMessage]:
         conn = self._pool.get()
         conn.row_factory = sqlite3.Row
@@ -132,13 +198,18 @@ class ContextManager:
             FROM conversations
             WHERE chat_id = ?
         """
+        params: list[Any] = [chat_id]
 
         if not include_system:
             query += " AND role != 'system'"
+        if after is not None:
+            query += " AND timestamp > ?"
+            params.append(after)
 
         query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
 
-        cursor = conn.execute(query, (chat_id, limit))
+        cursor = conn.execute(query, params)
         rows = cursor.fetchall()
 
         messages = []
@@ -159,6 +230,29 @@ class ContextManager:
     def _sync_clear_history(self, chat_id: str) -> None:
         conn = self._pool.get()
         conn.execute("DELETE FROM conversations WHERE chat_id = ?", (chat_id,))
+        conn.execute("DELETE FROM conversation_summaries WHERE chat_id = ?", (chat_id,))
+        conn.commit()
+
+    def _sync_get_summary(self, chat_id: str) -> ConversationSummary | None:
+        row = (
+            self._pool.get()
+            .execute(
+                "SELECT summary, through_timestamp FROM conversation_summaries WHERE chat_id = ?",
+                (chat_id,),
+            )
+            .fetchone()
+        )
+        return ConversationSummary(summary=row[0], through=row[1]) if row else None
+
+    def _sync_set_summary(self, chat_id: str, summary: ConversationSummary) -> None:
+        conn = self._pool.get()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO conversation_summaries (chat_id, summary, through_timestamp)
+            VALUES (?, ?, ?)
+        """,
+            (chat_id, summary.summary, summary.through),
+        )
         conn.commit()
 
     def _sync_prune_old_messages(self) -> int:
@@ -173,6 +267,84 @@ class ContextManager:
     # Public async API
     # ------------------------------------------------------------------
 
+    def _flush_pending_sync(self) -> None:
+        """Write any buffered messages synchronously (atexit hook)."""
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            self._sync_add_messages(rows)
+        except Exception as e:
+            logger.error("Failed to flush %d buffered context messages: %s", len(rows), e)
+
+    # ------------------------------------------------------------------
+    # Hot-session cache
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, chat_id: str) -> _CachedSession | None:
+        session = self._sessions.get(chat_id)
+        if session is not None:
+            self._sessions.move_to_end(chat_id)
+        return session
+
+    def _cache_put(self, chat_id: str, session: _CachedSession) -> None:
+        if self.max_cached_sessions <= 0:
+            return
+        self._sessions[chat_id] = session
+        self._sessions.move_to_end(chat_id)
+        while len(self._sessions) > self.max_cached_sessions:
+            self._sessions.popitem(last=False)
+
+    def _cache_append(self, chat_id: str, message: ContextMessage) -> None:
+        session = self._cache_get(chat_id)
+        if session is None:
+            return
+        session.messages.append(message)
+        if len(session.messages) > self.max_context_messages:
+            del session.messages[: -self.max_context_messages]
+            session.complete = False
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> None:
+        """Commit all buffered messages in a single transaction."""
+        async with self._flush_lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._sync_add_messages, rows)
+        except Exception:
+            # Keep the rows so the next flush (or exit hook) retries them
+            self._pending[:0] = rows
+            raise
+        logger.debug("Flushed %d context messages", len(rows))
+
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop(), name="context-flush")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Context write-behind flush failed: %s", e)
+
+    # ------------------------------------------------------------------
+    # Public async API
+    # ------------------------------------------------------------------
+
     async def add_message(
         self,
         chat_id: str,
@@ -184,6 +356,9 @@ class ContextManager:
         """
         Add a message to conversation history
 
+        The message is visible to get_history() immediately; with write-behind
+        enabled it reaches SQLite on the next flush.
+
         Args:
             chat_id: Unique conversation identifier
             role: Message role ('user', 'assistant', 'system')
@@ -191,12 +366,26 @@ class ContextManager:
             interface: Source interface (e.g., 'telegram', 'web')
             metadata: Additional metadata
         """
-        metadata = metadata or {}
-        await asyncio.to_thread(self._sync_add_message, chat_id, role, content, interface, metadata)
+        message = ContextMessage(
+            role=role,
+            content=content,
+            timestamp=datetime.now(tz=UTC).isoformat(),
+            interface=interface,
+            metadata=metadata or {},
+        )
+        self._cache_append(chat_id, message)
+        self._pending.append((chat_id, message))
+        if self.flush_interval <= 0:
+            await self.flush()
+        else:
+            self._ensure_flusher()
+            if len(self._pending) >= self._MAX_PENDING:
+                self._flush_now.set()
         logger.debug("Added %s message to %s from %s", role, chat_id, interface)
         # Periodic pruning: remove messages older than retention period
         self._insert_count += 1
         if self._insert_count % self._PRUNE_INTERVAL == 0:
+            await self.flush()
             deleted = await asyncio.to_thread(self._sync_prune_old_messages)
             if deleted:
                 logger.info(
@@ -209,6 +398,9 @@ class ContextManager:
         """
         Retrieve conversation history
 
+        Served from the hot-session cache when it holds enough messages;
+        otherwise buffered writes are flushed and SQLite is queried.
+
         Args:
             chat_id: Conversation identifier
             limit: Maximum number of messages (default: max_context_messages)
@@ -218,7 +410,56 @@ class ContextManager:
             List of messages in chronological order
         """
         limit = limit or self.max_context_messages
-        return await asyncio.to_thread(self._sync_get_history, chat_id, limit, include_system)
+        session = self._cache_get(chat_id)
+        if session is not None:
+            messages = [m for m in session.messages if include_system or m.role != "system"]
+            if len(messages) >= limit or session.complete:
+                return messages[-limit:]
+
+        # Hold the flush lock so no buffered write lands between the read and
+        # the cache fill; messages added meanwhile are still in _pending
+        async with self._flush_lock:
+            await self._flush_locked()
+            if not include_system:
+                return await asyncio.to_thread(self._sync_get_history, chat_id, limit, False)
+            depth = max(limit, self.max_context_messages)
+            rows = await asyncio.to_thread(self._sync_get_history, chat_id, depth, True)
+            complete = len(rows) < depth
+            rows.extend(msg for cid, msg in self._pending if cid == chat_id)
+        complete = complete and len(rows) <= self.max_context_messages
+        self._cache_put(
+            chat_id,
+            _CachedSession(messages=rows[-self.max_context_messages :], complete=complete),
+        )
+        return rows[-limit:]
+
+    async def get_history_since(
+        self, chat_id: str, after: str | None, limit: int
+    ) -> list[ContextMessage]:
+        """
+        Retrieve the messages newer than *after*, e.g. those a rolling summary
+        does not cover yet
+
+        Args:
+            chat_id: Conversation identifier
+            after: Timestamp to start after; None for the whole conversation
+            limit: Maximum number of (newest) messages
+
+        Returns:
+            List of messages in chronological order
+        """
+        session = self._cache_get(chat_id)
+        # The cache holds a contiguous tail; it suffices if it reaches back to *after*
+        if session is not None and (
+            session.complete
+            or (after is not None and session.messages and session.messages[0].timestamp <= after)
+        ):
+            messages = [m for m in session.messages if after is None or m.timestamp > after]
+            return messages[-limit:]
+
+        async with self._flush_lock:
+            await self._flush_locked()
+            return await asyncio.to_thread(self._sync_get_history, chat_id, limit, True, after)
 
     async def get_formatted_history(
         self, chat_id: str, limit: int | None = None, format: str = "openai"
@@ -254,12 +495,54 @@ class ContextManager:
         else:
             raise ValueError(f"Unsupported format: {format}")
 
+    async def get_summary(self, chat_id: str) -> ConversationSummary | None:
+        """Return the rolling summary of earlier turns in a chat, if one was stored."""
+        if chat_id in self._summaries:
+            self._summaries.move_to_end(chat_id)
+            return self._summaries[chat_id]
+        summary = await asyncio.to_thread(self._sync_get_summary, chat_id)
+        self._summary_cache_put(chat_id, summary)
+        return summary
+
+    async def set_summary(self, chat_id: str, summary: str, through: str) -> None:
+        """
+        Store the rolling summary of a chat.
+
+        Args:
+            chat_id: Conversation identifier
+            summary: Summary text
+            through: Timestamp of the newest message the summary covers
+        """
+        stored = ConversationSummary(summary=summary, through=through)
+        await asyncio.to_thread(self._sync_set_summary, chat_id, stored)
+        self._summary_cache_put(chat_id, stored)
+
+    def _summary_cache_put(self, chat_id: str, summary: ConversationSummary | None) -> None:
+        if self.max_cached_sessions <= 0:
+            return
+        self._summaries[chat_id] = summary
+        self._summaries.move_to_end(chat_id)
+        while len(self._summaries) > self.max_cached_sessions:
+            self._summaries.popitem(last=False)
+
     async def clear_history(self, chat_id: str) -> None:
-        """Clear conversation history for a chat"""
-        await asyncio.to_thread(self._sync_clear_history, chat_id)
+        """Clear conversation history (and its summary) for a chat"""
+        async with self._flush_lock:
+            self._pending = [(cid, msg) for cid, msg in self._pending if cid != chat_id]
+            self._cache_put(chat_id, _CachedSession(complete=True))
+            self._summary_cache_put(chat_id, None)
+            await asyncio.to_thread(self._sync_clear_history, chat_id)
         logger.info("Cleared history for chat_id: %s", chat_id)
 
     async def close(self) -> None:
-        """Close the connection pool and release resources."""
+        """Flush buffered messages, stop the flusher, and close the connection pool."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
         self._pool.close()
         logger.info("ContextManager connection pool closed")
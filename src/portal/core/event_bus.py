@@ -5,6 +5,11 @@ Event Bus - Asynchronous event system for real-time feedback
 Allows AgentCore to emit events during processing, enabling
 interfaces to provide intermediate feedback to users.
 
+Publishing only enqueues: each subscriber has a bounded queue served by its
+own worker task, so slow consumers (metrics, logging, websocket fan-out) do
+not add latency to the request path. A full queue drops its oldest event,
+blocks the publisher, or samples, per ``OverflowPolicy``.
+
 Examples:
 - "🔍 Searching knowledge base..."
 - "🔧 Running git tool..."
@@ -12,10 +17,13 @@ Examples:
 """
 
 import asyncio
+import contextlib
+import inspect
 import logging
+import time
 from collections import deque
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
@@ -73,6 +81,124 @@ class Event:
         }
 
 
+class OverflowPolicy(Enum):
+    """What a full subscriber queue does with a new event"""
+
+    DROP_OLDEST = "drop_oldest"  # evict the oldest queued event (default)
+    BLOCK = "block"  # publish() waits for room: backpressure on the publisher
+    SAMPLE = "sample"  # past half full keep 1 in ``sample_every``; drop when full
+
+
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_SAMPLE_EVERY = 10
+
+
+@dataclass
+class SubscriberStats:
+    """Delivery counters and lag for one subscriber"""
+
+    name: str
+    event_type: str
+    policy: str
+    queue_size: int
+    queued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    failed: int = 0
+    last_lag: float = 0.0  # seconds between publish and delivery
+    max_lag: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class _Subscription:
+    """A subscriber's bounded queue and the worker task that drains it"""
+
+    def __init__(
+        self,
+        event_type: EventType,
+        callback: Callable,
+        queue_size: int,
+        policy: OverflowPolicy,
+        sample_every: int,
+    ) -> None:
+        self.callback = callback
+        self.policy = policy
+        self.sample_every = max(sample_every, 1)
+        # (enqueue time, event); created lazily so subscribe() works without a loop
+        self.queue: asyncio.Queue[tuple[float, Event]] | None = None
+        self.queue_size = max(queue_size, 1)
+        self.worker: asyncio.Task | None = None
+        self._seen = 0
+        self.stats = SubscriberStats(
+            name=getattr(callback, "__qualname__", repr(callback)),
+            event_type=event_type.value,
+            policy=policy.value,
+            queue_size=self.queue_size,
+        )
+
+    def _ensure_worker(self) -> asyncio.Queue[tuple[float, Event]]:
+        if self.worker is not None and self.worker.get_loop() is not asyncio.get_running_loop():
+            # Bus reused on a new event loop; the old queue and worker are unusable
+            self.queue = self.worker = None
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(
+                self._run(self.queue), name=f"event-subscriber-{self.stats.name}"
+            )
+        return self.queue
+
+    async def offer(self, event: Event) -> None:
+        """Queue *event* according to the overflow policy"""
+        queue = self._ensure_worker()
+        item = (time.monotonic(), event)
+        if self.policy is OverflowPolicy.BLOCK:
+            await queue.put(item)
+        elif self.policy is OverflowPolicy.SAMPLE:
+            self._seen += 1
+            sampling = queue.qsize() >= self.queue_size // 2
+            if queue.full() or (sampling and self._seen % self.sample_every):
+                self.stats.dropped += 1
+                return
+            queue.put_nowait(item)
+        else:
+            if queue.full():
+                queue.get_nowait()
+                queue.task_done()
+                self.stats.dropped += 1
+            queue.put_nowait(item)
+        self.stats.queued = queue.qsize()
+
+    async def _run(self, queue: asyncio.Queue[tuple[float, Event]]) -> None:
+        while True:
+            enqueued_at, event = await queue.get()
+            lag = time.monotonic() - enqueued_at
+            self.stats.last_lag = lag
+            self.stats.max_lag = max(self.stats.max_lag, lag)
+            try:
+                result = self.callback(event)
+                if inspect.isawaitable(result):
+                    await result
+                self.stats.delivered += 1
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(
+                    f"Error in event subscriber for {event.event_type.value}: {e}", exc_info=True
+                )
+            finally:
+                self.stats.queued = queue.qsize()
+                queue.task_done()
+
+    async def close(self) -> None:
+        if self.worker is not None:
+            self.worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.worker
+            self.worker = None
+
+
 class EventBus:
     """
     Event bus for publishing and subscribing to events
@@ -80,8 +206,11 @@ class EventBus:
     Architecture:
     - Async publish/subscribe pattern
     - Multiple subscribers per event type
-    - Non-blocking event delivery
+    - Each subscriber has a bounded queue drained by its own worker task, so
+      publish() is an enqueue and a slow subscriber never delays the publisher
+      (except under OverflowPolicy.BLOCK, which opts into backpressure)
     - Error isolation (one subscriber failure doesn't affect others)
+    - Per-subscriber delivery, drop and lag counters via stats()
 
     Event History:
     - By default, event history is disabled to prevent memory leaks in long-running agents
@@ -89,7 +218,14 @@ class EventBus:
     - For production auditing, use the persistence layer instead of in-memory storage
     """
 
-    def __init__(self, enable_history: bool = False, max_history: int = 1000) -> None:
+    def __init__(
+        self,
+        enable_history: bool = False,
+        max_history: int = 1000,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        sample_every: int = DEFAULT_SAMPLE_EVERY,
+    ) -> None:
         """
         Initialize event bus
 
@@ -97,36 +233,65 @@ class EventBus:
             enable_history: Enable in-memory event history (default: False).
                            For long-running agents, prefer using the persistence layer.
             max_history: Maximum number of events to keep in memory (default: 1000)
+            queue_size: Default per-subscriber queue capacity
+            overflow_policy: Default policy when a subscriber queue is full
+            sample_every: Under OverflowPolicy.SAMPLE, events kept per N offered
+                          once a queue is half full
         """
-        self._subscribers: dict[EventType, list[Callable]] = {}
+        self._subscribers: dict[EventType, list[_Subscription]] = {}
         self._enable_history = enable_history
         self._event_history: deque[Event] = deque(maxlen=max_history) if enable_history else deque()
+        self.queue_size = queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.sample_every = sample_every
+
+        logger.info(
+            "EventBus initialized (history: %s, queue: %d, overflow: %s)",
+            enable_history,
+            queue_size,
+            self.overflow_policy.value,
+        )
 
-        logger.info("EventBus initialized (history: %s)", enable_history)
-
-    def subscribe(self, event_type: EventType, callback: Callable) -> None:
+    def subscribe(
+        self,
+        event_type: EventType,
+        callback: Callable,
+        queue_size: int | None = None,
+        overflow_policy: OverflowPolicy | str | None = None,
+    ) -> None:
         """
         Subscribe to an event type
 
         Args:
             event_type: Type of event to subscribe to
-            callback: Async function to call when event occurs
+            callback: Function to call when event occurs (async or plain)
                      Signature: async def callback(event: Event) -> None
+            queue_size: Queue capacity for this subscriber (default: bus setting)
+            overflow_policy: Overflow policy for this subscriber (default: bus setting)
         """
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-
-        self._subscribers[event_type].append(callback)
+        policy = (
+            self.overflow_policy if overflow_policy is None else OverflowPolicy(overflow_policy)
+        )
+        subscription = _Subscription(
+            event_type,
+            callback,
+            queue_size or self.queue_size,
+            policy,
+            self.sample_every,
+        )
+        self._subscribers.setdefault(event_type, []).append(subscription)
         logger.debug("Subscribed to %s", event_type.value)
 
     def unsubscribe(self, event_type: EventType, callback: Callable) -> None:
-        """Unsubscribe from an event type"""
-        if event_type in self._subscribers:
-            try:
-                self._subscribers[event_type].remove(callback)
+        """Unsubscribe from an event type; events still queued for it are discarded"""
+        for subscription in self._subscribers.get(event_type, []):
+            if subscription.callback == callback:
+                self._subscribers[event_type].remove(subscription)
+                if subscription.worker is not None:
+                    subscription.worker.cancel()
                 logger.debug("Unsubscribed from %s", event_type.value)
-            except ValueError:
-                logger.warning("Callback not found in %s subscribers", event_type.value)
+                return
+        logger.warning("Callback not found in %s subscribers", event_type.value)
 
     async def publish(
         self, event_type: EventType, chat_id: str, data: dict[str, Any], trace_id: str | None = None
@@ -134,6 +299,9 @@ class EventBus:
         """
         Publish an event
 
+        Returns once the event is queued for every subscriber; delivery
+        happens on the subscribers' worker tasks.
+
         Args:
             event_type: Type of event
             chat_id: Conversation identifier
@@ -153,44 +321,43 @@ class EventBus:
         if self._enable_history:
             self._event_history.append(event)
 
-        # Get subscribers for this event type
-        subscribers = self._subscribers.get(event_type, [])
-
+        subscribers = self._subscribers.get(event_type)
         if not subscribers:
             logger.debug("No subscribers for %s", event_type.value)
             return
 
-        # Notify all subscribers (non-blocking, error-isolated)
-        tasks = []
-        for callback in subscribers:
-            task = self._notify_subscriber(callback, event)
-            tasks.append(task)
-
-        # Wait for all notifications to complete (SafeTaskFactory pattern)
-        # return_exceptions=True ensures one subscriber failure doesn't crash others
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Log any exceptions that escaped _notify_subscriber (defense in depth)
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(
-                        f"Uncaught exception in event subscriber {i} for {event_type.value}: {result}",
-                        exc_info=result,
-                    )
-
-    async def _notify_subscriber(self, callback: Callable, event: Event) -> None:
-        """
-        Notify a single subscriber with error handling
-
-        Errors in one subscriber don't affect others
-        """
+        for subscription in subscribers:
+            await subscription.offer(event)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Per-subscriber queue depth, delivery counters and lag"""
+        return [
+            subscription.stats.to_dict()
+            for subscriptions in self._subscribers.values()
+            for subscription in subscriptions
+        ]
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been delivered; False on timeout"""
+        queues = [
+            subscription.queue
+            for subscriptions in self._subscribers.values()
+            for subscription in subscriptions
+            if subscription.queue is not None and subscription.worker is not None
+        ]
         try:
-            await callback(event)
-        except Exception as e:
-            logger.error(
-                f"Error in event subscriber for {event.event_type.value}: {e}", exc_info=True
-            )
+            await asyncio.wait_for(asyncio.gather(*(q.join() for q in queues)), timeout)
+        except TimeoutError:
+            logger.warning("EventBus drain timed out with events still queued")
+            return False
+        return True
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Deliver queued events (up to *timeout*) and stop subscriber workers"""
+        await self.drain(timeout)
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                await subscription.close()
 
 
 # =============================================================================
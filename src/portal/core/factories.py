@@ -8,10 +8,11 @@ from typing import TYPE_CHECKING, Any
 from portal.routing import ExecutionEngine, IntelligentRouter, ModelRegistry, RoutingStrategy
 from portal.routing.backend_registry import BackendRegistry
 from portal.routing.model_backends import MLXServerBackend, OllamaBackend
+from portal.routing.model_performance import ModelPerformanceTracker
 from portal.routing.workspace_registry import WorkspaceRegistry
 
 from .context_manager import ContextManager
-from .event_bus import EventBus
+from .event_bus import DEFAULT_QUEUE_SIZE, EventBus, OverflowPolicy
 from .prompt_manager import PromptManager
 from .structured_logger import get_logger
 
@@ -51,6 +52,10 @@ def create_router(
         strategy=routing_strategy,
         model_preferences=model_preferences,
         workspace_registry=workspace_registry,
+        performance=ModelPerformanceTracker(
+            half_life=config.get("routing_stats_half_life", 300.0),
+            shed_error_rate=config.get("routing_shed_error_rate", 0.5),
+        ),
     )
 
 
@@ -67,6 +72,9 @@ def create_execution_engine(
         "circuit_breaker_threshold": config.get("circuit_breaker_threshold", 3),
         "circuit_breaker_timeout": config.get("circuit_breaker_timeout", 60),
         "circuit_breaker_half_open_calls": config.get("circuit_breaker_half_open_calls", 1),
+        "circuit_breaker_probe_delay": config.get("circuit_breaker_probe_delay", 15.0),
+        "health_probe_min_interval": config.get("health_probe_min_interval", 5.0),
+        "health_probe_max_interval": config.get("health_probe_max_interval", 60.0),
     }
 
     registry = BackendRegistry()
@@ -87,18 +95,27 @@ def create_execution_engine(
 
 
 def create_context_manager(config: dict[str, Any]) -> ContextManager:
-    """Return a ContextManager with configured message limit."""
+    """Return a ContextManager with configured message limit and write-behind cache."""
     max_messages = config.get("max_context_messages", 50)
     logger.info("Creating ContextManager", max_messages=max_messages)
-    return ContextManager(max_context_messages=max_messages)
+    return ContextManager(
+        max_context_messages=max_messages,
+        max_cached_sessions=config.get("context_cache_sessions", 256),
+        flush_interval=config.get("context_flush_interval", 0.5),
+    )
 
 
 def create_event_bus_instance(config: dict[str, Any]) -> EventBus:
-    """Return an EventBus with optional history enabled."""
+    """Return an EventBus with optional history and per-subscriber queue settings."""
     enable_history = config.get("event_bus_enable_history", False)
     max_history = config.get("event_bus_max_history", 1000)
     logger.info("Creating EventBus", enable_history=enable_history, max_history=max_history)
-    return EventBus(enable_history=enable_history, max_history=max_history)
+    return EventBus(
+        enable_history=enable_history,
+        max_history=max_history,
+        queue_size=config.get("event_bus_queue_size", DEFAULT_QUEUE_SIZE),
+        overflow_policy=config.get("event_bus_overflow_policy", OverflowPolicy.DROP_OLDEST),
+    )
 
 
 def create_prompt_manager(config: dict[str, Any]) -> PromptManager:
@@ -109,10 +126,12 @@ def create_prompt_manager(config: dict[str, Any]) -> PromptManager:
     return PromptManager(prompts_dir=prompts_dir, personas_dir=personas_dir)
 
 
-def create_tool_registry(config: dict[str, Any]) -> ToolRegistry:  # noqa: ARG001
-    """Return the global ToolRegistry singleton."""
+def create_tool_registry(config: dict[str, Any]) -> ToolRegistry:
+    """Return the global ToolRegistry singleton, configured for manifest-driven loading."""
     from portal.tools import registry  # avoid circular import
 
+    registry.manifest_path = config.get("tool_manifest_path")
+    registry.lazy = config.get("tool_lazy_loading", True)
     logger.info("Creating ToolRegistry (using global registry)")
     return registry
 
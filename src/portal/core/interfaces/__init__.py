@@ -13,6 +13,7 @@ from .agent_interface import (
 )
 from .tool import (
     BaseTool,
+    ExecutionMode,
     ToolCategory,
     ToolMetadata,
     ToolParameter,
@@ -23,6 +24,7 @@ __all__ = [
     "ToolMetadata",
     "ToolParameter",
     "ToolCategory",
+    "ExecutionMode",
     "BaseInterface",
     "Message",
     "Response",
@@ -23,6 +23,14 @@ class ToolCategory(Enum):
     KNOWLEDGE = "knowledge"
 
 
+class ExecutionMode(Enum):
+    """Where ToolRuntime runs a tool's ``execute()``"""
+
+    ASYNC = "async"  # on the event loop; execute() only awaits non-blocking I/O
+    IO = "io"  # worker thread; blocking file, network or subprocess calls
+    CPU = "cpu"  # worker process; pure-Python or GIL-holding computation
+
+
 @dataclass
 class ToolParameter:
     """Tool parameter definition"""
@@ -46,6 +54,8 @@ class ToolMetadata:
     async_capable: bool = True
     parameters: list[ToolParameter] = field(default_factory=list)
     examples: list[str] = field(default_factory=list)
+    execution_mode: ExecutionMode = ExecutionMode.ASYNC
+    timeout: float | None = None  # seconds; None uses the runtime default
 
 
 class BaseTool(ABC):
@@ -55,6 +65,11 @@ class BaseTool(ABC):
     Subclasses must implement ``execute(parameters)`` and either:
     - Define a class-level ``METADATA`` dict (preferred), or
     - Override ``_get_metadata()`` (legacy, still supported).
+
+    A tool whose ``execute()`` does blocking work declares
+    ``"execution_mode": "io"`` or ``"cpu"`` so ToolRuntime keeps it off the
+    event loop. CPU tools run in a worker process on a fresh instance, so
+    they must not rely on state set after construction.
     """
 
     def __init__(self) -> None:
@@ -79,6 +94,8 @@ class BaseTool(ABC):
                     async_capable=cls_meta.get("async_capable", True),
                     parameters=[ToolParameter(**p) for p in cls_meta.get("parameters", [])],
                     examples=cls_meta.get("examples", []),
+                    execution_mode=ExecutionMode(cls_meta.get("execution_mode", "async")),
+                    timeout=cls_meta.get("timeout"),
                 )
             else:
                 self._metadata = self._get_metadata()
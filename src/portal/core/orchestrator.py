@@ -2,9 +2,14 @@
 Multi-Step Task Orchestrator
 ==============================
 
-Decomposes complex user requests into sequential steps and executes them,
-passing results forward as context. Implements linear chains; DAG support
-is deferred to a future iteration.
+Decomposes complex user requests into steps and executes them as a dependency
+graph, passing each step's result to the steps that depend on it. Every step
+whose dependencies have succeeded runs concurrently (up to a concurrency
+budget), so independent searches or reads finish in critical-path time. When a
+step fails, the steps downstream of it are skipped; unrelated branches continue.
+
+A step without explicit ``depends_on`` depends on every earlier step, so plans
+written as plain lists still run as linear chains.
 
 Design constraints:
 - No external agent frameworks (no LangChain, no CrewAI)
@@ -13,14 +18,19 @@ Design constraints:
 - Max steps capped to prevent runaway chains
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from enum import StrEnum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .planner import TaskPlanner
 
 logger = logging.getLogger(__name__)
 
 MAX_STEPS = 8  # Hard cap on plan length
+DEFAULT_MAX_PARALLEL_STEPS = 4  # Steps in flight at once within one plan
 
 
 class StepType(StrEnum):
@@ -40,9 +50,11 @@ class TaskStep:
     tool_name: str | None = None  # for TOOL steps
     tool_args: dict[str, Any] = field(default_factory=dict)
     llm_prompt_template: str | None = None  # for LLM steps; {context} substituted
+    depends_on: list[int] | None = None  # step_ids; None means every earlier step
     result: str | None = None
     error: str | None = None
     completed: bool = False
+    skipped: bool = False  # not run because a dependency failed
 
 
 @dataclass
@@ -61,11 +73,37 @@ class TaskPlan:
     def failed_steps(self) -> list[TaskStep]:
         return [s for s in self.steps if s.error is not None]
 
+    def dependencies(self, step: TaskStep) -> list[int]:
+        """Return the step_ids *step* waits on."""
+        if step.depends_on is None:
+            return [s.step_id for s in self.steps if s.step_id < step.step_id]
+        return sorted(set(step.depends_on))
+
+    def validate(self) -> None:
+        """Raise ValueError if a dependency is unknown or the steps form a cycle."""
+        ids = {s.step_id for s in self.steps}
+        remaining: dict[int, set[int]] = {}
+        for step in self.steps:
+            deps = set(self.dependencies(step))
+            unknown = deps - ids
+            if unknown or step.step_id in deps:
+                raise ValueError(f"Step {step.step_id} has invalid dependencies: {sorted(deps)}")
+            remaining[step.step_id] = deps
+        # Kahn's algorithm: peel off steps with no unresolved dependencies
+        while remaining:
+            ready = [sid for sid, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle among steps {sorted(remaining)}")
+            for sid in ready:
+                del remaining[sid]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
 
 class TaskOrchestrator:
     """
-    Orchestrates multi-step tasks by decomposing a user goal into sequential steps
-    and executing them, passing accumulated results forward as context.
+    Orchestrates multi-step tasks by decomposing a user goal into steps and
+    executing them as a dependency graph, passing results along its edges.
 
     Usage:
         orchestrator = TaskOrchestrator(execute_llm, execute_tool)
@@ -77,14 +115,20 @@ class TaskOrchestrator:
         self,
         llm_executor: Any | None = None,
         tool_executor: Any | None = None,
+        max_parallel_steps: int = DEFAULT_MAX_PARALLEL_STEPS,
+        planner: "TaskPlanner | None" = None,
     ) -> None:
         """
         Args:
             llm_executor: Callable (prompt: str) -> str for LLM calls
             tool_executor: Callable (name: str, args: dict) -> dict for tool calls
+            max_parallel_steps: Maximum number of steps of one plan running at once
+            planner: Optional TaskPlanner used by build_plan_from_llm
         """
         self._llm_executor = llm_executor
         self._tool_executor = tool_executor
+        self._max_parallel_steps = max(1, max_parallel_steps)
+        self._planner = planner
 
     def build_plan(self, goal: str, steps: list[dict[str, Any]] | None = None) -> TaskPlan:
         """
@@ -101,9 +145,14 @@ class TaskOrchestrator:
                    - tool_name: (tool steps) name of tool to call
                    - tool_args: (tool steps) args dict
                    - llm_prompt_template: (llm steps) prompt with {context} placeholder
+                   - depends_on: (optional) indices of the steps this one needs;
+                     omitted means every earlier step, [] means none
 
         Returns:
             TaskPlan ready for execution
+
+        Raises:
+            ValueError: If ``depends_on`` references an unknown step or forms a cycle
         """
         if not steps:
             return TaskPlan(
@@ -129,17 +178,47 @@ class TaskOrchestrator:
                     tool_name=step_dict.get("tool_name"),
                     tool_args=step_dict.get("tool_args", {}),
                     llm_prompt_template=step_dict.get("llm_prompt_template"),
+                    depends_on=step_dict.get("depends_on"),
                 )
             )
 
-        return TaskPlan(goal=goal, steps=task_steps)
+        plan = TaskPlan(goal=goal, steps=task_steps)
+        plan.validate()
+        return plan
+
+    async def build_plan_from_llm(
+        self, goal: str, tools: list[dict[str, Any]] | None = None
+    ) -> TaskPlan:
+        """
+        Build a TaskPlan for *goal* using the planner model.
+
+        Falls back to the single-step plan from ``build_plan(goal)`` when no
+        planner is configured or it cannot produce a valid plan.
+
+        Args:
+            goal: The user's overall objective
+            tools: Tools the plan may bind, as dicts with ``name`` and ``description``
+        """
+        if self._planner is None:
+            return self.build_plan(goal)
+        steps = await self._planner.plan(goal, tools or [])
+        if not steps:
+            return self.build_plan(goal)
+        try:
+            return self.build_plan(goal, steps)
+        except ValueError as e:
+            logger.warning("Discarding generated plan: %s", e)
+            return self.build_plan(goal)
 
     async def execute(self, plan: TaskPlan) -> str:
         """
-        Execute all steps in a TaskPlan sequentially.
+        Execute a TaskPlan, running every ready step concurrently.
 
-        Results from each step are accumulated into a shared context and
-        passed forward to subsequent steps via {context} substitution.
+        A step becomes ready once all of its dependencies have succeeded; it
+        receives their results as context via {context} substitution (and
+        ``{step_N}`` placeholders in tool args). If a dependency fails, the
+        step is skipped rather than run. At most ``max_parallel_steps`` steps
+        are in flight at once.
 
         Args:
             plan: TaskPlan to execute
@@ -147,39 +226,76 @@ class TaskOrchestrator:
         Returns:
             Final result string (last step's output, or summary of all steps)
         """
-        accumulated_context = f"Goal: {plan.goal}\n\n"
-
-        for step in plan.steps:
-            logger.info(
-                "Orchestrator step %d/%d: %s [%s]",
-                step.step_id + 1,
-                len(plan.steps),
-                step.description,
-                step.step_type,
-            )
-
-            try:
-                if step.step_type == StepType.TOOL:
-                    result = await self._run_tool_step(step)
-                else:
-                    result = await self._run_llm_step(step, accumulated_context)
-
-                step.result = result
-                step.completed = True
-                accumulated_context += (
-                    f"Step {step.step_id + 1} ({step.description}):\n{result}\n\n"
-                )
-
-            except Exception as e:
-                step.error = str(e)
-                step.completed = True
-                logger.warning("Step %d failed: %s", step.step_id, e)
-                accumulated_context += (
-                    f"Step {step.step_id + 1} ({step.description}) FAILED: {e}\n\n"
-                )
+        steps = {s.step_id: s for s in plan.steps}
+        pending = {s.step_id: set(plan.dependencies(s)) for s in plan.steps}
+        running: dict[asyncio.Task, TaskStep] = {}
+
+        try:
+            while pending or running:
+                self._skip_blocked(plan, steps, pending)
+                ready = [sid for sid, deps in pending.items() if not deps]
+                for sid in ready[: self._max_parallel_steps - len(running)]:
+                    del pending[sid]
+                    step = steps[sid]
+                    logger.info(
+                        "Orchestrator step %d/%d: %s [%s]",
+                        step.step_id + 1,
+                        len(plan.steps),
+                        step.description,
+                        step.step_type,
+                    )
+                    task = asyncio.create_task(self._run_step(plan, step, steps))
+                    running[task] = step
+
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    if step.error is None:
+                        for deps in pending.values():
+                            deps.discard(step.step_id)
+        finally:
+            for task in running:
+                task.cancel()
 
         return self._summarize(plan)
 
+    @staticmethod
+    def _skip_blocked(
+        plan: TaskPlan, steps: dict[int, TaskStep], pending: dict[int, set[int]]
+    ) -> None:
+        """Skip pending steps downstream of a failed or skipped step."""
+        changed = True
+        while changed:
+            changed = False
+            for sid, deps in list(pending.items()):
+                failed = [d for d in deps if steps[d].completed and steps[d].error is not None]
+                if failed:
+                    step = steps[sid]
+                    step.error = f"Skipped: dependency step {failed[0] + 1} failed"
+                    step.skipped = True
+                    step.completed = True
+                    del pending[sid]
+                    changed = True
+                    logger.info("Skipping step %d: dependency failed", sid)
+
+    async def _run_step(self, plan: TaskPlan, step: TaskStep, steps: dict[int, TaskStep]) -> None:
+        """Run one step, recording its result or error on the step itself."""
+        deps = [steps[d] for d in plan.dependencies(step)]
+        context = f"Goal: {plan.goal}\n\n" + "".join(
+            f"Step {d.step_id + 1} ({d.description}):\n{d.result}\n\n" for d in deps
+        )
+        try:
+            if step.step_type == StepType.TOOL:
+                step.result = await self._run_tool_step(step, deps)
+            else:
+                step.result = await self._run_llm_step(step, context)
+        except Exception as e:
+            step.error = str(e)
+            logger.warning("Step %d failed: %s", step.step_id, e)
+        step.completed = True
+
     async def _run_llm_step(self, step: TaskStep, context: str) -> str:
         """Execute an LLM step, substituting {context} in the prompt template."""
         if self._llm_executor is None:
@@ -187,21 +303,34 @@ class TaskOrchestrator:
 
         prompt = step.llm_prompt_template or step.description
         if "{context}" in prompt:
-            prompt = prompt.format(context=context)
+            # Not str.format: templates hold model and user text with stray braces
+            prompt = prompt.replace("{context}", context)
         else:
             # Prepend context if template doesn't reference it
             prompt = f"Context from previous steps:\n{context}\n\nTask: {prompt}"
 
         return await self._llm_executor(prompt)
 
-    async def _run_tool_step(self, step: TaskStep) -> str:
-        """Execute a tool step and return a string summary of the result."""
+    async def _run_tool_step(self, step: TaskStep, deps: list[TaskStep] | None = None) -> str:
+        """Execute a tool step and return a string summary of the result.
+
+        String args may reference a dependency's result as ``{step_N}`` (1-based).
+        """
         if self._tool_executor is None:
             return f"[Tool executor not configured — tool: {step.tool_name}]"
         if not step.tool_name:
             return "[No tool_name specified for tool step]"
 
-        result = await self._tool_executor(step.tool_name, step.tool_args)
+        args = step.tool_args
+        if deps:
+            args = {}
+            for key, value in step.tool_args.items():
+                if isinstance(value, str):
+                    for dep in deps:
+                        value = value.replace(f"{{step_{dep.step_id + 1}}}", dep.result or "")
+                args[key] = value
+
+        result = await self._tool_executor(step.tool_name, args)
         if isinstance(result, dict):
             if result.get("success") is False:
                 raise RuntimeError(result.get("error", "Tool call failed"))
@@ -220,7 +349,7 @@ class TaskOrchestrator:
         # Multi-step: return last successful result, with a brief summary header
         results = []
         for step in plan.steps:
-            status = "✓" if not step.error else "✗"
+            status = "✓" if not step.error else ("–" if step.skipped else "✗")
             results.append(f"{status} Step {step.step_id + 1}: {step.description}")
 
         last_result = next(
@@ -0,0 +1,256 @@
+"""
+Task Planner — LLM-generated step plans for the TaskOrchestrator.
+
+Asks a small local Ollama model to decompose a multi-step request into a JSON
+step list with tool bindings, then validates the result: every tool step must
+name a tool the registry can execute, and every ``depends_on`` entry must point
+at an earlier step, so a validated plan is always acyclic. Tools that require
+user confirmation are never offered to the model and are rejected if it names
+them anyway, since planned steps run without a confirmation prompt.
+
+Validated plans are cached in a bounded in-memory LRU keyed on the normalized
+request text, the planner model and the set of available tools. Repeated
+requests skip planning entirely, and concurrent identical requests share a
+single model call. Invalid or failed plans are never cached.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Collection, Sequence
+from typing import Any
+
+import httpx
+
+from portal.routing.llm_classifier import normalize_query
+
+from .orchestrator import MAX_STEPS, StepType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PLANNER_MODEL = "qwen2.5:0.5b"
+
+
+def validate_plan_steps(
+    raw: Any, tool_names: Sequence[str], confirmation_tools: Collection[str] = ()
+) -> list[dict[str, Any]]:
+    """Check a model-emitted plan and return it as ``build_plan`` step dicts.
+
+    Accepts ``{"steps": [...]}`` or a bare list. Raises ValueError if the plan
+    is empty, longer than MAX_STEPS, names an unknown step type or tool, uses
+    a tool in *confirmation_tools*, or has a dependency that does not point at
+    an earlier step.
+    """
+    if isinstance(raw, dict):
+        raw = raw.get("steps")
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("Plan has no steps")
+    if len(raw) > MAX_STEPS:
+        raise ValueError(f"Plan has {len(raw)} steps (max {MAX_STEPS})")
+
+    known_tools = set(tool_names)
+    steps: list[dict[str, Any]] = []
+    for i, item in enumerate(raw):
+        if not isinstance(item, dict):
+            raise ValueError(f"Step {i} is not an object")
+        try:
+            step_type = StepType(str(item.get("type", "llm")).lower())
+        except ValueError:
+            raise ValueError(f"Step {i} has unknown type {item.get('type')!r}") from None
+        description = str(item.get("description") or f"Step {i + 1}")
+        step: dict[str, Any] = {"type": step_type.value, "description": description}
+
+        if step_type == StepType.TOOL:
+            tool_name = item.get("tool_name")
+            if tool_name in confirmation_tools:
+                raise ValueError(f"Step {i} uses tool {tool_name!r}, which requires confirmation")
+            if tool_name not in known_tools:
+                raise ValueError(f"Step {i} uses unknown tool {tool_name!r}")
+            tool_args = item.get("tool_args") or {}
+            if not isinstance(tool_args, dict):
+                raise ValueError(f"Step {i} tool_args is not an object")
+            step["tool_name"] = tool_name
+            step["tool_args"] = tool_args
+        else:
+            template = item.get("llm_prompt_template") or f"{description}\n\n{{context}}"
+            step["llm_prompt_template"] = str(template)
+
+        depends_on = item.get("depends_on")
+        if depends_on is not None:
+            if not isinstance(depends_on, list) or not all(
+                isinstance(d, int) and not isinstance(d, bool) and 0 <= d < i for d in depends_on
+            ):
+                raise ValueError(f"Step {i} depends_on must list earlier step indices")
+            step["depends_on"] = depends_on
+        steps.append(step)
+    return steps
+
+
+class TaskPlanner:
+    """
+    Generates orchestrator step plans with a small Ollama model.
+
+    ``plan()`` returns validated step dicts for ``TaskOrchestrator.build_plan``,
+    or None when the model is unreachable or its output does not validate.
+    All requests go through one pooled ``httpx.AsyncClient``.
+    """
+
+    PLAN_PROMPT = """Break the request below into at most {max_steps} steps.
+Available tools:
+{tools}
+
+Respond with ONLY a JSON object of the form:
+{{"steps": [{{"type": "tool" or "llm", "description": "...", "tool_name": "...", "tool_args": {{}}, "llm_prompt_template": "... {{context}} ...", "depends_on": [0]}}]}}
+
+Rules:
+- "tool" steps must use a tool_name from the list above.
+- "llm" steps write, summarize or reason; put {{context}} where earlier results belong.
+- "depends_on" lists the 0-based indices of earlier steps whose results the step needs.
+  Use [] for steps that can start immediately, so independent steps run in parallel.
+- A tool arg may contain {{step_N}} (1-based) to use step N's result.
+
+Request: {goal}"""
+
+    def __init__(
+        self,
+        ollama_host: str = "http://localhost:11434",
+        model: str = DEFAULT_PLANNER_MODEL,
+        timeout: float = 15.0,
+        cache_size: int = 64,
+        cache_ttl: float = 3600.0,
+    ) -> None:
+        self.ollama_host = ollama_host
+        self.model = model
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._client: httpx.AsyncClient | None = None
+        # key -> (created_at, steps), most recently used last
+        self._cache: OrderedDict[str, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.planning_seconds = 0.0  # total time spent in model calls
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def plan(self, goal: str, tools: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+        """
+        Return validated step dicts for *goal*, or None if no valid plan was produced.
+
+        Args:
+            goal: The user's multi-step request
+            tools: Executable tools as dicts with ``name`` and ``description``;
+                entries with ``requires_confirmation`` set are left out of the plan
+        """
+        blocked = frozenset(t["name"] for t in tools if t.get("requires_confirmation"))
+        tools = sorted(
+            (t for t in tools if not t.get("requires_confirmation")), key=lambda t: t["name"]
+        )
+        key = self._cache_key(goal, tools)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return copy.deepcopy(cached)
+
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._plan_uncached(key, goal, tools, blocked))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._inflight.pop(k, None))
+        try:
+            steps = await asyncio.shield(task)
+        except Exception as e:
+            logger.warning("Plan generation failed: %s", e)
+            return None
+        return copy.deepcopy(steps)
+
+    async def _plan_uncached(
+        self, key: str, goal: str, tools: list[dict[str, Any]], blocked: frozenset[str]
+    ) -> list[dict[str, Any]]:
+        self.cache_misses += 1
+        started = time.perf_counter()
+        try:
+            raw = await self._generate_plan(goal, tools)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.planning_seconds += elapsed
+        steps = validate_plan_steps(raw, [t["name"] for t in tools], blocked)
+        self._cache_put(key, steps)
+        logger.info("Generated %d-step plan in %.0f ms", len(steps), elapsed * 1000)
+        return steps
+
+    async def _generate_plan(self, goal: str, tools: list[dict[str, Any]]) -> Any:
+        """Ask the model for a plan and return the parsed JSON."""
+        tool_lines = "\n".join(f"- {t['name']}: {t.get('description', '')}" for t in tools)
+        prompt = self.PLAN_PROMPT.format(
+            max_steps=MAX_STEPS, tools=tool_lines or "(none)", goal=goal
+        )
+        resp = await self._get_client().post(
+            f"{self.ollama_host}/api/generate",
+            json={"model": self.model, "prompt": prompt, "stream": False, "format": "json"},
+        )
+        resp.raise_for_status()
+        text = resp.json().get("response", "")
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Planner returned invalid JSON: {text[:80]!r}") from e
+
+    def _cache_key(self, goal: str, tools: list[dict[str, Any]]) -> str:
+        tool_set = ",".join(t["name"] for t in tools)
+        material = f"{self.model}\0{tool_set}\0{normalize_query(goal)}"
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> list[dict[str, Any]] | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        created_at, steps = entry
+        if time.monotonic() - created_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return steps
+
+    def _cache_put(self, key: str, steps: list[dict[str, Any]]) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic(), steps)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def create_planner(ollama_host: str | None = None, model: str | None = None) -> TaskPlanner:
+    """Factory function to create a TaskPlanner with config from the environment.
+
+    The model comes from ``ORCHESTRATOR_PLANNER_MODEL``, then ``ROUTING_LLM_MODEL``.
+    """
+    import os
+
+    _default_host = "http://localhost:11434"
+    host = ollama_host or os.getenv("OLLAMA_HOST", _default_host) or _default_host
+    planner_model = (
+        model
+        or os.getenv("ORCHESTRATOR_PLANNER_MODEL")
+        or os.getenv("ROUTING_LLM_MODEL")
+        or DEFAULT_PLANNER_MODEL
+    )
+    return TaskPlanner(ollama_host=host, model=planner_model)
@@ -0,0 +1,103 @@
+"""Tool Call Scheduler — runs independent tool calls from one LLM turn concurrently."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Collection
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ToolJob = tuple[str, Callable[[], Awaitable[dict[str, Any]]]]
+
+
+class ToolCallScheduler:
+    """Bounded concurrent dispatcher for a batch of tool calls.
+
+    Each job is a ``(tool_name, factory)`` pair, where *factory* returns the
+    awaitable that performs the call.  Jobs start together but are throttled
+    by a cap on the whole batch (*max_concurrency*) and a per-tool cap
+    (*per_tool_concurrency*).  Tools in *serialized_tools* share one lock so
+    they run one at a time, in submission order.
+
+    The caps and the lock belong to a single ``run()`` call, so concurrent
+    requests sharing one scheduler never wait on each other.
+
+    Results come back in submission order regardless of completion order.  A
+    call that raises or exceeds *call_timeout* yields an error result instead
+    of cancelling its siblings.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        per_tool_concurrency: int = 2,
+        call_timeout: float | None = 60.0,
+        serialized_tools: Collection[str] = (),
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_tool_concurrency = max(1, per_tool_concurrency)
+        self.call_timeout = call_timeout
+        self.serialized_tools = frozenset(serialized_tools)
+
+    async def run(
+        self, jobs: list[ToolJob], serialized_tools: Collection[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Run *jobs* and return their results in submission order.
+
+        *serialized_tools* overrides the scheduler default for this batch.
+        """
+        if len(jobs) == 1:
+            return [await self._call(*jobs[0])]
+        batch = _Batch(
+            self,
+            self.serialized_tools if serialized_tools is None else frozenset(serialized_tools),
+        )
+        return list(await asyncio.gather(*(batch.run_one(name, factory) for name, factory in jobs)))
+
+    async def _call(
+        self, tool_name: str, factory: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        try:
+            return await asyncio.wait_for(factory(), timeout=self.call_timeout)
+        except TimeoutError:
+            logger.warning("Tool call %s timed out after %ss", tool_name, self.call_timeout)
+            return {
+                "tool": tool_name,
+                "result": None,
+                "error": f"Tool call timed out after {self.call_timeout}s",
+            }
+        except Exception as e:
+            logger.warning("Tool call %s failed: %s", tool_name, e)
+            return {"tool": tool_name, "result": None, "error": str(e)}
+
+
+class _Batch:
+    """Concurrency limits for one ``ToolCallScheduler.run()`` call."""
+
+    def __init__(self, scheduler: ToolCallScheduler, serialized_tools: frozenset[str]) -> None:
+        self.scheduler = scheduler
+        self.serialized_tools = serialized_tools
+        self._global = asyncio.Semaphore(scheduler.max_concurrency)
+        self._per_tool: dict[str, asyncio.Semaphore] = {}
+        self._serial_lock = asyncio.Lock()
+
+    def _tool_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        sem = self._per_tool.get(tool_name)
+        if sem is None:
+            sem = asyncio.Semaphore(self.scheduler.per_tool_concurrency)
+            self._per_tool[tool_name] = sem
+        return sem
+
+    async def run_one(
+        self, tool_name: str, factory: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        if tool_name in self.serialized_tools:
+            async with self._serial_lock:
+                return await self._run_limited(tool_name, factory)
+        return await self._run_limited(tool_name, factory)
+
+    async def _run_limited(
+        self, tool_name: str, factory: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        async with self._tool_semaphore(tool_name), self._global:
+            return await self.scheduler._call(tool_name, factory)
@@ -0,0 +1,224 @@
+"""Tool Runtime — runs local tools where their blocking work cannot stall the event loop.
+
+Each tool declares an ``ExecutionMode`` in its metadata:
+
+- ``ASYNC`` tools are awaited on the event loop, as before.
+- ``IO`` tools run on a thread pool, each call on a private event loop in its
+  worker thread, so blocking file, network and subprocess calls inside
+  ``execute()`` only occupy that thread.
+- ``CPU`` tools run in a process pool on a per-process instance of the tool
+  class, so pure-Python computation does not hold the server's GIL. A tool
+  class that cannot be re-created in a worker process falls back to a thread.
+
+Every pool admits at most ``workers + queue_size`` calls; further calls are
+rejected with ToolExecutionError rather than queued without bound. Pool calls
+are limited by the tool's ``timeout`` (or the runtime default); ``ASYNC`` tools
+only by a declared ``timeout``. For tools that declare a ``timeout``
+parameter, a numeric ``timeout`` argument raises the limit, up to
+``max_timeout``, so such a tool is not cut off before its own deadline. A
+cancelled or timed-out call that has not started is dropped. One already
+running in a thread is cancelled at its next ``await``. A running process call
+cannot be interrupted; its result is discarded.
+"""
+
+import asyncio
+import contextlib
+import importlib
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from .exceptions import ToolExecutionError
+from .interfaces.tool import BaseTool, ExecutionMode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOOL_IO_WORKERS = 8
+DEFAULT_TOOL_CPU_WORKERS = max((os.cpu_count() or 2) // 2, 1)
+DEFAULT_TOOL_QUEUE_SIZE = 32  # calls that may wait per pool once all workers are busy
+DEFAULT_TOOL_TIMEOUT = 120.0
+DEFAULT_TOOL_MAX_TIMEOUT = 900.0  # ceiling for a call's own ``timeout`` argument
+
+# Tool instances created inside worker processes, keyed by "module:qualname"
+_process_tools: dict[str, BaseTool] = {}
+
+
+def _run_in_process(module: str, qualname: str, parameters: dict[str, Any]) -> dict[str, Any]:
+    """Process-pool entry point: execute a tool on this process's own instance."""
+    key = f"{module}:{qualname}"
+    tool = _process_tools.get(key)
+    if tool is None:
+        tool = getattr(importlib.import_module(module), qualname)()
+        _process_tools[key] = tool
+    return asyncio.run(tool.execute(parameters))
+
+
+class _ThreadCall:
+    """One tool call on a private event loop in a worker thread."""
+
+    def __init__(self, tool: BaseTool, parameters: dict[str, Any]) -> None:
+        self.tool = tool
+        self.parameters = parameters
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._cancelled = False
+
+    def run(self) -> dict[str, Any]:
+        loop = asyncio.new_event_loop()
+        try:
+            with self._lock:
+                if self._cancelled:
+                    raise asyncio.CancelledError
+                task = loop.create_task(self.tool.execute(self.parameters))
+                self._loop, self._task = loop, task
+            return loop.run_until_complete(task)
+        finally:
+            with self._lock:
+                self._loop = None
+            loop.close()
+
+    def cancel(self) -> None:
+        """Cancel the call from another thread (at its next ``await``)."""
+        with self._lock:
+            self._cancelled = True
+            if self._loop is not None and self._task is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+class ToolRuntime:
+    """Dispatches ``BaseTool.execute()`` by execution mode to bounded worker pools."""
+
+    def __init__(
+        self,
+        io_workers: int = DEFAULT_TOOL_IO_WORKERS,
+        cpu_workers: int = DEFAULT_TOOL_CPU_WORKERS,
+        queue_size: int = DEFAULT_TOOL_QUEUE_SIZE,
+        default_timeout: float = DEFAULT_TOOL_TIMEOUT,
+        max_timeout: float = DEFAULT_TOOL_MAX_TIMEOUT,
+    ) -> None:
+        self.io_workers = max(io_workers, 1)
+        self.cpu_workers = max(cpu_workers, 1)
+        self.queue_size = max(queue_size, 0)
+        self.default_timeout = default_timeout
+        self.max_timeout = max_timeout
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._slots = {
+            ExecutionMode.IO: asyncio.Semaphore(self.io_workers + self.queue_size),
+            ExecutionMode.CPU: asyncio.Semaphore(self.cpu_workers + self.queue_size),
+        }
+
+    async def run(self, tool: BaseTool, parameters: dict[str, Any]) -> dict[str, Any]:
+        """Execute *tool* in the pool matching its execution mode.
+
+        Raises:
+            ToolExecutionError: The pool is full or the call timed out
+        """
+        metadata = tool.metadata
+        mode = getattr(metadata, "execution_mode", ExecutionMode.ASYNC)
+        timeout = self._timeout(metadata, mode, parameters)
+        try:
+            if mode is ExecutionMode.ASYNC:
+                return await asyncio.wait_for(tool.execute(parameters), timeout)
+            slots = self._slots[mode]
+            if slots.locked():
+                raise ToolExecutionError(
+                    metadata.name,
+                    f"Too many {mode.value}-bound tool calls in progress; try again shortly",
+                )
+            async with slots:
+                if mode is ExecutionMode.CPU and self._process_safe(tool):
+                    try:
+                        return await self._run_process(tool, parameters, timeout)
+                    except (BrokenProcessPool, pickle.PicklingError) as e:
+                        logger.warning(
+                            "Process pool failed for %s (%s); using a thread", metadata.name, e
+                        )
+                        self._reset_process_pool()
+                return await self._run_thread(tool, parameters, timeout)
+        except TimeoutError:
+            raise ToolExecutionError(
+                metadata.name, f"Tool timed out after {timeout}s", details={"timeout": timeout}
+            ) from None
+
+    def _timeout(
+        self, metadata: Any, mode: ExecutionMode, parameters: dict[str, Any]
+    ) -> float | None:
+        """Declared timeout (runtime default for pools), raised to the call's own ``timeout``.
+
+        The argument only counts for tools that declare a ``timeout`` parameter,
+        and is capped at ``max_timeout``: arguments are model-generated.
+        """
+        limit = getattr(metadata, "timeout", None)
+        if limit is None and mode is not ExecutionMode.ASYNC:
+            limit = self.default_timeout
+        if limit is None or not any(
+            p.name == "timeout" for p in getattr(metadata, "parameters", ())
+        ):
+            return limit
+        requested = parameters.get("timeout")
+        if isinstance(requested, int | float) and not isinstance(requested, bool):
+            limit = max(limit, min(float(requested), self.max_timeout))
+        return limit
+
+    async def _run_thread(
+        self, tool: BaseTool, parameters: dict[str, Any], timeout: float | None
+    ) -> dict[str, Any]:
+        call = _ThreadCall(tool, parameters)
+        future = asyncio.get_running_loop().run_in_executor(self._threads(), call.run)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (TimeoutError, asyncio.CancelledError):
+            call.cancel()
+            raise
+
+    async def _run_process(
+        self, tool: BaseTool, parameters: dict[str, Any], timeout: float | None
+    ) -> dict[str, Any]:
+        cls = type(tool)
+        future = asyncio.get_running_loop().run_in_executor(
+            self._processes(), _run_in_process, cls.__module__, cls.__qualname__, parameters
+        )
+        return await asyncio.wait_for(future, timeout)
+
+    @staticmethod
+    def _process_safe(tool: BaseTool) -> bool:
+        """True if a worker process can re-create *tool* from its import path."""
+        cls = type(tool)
+        module = importlib.import_module(cls.__module__)
+        return getattr(module, cls.__qualname__, None) is cls
+
+    def _threads(self) -> Executor:
+        if self._thread_pool is None:
+            # IO calls plus CPU calls that fell back to threads
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.io_workers + self.cpu_workers, thread_name_prefix="portal-tool"
+            )
+        return self._thread_pool
+
+    def _processes(self) -> Executor:
+        if self._process_pool is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.cpu_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+
+    def _reset_process_pool(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release both pools without waiting."""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                with contextlib.suppress(Exception):
+                    pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = self._process_pool = None
@@ -1,10 +1,15 @@
 """Build OpenAI-compatible tool schemas from ToolRegistry and MCPRegistry."""
 
+import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TOOL_SCHEMA_REFRESH_INTERVAL = 60.0  # seconds
+
 if TYPE_CHECKING:
     from portal.protocols.mcp.mcp_registry import MCPRegistry
     from portal.tools import ToolRegistry
@@ -48,8 +53,7 @@ def build_tool_schemas(
         except Exception as e:
             logger.warning("Failed to get internal tools: %s", e)
 
-    # MCP server tools (discovered at startup via list_tools)
-    # These are cached after first discovery - synchronous access to cached data
+    # MCP server tools from MCPRegistry's discovery cache - synchronous, no I/O
     if mcp_registry:
         try:
             mcp_tools = _get_cached_mcp_tools(mcp_registry)
@@ -165,29 +169,34 @@ def _convert_internal_tool(tool) -> dict[str, Any] | None:
 
 
 def _get_cached_mcp_tools(mcp_registry: "MCPRegistry") -> list[dict[str, Any]]:
-    """Get tool schemas from registered MCP servers (from cache)."""
+    """Get tool schemas from registered MCP servers (from cache, no I/O)."""
     tools: list[dict[str, Any]] = []
 
     try:
-        # Get list of servers
         servers = mcp_registry.list_servers()
-        for server_name in servers:
-            # Try to get cached tools for this server
-            try:
-                server_tools = mcp_registry.list_tools_sync(server_name)
-                for tool in server_tools:
-                    schema = _convert_mcp_tool(server_name, tool)
-                    if schema:
-                        tools.append(schema)
-            except Exception as e:
-                logger.debug("Could not get tools for MCP server %s: %s", server_name, e)
-                continue
+        discovered = {name: mcp_registry.get_cached_tools(name) for name in servers}
+        tools.extend(_convert_discovered_tools(discovered))
     except Exception as e:
         logger.warning("Failed to list MCP servers: %s", e)
 
     return tools
 
 
+def _convert_discovered_tools(
+    discovered: dict[str, list[dict[str, Any]] | None],
+) -> list[dict[str, Any]]:
+    """Convert ``{server: tools}`` (``None`` = not discovered yet) to OpenAI schemas."""
+    tools: list[dict[str, Any]] = []
+    for server_name, server_tools in discovered.items():
+        if not server_tools:
+            continue
+        for tool in server_tools:
+            schema = _convert_mcp_tool(server_name, tool)
+            if schema:
+                tools.append(schema)
+    return tools
+
+
 def _convert_mcp_tool(server_name: str, tool: dict[str, Any]) -> dict[str, Any] | None:
     """Convert an MCP server tool manifest to OpenAI function schema."""
     try:
@@ -234,26 +243,130 @@ def _convert_mcp_tool(server_name: str, tool: dict[str, Any]) -> dict[str, Any]
 
 async def discover_mcp_tool_schemas(mcp_registry: "MCPRegistry") -> list[dict[str, Any]]:
     """
-    Async discovery of MCP tool schemas - calls list_tools on each server.
+    Async discovery of MCP tool schemas - lists tools on all servers concurrently.
 
-    This should be called during startup to populate the cache.
-    For runtime, use build_tool_schemas() which reads from cache.
+    Servers that miss the discovery deadline contribute no schemas.
+    For runtime, use ToolSchemaProvider, which refreshes in the background.
     """
-    tools: list[dict[str, Any]] = []
-
     try:
-        servers = mcp_registry.list_servers()
-        for server_name in servers:
-            try:
-                server_tools = await mcp_registry.list_tools(server_name)
-                for tool in server_tools:
-                    schema = _convert_mcp_tool(server_name, tool)
-                    if schema:
-                        tools.append(schema)
-            except Exception as e:
-                logger.debug("Could not discover tools for MCP server %s: %s", server_name, e)
+        return _convert_discovered_tools(await mcp_registry.discover_tools())
     except Exception as e:
         logger.warning("Failed to discover MCP tools: %s", e)
+        return []
 
-    return tools
 
+@dataclass(frozen=True)
+class ToolSchemaSnapshot:
+    """One immutable build of the combined tool schema list."""
+
+    schemas: list[dict[str, Any]]
+    version: int
+    built_at: float  # time.monotonic()
+
+
+class ToolSchemaProvider:
+    """
+    Versioned, background-refreshed tool schemas for the request path.
+
+    ``get_schemas()`` never performs I/O: it returns the current snapshot and,
+    once that is older than *refresh_interval*, schedules an async refresh on
+    the running loop. The refresh lists tools on all MCP servers concurrently
+    (``MCPRegistry.discover_tools``), so MCP servers that start or restart after
+    boot show up without a process restart. The snapshot version is bumped only
+    when the schema list actually changes.
+    """
+
+    def __init__(
+        self,
+        tool_registry: "ToolRegistry | None" = None,
+        mcp_registry: "MCPRegistry | None" = None,
+        refresh_interval: float = DEFAULT_TOOL_SCHEMA_REFRESH_INTERVAL,
+    ) -> None:
+        self.tool_registry = tool_registry
+        self.mcp_registry = mcp_registry
+        self.refresh_interval = refresh_interval
+        self._snapshot: ToolSchemaSnapshot | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot else 0
+
+    def set_mcp_registry(self, mcp_registry: "MCPRegistry | None") -> None:
+        """Swap the MCP registry and rebuild on next use."""
+        self.mcp_registry = mcp_registry
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale; the next ``get_schemas()`` schedules a refresh."""
+        if self._snapshot is not None:
+            self._snapshot = ToolSchemaSnapshot(
+                self._snapshot.schemas, self._snapshot.version, float("-inf")
+            )
+
+    def get_schemas(self) -> list[dict[str, Any]]:
+        """Return the current schemas without blocking; schedule a refresh if stale."""
+        if self._snapshot is None:
+            # First use: internal tools plus whatever MCP discovery has cached
+            self._publish(build_tool_schemas(self.tool_registry, self.mcp_registry))
+        assert self._snapshot is not None
+        if time.monotonic() - self._snapshot.built_at >= self.refresh_interval:
+            self._schedule_refresh()
+        return self._snapshot.schemas
+
+    async def refresh(self) -> ToolSchemaSnapshot:
+        """Rediscover MCP tools concurrently and publish a new snapshot.
+
+        If discovery itself fails the exception propagates and the previous
+        snapshot stays in place (servers that merely time out keep their
+        last known tools inside ``discover_tools``).
+        """
+        schemas = build_tool_schemas(self.tool_registry, None)
+        if self.mcp_registry is not None:
+            schemas.extend(_convert_discovered_tools(await self.mcp_registry.discover_tools()))
+        return self._publish(schemas)
+
+    async def start(self) -> None:
+        """Kick off initial MCP discovery without delaying startup."""
+        self._schedule_refresh()
+
+    async def stop(self) -> None:
+        """Cancel an in-flight refresh."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _schedule_refresh(self) -> None:
+        if self.mcp_registry is None:
+            # Nothing to discover; internal tools are rebuilt in place
+            self._publish(build_tool_schemas(self.tool_registry, None))
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop (sync caller at import/CLI time); keep the current snapshot
+        self._refresh_task = loop.create_task(self._refresh_logged(), name="tool-schema-refresh")
+
+    async def _refresh_logged(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("Tool schema refresh failed: %s", e)
+
+    def _publish(self, schemas: list[dict[str, Any]]) -> ToolSchemaSnapshot:
+        now = time.monotonic()
+        current = self._snapshot
+        if current is not None and current.schemas == schemas:
+            self._snapshot = ToolSchemaSnapshot(current.schemas, current.version, now)
+        else:
+            self._snapshot = ToolSchemaSnapshot(schemas, self.version + 1, now)
+            logger.info(
+                "Tool schemas v%d published (%d tools)", self._snapshot.version, len(schemas)
+            )
+        return self._snapshot
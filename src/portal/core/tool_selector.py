@@ -0,0 +1,243 @@
+"""Tool Selector — attaches only the tool schemas relevant to the current request.
+
+Sending every schema on every model call inflates prompt tokens and prefill
+time on small local models, and invites spurious tool calls. ``ToolSelector``
+ranks the available schemas against the query and the routing category and
+keeps the top *k*, plus any pinned tools.
+
+Scoring is lexical by default: BM25-style term weights over each tool's name,
+description, parameters and (for internal tools) ``BaseTool.metadata``
+category and examples, with name matches weighted higher. The routing category
+adds hint terms at half weight. If an *embedder* is configured, cosine
+similarity between the query and each tool document is blended in. Tool
+documents are indexed once per ``ToolSchemaProvider`` snapshot version.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from collections.abc import Callable, Collection, Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from portal.tools import ToolRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOOL_SELECTION_TOP_K = 8
+
+Embedder = Callable[[list[str]], Sequence[Sequence[float]]]
+
+# Routing category -> terms that tools serving that category tend to use
+CATEGORY_HINTS: dict[str, tuple[str, ...]] = {
+    "image_gen": ("image", "picture", "draw", "comfyui", "flux", "generate"),
+    "audio_gen": ("speech", "tts", "voice", "audio", "speak", "clone"),
+    "video_gen": ("video", "animation", "clip", "generate"),
+    "music_gen": ("music", "song", "melody", "audio", "generate"),
+    "document_gen": ("document", "word", "docx", "pdf", "powerpoint", "excel", "spreadsheet"),
+    "research": ("web", "search", "fetch", "scrape", "browse", "url", "page"),
+    "code": ("code", "python", "bash", "git", "sandbox", "execute", "run", "file"),
+    "math": ("calculate", "math", "compute"),
+    "analysis": ("data", "csv", "excel", "analyze", "chart", "statistic"),
+    "summarization": ("document", "read", "file", "summarize"),
+    "tool_use": (),
+}
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from how i in is it me my of on or please "
+    "the this that to use using want what with you your".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_NAME_WEIGHT = 2.0
+_HINT_WEIGHT = 0.5
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with stopwords dropped and light suffix stemming."""
+    tokens = []
+    for tok in _TOKEN_RE.findall(text.lower().replace("_", " ")):
+        if tok in _STOPWORDS:
+            continue
+        for suffix in ("ing", "es", "ed", "s"):
+            if len(tok) > len(suffix) + 3 and tok.endswith(suffix):
+                tok = tok[: -len(suffix)]
+                break
+        tokens.append(tok)
+    return tokens
+
+
+def _schema_name(schema: dict[str, Any]) -> str:
+    return schema.get("function", {}).get("name", "")
+
+
+def _schema_text(schema: dict[str, Any]) -> str:
+    fn = schema.get("function", {})
+    props = fn.get("parameters", {}).get("properties", {}) or {}
+    parts = [fn.get("description", "")]
+    for pname, spec in props.items():
+        parts.append(pname)
+        if isinstance(spec, dict):
+            parts.append(str(spec.get("description", "")))
+    return " ".join(parts)
+
+
+def _metadata_text(tool_registry: "ToolRegistry | None") -> dict[str, str]:
+    """Extra searchable text (category, examples) for internal tools, keyed by name."""
+    if tool_registry is None:
+        return {}
+    extra: dict[str, str] = {}
+    try:
+        for tool in tool_registry.get_all_tools():
+            md = getattr(tool, "metadata", None)
+            if md is None or not getattr(md, "name", None):
+                continue
+            category = getattr(md.category, "value", md.category)
+            extra[md.name] = " ".join([str(category), *map(str, md.examples or [])])
+    except Exception as e:
+        logger.debug("Tool metadata unavailable for selection: %s", e)
+    return extra
+
+
+class ToolSelector:
+    """Rank tool schemas per request and keep the top *top_k* plus *pinned* tools.
+
+    Args:
+        top_k: Maximum number of ranked (non-pinned) tools to attach; ``0``
+            disables selection and attaches every schema.
+        pinned: Tool names that are always attached when available.
+        embedder: Optional ``texts -> vectors`` function for semantic scoring.
+        embedding_weight: Weight of cosine similarity relative to the
+            normalized lexical score.
+    """
+
+    def __init__(
+        self,
+        top_k: int = DEFAULT_TOOL_SELECTION_TOP_K,
+        pinned: Collection[str] = (),
+        embedder: Embedder | None = None,
+        embedding_weight: float = 1.0,
+    ) -> None:
+        self.top_k = top_k
+        self.pinned = frozenset(pinned)
+        self.embedder = embedder
+        self.embedding_weight = embedding_weight
+        self._indexed_version: int | None = None
+        self._schemas: list[dict[str, Any]] = []
+        self._name_tokens: list[set[str]] = []
+        self._doc_tokens: list[Counter[str]] = []
+        self._idf: dict[str, float] = {}
+        self._doc_vectors: list[list[float]] | None = None
+
+    def select(
+        self,
+        schemas: list[dict[str, Any]],
+        query: str,
+        category: str | None = None,
+        version: int | None = None,
+        tool_registry: "ToolRegistry | None" = None,
+    ) -> list[dict[str, Any]]:
+        """Return the schemas to attach for *query*, in ranked order, pinned first.
+
+        *version* identifies the schema snapshot; the index is rebuilt only
+        when it changes (or on every call if ``None``).
+        """
+        if self.top_k <= 0 or len(schemas) <= self.top_k:
+            return schemas
+        if version is None or version != self._indexed_version or schemas is not self._schemas:
+            self._build_index(schemas, tool_registry)
+            self._indexed_version = version
+
+        scores = self._score(query, category)
+        pinned = [i for i, s in enumerate(schemas) if _schema_name(s) in self.pinned]
+        ranked = sorted(
+            (i for i in range(len(schemas)) if scores[i] > 0 and i not in pinned),
+            key=lambda i: -scores[i],
+        )[: self.top_k]
+        selected = [schemas[i] for i in pinned + ranked]
+        logger.debug(
+            "Selected %d/%d tools for category=%s: %s",
+            len(selected),
+            len(schemas),
+            category,
+            [_schema_name(s) for s in selected],
+        )
+        return selected
+
+    def _build_index(
+        self, schemas: list[dict[str, Any]], tool_registry: "ToolRegistry | None"
+    ) -> None:
+        extra = _metadata_text(tool_registry)
+        self._schemas = schemas
+        self._name_tokens = [set(tokenize(_schema_name(s))) for s in schemas]
+        self._doc_tokens = [
+            Counter(tokenize(f"{_schema_text(s)} {extra.get(_schema_name(s), '')}"))
+            + Counter(dict.fromkeys(names, 1))
+            for s, names in zip(schemas, self._name_tokens, strict=True)
+        ]
+        df: Counter[str] = Counter()
+        for doc in self._doc_tokens:
+            df.update(doc.keys())
+        n = len(schemas)
+        self._idf = {term: math.log(1 + n / count) for term, count in df.items()}
+
+        self._doc_vectors = None
+        if self.embedder is not None:
+            docs = [f"{_schema_name(s)}: {_schema_text(s)}" for s in schemas]
+            try:
+                self._doc_vectors = [_unit(v) for v in self.embedder(docs)]
+            except Exception as e:
+                logger.warning("Tool embedding failed; using lexical selection only: %s", e)
+
+    def _score(self, query: str, category: str | None) -> list[float]:
+        terms = Counter(tokenize(query))
+        hints = CATEGORY_HINTS.get(category or "", ())
+        weighted: dict[str, float] = {t: float(c) for t, c in terms.items()}
+        for hint in tokenize(" ".join(hints)):
+            weighted[hint] = weighted.get(hint, 0.0) + _HINT_WEIGHT
+
+        scores = []
+        for names, doc in zip(self._name_tokens, self._doc_tokens, strict=True):
+            score = 0.0
+            for term, weight in weighted.items():
+                if term in doc:
+                    tf = doc[term] / (doc[term] + 1.0)
+                    boost = _NAME_WEIGHT if term in names else 1.0
+                    score += weight * self._idf.get(term, 0.0) * tf * boost
+            scores.append(score)
+
+        if self._doc_vectors is not None and query.strip():
+            try:
+                query_vec = _unit(self.embedder([query])[0])  # type: ignore[misc]
+            except Exception as e:
+                logger.debug("Query embedding failed: %s", e)
+            else:
+                top = max(scores) or 1.0
+                for i, vec in enumerate(self._doc_vectors):
+                    similarity = sum(a * b for a, b in zip(query_vec, vec, strict=False))
+                    # Lexical scores are normalized to [0, 1] before blending
+                    scores[i] = scores[i] / top + self.embedding_weight * max(0.0, similarity)
+        return scores
+
+
+def _unit(vector: Sequence[float]) -> list[float]:
+    values = [float(x) for x in vector]
+    norm = math.sqrt(sum(x * x for x in values)) or 1.0
+    return [x / norm for x in values]
+
+
+def load_sentence_embedder(model_name: str) -> Embedder | None:
+    """Return an embedder backed by sentence-transformers, or ``None`` if unavailable."""
+    if not model_name:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.info("sentence-transformers not installed; tool selection is lexical only")
+        return None
+    try:
+        model = SentenceTransformer(model_name)
+    except Exception as e:
+        logger.warning("Could not load tool selection embedding model %s: %s", model_name, e)
+        return None
+    return lambda texts: model.encode(texts, show_progress_bar=False).tolist()
@@ -0,0 +1,162 @@
+"""
+Model Catalogue - cached listing for /v1/models and /v1/personas
+================================================================
+
+Open WebUI polls ``/v1/models`` often. Building the listing means reading
+``router_rules.json`` and parsing every persona YAML, so it is built once and
+served from memory. The source files are re-checked with ``stat`` only (no
+reads) at most every ``check_interval`` seconds, the same polling cadence as
+:class:`~portal.observability.config_watcher.ConfigWatcher`, and the listing
+is rebuilt only when a file was added, removed or modified.
+
+Each distinct listing gets a content-derived ETag, so clients sending
+``If-None-Match`` get a 304 until something actually changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_RULES_PATH = Path(__file__).parents[2] / "routing" / "router_rules.json"
+_DEFAULT_PERSONAS_DIR = Path(__file__).parents[4] / "config" / "personas"
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One immutable build of the catalogue."""
+
+    models: list[dict]
+    personas: list[dict]
+    etag: str
+    version: int
+    created: int
+
+    def models_body(self) -> dict:
+        return {"object": "list", "data": self.models}
+
+    def personas_body(self) -> dict:
+        return {"object": "list", "data": self.personas}
+
+
+class ModelCatalog:
+    """Versioned, lazily rebuilt catalogue of workspace and persona models."""
+
+    def __init__(
+        self,
+        rules_path: Path | None = None,
+        personas_dir: Path | None = None,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rules_path = Path(rules_path or _DEFAULT_RULES_PATH)
+        self.personas_dir = Path(personas_dir or _DEFAULT_PERSONAS_DIR)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: CatalogSnapshot | None = None
+        self._fingerprint: tuple | None = None
+        self._checked_at = 0.0
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the current catalogue, rebuilding it if a source file changed."""
+        with self._lock:
+            now = self._clock()
+            if self._snapshot is not None and now - self._checked_at < self.check_interval:
+                return self._snapshot
+            self._checked_at = now
+            fingerprint = self._source_fingerprint()
+            if self._snapshot is None or fingerprint != self._fingerprint:
+                self._fingerprint = fingerprint
+                self._snapshot = self._build(self._snapshot)
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Force a source check on the next :meth:`snapshot` call."""
+        with self._lock:
+            self._fingerprint = None
+            self._checked_at = 0.0
+
+    def _source_fingerprint(self) -> tuple:
+        """Cheap change detector: (name, mtime, size) of every source file."""
+        entries = []
+        try:
+            st = self.rules_path.stat()
+            entries.append((self.rules_path.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            entries.append((self.rules_path.name, None, None))
+        try:
+            with os.scandir(self.personas_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".yaml") and entry.is_file():
+                        st = entry.stat()
+                        entries.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+        return tuple(sorted(entries, key=lambda e: e[0]))
+
+    def _build(self, previous: CatalogSnapshot | None) -> CatalogSnapshot:
+        workspaces: list[str] = []
+        try:
+            if self.rules_path.exists():
+                rules = json.loads(self.rules_path.read_text())
+                workspaces = [
+                    name
+                    for name, ws in rules.get("workspaces", {}).items()
+                    if isinstance(ws, dict)  # skip "_comment_*" annotations
+                ]
+        except Exception as e:
+            logger.warning("Failed to load workspace models: %s", e)
+
+        personas: list[dict] = []
+        try:
+            from portal.core.prompt_manager import PersonaLibrary
+
+            personas = PersonaLibrary(self.personas_dir).list_personas()
+            personas.sort(key=lambda p: p["slug"])
+        except Exception as e:
+            logger.warning("Failed to load persona models: %s", e)
+
+        # (id, owned_by) pairs; "created" is filled in per build below
+        entries = [(ws, "portal-workspace") for ws in workspaces]
+        entries += [(p["name"], "portal-persona") for p in personas]
+        if not entries:
+            entries = [("auto", "portal")]
+
+        digest = hashlib.sha256(
+            json.dumps([entries, personas], sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        etag = f'"{digest}"'
+        if previous is not None and previous.etag == etag:
+            return previous  # touched but unchanged: keep version, timestamp and ETag
+
+        version = previous.version + 1 if previous else 1
+        created = int(time.time())
+        models = [
+            {"id": model_id, "object": "model", "created": created, "owned_by": owner}
+            for model_id, owner in entries
+        ]
+        logger.info(
+            "Model catalogue v%d built: %d workspaces, %d personas",
+            version,
+            len(workspaces),
+            len(personas),
+        )
+        return CatalogSnapshot(models, personas, etag, version, created)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an ``If-None-Match`` header value matches *etag* (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
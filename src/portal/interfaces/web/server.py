@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import hmac
+import inspect
 import json
 import logging
 import time
@@ -45,6 +46,7 @@ from portal.core.exceptions import (
 )
 from portal.core.interfaces.agent_interface import BaseInterface
 from portal.core.types import IncomingMessage, InterfaceType, ProcessingResult
+from portal.interfaces.web.model_catalog import ModelCatalog, etag_matches
 from portal.observability.metrics import (
     TOKENS_PER_SECOND,
     TTFT_MS,
@@ -151,6 +153,8 @@ class WebInterface(BaseInterface):
         self.secure_agent = secure_agent  # SecurityMiddleware wrapping agent_core
         self.config = config
         self.user_store = UserStore()
+        # Workspace/persona listing for /v1/models and /v1/personas, rebuilt only on file changes
+        self.model_catalog = ModelCatalog()
         self._server: uvicorn.Server | None = None
         # Shared HTTP client for Ollama/Whisper calls (avoids per-request connection overhead)
         self._ollama_client: httpx.AsyncClient | None = None
@@ -227,7 +231,9 @@ class WebInterface(BaseInterface):
             raise HTTPException(status_code=401, detail=str(exc)) from exc
         return {"user_id": ctx.user_id, "role": ctx.role}
 
-    async def _validate_request(self, user_id: str, message: str) -> tuple[str, list[str]]:
+    async def _validate_request(
+        self, user_id: str, message: str, workspace_id: str | None = None
+    ) -> tuple[str, list[str]]:
         """
         Shared security validation for all request paths (HTTP streaming, WebSocket).
 
@@ -246,7 +252,7 @@ class WebInterface(BaseInterface):
             raise ValidationError("Message blocked by security policy")
 
         # Rate limiting
-        allowed, error_msg = await self.secure_agent.rate_limiter.check_limit(user_id)
+        allowed, error_msg = await self.secure_agent.check_rate_limit(user_id, workspace_id)
         if not allowed:
             raise RateLimitError(error_msg or "Rate limit exceeded", retry_after=60)
 
@@ -269,6 +275,8 @@ class WebInterface(BaseInterface):
 
             async def _warmup() -> None:
                 try:
+                    if inspect.iscoroutinefunction(getattr(self.agent_core, "start", None)):
+                        await self.agent_core.start()
                     if hasattr(self.agent_core, "health_check"):
                         await self.agent_core.health_check()
                 except Exception as e:
@@ -373,13 +381,13 @@ class WebInterface(BaseInterface):
             return await self._handle_audio_transcriptions(file, auth)
 
         @app.get("/v1/models")
-        async def list_models(auth=Depends(self._auth_context)):
-            return await self._handle_list_models(auth)
+        async def list_models(request: Request, auth=Depends(self._auth_context)):
+            return await self._handle_list_models(auth, request)
 
         @app.get("/v1/personas")
-        async def list_personas(auth=Depends(self._auth_context)):
+        async def list_personas(request: Request, auth=Depends(self._auth_context)):
             """List available personas from config/personas/."""
-            return await self._handle_list_personas(auth)
+            return await self._handle_list_personas(auth, request)
 
         @app.get("/tools")
         async def list_all_tools(auth=Depends(self._auth_context)):
@@ -428,7 +436,7 @@ class WebInterface(BaseInterface):
 
         if payload.stream:
             # Use shared validation method for security checks
-            await self._validate_request(user_id, str(last_user_msg))
+            await self._validate_request(user_id, str(last_user_msg), selected_model)
             return StreamingResponse(
                 self._stream_response(incoming, selected_model, user_id),
                 media_type="text/event-stream",
@@ -473,68 +481,27 @@ class WebInterface(BaseInterface):
         out = resp.json()
         return {"text": out.get("text", "")}
 
-    async def _handle_list_models(self, auth: dict) -> dict:
+    async def _handle_list_models(self, auth: dict, request: Request | None = None) -> Any:
         """Handle /v1/models — returns ONLY workspace and persona models (no raw Ollama models).
 
         This ensures Open WebUI users see only virtual models that trigger intelligent routing.
         Raw Ollama models are excluded to force all requests through Portal's router.
+        Served from the cached catalogue; ``If-None-Match`` with the current ETag gets a 304.
         """
-        created = int(time.time())
-        models: list[dict] = []
-
-        # 1. Add virtual workspace models (these trigger intelligent routing)
-        try:
-            rules_path = Path(__file__).parents[2] / "routing" / "router_rules.json"
-            if rules_path.exists():
-                rules = json.loads(rules_path.read_text())
-                for ws_name in rules.get("workspaces", {}):
-                    models.append(
-                        {
-                            "id": ws_name,
-                            "object": "model",
-                            "created": created,
-                            "owned_by": "portal-workspace",
-                        }
-                    )
-        except Exception as e:
-            logger.warning("Failed to load workspace models: %s", e)
-
-        # 2. Add persona models (for persona switching)
-        try:
-            from portal.core.prompt_manager import PersonaLibrary
-
-            personas_lib = PersonaLibrary()
-            for persona in personas_lib.list_personas():
-                models.append(
-                    {
-                        "id": persona["name"],
-                        "object": "model",
-                        "created": created,
-                        "owned_by": "portal-persona",
-                    }
-                )
-        except Exception as e:
-            logger.warning("Failed to load persona models: %s", e)
-
-        # 3. Fallback: always have at least "auto" if no workspaces configured
-        if not models:
-            models.append(
-                {"id": "auto", "object": "model", "created": created, "owned_by": "portal"}
-            )
-
-        return {"object": "list", "data": models}
+        snapshot = self.model_catalog.snapshot()
+        return self._catalog_response(snapshot.models_body(), snapshot.etag, request)
 
-    async def _handle_list_personas(self, auth: dict) -> dict:
+    async def _handle_list_personas(self, auth: dict, request: Request | None = None) -> Any:
         """Handle /v1/personas — list available personas from config/personas/."""
-        from portal.core.prompt_manager import PersonaLibrary
+        snapshot = self.model_catalog.snapshot()
+        return self._catalog_response(snapshot.personas_body(), snapshot.etag, request)
 
-        try:
-            personas_lib = PersonaLibrary()
-            personas = personas_lib.list_personas()
-            return {"object": "list", "data": personas}
-        except Exception as e:
-            logger.warning("Failed to load personas: %s", e)
-            return {"object": "list", "data": []}
+    @staticmethod
+    def _catalog_response(body: dict, etag: str, request: Request | None) -> Response:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return JSONResponse(body, headers=headers)
 
     async def _handle_list_tools(self, auth: dict) -> dict:
         """Handle /tools — list all available tools from internal registry and MCP servers."""
@@ -550,12 +517,15 @@ class WebInterface(BaseInterface):
                 "source": "internal",
             })
 
-        # Get MCP server tools if registry is available
+        # Get MCP server tools if registry is available (all servers queried concurrently)
+        unavailable: list[str] = []
         if self.agent_core.mcp_registry:
             try:
-                mcp_servers = self.agent_core.mcp_registry._servers
-                for server_name in mcp_servers:
-                    server_tools = await self.agent_core.mcp_registry.list_tools(server_name)
+                discovered = await self.agent_core.mcp_registry.discover_tools()
+                for server_name, server_tools in discovered.items():
+                    if server_tools is None:
+                        unavailable.append(server_name)
+                        continue
                     for tool in server_tools:
                         tools.append({
                             "name": tool.get("name", "unknown"),
@@ -566,6 +536,9 @@ class WebInterface(BaseInterface):
             except Exception as e:
                 logger.warning("Failed to load MCP tools: %s", e)
 
+        if unavailable:
+            # Partial result: the listed servers missed the discovery deadline or failed
+            return {"object": "list", "data": tools, "unavailable": unavailable}
         return {"object": "list", "data": tools}
 
     def _register_utility_routes(self, app: FastAPI, _agent_ready: asyncio.Event) -> None:
@@ -93,6 +93,7 @@ class Runtime:
         settings = self._load_settings()
         agent_core, secure_agent = self._create_agent(settings)
         await self._discover_ollama_models(agent_core, settings)
+        await agent_core.start()
         watchdog, log_rotator = await self._init_observability(settings)
 
         self._setup_signal_handlers()
@@ -283,6 +284,7 @@ class Runtime:
         try:
             self.context.accepting_work = False
             await self._drain_tasks()
+            await self._flush_conversation_store()
             await self._stop_optional_components()
             await self._run_shutdown_callbacks()
             await self._cleanup_agent_core()
@@ -313,6 +315,18 @@ class Runtime:
                 len(self.context.active_tasks),
             )
 
+    async def _flush_conversation_store(self):
+        """Persist buffered conversation history as soon as in-flight work has drained."""
+        context_manager = getattr(self.context.agent_core, "context_manager", None)
+        flush = getattr(context_manager, "flush", None)
+        if not inspect.iscoroutinefunction(flush):
+            return
+        try:
+            await asyncio.wait_for(flush(), timeout=10.0)
+            logger.info("Conversation history flushed")
+        except Exception as e:
+            logger.error("Error flushing conversation history: %s", e, exc_info=True)
+
     async def _stop_optional_components(self):
         """Stop watchdog, log rotator, and config watcher."""
         for name, component in [
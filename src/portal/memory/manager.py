@@ -5,12 +5,16 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-from collections.abc import Iterable
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 from portal.core.db import ConnectionPool
+from portal.core.tool_selector import load_sentence_embedder
+from portal.routing.llm_classifier import normalize_query
+
+from .retrieval import DEFAULT_IMPORTANCE, Embedder, MemoryRetriever
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +32,18 @@ class MemoryManager:
     """User-scoped memory abstraction.
 
     Prefers Mem0 when available and enabled, and falls back to local SQLite retrieval.
+    SQLite retrieval is ranked by FTS5 relevance, optional embedding similarity,
+    and importance-weighted recency (see ``portal.memory.retrieval``). Results are
+    cached per user until that user's memories change.
     """
 
     # Pruning configuration
     _PRUNE_INTERVAL = 100  # prune check every N inserts
+    # Result cache bounds
+    _CACHE_USERS = 256
+    _CACHE_QUERIES_PER_USER = 32
 
-    def __init__(self, db_path: str | Path | None = None) -> None:
+    def __init__(self, db_path: str | Path | None = None, embedder: Embedder | None = None) -> None:
         self.db_path = Path(db_path or os.getenv("PORTAL_MEMORY_DB") or "data/memory.db")
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.provider = os.getenv("PORTAL_MEMORY_PROVIDER", "auto").lower()
@@ -41,6 +51,18 @@ class MemoryManager:
         self._mem0 = None
         self._insert_count = 0
         self._pool = ConnectionPool(self.db_path, pragmas=("PRAGMA journal_mode=WAL",))
+        if embedder is None:
+            embedder = load_sentence_embedder(os.getenv("PORTAL_MEMORY_EMBEDDING_MODEL", ""))
+        self._retriever = MemoryRetriever(
+            embedder=embedder,
+            half_life_days=float(os.getenv("PORTAL_MEMORY_HALF_LIFE_DAYS", "30")),
+        )
+        # user_id -> (normalized query, limit) -> snippets, most recently used last
+        self._cache: OrderedDict[str, OrderedDict[tuple[str, int], list[MemorySnippet]]] = (
+            OrderedDict()
+        )
+        # Bumped on every write so a search that raced a write is not cached
+        self._generations: dict[str, int] = {}
         self._init_db()
         self._init_provider()
 
@@ -79,15 +101,21 @@ class MemoryManager:
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_memories_user_id ON memories(user_id, created_at DESC)"
         )
+        self._retriever.init_schema(conn)
         conn.commit()
 
-    async def add_message(self, user_id: str, content: str) -> None:
+    async def add_message(
+        self, user_id: str, content: str, importance: float = DEFAULT_IMPORTANCE
+    ) -> None:
+        """Store *content* for *user_id*; *importance* (0-1) boosts it in ranking."""
         if not content.strip():
             return
         if self.provider == "mem0" and self._mem0 is not None:
             await asyncio.to_thread(self._mem0.add, content, user_id=user_id)
             return
-        await asyncio.to_thread(self._store_sqlite, user_id, content)
+        self._invalidate(user_id)
+        await asyncio.to_thread(self._store_sqlite, user_id, content, importance)
+        self._invalidate(user_id)
         # Periodic pruning: remove memories older than retention period
         self._insert_count += 1
         if self._insert_count % self._PRUNE_INTERVAL == 0:
@@ -95,11 +123,21 @@ class MemoryManager:
             if deleted:
                 logger.info("Pruned %d old memories (>%d days)", deleted, self._max_age_days)
 
-    def _store_sqlite(self, user_id: str, content: str) -> None:
+    def _store_sqlite(
+        self, user_id: str, content: str, importance: float = DEFAULT_IMPORTANCE
+    ) -> None:
+        embedding = self._retriever.embed(content)
         conn = self._pool.get()
-        conn.execute("INSERT INTO memories (user_id, content) VALUES (?, ?)", (user_id, content))
+        conn.execute(
+            "INSERT INTO memories (user_id, content, importance, embedding) VALUES (?, ?, ?, ?)",
+            (user_id, content, min(max(importance, 0.0), 1.0), embedding),
+        )
         conn.commit()
 
+    def _invalidate(self, user_id: str) -> None:
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self._cache.pop(user_id, None)
+
     def _prune_old_memories(self) -> int:
         """Delete memories older than the retention period. Returns count deleted."""
         cutoff = (datetime.now(tz=UTC) - timedelta(days=self._max_age_days)).strftime(
@@ -108,6 +146,10 @@ class MemoryManager:
         conn = self._pool.get()
         cursor = conn.execute("DELETE FROM memories WHERE created_at < ?", (cutoff,))
         conn.commit()
+        if cursor.rowcount:
+            for user_id in list(self._generations):
+                self._generations[user_id] += 1
+            self._cache.clear()
         return cursor.rowcount
 
     async def retrieve(self, user_id: str, query: str, limit: int = 5) -> list[MemorySnippet]:
@@ -128,23 +170,36 @@ class MemoryManager:
             except Exception as exc:  # pragma: no cover
                 logger.warning("Mem0 retrieval failed: %s", exc)
 
-        rows = await asyncio.to_thread(self._retrieve_sqlite, user_id, query, limit)
-        return [MemorySnippet(text=row, source="sqlite") for row in rows]
-
-    def _retrieve_sqlite(self, user_id: str, query: str, limit: int) -> Iterable[str]:
-        like = f"%{query.strip()[:200]}%"
-        conn = self._pool.get()
-        cursor = conn.execute(
-            """
-            SELECT content
-            FROM memories
-            WHERE user_id = ?
-            ORDER BY CASE WHEN content LIKE ? THEN 0 ELSE 1 END, created_at DESC
-            LIMIT ?
-            """,
-            (user_id, like, limit),
-        )
-        return [r[0] for r in cursor.fetchall()]
+        key = (normalize_query(query), limit)
+        cached = self._cache_get(user_id, key)
+        if cached is not None:
+            return list(cached)
+        generation = self._generations.get(user_id, 0)
+        snippets = await asyncio.to_thread(self._retrieve_sqlite, user_id, query, limit)
+        if self._generations.get(user_id, 0) == generation:
+            self._cache_put(user_id, key, snippets)
+        return list(snippets)
+
+    def _retrieve_sqlite(self, user_id: str, query: str, limit: int) -> list[MemorySnippet]:
+        ranked = self._retriever.search(self._pool.get(), user_id, query, limit)
+        return [MemorySnippet(text=m.text, score=m.score, source="sqlite") for m in ranked]
+
+    def _cache_get(self, user_id: str, key: tuple[str, int]) -> list[MemorySnippet] | None:
+        entries = self._cache.get(user_id)
+        if entries is None or key not in entries:
+            return None
+        self._cache.move_to_end(user_id)
+        entries.move_to_end(key)
+        return entries[key]
+
+    def _cache_put(self, user_id: str, key: tuple[str, int], snippets: list[MemorySnippet]) -> None:
+        entries = self._cache.setdefault(user_id, OrderedDict())
+        self._cache.move_to_end(user_id)
+        entries[key] = snippets
+        while len(entries) > self._CACHE_QUERIES_PER_USER:
+            entries.popitem(last=False)
+        while len(self._cache) > self._CACHE_USERS:
+            self._cache.popitem(last=False)
 
     async def build_context_block(self, user_id: str, query: str) -> str:
         snippets = await self.retrieve(user_id=user_id, query=query)
@@ -179,15 +234,14 @@ class MemoryManager:
             or None if no relevant memories found.
         """
         # Use sync retrieval method
-        rows = self._retrieve_sqlite(user_id, query, max_snippets)
-        rows = list(rows)
+        snippets = self._retrieve_sqlite(user_id, query, max_snippets)
 
-        if not rows:
+        if not snippets:
             return None
 
         lines = ["## Relevant Long-term Memory"]
-        for idx, text in enumerate(rows, start=1):
-            lines.append(f"{idx}. {text}")
+        for idx, snippet in enumerate(snippets, start=1):
+            lines.append(f"{idx}. {snippet.text}")
 
         content = (
             "You have access to the user's long-term memory from previous conversations. "
@@ -0,0 +1,229 @@
+"""Ranked retrieval over the SQLite ``memories`` table.
+
+Candidates come from three indexed sources instead of a table scan:
+
+- an FTS5 index over ``memories.content`` (external-content table kept in sync
+  by triggers), ranked with bm25;
+- the user's most recent memories, via ``idx_memories_user_id``;
+- optionally, cosine similarity against float32 embeddings of the user's most
+  recent ``VECTOR_SCAN_LIMIT`` memories, when an embedder is configured.
+
+Each candidate is scored as a blend of text/vector relevance and an
+importance-weighted recency term that halves every ``half_life_days``. A strong
+match outranks a memory that is merely recent; between similar matches, the
+fresher and more important one wins.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import sqlite3
+from array import array
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[list[str]], Sequence[Sequence[float]]]
+
+VECTOR_SCAN_LIMIT = 1000  # most recent embedded memories compared per query
+DEFAULT_IMPORTANCE = 0.5
+
+_MAX_QUERY_CHARS = 200
+_MAX_QUERY_TERMS = 16
+_TERM_RE = re.compile(r"\w+")
+
+# Score = relevance weight * relevance + memory weight * importance * recency decay
+_RELEVANCE_WEIGHT = 0.7
+_MEMORY_WEIGHT = 0.3
+# Share of relevance taken from vector similarity when embeddings are available
+_VECTOR_WEIGHT = 0.5
+
+
+@dataclass(slots=True)
+class ScoredMemory:
+    """A ranked memory row."""
+
+    memory_id: int
+    text: str
+    score: float
+
+
+def fts_query(query: str) -> str | None:
+    """Turn free-form *query* into an FTS5 OR-query of quoted terms.
+
+    Quoting every term keeps punctuation and FTS5 operators in user text from
+    being parsed as query syntax. Returns None when there are no terms.
+    """
+    terms = _TERM_RE.findall(query[:_MAX_QUERY_CHARS].lower())
+    unique = list(dict.fromkeys(terms))[:_MAX_QUERY_TERMS]
+    if not unique:
+        return None
+    return " OR ".join(f'"{term}"' for term in unique)
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    """Serialize an embedding as a float32 BLOB."""
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(blob: bytes) -> array:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector
+
+
+def cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b, strict=False))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class MemoryRetriever:
+    """Schema setup, embedding storage and ranked search for ``memories``."""
+
+    def __init__(self, embedder: Embedder | None = None, half_life_days: float = 30.0) -> None:
+        self.embedder = embedder
+        self.half_life_days = max(half_life_days, 0.1)
+        self.fts_enabled = False
+
+    def init_schema(self, conn: sqlite3.Connection) -> None:
+        """Add ranking columns and the FTS5 index to an existing ``memories`` table."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(memories)")}
+        if "importance" not in columns:
+            conn.execute(
+                f"ALTER TABLE memories ADD COLUMN importance REAL DEFAULT {DEFAULT_IMPORTANCE}"
+            )
+        if "embedding" not in columns:
+            conn.execute("ALTER TABLE memories ADD COLUMN embedding BLOB")
+
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='memories_fts'"
+        ).fetchone()
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5("
+                "content, content='memories', content_rowid='id')"
+            )
+        except sqlite3.OperationalError as exc:
+            logger.warning("FTS5 unavailable, memory search limited to recency: %s", exc)
+            return
+        conn.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF content ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, content)
+                VALUES ('delete', old.id, old.content);
+                INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+            END;
+            """
+        )
+        if not exists:
+            # Index memories written before the FTS table existed
+            conn.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+        self.fts_enabled = True
+
+    def embed(self, text: str) -> bytes | None:
+        """Return the packed embedding of *text*, or None without an embedder."""
+        if self.embedder is None:
+            return None
+        try:
+            return pack_vector(self.embedder([text])[0])
+        except Exception as exc:
+            logger.warning("Memory embedding failed: %s", exc)
+            return None
+
+    def search(
+        self, conn: sqlite3.Connection, user_id: str, query: str, limit: int
+    ) -> list[ScoredMemory]:
+        """Return the user's top *limit* memories for *query*, best first."""
+        if limit <= 0:
+            return []
+        text_scores = self._text_scores(conn, user_id, query, limit * 4)
+        vector_scores = self._vector_scores(conn, user_id, query)
+        recent_ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT id FROM memories WHERE user_id = ? ORDER BY created_at DESC, id DESC "
+                "LIMIT ?",
+                (user_id, limit),
+            )
+        ]
+        top_vector = sorted(vector_scores, key=vector_scores.__getitem__, reverse=True)
+        candidates = set(text_scores) | set(top_vector[: limit * 4]) | set(recent_ids)
+        if not candidates:
+            return []
+
+        placeholders = ",".join("?" * len(candidates))
+        rows = conn.execute(
+            f"""
+            SELECT id, content, COALESCE(importance, ?),
+                   MAX(julianday('now') - julianday(created_at), 0)
+            FROM memories
+            WHERE id IN ({placeholders})
+            """,
+            (DEFAULT_IMPORTANCE, *candidates),
+        ).fetchall()
+
+        vector_weight = _VECTOR_WEIGHT if vector_scores else 0.0
+        scored = []
+        for memory_id, content, importance, age_days in rows:
+            text_score = text_scores.get(memory_id, 0.0)
+            vector_score = max(vector_scores.get(memory_id, 0.0), 0.0)
+            relevance = (1 - vector_weight) * text_score + vector_weight * vector_score
+            decay = 0.5 ** (age_days / self.half_life_days)
+            score = _RELEVANCE_WEIGHT * relevance + _MEMORY_WEIGHT * importance * decay
+            scored.append(ScoredMemory(memory_id, content, score))
+        scored.sort(key=lambda m: (m.score, m.memory_id), reverse=True)
+        return scored[:limit]
+
+    def _text_scores(
+        self, conn: sqlite3.Connection, user_id: str, query: str, k: int
+    ) -> dict[int, float]:
+        """bm25 matches for *query*, normalized so the best match scores 1.0."""
+        if not self.fts_enabled:
+            return {}
+        match = fts_query(query)
+        if match is None:
+            return {}
+        rows = conn.execute(
+            """
+            SELECT m.id, bm25(memories_fts) AS rank
+            FROM memories_fts
+            JOIN memories m ON m.id = memories_fts.rowid
+            WHERE memories_fts MATCH ? AND m.user_id = ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (match, user_id, k),
+        ).fetchall()
+        if not rows:
+            return {}
+        # bm25 is negative; more negative is better
+        best = min(rank for _, rank in rows)
+        return {mid: (rank / best if best else 1.0) for mid, rank in rows}
+
+    def _vector_scores(
+        self, conn: sqlite3.Connection, user_id: str, query: str
+    ) -> dict[int, float]:
+        """Cosine similarity between *query* and the user's recent embedded memories."""
+        if self.embedder is None or not query.strip():
+            return {}
+        blob = self.embed(query[:_MAX_QUERY_CHARS])
+        if blob is None:
+            return {}
+        query_vec = unpack_vector(blob)
+        rows = conn.execute(
+            "SELECT id, embedding FROM memories WHERE user_id = ? AND embedding IS NOT NULL "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (user_id, VECTOR_SCAN_LIMIT),
+        )
+        return {mid: cosine(query_vec, unpack_vector(emb)) for mid, emb in rows}
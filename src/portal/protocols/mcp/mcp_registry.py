@@ -7,16 +7,25 @@ Manages HTTP connections, health checks, and tool discovery.
 Supports two transports:
   - openapi: mcpo-style OpenAPI HTTP proxy (Open WebUI path)
   - streamable-http: native MCP streamable HTTP (LibreChat path)
+
+Discovery and health checks fan out to all servers concurrently, each bounded
+by a per-server deadline, so a slow or hung server only costs its own deadline.
+Tool lists are kept in a TTL cache; a stale entry is served immediately while a
+background task refreshes it.
 """
 
 import asyncio
 import logging
+import os
+import time
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
 _RETRY_DELAYS = (1.0, 2.0, 4.0)  # seconds between attempts (3 retries total)
+_DISCOVERY_TIMEOUT = float(os.getenv("MCP_DISCOVERY_TIMEOUT", "5.0"))  # per server
+_TOOL_CACHE_TTL = float(os.getenv("MCP_TOOL_CACHE_TTL", "300"))
 
 
 class MCPRegistry:
@@ -25,10 +34,20 @@ class MCPRegistry:
     Manages connections, health checks, and tool discovery.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        discovery_timeout: float = _DISCOVERY_TIMEOUT,
+        tool_cache_ttl: float = _TOOL_CACHE_TTL,
+    ):
         self._servers: dict[str, dict] = {}
         transport = httpx.AsyncHTTPTransport(retries=3)
         self._client = httpx.AsyncClient(transport=transport, timeout=60.0)
+        self.discovery_timeout = discovery_timeout
+        self.tool_cache_ttl = tool_cache_ttl
+        # server name -> (monotonic fetch time, tools)
+        self._tool_cache: dict[str, tuple[float, list[dict]]] = {}
+        # In-flight fetches, shared by concurrent callers and background refreshes
+        self._tool_fetches: dict[str, asyncio.Task] = {}
 
     async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
         """Execute an HTTP request with simple retry logic on transient errors."""
@@ -50,6 +69,9 @@ class MCPRegistry:
 
     async def close(self) -> None:
         """Close the shared HTTP client. Call during application shutdown."""
+        for task in self._tool_fetches.values():
+            task.cancel()
+        self._tool_fetches.clear()
         await self._client.aclose()
 
     async def register(
@@ -65,6 +87,7 @@ class MCPRegistry:
             "transport": transport,
             "api_key": api_key,
         }
+        self.invalidate_tools(name)
         logger.info("Registered MCP server '%s' at %s (%s)", name, url, transport)
 
     async def health_check(self, name: str) -> bool:
@@ -136,60 +159,144 @@ class MCPRegistry:
         }
 
     async def health_check_all(self) -> dict[str, bool]:
-        """Check all registered servers. Returns {name: is_healthy}."""
-        results = {}
-        for name in self._servers:
-            results[name] = await self.health_check(name)
-        return results
+        """Check all registered servers concurrently. Returns {name: is_healthy}."""
+        details = await self.health_check_all_detailed()
+        return {name: d["status"] == "healthy" for name, d in details.items()}
 
     async def health_check_all_detailed(self) -> dict[str, dict]:
-        """Check all registered servers with detailed status. Returns {name: details}."""
-        results = {}
-        for name in self._servers:
-            results[name] = await self.health_check_detailed(name)
-        return results
+        """Check all registered servers concurrently with detailed status.
+
+        Each check is bounded by ``discovery_timeout``; a server that misses
+        it is reported as ``degraded`` instead of delaying the others.
+        Returns {name: details}.
+        """
+        names = list(self._servers)
+        results = await asyncio.gather(*(self._health_check_bounded(n) for n in names))
+        return dict(zip(names, results, strict=True))
+
+    async def _health_check_bounded(self, name: str) -> dict:
+        try:
+            return await asyncio.wait_for(
+                self.health_check_detailed(name), timeout=self.discovery_timeout
+            )
+        except TimeoutError:
+            return {
+                "status": "degraded",
+                "message": f"Health check exceeded {self.discovery_timeout:.1f}s deadline",
+                "server_url": self._servers.get(name, {}).get("url"),
+                "error_type": "timeout",
+            }
 
     async def list_tools(self, server_name: str) -> list[dict]:
-        """Return the tool manifest from a specific server."""
-        server = self._servers.get(server_name)
-        if not server:
-            return []
+        """Return the tool manifest from a specific server.
 
-        headers = self._auth_headers(server)
+        Served from the TTL cache when possible. A stale entry is returned
+        immediately and refreshed in the background; a missing entry is fetched.
+        """
+        if server_name not in self._servers:
+            return []
+        cached = self._tool_cache.get(server_name)
+        if cached is not None:
+            if time.monotonic() - cached[0] >= self.tool_cache_ttl:
+                self._fetch_tools_task(server_name)  # refresh in the background
+            return cached[1]
         try:
-            if server["transport"] == "openapi":
-                resp = await self._request(
-                    "GET", f"{server['url']}/openapi.json", headers=headers, timeout=10.0
-                )
-                resp.raise_for_status()
-                spec = resp.json()
-                tools = []
-                for path, methods in spec.get("paths", {}).items():
-                    for method, details in methods.items():
-                        if method in ("get", "post"):
-                            tools.append(
-                                {
-                                    "name": details.get("operationId", path.strip("/")),
-                                    "description": details.get("summary", ""),
-                                    "path": path,
-                                    "method": method,
-                                }
-                            )
-                return tools
-            else:
-                resp = await self._request(
-                    "GET", f"{server['url']}/tools", headers=headers, timeout=10.0
-                )
-                if resp.status_code == 200:
-                    return resp.json().get("tools", [])
-                return []
+            return await asyncio.shield(self._fetch_tools_task(server_name))
         except Exception as exc:
             logger.warning("list_tools failed for %r: %s", server_name, exc)
             return []
 
-    def list_tools_sync(self, server_name: str) -> list[dict]:
-        """Synchronous wrapper for list_tools (for use in non-async contexts)."""
-        return asyncio.get_event_loop().run_until_complete(self.list_tools(server_name))
+    async def discover_tools(self, timeout: float | None = None) -> dict[str, list[dict] | None]:
+        """List tools on every registered server concurrently.
+
+        Each server gets *timeout* seconds (default ``discovery_timeout``). A
+        server that misses the deadline or fails maps to its stale cached list
+        if there is one, otherwise to ``None``; its fetch keeps running in the
+        background and fills the cache for the next call.
+        """
+        timeout = self.discovery_timeout if timeout is None else timeout
+        names = list(self._servers)
+        results = await asyncio.gather(*(self._discover_one(n, timeout) for n in names))
+        return dict(zip(names, results, strict=True))
+
+    async def _discover_one(self, name: str, timeout: float) -> list[dict] | None:
+        cached = self._tool_cache.get(name)
+        if cached is not None and time.monotonic() - cached[0] < self.tool_cache_ttl:
+            return cached[1]
+        try:
+            # shield: a missed deadline must not cancel the shared fetch
+            return await asyncio.wait_for(
+                asyncio.shield(self._fetch_tools_task(name)), timeout=timeout
+            )
+        except TimeoutError:
+            logger.warning("MCP tool discovery for %r exceeded %.1fs", name, timeout)
+        except Exception as exc:
+            logger.warning("MCP tool discovery for %r failed: %s", name, exc)
+        return cached[1] if cached is not None else None
+
+    def get_cached_tools(self, server_name: str) -> list[dict] | None:
+        """Return the cached tool list for *server_name* (even if stale) without any I/O."""
+        cached = self._tool_cache.get(server_name)
+        return cached[1] if cached is not None else None
+
+    def invalidate_tools(self, server_name: str | None = None) -> None:
+        """Drop cached tool lists for one server, or all servers."""
+        if server_name is None:
+            self._tool_cache.clear()
+        else:
+            self._tool_cache.pop(server_name, None)
+
+    def _fetch_tools_task(self, server_name: str) -> asyncio.Task:
+        """Return the in-flight fetch for *server_name*, starting one if needed."""
+        task = self._tool_fetches.get(server_name)
+        if task is None or task.done():
+            task = asyncio.create_task(
+                self._fetch_and_cache_tools(server_name), name=f"mcp-tools-{server_name}"
+            )
+            task.add_done_callback(self._on_fetch_done)
+            self._tool_fetches[server_name] = task
+        return task
+
+    def _on_fetch_done(self, task: asyncio.Task) -> None:
+        for name, t in list(self._tool_fetches.items()):
+            if t is task:
+                del self._tool_fetches[name]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("MCP tool fetch failed: %s", task.exception())
+
+    async def _fetch_and_cache_tools(self, server_name: str) -> list[dict]:
+        tools = await self._fetch_tools(server_name)
+        if server_name in self._servers:
+            self._tool_cache[server_name] = (time.monotonic(), tools)
+        return tools
+
+    async def _fetch_tools(self, server_name: str) -> list[dict]:
+        """Fetch the tool manifest from the server; raises on transport/HTTP errors."""
+        server = self._servers[server_name]
+        headers = self._auth_headers(server)
+        if server["transport"] == "openapi":
+            resp = await self._request(
+                "GET", f"{server['url']}/openapi.json", headers=headers, timeout=10.0
+            )
+            resp.raise_for_status()
+            spec = resp.json()
+            tools = []
+            for path, methods in spec.get("paths", {}).items():
+                for method, details in methods.items():
+                    if method in ("get", "post"):
+                        tools.append(
+                            {
+                                "name": details.get("operationId", path.strip("/")),
+                                "description": details.get("summary", ""),
+                                "path": path,
+                                "method": method,
+                            }
+                        )
+            return tools
+        resp = await self._request("GET", f"{server['url']}/tools", headers=headers, timeout=10.0)
+        # An error status must not be cached as "no tools"; callers keep the stale list
+        resp.raise_for_status()
+        return resp.json().get("tools", [])
 
     async def call_tool(
         self,
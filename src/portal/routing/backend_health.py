@@ -0,0 +1,205 @@
+"""Backend Health Monitor — background availability probes with cached readiness."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from .model_backends import ModelBackend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackendHealth:
+    """Cached probe state for a single backend."""
+
+    available: bool = False
+    checked_at: float = 0.0
+    interval: float = 0.0
+    consecutive_failures: int = 0
+    last_error: str | None = None
+    stale: bool = True
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "available": self.available,
+            "last_checked": self.checked_at or None,
+            "probe_interval": self.interval,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+
+class BackendHealthMonitor:
+    """Probes registered backends on an adaptive schedule and caches readiness.
+
+    Healthy backends are probed progressively less often (the interval doubles
+    up to *max_interval*); a failed probe drops the interval back to
+    *min_interval* so recovery is noticed quickly.  ``invalidate()`` marks a
+    backend stale after a real request fails, so the next caller re-probes it
+    instead of trusting the cached result.
+
+    When the background loop is not running, cached results expire after twice
+    their probe interval and ``is_available()`` falls back to an inline probe.
+    """
+
+    def __init__(
+        self,
+        backends: dict[str, ModelBackend],
+        min_interval: float = 5.0,
+        max_interval: float = 60.0,
+        probe_timeout: float = 5.0,
+    ) -> None:
+        self.backends = backends
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.probe_timeout = probe_timeout
+        self._states: dict[str, BackendHealth] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def get_state(self, name: str) -> BackendHealth:
+        """Return the cached state for *name*, creating an unprobed entry if needed."""
+        state = self._states.get(name)
+        if state is None:
+            state = BackendHealth(interval=self.min_interval)
+            self._states[name] = state
+        return state
+
+    def is_fresh(self, name: str) -> bool:
+        """Return True if the cached state for *name* can be trusted without probing."""
+        state = self.get_state(name)
+        if state.stale:
+            return False
+        return time.time() - state.checked_at <= state.interval * 2
+
+    async def is_available(self, name: str) -> bool:
+        """Return cached readiness for *name*, probing inline only when stale."""
+        if name not in self.backends:
+            return False
+        if self.is_fresh(name):
+            return self.get_state(name).available
+        return await self.probe(name)
+
+    async def probe(self, name: str) -> bool:
+        """Probe *name* now. Concurrent callers share a single in-flight probe."""
+        task = self._inflight.get(name)
+        if task is None or task.done():
+            task = asyncio.create_task(self._probe(name), name=f"health-probe-{name}")
+            self._inflight[name] = task
+        return await asyncio.shield(task)
+
+    async def _probe(self, name: str) -> bool:
+        backend = self.backends.get(name)
+        if backend is None:
+            return False
+
+        error: str | None = None
+        try:
+            available = bool(
+                await asyncio.wait_for(backend.is_available(), timeout=self.probe_timeout)
+            )
+        except TimeoutError:
+            available, error = False, f"probe timed out after {self.probe_timeout}s"
+        except Exception as e:
+            available, error = False, str(e)
+
+        state = self.get_state(name)
+        if available:
+            # Back off while the backend stays healthy; reset after a recovery
+            state.interval = (
+                min(state.interval * 2, self.max_interval)
+                if state.available and not state.stale
+                else self.min_interval
+            )
+            state.consecutive_failures = 0
+            state.last_error = None
+        else:
+            if state.available:
+                logger.warning("Backend %s became unavailable: %s", name, error or "probe failed")
+            state.interval = self.min_interval
+            state.consecutive_failures += 1
+            state.last_error = error or state.last_error
+        state.available = available
+        state.checked_at = time.time()
+        state.stale = False
+        return available
+
+    def record_success(self, name: str) -> None:
+        """A completed request proves reachability — refresh the cache without a probe."""
+        state = self.get_state(name)
+        state.available = True
+        state.checked_at = time.time()
+        state.stale = False
+        state.consecutive_failures = 0
+        state.last_error = None
+
+    def invalidate(self, name: str, error: str | None = None) -> None:
+        """Mark *name* stale after a failed request so it is re-probed before reuse."""
+        state = self.get_state(name)
+        state.stale = True
+        if error:
+            state.last_error = error
+        self._wakeup.set()
+
+    def probed_after(self, name: str, timestamp: float) -> bool:
+        """Return True if *name* passed a probe more recently than *timestamp*."""
+        state = self._states.get(name)
+        return bool(state and state.available and not state.stale and state.checked_at > timestamp)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return cached state for every registered backend."""
+        return {name: self.get_state(name).to_dict() for name in self.backends}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background probe loop (idempotent)."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="backend-health-monitor")
+        logger.info(
+            "Backend health monitor started (interval %.0f-%.0fs)",
+            self.min_interval,
+            self.max_interval,
+        )
+
+    async def stop(self) -> None:
+        """Stop the background probe loop and cancel in-flight probes."""
+        tasks = [t for t in (self._task, *self._inflight.values()) if t and not t.done()]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+        self._inflight.clear()
+
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            due = []
+            for name in list(self.backends):
+                state = self.get_state(name)
+                if state.stale or now >= state.checked_at + state.interval:
+                    due.append(name)
+            if due:
+                await asyncio.gather(*(self.probe(name) for name in due), return_exceptions=True)
+
+            now = time.time()
+            next_due = min(
+                (s.checked_at + s.interval for n, s in self._states.items() if n in self.backends),
+                default=now + self.min_interval,
+            )
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(next_due - now, 0.05))
+            except TimeoutError:
+                pass
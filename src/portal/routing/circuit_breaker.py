@@ -4,6 +4,10 @@ import logging
 import time
 from collections import defaultdict
 from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .backend_health import BackendHealthMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +19,29 @@ class CircuitState(Enum):
 
 
 class CircuitBreaker:
-    """Prevents retrying repeatedly failing backends (circuit breaker pattern)."""
+    """Prevents retrying repeatedly failing backends (circuit breaker pattern).
+
+    If a BackendHealthMonitor is attached, an open circuit moves to HALF_OPEN
+    as soon as the monitor sees a successful probe taken at least
+    *probe_recovery_delay* seconds after the last failure, instead of waiting
+    out the full recovery timeout.  Probes that run sooner (such as the
+    re-probe triggered by the failure itself) only show the server is up, not
+    that generation works, so they are ignored.
+    """
 
     def __init__(
-        self, failure_threshold: int = 3, recovery_timeout: int = 60, half_open_max_calls: int = 1
+        self,
+        failure_threshold: int = 3,
+        recovery_timeout: int = 60,
+        half_open_max_calls: int = 1,
+        health_monitor: "BackendHealthMonitor | None" = None,
+        probe_recovery_delay: float = 15.0,
     ):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         self.half_open_max_calls = half_open_max_calls
+        self.health_monitor = health_monitor
+        self.probe_recovery_delay = min(probe_recovery_delay, recovery_timeout)
         self.failure_counts: dict[str, int] = defaultdict(int)
         self.states: dict[str, CircuitState] = defaultdict(lambda: CircuitState.CLOSED)
         self.last_failure_times: dict[str, float] = {}
@@ -35,10 +54,20 @@ class CircuitBreaker:
             return True, "circuit_closed"
         if state == CircuitState.OPEN:
             last_failure = self.last_failure_times.get(backend_id, 0)
-            if time.time() - last_failure >= self.recovery_timeout:
+            probe_recovered = bool(
+                self.health_monitor
+                and self.health_monitor.probed_after(
+                    backend_id, last_failure + self.probe_recovery_delay
+                )
+            )
+            if probe_recovered or time.time() - last_failure >= self.recovery_timeout:
                 self.states[backend_id] = CircuitState.HALF_OPEN
                 self.half_open_calls[backend_id] = 0
-                logger.info("Circuit breaker for %s: OPEN -> HALF_OPEN", backend_id)
+                logger.info(
+                    "Circuit breaker for %s: OPEN -> HALF_OPEN%s",
+                    backend_id,
+                    " (health probe passed)" if probe_recovered else "",
+                )
                 return True, "circuit_testing_recovery"
             wait_time = int(self.recovery_timeout - (time.time() - last_failure))
             return False, f"circuit_open_wait_{wait_time}s"
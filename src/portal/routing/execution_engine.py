@@ -1,4 +1,8 @@
-"""Execution Engine — model execution with fallback chains and circuit breaker."""
+"""Execution Engine — model execution with fallback chains and circuit breaker.
+
+Every generation's latency, throughput and outcome is recorded in the router's
+ModelPerformanceTracker, which feeds latency-aware routing.
+"""
 
 import asyncio
 import logging
@@ -7,9 +11,11 @@ from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any
 
+from .backend_health import BackendHealthMonitor
 from .circuit_breaker import CircuitBreaker, CircuitState  # noqa: F401
 from .intelligent_router import IntelligentRouter, RoutingDecision
-from .model_backends import GenerationResult, ModelBackend, OllamaBackend
+from .model_backends import GenerationResult, ModelBackend, OllamaBackend, ToolCallChunk
+from .model_performance import ModelPerformanceTracker
 from .model_registry import ModelMetadata, ModelRegistry
 
 logger = logging.getLogger(__name__)
@@ -39,9 +45,15 @@ class ExecutionEngine:
         router: IntelligentRouter,
         config: dict[str, Any] | None = None,
         backends: dict[str, ModelBackend] | None = None,
+        performance: ModelPerformanceTracker | None = None,
     ):
         self.registry = registry
         self.router = router
+        # Share the router's tracker so measurements here steer its decisions
+        tracker = performance or getattr(router, "performance", None)
+        self.performance = (
+            tracker if isinstance(tracker, ModelPerformanceTracker) else ModelPerformanceTracker()
+        )
         self.config = config or {}
         self.backends: dict[str, ModelBackend] = backends or {
             "ollama": OllamaBackend(
@@ -50,12 +62,20 @@ class ExecutionEngine:
         }
 
         self.timeout_seconds = self.config.get("timeout_seconds", 60)
+        # Shared readiness cache — replaces a per-request is_available() round-trip
+        self.health_monitor = BackendHealthMonitor(
+            self.backends,
+            min_interval=self.config.get("health_probe_min_interval", 5.0),
+            max_interval=self.config.get("health_probe_max_interval", 60.0),
+        )
         self.circuit_breaker_enabled = self.config.get("circuit_breaker_enabled", True)
         self.circuit_breaker = (
             CircuitBreaker(
                 failure_threshold=self.config.get("circuit_breaker_threshold", 3),
                 recovery_timeout=self.config.get("circuit_breaker_timeout", 60),
                 half_open_max_calls=self.config.get("circuit_breaker_half_open_calls", 1),
+                health_monitor=self.health_monitor,
+                probe_recovery_delay=self.config.get("circuit_breaker_probe_delay", 15.0),
             )
             if self.circuit_breaker_enabled
             else None
@@ -68,13 +88,13 @@ class ExecutionEngine:
         )
 
     async def _backend_ready(self, backend, backend_id: str) -> bool:
-        """Return True if the backend passes circuit-breaker and availability checks."""
+        """Return True if the backend passes circuit-breaker and cached availability checks."""
         if self.circuit_breaker:
             allowed, reason = self.circuit_breaker.should_allow_request(backend_id)
             if not allowed:
                 logger.info("Circuit breaker blocked %s: %s", backend_id, reason)
                 return False
-        if not await backend.is_available():
+        if not await self.health_monitor.is_available(backend_id):
             logger.warning("Backend %s not available", backend_id)
             if self.circuit_breaker:
                 self.circuit_breaker.record_failure(backend_id)
@@ -91,10 +111,17 @@ class ExecutionEngine:
         messages: list[dict[str, Any]] | None = None,
         workspace_id: str | None = None,
         tools: list[dict[str, Any]] | None = None,
+        routing_decision: RoutingDecision | None = None,
     ) -> ExecutionResult:
-        """Execute query with routing and fallback. Returns ExecutionResult."""
+        """Execute query with routing and fallback. Returns ExecutionResult.
+
+        A caller-supplied *routing_decision* (made once per request) is used as-is,
+        skipping classification; otherwise the query is routed here.
+        """
         start_time = time.time()
-        decision = await self.router.route(query, max_cost, workspace_id=workspace_id)
+        decision = routing_decision or await self.router.route(
+            query, max_cost, workspace_id=workspace_id
+        )
         model_chain = [decision.model_id] + decision.fallback_models
         fallbacks_used = 0
         last_error = None
@@ -122,6 +149,14 @@ class ExecutionEngine:
                     tools=tools,
                 )
                 if result.success:
+                    self.performance.record_success(
+                        model.model_id,
+                        model.backend,
+                        result.time_ms,
+                        result.tokens_generated,
+                        ttft_ms=result.ttft_ms,
+                    )
+                    self.health_monitor.record_success(model.backend)
                     if self.circuit_breaker:
                         self.circuit_breaker.record_success(model.backend)
                     return ExecutionResult(
@@ -134,14 +169,19 @@ class ExecutionEngine:
                         fallbacks_used=fallbacks_used,
                         tool_calls=result.tool_calls or [],
                     )
+                self.performance.record_failure(model.model_id, model.backend)
+                self.health_monitor.invalidate(model.backend, result.error)
                 if self.circuit_breaker:
                     self.circuit_breaker.record_failure(model.backend)
                 last_error = result.error
                 fallbacks_used += 1
                 logger.warning("Model %s failed: %s", model_id, result.error)
             except Exception as e:
-                if model and model.backend and self.circuit_breaker:
-                    self.circuit_breaker.record_failure(model.backend)
+                if model and model.backend:
+                    self.performance.record_failure(model.model_id, model.backend)
+                    self.health_monitor.invalidate(model.backend, str(e))
+                    if self.circuit_breaker:
+                        self.circuit_breaker.record_failure(model.backend)
                 last_error = str(e)
                 fallbacks_used += 1
                 logger.error("Error with model %s: %s", model_id, e)
@@ -204,15 +244,18 @@ class ExecutionEngine:
         messages: list[dict[str, Any]] | None = None,
         workspace_id: str | None = None,
         tools: list[dict[str, Any]] | None = None,
-    ) -> AsyncIterator[str]:
+        routing_decision: RoutingDecision | None = None,
+    ) -> AsyncIterator[str | ToolCallChunk]:
         """
         Stream generation token-by-token from the best available backend.
 
         Follows the same model-chain / circuit-breaker logic as execute() but
         calls each backend's generate_stream() so tokens flow to the caller as
-        they are produced by Ollama rather than being buffered.
+        they are produced by Ollama rather than being buffered.  Like execute(),
+        a supplied *routing_decision* skips re-routing.  When *tools* are given,
+        tool calls requested by the model are yielded as ToolCallChunk items.
         """
-        decision = await self.router.route(query, workspace_id=workspace_id)
+        decision = routing_decision or await self.router.route(query, workspace_id=workspace_id)
         model_chain = [decision.model_id] + decision.fallback_models
 
         for model_id in model_chain:
@@ -230,6 +273,9 @@ class ExecutionEngine:
 
             try:
                 yielded = False
+                started = time.monotonic()
+                first_token_at: float | None = None
+                chunks = 0
                 async for token in backend.generate_stream(
                     prompt=query,
                     model_name=model.api_model_name or model.model_id,
@@ -240,12 +286,28 @@ class ExecutionEngine:
                     tools=tools,
                 ):
                     yielded = True
+                    if isinstance(token, str):
+                        # Ollama streams about one token per chunk
+                        chunks += 1
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
                     yield token
-                if yielded and self.circuit_breaker:
-                    self.circuit_breaker.record_success(model.backend)
+                if yielded:
+                    self.performance.record_success(
+                        model.model_id,
+                        model.backend,
+                        (time.monotonic() - started) * 1000,
+                        chunks,
+                        ttft_ms=(first_token_at - started) * 1000 if first_token_at else None,
+                    )
+                    self.health_monitor.record_success(model.backend)
+                    if self.circuit_breaker:
+                        self.circuit_breaker.record_success(model.backend)
                 return
             except Exception as e:
                 logger.error("Streaming error with model %s: %s", model_id, e)
+                self.performance.record_failure(model.model_id, model.backend)
+                self.health_monitor.invalidate(model.backend, str(e))
                 if self.circuit_breaker:
                     self.circuit_breaker.record_failure(model.backend)
                 continue
@@ -253,18 +315,34 @@ class ExecutionEngine:
         logger.error("No models available for streaming")
         return
 
+    async def start(self) -> None:
+        """Start background backend health probing."""
+        await self.health_monitor.start()
+
     async def close(self) -> None:
-        """Close all backends"""
+        """Stop health probing and close all backends and the router's classifier"""
+        await self.health_monitor.stop()
         for backend in self.backends.values():
             if hasattr(backend, "close"):
                 await backend.close()
+        if isinstance(self.router, IntelligentRouter):
+            await self.router.close()
 
     async def health_check(self) -> dict[str, Any]:
-        """Check health of all backends including circuit breaker status."""
+        """Report backend health from the shared monitor cache, plus circuit breaker status."""
         health = {}
-        for name, backend in self.backends.items():
+        for name in self.backends:
             try:
-                info: dict[str, Any] = {"available": await backend.is_available()}
+                available = await self.health_monitor.is_available(name)
+                state = self.health_monitor.get_state(name)
+                info: dict[str, Any] = {
+                    "available": available,
+                    "last_checked": state.checked_at or None,
+                    "probe_interval": state.interval,
+                }
+                if not available and state.last_error:
+                    info["error"] = state.last_error
+                info["degraded"] = self.performance.is_degraded(name)
                 if self.circuit_breaker:
                     info["circuit_state"] = self.circuit_breaker.get_state(name).value
                     info["failure_count"] = self.circuit_breaker.failure_counts[name]
@@ -282,6 +360,10 @@ class ExecutionEngine:
                 logger.error("Health check failed for %s: %s", name, e)
         return health
 
+    def get_performance_stats(self) -> dict[str, dict[str, Any]]:
+        """Live TTFT, tokens/sec and error-rate estimates per model and backend."""
+        return self.performance.snapshot()
+
     def get_circuit_breaker_status(self) -> dict[str, Any]:
         """Get circuit breaker status for all backends."""
         if not self.circuit_breaker:
@@ -1,16 +1,25 @@
-"""Intelligent Router — model selection based on task analysis."""
+"""Intelligent Router — model selection based on task analysis.
+
+SPEED and BALANCED routing, fallback ordering and load shedding use the live
+latency, throughput and error estimates in ``ModelPerformanceTracker`` once
+models have been observed; until then the static ``ModelMetadata`` figures apply.
+"""
 
 import logging
 from dataclasses import dataclass
 from enum import Enum
 
-from .llm_classifier import LLMCategory, LLMClassifier
+from .llm_classifier import LLMCategory, LLMClassifier, create_classifier
+from .model_performance import ModelPerformanceTracker
 from .model_registry import ModelCapability, ModelMetadata, ModelRegistry
 from .task_classifier import TaskCategory, TaskClassification, TaskClassifier, TaskComplexity
 from .workspace_registry import WorkspaceRegistry
 
 logger = logging.getLogger(__name__)
 
+# BALANCED may trade this much quality score for a measurably faster model
+BALANCED_QUALITY_MARGIN = 0.05
+
 
 class RoutingStrategy(Enum):
     AUTO = "auto"
@@ -39,10 +48,13 @@ class IntelligentRouter:
         strategy: RoutingStrategy = RoutingStrategy.AUTO,
         model_preferences: dict[str, list[str]] | None = None,
         workspace_registry: WorkspaceRegistry | None = None,
+        llm_classifier: LLMClassifier | None = None,
+        performance: ModelPerformanceTracker | None = None,
     ) -> None:
         self.registry = registry
+        self.performance = performance or ModelPerformanceTracker()
         self.strategy = strategy
-        self.llm_classifier = LLMClassifier()
+        self.llm_classifier = llm_classifier or create_classifier()
         self.classifier = TaskClassifier()  # keep for metadata
         self.model_preferences = model_preferences if model_preferences is not None else {}
         self.workspace_registry = workspace_registry
@@ -113,15 +125,22 @@ class IntelligentRouter:
         model = strategy_dispatch.get(self.strategy, lambda c: self._route_auto(c, max_cost))(
             classification
         )
+        fallbacks = self._build_fallback_chain(model, classification)
+        if self.performance.is_degraded(model.backend):
+            model, fallbacks = self._shed_load(model, fallbacks)
         return RoutingDecision(
             model_id=model.model_id,
             model_metadata=model,
             classification=classification,
             strategy_used=self.strategy,
-            fallback_models=self._build_fallback_chain(model, classification),
+            fallback_models=fallbacks,
             reasoning=self._generate_reasoning(model, classification),
         )
 
+    async def close(self) -> None:
+        """Release the LLM classifier's pooled client and cache connection."""
+        await self.llm_classifier.close()
+
     def _route_auto(self, classification: TaskClassification, max_cost: float) -> ModelMetadata:
         """Automatic balanced routing using configurable model preferences."""
         if classification.category == TaskCategory.SECURITY:
@@ -149,40 +168,74 @@ class IntelligentRouter:
         return self._get_any_available_model()
 
     def _route_speed(self, classification: TaskClassification) -> ModelMetadata:
-        """Route for maximum speed."""
+        """Route for maximum speed: lowest observed latency, else static speed class."""
         capability = (
             ModelCapability.CODE
             if classification.requires_code
             else (ModelCapability.MATH if classification.requires_math else None)
         )
         fastest = self.registry.get_fastest_model(capability)
-        return fastest if fastest else self._get_any_available_model()
+        if not fastest:
+            return self._get_any_available_model()
+        candidates = self._healthy(
+            [
+                m
+                for m in self.registry.get_all_models()
+                if m.available and (capability is None or capability in m.capabilities)
+            ]
+        )
+        if fastest in candidates and not any(
+            self.performance.has_observations(m.model_id) for m in candidates
+        ):
+            return fastest
+        return min(candidates, key=self.performance.expected_latency)
 
     def _route_quality(self, classification: TaskClassification, max_cost: float) -> ModelMetadata:
         """Route for maximum quality."""
-        if classification.requires_code:
-            capability = ModelCapability.CODE
-        elif classification.category == TaskCategory.SECURITY:
-            capability = ModelCapability.SECURITY
-        elif classification.requires_math:
-            capability = ModelCapability.MATH
-        elif classification.category == TaskCategory.ANALYSIS:
-            capability = ModelCapability.REASONING
-        elif classification.category == TaskCategory.CREATIVE:
-            capability = ModelCapability.GENERAL
-        else:
-            capability = ModelCapability.GENERAL
+        capability = self._quality_capability(classification)
         best = self.registry.get_best_quality_model(capability, max_cost)
         return best if best else self._get_any_available_model()
 
     def _route_balanced(self, classification: TaskClassification, max_cost: float) -> ModelMetadata:
-        """Balanced routing — speed for simple tasks, quality for complex ones."""
+        """Balanced routing — speed for simple tasks, quality for complex ones.
+
+        For complex tasks, a measurably faster model whose quality is within
+        BALANCED_QUALITY_MARGIN of the best is preferred.
+        """
         if classification.complexity in (TaskComplexity.TRIVIAL, TaskComplexity.SIMPLE):
             return self._route_speed(classification)
         if classification.complexity in (TaskComplexity.COMPLEX, TaskComplexity.EXPERT):
-            return self._route_quality(classification, max_cost)
+            best = self._route_quality(classification, max_cost)
+            capability = self._quality_capability(classification)
+            floor = _quality(best, capability) - BALANCED_QUALITY_MARGIN
+            peers = self._healthy(
+                [
+                    m
+                    for m in self.registry.get_all_models()
+                    if m.available
+                    and m.cost <= max_cost
+                    and capability in m.capabilities
+                    and _quality(m, capability) >= floor
+                ]
+            )
+            if not any(self.performance.has_observations(m.model_id) for m in peers):
+                return best
+            return min(peers, key=self.performance.expected_latency)
         return self._route_auto(classification, max_cost * 0.7)
 
+    @staticmethod
+    def _quality_capability(classification: TaskClassification) -> ModelCapability:
+        """Capability whose quality score matters most for *classification*."""
+        if classification.requires_code:
+            return ModelCapability.CODE
+        if classification.category == TaskCategory.SECURITY:
+            return ModelCapability.SECURITY
+        if classification.requires_math:
+            return ModelCapability.MATH
+        if classification.category == TaskCategory.ANALYSIS:
+            return ModelCapability.REASONING
+        return ModelCapability.GENERAL
+
     def _route_cost_optimized(self, classification: TaskClassification) -> ModelMetadata:
         """Route for minimum resource usage."""
         available = sorted(
@@ -200,18 +253,47 @@ class IntelligentRouter:
     def _build_fallback_chain(
         self, primary: ModelMetadata, classification: TaskClassification
     ) -> list[str]:  # noqa: ARG002
-        """Build fallback model chain (up to 3, sorted by quality descending)."""
+        """Build fallback model chain (up to 3).
+
+        Models on healthy backends come first, then by quality discounted by
+        each model's observed error rate.
+        """
         available = sorted(
             (
                 m
                 for m in self.registry.get_all_models()
                 if m.available and m.model_id != primary.model_id
             ),
-            key=lambda m: m.general_quality,
-            reverse=True,
+            key=lambda m: (
+                self.performance.is_degraded(m.backend),
+                -m.general_quality * (1 - self.performance.error_rate(m.model_id)),
+            ),
         )
         return [m.model_id for m in available[:3]]
 
+    def _healthy(self, models: list[ModelMetadata]) -> list[ModelMetadata]:
+        """Drop models on degraded backends, unless that would leave none."""
+        healthy = [m for m in models if not self.performance.is_degraded(m.backend)]
+        return healthy or models
+
+    def _shed_load(
+        self, model: ModelMetadata, fallbacks: list[str]
+    ) -> tuple[ModelMetadata, list[str]]:
+        """Swap *model* on a degraded backend for the first fallback on a healthy one."""
+        for model_id in fallbacks:
+            candidate = self.registry.get_model(model_id)
+            if candidate and not self.performance.is_degraded(candidate.backend):
+                logger.info(
+                    "Backend %s degraded; routing %s -> %s",
+                    model.backend,
+                    model.model_id,
+                    candidate.model_id,
+                )
+                rest = [m for m in fallbacks if m != model_id]
+                # The original choice stays in the chain as a last resort
+                return candidate, [*rest, model.model_id][:3]
+        return model, fallbacks
+
     def _get_any_available_model(self) -> ModelMetadata:
         """Return any available model as last resort."""
         all_models = self.registry.get_all_models()
@@ -248,3 +330,12 @@ class IntelligentRouter:
                 f"Speed: {model.speed_class.value}",
             ]
         )
+
+
+def _quality(model: ModelMetadata, capability: ModelCapability) -> float:
+    """Quality score of *model* for *capability* (general quality if unscored)."""
+    return {
+        ModelCapability.CODE: model.code_quality,
+        ModelCapability.REASONING: model.reasoning_quality,
+        ModelCapability.SECURITY: model.security_quality,
+    }.get(capability, model.general_quality)
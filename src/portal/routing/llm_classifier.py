@@ -3,19 +3,35 @@ LLM-Based Task Classifier - Uses a small Ollama model for intelligent query clas
 
 This classifier replaces regex-based heuristics with LLM classification while
 keeping TaskClassifier as a zero-latency fallback.
+
+LLM verdicts are cached in a bounded in-memory LRU keyed on normalized query
+text, optionally backed by a SQLite table so they survive restarts.
 """
 
+import asyncio
+import hashlib
 import logging
+import re
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import httpx
 
 from portal.routing.task_classifier import TaskCategory, TaskClassification, TaskClassifier
 
+if TYPE_CHECKING:
+    from portal.core.db import ConnectionPool
+
 logger = logging.getLogger(__name__)
 
+# Confidence given to GENERAL when the model's reply names no category
+UNPARSED_CONFIDENCE = 0.3
+
 
 class LLMCategory(Enum):
     """Categories returned by LLM classifier."""
@@ -43,12 +59,27 @@ class LLMClassification:
     reasoning: str | None = None
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize *query* for cache lookups.
+
+    Case, runs of whitespace and surrounding punctuation do not change the
+    category, so "Write a Python script!" and "write a  python script" share
+    one cache entry.
+    """
+    return _WHITESPACE_RE.sub(" ", query.lower()).strip(" \t\n.,;:!?\"'`")
+
+
 class LLMClassifier:
     """
     LLM-based task classifier using a small Ollama model.
 
     Falls back to TaskClassifier if LLM is unavailable.
-    LRU cache avoids reclassifying identical prompts.
+    LLM verdicts are cached (in-memory LRU, plus SQLite when *cache_db_path*
+    is set) and concurrent identical queries share a single model call.
+    All requests go through one pooled ``httpx.AsyncClient``.
     """
 
     # Default classification prompt
@@ -75,14 +106,66 @@ Query: {query}"""
         model: str = "qwen2.5:0.5b",
         timeout: float = 30.0,
         cache_size: int = 128,
+        cache_db_path: str | Path | None = None,
+        cache_ttl: float = 7 * 24 * 3600,
     ):
         self.ollama_host = ollama_host
         self.model = model
         self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
         # Fallback to regex-based classifier
         self._fallback = TaskClassifier()
         # Track LLM availability
         self._llm_available: bool | None = None
+        # Shared connection pool for every request to the classifier model
+        self._client: httpx.AsyncClient | None = None
+        # Normalized-query cache of LLM verdicts, most recently used last
+        self._cache: OrderedDict[str, LLMClassification] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self.cache_db_path = Path(cache_db_path) if cache_db_path else None
+        self._pool: ConnectionPool | None = None
+        if self.cache_db_path is not None:
+            # Imported lazily: portal.core imports portal.routing at package load
+            from portal.core import db
+
+            self.cache_db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._pool = db.ConnectionPool(self.cache_db_path)
+            self._init_db()
+
+    def _init_db(self) -> None:
+        assert self._pool is not None
+        conn = self._pool.get()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classifications (
+                key TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                reasoning TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        conn.commit()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client and the SQLite cache connection."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._pool is not None:
+            self._pool.close()
 
     async def is_available(self) -> bool:
         """Check if LLM classifier is available."""
@@ -90,9 +173,8 @@ Query: {query}"""
             return self._llm_available
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                resp = await client.get(f"{self.ollama_host}/api/tags")
-                self._llm_available = resp.status_code == 200
+            resp = await self._get_client().get(f"{self.ollama_host}/api/tags", timeout=5.0)
+            self._llm_available = resp.status_code == 200
         except Exception:
             self._llm_available = False
 
@@ -104,17 +186,102 @@ Query: {query}"""
         Classify a query using LLM.
 
         Falls back to TaskClassifier if LLM is unavailable.
-        Results are cached to avoid reclassifying identical prompts.
+        LLM results are cached by normalized query text; regex fallbacks and
+        unparseable model replies (GENERAL at low confidence) are not cached,
+        so the model is asked again next time.
         """
         if not await self.is_available():
             return self._fallback_to_regex(query)
 
+        key = self._cache_key(query)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._classify_uncached(key, query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._inflight.pop(k, None))
         try:
-            return await self._classify_with_llm(query)
+            return await asyncio.shield(task)
         except Exception as e:
             logger.warning("LLM classification failed: %s, falling back to regex", e)
             return self._fallback_to_regex(query)
 
+    async def _classify_uncached(self, key: str, query: str) -> LLMClassification:
+        """Consult the persistent cache, then the model; store the verdict in both."""
+        if self._pool is not None:
+            stored = await asyncio.to_thread(self._sync_db_get, key)
+            if stored is not None:
+                self.cache_hits += 1
+                self._cache_put(key, stored)
+                return stored
+
+        self.cache_misses += 1
+        result = await self._classify_with_llm(query)
+        if result is None:
+            # Not cached, so one bad reply is not replayed for the cache TTL
+            return LLMClassification(
+                category=LLMCategory.GENERAL,
+                confidence=UNPARSED_CONFIDENCE,
+                reasoning="unparsed_llm_reply",
+            )
+        self._cache_put(key, result)
+        if self._pool is not None:
+            try:
+                await asyncio.to_thread(self._sync_db_put, key, result)
+            except Exception as e:
+                logger.debug("Failed to persist classification: %s", e)
+        return result
+
+    def _cache_key(self, query: str) -> str:
+        normalized = normalize_query(query)
+        return hashlib.sha256(f"{self.model}\0{normalized}".encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> LLMClassification | None:
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: str, result: LLMClassification) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _sync_db_get(self, key: str) -> LLMClassification | None:
+        assert self._pool is not None
+        row = (
+            self._pool.get()
+            .execute(
+                "SELECT category, reasoning, created_at FROM classifications WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        if row is None or time.time() - row[2] > self.cache_ttl:
+            return None
+        try:
+            category = LLMCategory(row[0])
+        except ValueError:
+            return None
+        return LLMClassification(category=category, confidence=0.9, reasoning=row[1])
+
+    def _sync_db_put(self, key: str, result: LLMClassification) -> None:
+        assert self._pool is not None
+        conn = self._pool.get()
+        conn.execute(
+            "INSERT OR REPLACE INTO classifications (key, category, reasoning, created_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, result.category.value, result.reasoning, time.time()),
+        )
+        conn.commit()
+
     @lru_cache(maxsize=128)
     def _cached_classify(self, query: str) -> TaskClassification:
         """Synchronous fallback using regex classifier."""
@@ -151,21 +318,20 @@ Query: {query}"""
             reasoning="regex_fallback",
         )
 
-    async def _classify_with_llm(self, query: str) -> LLMClassification:
-        """Classify using the LLM."""
+    async def _classify_with_llm(self, query: str) -> LLMClassification | None:
+        """Classify using the LLM; None if its reply is not a category."""
         prompt = self.CLASSIFY_PROMPT.format(query=query)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.post(
-                f"{self.ollama_host}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                },
-            )
-            resp.raise_for_status()
-            result = resp.json()
+        resp = await self._get_client().post(
+            f"{self.ollama_host}/api/generate",
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False,
+            },
+        )
+        resp.raise_for_status()
+        result = resp.json()
 
         response_text = result.get("response", "").strip().lower()
 
@@ -173,9 +339,8 @@ Query: {query}"""
         try:
             category = LLMCategory(response_text)
         except ValueError:
-            # Default to general if response is unexpected
-            category = LLMCategory.GENERAL
             logger.debug("Unexpected LLM response: %s, defaulting to general", response_text)
+            return None
 
         return LLMClassification(
             category=category,
@@ -187,8 +352,13 @@ Query: {query}"""
 def create_classifier(
     ollama_host: str | None = None,
     model: str | None = None,
+    cache_db_path: str | Path | None = None,
 ) -> LLMClassifier:
-    """Factory function to create an LLMClassifier with config from settings."""
+    """Factory function to create an LLMClassifier with config from settings.
+
+    The persistent verdict cache is enabled when *cache_db_path* or the
+    ``ROUTING_CLASSIFIER_CACHE_DB`` environment variable is set.
+    """
     import os
 
     _default_host = "http://localhost:11434"
@@ -205,4 +375,6 @@ def create_classifier(
         else os.getenv("ROUTING_LLM_MODEL", _default_model) or _default_model
     )
 
-    return LLMClassifier(ollama_host=host, model=classifier_model)
+    cache_path = cache_db_path or os.getenv("ROUTING_CLASSIFIER_CACHE_DB") or None
+
+    return LLMClassifier(ollama_host=host, model=classifier_model, cache_db_path=cache_path)
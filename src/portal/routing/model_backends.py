@@ -26,6 +26,18 @@ class GenerationResult:
     success: bool
     error: str | None = None
     tool_calls: list | None = None  # Parsed tool-call entries from the LLM response
+    ttft_ms: float | None = None  # Load + prompt processing time, when the backend reports it
+
+
+@dataclass
+class ToolCallChunk:
+    """Tool calls parsed from a streaming response.
+
+    Yielded by ``generate_stream()`` alongside text tokens, only when the
+    caller passed ``tools``; plain streams stay ``str``-only.
+    """
+
+    tool_calls: list[dict[str, Any]]
 
 
 class ModelBackend(ABC):
@@ -67,8 +79,8 @@ class ModelBackend(ABC):
         temperature: float = 0.7,
         messages: list[dict[str, Any]] | None = None,
         tools: list[dict[str, Any]] | None = None,
-    ) -> AsyncIterator[str]:
-        """Stream text generation"""
+    ) -> AsyncIterator[str | ToolCallChunk]:
+        """Stream text generation; may yield ToolCallChunk when *tools* are given"""
         ...
 
     @abstractmethod
@@ -194,6 +206,8 @@ class OllamaBackend(BaseHTTPBackend):
             status, data = await self._post_json("/api/chat", payload)
             if status == 200:
                 msg = data.get("message", {})
+                # Ollama reports durations in nanoseconds
+                prefill_ns = data.get("load_duration", 0) + data.get("prompt_eval_duration", 0)
                 return GenerationResult(
                     text=msg.get("content", ""),
                     tokens_generated=data.get("eval_count", 0),
@@ -201,6 +215,7 @@ class OllamaBackend(BaseHTTPBackend):
                     model_id=model_name,
                     success=True,
                     tool_calls=self._normalize_tool_calls(msg.get("tool_calls")),
+                    ttft_ms=prefill_ns / 1e6 if prefill_ns else None,
                 )
             return self._error_result(model_name, start_time, f"HTTP {status}: {data}")
         except Exception as e:
@@ -216,8 +231,13 @@ class OllamaBackend(BaseHTTPBackend):
         temperature: float = 0.7,
         messages: list[dict[str, Any]] | None = None,
         tools: list[dict[str, Any]] | None = None,
-    ) -> AsyncGenerator[str, None]:
-        """Stream generation from Ollama /api/chat."""
+    ) -> AsyncGenerator[str | ToolCallChunk, None]:
+        """Stream generation from Ollama /api/chat.
+
+        Text is yielded as soon as each NDJSON line arrives.  When *tools* are
+        offered, tool calls found in the stream are yielded as ToolCallChunk so
+        the caller can dispatch them without a separate non-streaming request.
+        """
         try:
             payload = {
                 "model": model_name,
@@ -230,11 +250,16 @@ class OllamaBackend(BaseHTTPBackend):
             async for line in self._stream_content("/api/chat", payload):
                 try:
                     data = json.loads(line)
-                    content = data.get("message", {}).get("content", "")
-                    if content:
-                        yield content
                 except json.JSONDecodeError:
                     continue
+                message = data.get("message", {})
+                content = message.get("content", "")
+                if content:
+                    yield content
+                if tools:
+                    tool_calls = self._normalize_tool_calls(message.get("tool_calls"))
+                    if tool_calls:
+                        yield ToolCallChunk(tool_calls=tool_calls)
         except (httpx.HTTPError, json.JSONDecodeError, TimeoutError) as e:
             logger.error("Stream error from Ollama: %s", e, exc_info=True)
             raise
@@ -312,7 +337,7 @@ class MLXServerBackend(BaseHTTPBackend):
         temperature: float = 0.7,
         messages: list[dict[str, Any]] | None = None,
         tools: list[dict[str, Any]] | None = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[str | ToolCallChunk, None]:
         """Stream generation from MLX-LM server /v1/chat/completions."""
         try:
             payload = {
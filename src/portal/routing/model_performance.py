@@ -0,0 +1,231 @@
+"""Model Performance Tracker — live latency, throughput and error estimates for routing."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .model_registry import ModelMetadata, SpeedClass
+
+logger = logging.getLogger(__name__)
+
+# Output length used to turn TTFT + tokens/sec into one expected-latency figure
+REFERENCE_TOKENS = 256
+
+# Throughput assumed for a model with no observations and no tokens_per_second
+_SPEED_CLASS_TPS = {
+    SpeedClass.ULTRA_FAST: 120.0,
+    SpeedClass.FAST: 60.0,
+    SpeedClass.MEDIUM: 30.0,
+    SpeedClass.SLOW: 15.0,
+    SpeedClass.VERY_SLOW: 6.0,
+}
+_DEFAULT_TTFT_S = 0.5
+
+# A backend's TTFT baseline moves this many times slower than its live estimate
+_BASELINE_SLOWDOWN = 10
+
+
+@dataclass
+class DecayingAverage:
+    """Exponentially weighted average whose memory fades with time.
+
+    A new sample gets weight ``1 - 0.5 ** (elapsed / half_life)`` (at least
+    *min_weight*), so a burst of requests averages smoothly while a sample
+    arriving after a long quiet period mostly replaces the old estimate.
+    """
+
+    half_life: float
+    min_weight: float = 0.1
+    value: float | None = None
+    updated_at: float = 0.0
+
+    def update(self, sample: float, now: float) -> None:
+        if self.value is None:
+            self.value = sample
+        else:
+            elapsed = max(now - self.updated_at, 0.0)
+            weight = max(1 - 0.5 ** (elapsed / self.half_life), self.min_weight)
+            self.value += weight * (sample - self.value)
+        self.updated_at = now
+
+
+@dataclass
+class PerformanceStats:
+    """Decayed estimates for one model or backend."""
+
+    half_life: float
+    ttft: DecayingAverage = field(init=False)  # seconds to first token
+    tokens_per_second: DecayingAverage = field(init=False)
+    errors: DecayingAverage = field(init=False)  # 1.0 per failure, 0.0 per success
+    samples: int = 0
+
+    def __post_init__(self) -> None:
+        self.ttft = DecayingAverage(self.half_life)
+        self.tokens_per_second = DecayingAverage(self.half_life)
+        self.errors = DecayingAverage(self.half_life, min_weight=0.2)
+
+    def error_rate(self, now: float) -> float:
+        """Current error rate, fading toward zero while no requests are made.
+
+        Without the fade a backend that was shed would never receive the
+        traffic needed to show it has recovered.
+        """
+        if self.errors.value is None:
+            return 0.0
+        idle = max(now - self.errors.updated_at, 0.0)
+        return self.errors.value * 0.5 ** (idle / self.half_life)
+
+
+class ModelPerformanceTracker:
+    """Live per-model and per-backend performance, fed by ExecutionEngine.
+
+    Estimates decay with *half_life* seconds, so routing follows what the
+    hardware does now rather than the static ``ModelMetadata`` figures. Until a
+    model has *min_samples* observations its static figures are used instead.
+
+    A backend is *degraded* when its error rate reaches *shed_error_rate* or
+    its TTFT climbs to *degraded_ttft_ratio* times its slow-moving baseline;
+    the router sheds load away from degraded backends while alternatives exist.
+    """
+
+    def __init__(
+        self,
+        half_life: float = 300.0,
+        min_samples: int = 3,
+        shed_error_rate: float = 0.5,
+        degraded_ttft_ratio: float = 3.0,
+    ) -> None:
+        self.half_life = max(half_life, 1.0)
+        self.min_samples = max(min_samples, 1)
+        self.shed_error_rate = shed_error_rate
+        self.degraded_ttft_ratio = degraded_ttft_ratio
+        self._models: dict[str, PerformanceStats] = {}
+        self._backends: dict[str, PerformanceStats] = {}
+        self._baselines: dict[str, DecayingAverage] = {}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record_success(
+        self,
+        model_id: str,
+        backend: str,
+        duration_ms: float,
+        tokens: int,
+        ttft_ms: float | None = None,
+    ) -> None:
+        """Record a completed generation.
+
+        *ttft_ms* is the time to the first token when known (streaming, or a
+        backend that reports prompt-processing time); throughput is measured
+        over the remaining generation time.
+        """
+        now = time.monotonic()
+        ttft_s = ttft_ms / 1000 if ttft_ms is not None else None
+        generation_s = (duration_ms - (ttft_ms or 0.0)) / 1000
+        tps = tokens / generation_s if tokens > 0 and generation_s > 0 else None
+        for stats in (self._model(model_id), self._backend(backend)):
+            stats.samples += 1
+            stats.errors.update(0.0, now)
+            if ttft_s is not None:
+                stats.ttft.update(ttft_s, now)
+            if tps is not None:
+                stats.tokens_per_second.update(tps, now)
+        if ttft_s is not None:
+            baseline = self._baselines.setdefault(
+                backend, DecayingAverage(self.half_life * _BASELINE_SLOWDOWN, min_weight=0.02)
+            )
+            baseline.update(ttft_s, now)
+
+    def record_failure(self, model_id: str, backend: str) -> None:
+        """Record a failed or timed-out generation."""
+        now = time.monotonic()
+        for stats in (self._model(model_id), self._backend(backend)):
+            stats.samples += 1
+            stats.errors.update(1.0, now)
+
+    def _model(self, model_id: str) -> PerformanceStats:
+        return self._models.setdefault(model_id, PerformanceStats(self.half_life))
+
+    def _backend(self, backend: str) -> PerformanceStats:
+        return self._backends.setdefault(backend, PerformanceStats(self.half_life))
+
+    # ------------------------------------------------------------------
+    # Queries used by IntelligentRouter
+    # ------------------------------------------------------------------
+
+    def has_observations(self, model_id: str) -> bool:
+        stats = self._models.get(model_id)
+        return stats is not None and stats.samples >= self.min_samples
+
+    def error_rate(self, model_id: str) -> float:
+        stats = self._models.get(model_id)
+        if stats is None or stats.samples < self.min_samples:
+            return 0.0
+        return stats.error_rate(time.monotonic())
+
+    def expected_latency(self, model: ModelMetadata) -> float:
+        """Seconds to produce a reference-length reply, penalized by error rate.
+
+        Uses observed TTFT and tokens/sec when available, otherwise the
+        model's static ``tokens_per_second`` or its speed class.
+        """
+        stats = self._models.get(model.model_id)
+        tps = ttft = None
+        if stats is not None and stats.samples >= self.min_samples:
+            tps, ttft = stats.tokens_per_second.value, stats.ttft.value
+        if tps is None:
+            tps = float(model.tokens_per_second or _SPEED_CLASS_TPS[model.speed_class])
+        if ttft is None:
+            ttft = _DEFAULT_TTFT_S
+        latency = ttft + REFERENCE_TOKENS / max(tps, 0.1)
+        # A request that fails costs a retry elsewhere; 90% errors ≈ 10x latency
+        return latency / max(1.0 - self.error_rate(model.model_id), 0.1)
+
+    def is_degraded(self, backend: str) -> bool:
+        """True if *backend* is failing or markedly slower than its baseline."""
+        stats = self._backends.get(backend)
+        if stats is None or stats.samples < self.min_samples:
+            return False
+        now = time.monotonic()
+        if stats.error_rate(now) >= self.shed_error_rate:
+            return True
+        # Slow TTFT only counts while recent, so a shed backend gets retried
+        baseline = self._baselines.get(backend)
+        return bool(
+            baseline
+            and baseline.value
+            and stats.ttft.value is not None
+            and now - stats.ttft.updated_at < self.half_life
+            and stats.ttft.value >= baseline.value * self.degraded_ttft_ratio
+        )
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Current estimates for every model and backend seen so far."""
+        now = time.monotonic()
+
+        def describe(stats: PerformanceStats) -> dict[str, Any]:
+            return {
+                "samples": stats.samples,
+                "ttft_ms": _ms(stats.ttft.value),
+                "tokens_per_second": _round(stats.tokens_per_second.value),
+                "error_rate": round(stats.error_rate(now), 3),
+            }
+
+        return {
+            "models": {m: describe(s) for m, s in self._models.items()},
+            "backends": {
+                b: {**describe(s), "degraded": self.is_degraded(b)}
+                for b, s in self._backends.items()
+            },
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
@@ -6,11 +6,15 @@ import logging
 import os
 import re
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
 import httpx
 from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from portal import __version__
 from portal.routing.llm_classifier import create_classifier
@@ -68,12 +72,50 @@ for rule in sorted(RULES.get("regex_rules", []), key=lambda r: -r.get("priority"
     patterns = [re.compile(k) for k in rule.get("keywords", [])]
     _compiled_rules.append((rule.get("priority", 0), rule["name"], patterns, rule["model"]))
 
+# Upstream transport — one pooled keep-alive client for the process lifetime
+_UPSTREAM_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+_UPSTREAM_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("ROUTER_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("ROUTER_MAX_KEEPALIVE", "20")),
+    keepalive_expiry=30.0,
+)
+_REWRITE_PATHS = ("api/chat", "api/generate")
+_STREAM_PATHS = ("api/chat", "api/generate", "v1/chat/completions")
+# Hop-by-hop / framing headers that must not be copied between connections
+_SKIP_REQUEST_HEADERS = frozenset({"host", "content-length", "connection", "transfer-encoding"})
+_SKIP_RESPONSE_HEADERS = frozenset({"content-length", "connection", "transfer-encoding"})
+
+_upstream: httpx.AsyncClient | None = None
+
+
+def _get_upstream() -> httpx.AsyncClient:
+    """Return the shared upstream client, creating it on first use."""
+    global _upstream
+    if _upstream is None or _upstream.is_closed:
+        _upstream = httpx.AsyncClient(timeout=_UPSTREAM_TIMEOUT, limits=_UPSTREAM_LIMITS)
+    return _upstream
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    global _upstream
+    _get_upstream()
+    try:
+        yield
+    finally:
+        if _upstream is not None:
+            await _upstream.aclose()
+            _upstream = None
+        await _llm_classifier.close()
+
+
 app = FastAPI(
     title="Portal Model Router",
     version="1.0.0",
     description="Intelligent Ollama proxy with workspace routing",
     docs_url="/docs",
     redoc_url=None,
+    lifespan=_lifespan,
 )
 
 
@@ -151,16 +193,15 @@ async def resolve_model(requested_model: str, messages: list[dict]) -> tuple[str
 async def health() -> dict:
     """Health check — verify Ollama connectivity."""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(f"{OLLAMA_HOST}/api/tags")
-            models = resp.json().get("models", [])
-            return {
-                "status": "ok",
-                "ollama": "ok",
-                "model_count": len(models),
-                "default_model": DEFAULT_MODEL,
-                "version": __version__,
-            }
+        resp = await _get_upstream().get(f"{OLLAMA_HOST}/api/tags", timeout=5.0)
+        models = resp.json().get("models", [])
+        return {
+            "status": "ok",
+            "ollama": "ok",
+            "model_count": len(models),
+            "default_model": DEFAULT_MODEL,
+            "version": __version__,
+        }
     except Exception as e:
         return {
             "status": "degraded",
@@ -189,9 +230,8 @@ async def dry_run(request: Request) -> dict:
 async def list_tags() -> dict:
     """Return Ollama models augmented with virtual workspace names."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(f"{OLLAMA_HOST}/api/tags")
-            data = resp.json()
+        resp = await _get_upstream().get(f"{OLLAMA_HOST}/api/tags", timeout=10.0)
+        data = resp.json()
     except Exception as e:
         logger.warning("Could not fetch Ollama tags: %s", e)
         data = {"models": []}
@@ -200,6 +240,8 @@ async def list_tags() -> dict:
 
     # Add virtual workspace models
     for ws_name, ws_config in RULES.get("workspaces", {}).items():
+        if not isinstance(ws_config, dict):
+            continue  # "_comment_*" annotations in router_rules.json
         virtual = {
             "name": ws_name,
             "model": ws_name,
@@ -218,17 +260,40 @@ async def list_tags() -> dict:
     return {"models": real_models}
 
 
-async def _proxy_stream(
-    method: str,
-    url: str,
-    headers: dict,
-    body: bytes,
-):
-    """Stream response from Ollama back to client."""
-    async with httpx.AsyncClient(timeout=httpx.Timeout(300.0, connect=10.0)) as client:
-        async with client.stream(method, url, headers=headers, content=body) as resp:
-            async for chunk in resp.aiter_bytes():
-                yield chunk
+def _parse_payload(body: bytes) -> dict[str, Any] | None:
+    """Decode *body* once; return the JSON object or None if it is not one."""
+    try:
+        payload = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logger.debug("Payload rewrite skipped — JSON parse error: %s", e)
+        return None
+    if not isinstance(payload, dict):
+        logger.debug("Payload rewrite skipped — payload must be a JSON object")
+        return None
+    return payload
+
+
+async def _rewrite_model(payload: dict[str, Any]) -> bool:
+    """Resolve the routed model into *payload*; return True if it changed."""
+    messages = payload.get("messages") or []
+    if not messages:
+        # generate endpoint uses "prompt" not "messages"
+        messages = [{"role": "user", "content": payload.get("prompt", "")}]
+    requested = payload.get("model", "auto")
+    try:
+        resolved_model, reason = await resolve_model(requested, messages)
+    except (KeyError, TypeError, AttributeError) as e:
+        logger.debug("Payload rewrite skipped — unexpected payload structure: %s", e)
+        return False
+    logger.debug("Routing %r → %r (%s)", requested, resolved_model, reason)
+    if resolved_model == requested:
+        return False
+    payload["model"] = resolved_model
+    return True
+
+
+def _response_headers(resp: httpx.Response) -> dict[str, str]:
+    return {k: v for k, v in resp.headers.items() if k.lower() not in _SKIP_RESPONSE_HEADERS}
 
 
 @app.api_route(
@@ -240,64 +305,42 @@ async def proxy(request: Request, path: str) -> Response:
     """
     Catch-all proxy — forward all Ollama API calls.
     Rewrites model field in chat/generate endpoints before forwarding.
+
+    The body is parsed at most once; the same payload drives routing and the
+    streaming decision, and is only re-encoded if the model was rewritten.
+    Streamed responses are relayed as raw upstream bytes without re-framing.
     """
     body = await request.body()
-    headers = {
-        k: v for k, v in request.headers.items() if k.lower() not in ("host", "content-length")
-    }
+    headers = {k: v for k, v in request.headers.items() if k.lower() not in _SKIP_REQUEST_HEADERS}
 
-    # Rewrite model in chat/generate requests
-    resolved_model = None
-    if path in ("api/chat", "api/generate") and body:
-        try:
-            payload = json.loads(body)
-            if not isinstance(payload, dict):
-                raise TypeError("payload must be a JSON object, not an array or scalar")
-            messages = payload.get("messages", [])
-            if not messages:
-                # generate endpoint uses "prompt" not "messages"
-                messages = [{"role": "user", "content": payload.get("prompt", "")}]
-            requested = payload.get("model", "auto")
-            resolved_model, reason = await resolve_model(requested, messages)
-            payload["model"] = resolved_model
-            body = json.dumps(payload).encode()
-            headers["content-length"] = str(len(body))
-            logger.debug("Routing %r → %r (%s)", requested, resolved_model, reason)
-        except json.JSONDecodeError as _e:
-            logger.debug("Payload rewrite skipped — JSON parse error: %s", _e)
-        except (KeyError, TypeError) as _e:
-            logger.debug("Payload rewrite skipped — unexpected payload structure: %s", _e)
+    payload = _parse_payload(body) if body and path in _STREAM_PATHS else None
+    if payload is not None and path in _REWRITE_PATHS and await _rewrite_model(payload):
+        body = json.dumps(payload, separators=(",", ":")).encode()
 
     target_url = f"{OLLAMA_HOST}/{path}"
     if request.url.query:
         target_url += f"?{request.url.query}"
 
-    # Check if client wants streaming
-    is_stream = False
-    if body:
-        try:
-            payload = json.loads(body)
-            if isinstance(payload, dict):
-                is_stream = payload.get("stream", True)  # Ollama defaults to streaming
-        except (json.JSONDecodeError, TypeError):
-            pass
+    client = _get_upstream()
+    upstream_request = client.build_request(
+        request.method, target_url, headers=headers, content=body
+    )
 
-    if is_stream and path in ("api/chat", "api/generate", "v1/chat/completions"):
+    # Ollama defaults to streaming when "stream" is omitted
+    if payload is not None and payload.get("stream", True):
+        resp = await client.send(upstream_request, stream=True)
         return StreamingResponse(
-            _proxy_stream(request.method, target_url, headers, body),
-            media_type="application/x-ndjson",
-        )
-
-    # Non-streaming
-    async with httpx.AsyncClient(timeout=httpx.Timeout(300.0, connect=10.0)) as client:
-        resp = await client.request(
-            request.method,
-            target_url,
-            headers=headers,
-            content=body,
-        )
-        return Response(
-            content=resp.content,
+            resp.aiter_raw(),
             status_code=resp.status_code,
-            headers=dict(resp.headers),
+            headers=_response_headers(resp),
+            media_type=resp.headers.get("content-type", "application/x-ndjson"),
+            background=BackgroundTask(resp.aclose),
         )
+
+    # Non-streaming — relay the raw body so content-encoding stays consistent
+    resp = await client.send(upstream_request, stream=True)
+    try:
+        content = b"".join([chunk async for chunk in resp.aiter_raw()])
+    finally:
+        await resp.aclose()
+    return Response(content=content, status_code=resp.status_code, headers=_response_headers(resp))
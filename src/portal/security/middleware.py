@@ -12,6 +12,7 @@ from typing import Any
 
 from portal.core.exceptions import PolicyViolationError, RateLimitError, ValidationError
 from portal.core.structured_logger import get_logger
+from portal.routing.workspace_registry import WorkspaceRegistry
 from portal.security.input_sanitizer import InputSanitizer
 from portal.security.rate_limiter import RateLimiter
 
@@ -56,6 +57,7 @@ class SecurityMiddleware:
         enable_rate_limiting: bool = True,
         enable_input_sanitization: bool = True,
         max_message_length: int = 10000,
+        workspace_registry: WorkspaceRegistry | None = None,
     ):
         """
         Initialize security middleware
@@ -66,6 +68,8 @@ class SecurityMiddleware:
             input_sanitizer: Input sanitizer instance (creates default if None)
             enable_rate_limiting: Enable rate limiting
             enable_input_sanitization: Enable input sanitization
+            workspace_registry: Source of per-workspace ``rate_limit`` overrides
+                (defaults to the one configured on the agent's router)
         """
         self.agent_core = agent_core
         self.rate_limiter = rate_limiter or RateLimiter()
@@ -73,6 +77,13 @@ class SecurityMiddleware:
         self.enable_rate_limiting = enable_rate_limiting
         self.enable_input_sanitization = enable_input_sanitization
         self.max_message_length = max_message_length
+        if workspace_registry is None:
+            workspace_registry = getattr(
+                getattr(agent_core, "router", None), "workspace_registry", None
+            )
+        self.workspace_registry = (
+            workspace_registry if isinstance(workspace_registry, WorkspaceRegistry) else None
+        )
 
         logger.info(
             "SecurityMiddleware initialized",
@@ -123,7 +134,7 @@ class SecurityMiddleware:
         # Always apply rate limiting - derive key from user_id, ip_address, chat_id, or use "anonymous"
         if self.enable_rate_limiting:
             rate_limit_key = user_id or ip_address or chat_id or "anonymous"
-            await self._check_rate_limit(rate_limit_key, sec_ctx)
+            await self._check_rate_limit(rate_limit_key, sec_ctx, workspace_id)
 
         # Step 2: Input sanitization
         if self.enable_input_sanitization:
@@ -162,18 +173,44 @@ class SecurityMiddleware:
 
         return result
 
-    async def _check_rate_limit(self, user_id: str, sec_ctx: SecurityContext) -> None:
+    async def check_rate_limit(
+        self, user_id: str, workspace_id: str | None = None
+    ) -> tuple[bool, str | None]:
+        """
+        Check *user_id* against the rate limit that applies to *workspace_id*.
+
+        A workspace whose ACL declares ``rate_limit`` (requests per minute) gets
+        its own per-user bucket with that limit; otherwise the global limit applies.
+
+        Returns:
+            (is_allowed, error_message)
+        """
+        ws_limit = (
+            self.workspace_registry.get_rate_limit(workspace_id)
+            if workspace_id and self.workspace_registry
+            else None
+        )
+        if ws_limit:
+            return await self.rate_limiter.check_limit(
+                user_id, limit=ws_limit, window=60, scope=workspace_id
+            )
+        return await self.rate_limiter.check_limit(user_id)
+
+    async def _check_rate_limit(
+        self, user_id: str, sec_ctx: SecurityContext, workspace_id: str | None = None
+    ) -> None:
         """
         Check rate limiting
 
         Args:
             user_id: User identifier
             sec_ctx: Security context
+            workspace_id: Workspace whose ACL may override the limit
 
         Raises:
             RateLimitError: If rate limit exceeded
         """
-        allowed, error_msg = await self.rate_limiter.check_limit(user_id)
+        allowed, error_msg = await self.check_rate_limit(user_id, workspace_id)
 
         if not allowed:
             logger.warning(
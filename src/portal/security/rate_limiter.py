@@ -1,94 +1,165 @@
-"""Rate Limiter — per-user sliding-window rate limiting with persistence."""
+"""Rate Limiter — per-user GCRA (token bucket) rate limiting with persistence."""
 
 import asyncio
 import atexit
 import json
 import logging
+import math
 import os
-import shutil
-import tempfile
+import sqlite3
+import threading
 import time
-from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_SHARDS = 16
+
+
+@dataclass
+class _Bucket:
+    """GCRA state: the theoretical arrival time of the next conforming request."""
+
+    tat: float
+    violations: int = 0
+    total: int = 0
+
+
+class _Shard:
+    """One lock stripe of the bucket map, with its own dirty set."""
+
+    __slots__ = ("lock", "buckets", "dirty", "sweep_at")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.buckets: dict[str, _Bucket] = {}
+        self.dirty: set[str] = set()
+        self.sweep_at = 64
+
 
 class RateLimiter:
-    """Per-user sliding-window rate limiter. Persists state to prevent restart-bypass attacks."""
+    """Per-user rate limiter using the generic cell rate algorithm (GCRA).
+
+    Each key stores one timestamp (the theoretical arrival time, TAT), so a
+    check is O(1) regardless of how many users are tracked: a request is
+    allowed while ``TAT + interval - now <= window``, where
+    ``interval = window / max_requests``. This is equivalent to a token bucket
+    of ``max_requests`` tokens refilled continuously over ``window`` seconds.
+
+    Buckets are spread over lock-striped shards. A bucket whose TAT has passed
+    is full again; such buckets are dropped lazily, when their shard has
+    doubled in size since its last sweep. Only buckets changed since the last
+    flush are written to SQLite, so restarts cannot be used to bypass limits.
+    """
 
     def __init__(
-        self, max_requests: int = 30, window_seconds: int = 60, persist_path: Path | None = None
+        self,
+        max_requests: int = 30,
+        window_seconds: int = 60,
+        persist_path: Path | None = None,
+        shards: int = _DEFAULT_SHARDS,
     ):
         self.max_requests = max_requests
         self.window = window_seconds
-        self.requests: dict[str, list[float]] = defaultdict(list)
-        self.violations: dict[str, int] = defaultdict(int)
         self.persist_path = (
-            persist_path or Path(os.getenv("RATE_LIMIT_DATA_DIR", "data")) / "rate_limits.json"
+            persist_path or Path(os.getenv("RATE_LIMIT_DATA_DIR", "data")) / "rate_limits.db"
         )
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._reset_keys: set[str] = set()
+        self._persist_lock = threading.Lock()
         self._dirty = False
         self._last_save = time.time()
         self._save_interval = 5.0
         self._load_state()
         atexit.register(self._flush_if_dirty)
 
-    def _check_limit_sync(self, user_id: str) -> tuple[bool, str | None]:
-        """Synchronous core of rate limit check (called via asyncio.to_thread)."""
+    @staticmethod
+    def bucket_key(user_id: str, scope: str | None = None) -> str:
+        """Return the bucket key for *user_id*, namespaced by *scope* (e.g. a workspace)."""
+        return f"{scope}\x00{user_id}" if scope else user_id
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _check_limit_sync(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        window: float | None = None,
+        scope: str | None = None,
+    ) -> tuple[bool, str | None]:
+        """O(1) core of the rate limit check."""
         now = time.time()
-        user_requests = [t for t in self.requests[user_id] if now - t < self.window]
-        if len(user_requests) >= self.max_requests:
-            self.violations[user_id] += 1
-            wait_time = int(user_requests[0] + self.window - now)
-
-            logger.warning(
-                "Rate limit exceeded for user %s (%d/%d requests)",
-                user_id,
-                len(user_requests),
-                self.max_requests,
-            )
-
-            self._dirty = True
-            if now - self._last_save >= self._save_interval:
-                self._save_state()
-                self._last_save = now
-                self._dirty = False
-
-            return False, f"⏱️ Rate limit exceeded. Please wait {wait_time} seconds."
-
-        # Add current request
-        user_requests.append(now)
-        self.requests[user_id] = user_requests[-self.max_requests :]
-
-        # Evict expired users to prevent unbounded memory growth
-        self._evict_expired_users()
-
+        limit = limit or self.max_requests
+        window = window or self.window
+        interval = window / limit
+        key = self.bucket_key(user_id, scope)
+        shard = self._shard(key)
+
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            tat = max(bucket.tat, now) if bucket else now
+            new_tat = tat + interval
+            if new_tat - now > window:
+                bucket.violations += 1  # bucket is necessarily present when over the limit
+                shard.dirty.add(key)
+                self._dirty = True
+                wait_time = max(1, math.ceil(new_tat - window - now))
+                logger.warning(
+                    "Rate limit exceeded for user %s (%d requests per %ss)",
+                    key.replace("\x00", ":"),
+                    limit,
+                    window,
+                )
+                return False, f"⏱️ Rate limit exceeded. Please wait {wait_time} seconds."
+
+            if bucket is None:
+                bucket = shard.buckets[key] = _Bucket(tat=new_tat)
+                if len(shard.buckets) >= shard.sweep_at:
+                    self._sweep_shard(shard, now)
+            else:
+                bucket.tat = new_tat
+            bucket.total += 1
+            shard.dirty.add(key)
         self._dirty = True
-        if now - self._last_save >= self._save_interval:
-            self._save_state()
-            self._last_save = now
-            self._dirty = False
-
         return True, None
 
-    async def check_limit(self, user_id: str) -> tuple[bool, str | None]:
+    async def check_limit(
+        self,
+        user_id: str,
+        limit: int | None = None,
+        window: float | None = None,
+        scope: str | None = None,
+    ) -> tuple[bool, str | None]:
         """
         Check if user is within rate limit.
 
         Args:
-            user_id: Telegram user ID
+            user_id: User identifier
+            limit: Requests per window for this call (defaults to ``max_requests``)
+            window: Window length in seconds for this call (defaults to ``window``)
+            scope: Optional namespace (e.g. workspace ID) with its own bucket
 
         Returns:
             (is_allowed, error_message)
         """
-        return await asyncio.to_thread(self._check_limit_sync, user_id)
+        result = self._check_limit_sync(user_id, limit, window, scope)
+        if self._dirty and time.time() - self._last_save >= self._save_interval:
+            self._last_save = time.time()
+            await asyncio.to_thread(self._flush_if_dirty)
+        return result
 
     def reset_user(self, user_id: str) -> None:
         """Reset rate limit for specific user"""
-        self.requests[user_id] = []
-        self.violations[user_id] = 0
+        shard = self._shard(user_id)
+        with shard.lock:
+            shard.buckets.pop(user_id, None)
+            shard.dirty.discard(user_id)
+        with self._persist_lock:
+            self._reset_keys.add(user_id)
+        self._dirty = True
         self._flush_if_dirty()
-        self._save_state()
 
     def update_limits(self, max_requests: int, window_seconds: int) -> None:
         """Update rate limit parameters at runtime."""
@@ -101,100 +172,169 @@ class RateLimiter:
     def _flush_if_dirty(self) -> None:
         """Flush state to disk if there are pending changes."""
         if self._dirty:
-            self._save_state()
             self._dirty = False
+            self._save_state()
 
-    def get_stats(self, user_id: str) -> dict[str, int]:
+    def get_stats(self, user_id: str, scope: str | None = None) -> dict[str, int]:
         """Get statistics for a user"""
         now = time.time()
-        user_requests = self.requests[user_id]
-
-        recent_requests = [req for req in user_requests if now - req < self.window]
-
+        key = self.bucket_key(user_id, scope)
+        shard = self._shard(key)
+        interval = self.window / self.max_requests
+        with shard.lock:
+            bucket = shard.buckets.get(key)
+            tat = bucket.tat if bucket else now
+            total = bucket.total if bucket else 0
+            violations = bucket.violations if bucket else 0
+
+        # Requests still "counted" against the window
+        recent = min(self.max_requests, max(0, math.ceil((tat - now) / interval - 1e-9)))
         return {
-            "total_requests": len(user_requests),
-            "recent_requests": len(recent_requests),
-            "remaining": self.max_requests - len(recent_requests),
-            "violations": self.violations[user_id],
+            "total_requests": total,
+            "recent_requests": recent,
+            "remaining": self.max_requests - recent,
+            "violations": violations,
         }
 
-    def _evict_expired_users(self) -> None:
-        """Remove users whose last request is older than the window to bound map size."""
-        now = time.time()
-        for user_id in list(self.requests.keys()):
-            self.requests[user_id] = [
-                req for req in self.requests[user_id] if now - req < self.window
-            ]
-            if not self.requests[user_id]:
-                del self.requests[user_id]
+    @staticmethod
+    def _sweep_shard(shard: _Shard, now: float) -> None:
+        """Drop full (expired) buckets; caller holds ``shard.lock``.
+
+        Runs only when the shard has doubled since the last sweep, so the cost
+        is amortized O(1) per inserted bucket. Buckets with violations are kept
+        so ``get_stats`` still reports them.
+        """
+        expired = [k for k, b in shard.buckets.items() if b.tat <= now and not b.violations]
+        for k in expired:
+            del shard.buckets[k]
+        shard.sweep_at = max(64, 2 * len(shard.buckets))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.persist_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, tat REAL NOT NULL, "
+            "violations INTEGER NOT NULL DEFAULT 0, total INTEGER NOT NULL DEFAULT 0)"
+        )
+        return conn
 
     def _load_state(self) -> None:
         """
         Load rate limit state from disk.
         Prevents malicious users from bypassing limits via restart.
         """
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+                shard.dirty.clear()
+
+        legacy_json = self.persist_path.with_suffix(".json")
+        if legacy_json != self.persist_path and legacy_json.exists():
+            self._migrate_json_state(legacy_json)
+
         if not self.persist_path.exists():
             return
 
+        now = time.time()
         try:
-            with open(self.persist_path, encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Keep string keys (user_ids are stored as strings)
-            self.requests = defaultdict(list, {k: v for k, v in data.get("requests", {}).items()})
-            self.violations = defaultdict(
-                int, {k: v for k, v in data.get("violations", {}).items()}
-            )
-
-            # Clean up old requests outside the window
-            self._evict_expired_users()
-
-            logger.info("Loaded rate limit state for %s users", len(self.requests))
-
-        except json.JSONDecodeError as e:
-            logger.error("Failed to decode rate limit state (corrupt file): %s", e)
-            bak_path = self.persist_path.with_suffix(".json.bak")
+            conn = self._connect()
+            try:
+                # Full buckets without violations carry no state worth keeping
+                conn.execute("DELETE FROM buckets WHERE tat <= ? AND violations = 0", (now,))
+                conn.commit()
+                rows = conn.execute("SELECT key, tat, violations, total FROM buckets").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.DatabaseError as e:
+            logger.error("Failed to load rate limit state (corrupt file): %s", e)
+            bak_path = self.persist_path.with_suffix(self.persist_path.suffix + ".bak")
             try:
                 self.persist_path.rename(bak_path)
-                logger.warning("Renamed corrupt rate_limits.json to %s for inspection", bak_path)
+                logger.warning("Renamed corrupt rate limit store to %s for inspection", bak_path)
             except OSError as rename_err:
                 logger.error("Could not rename corrupt file: %s", rename_err)
-        except Exception as e:
-            logger.error("Failed to load rate limit state: %s", e)
+            return
 
-    def _save_state(self) -> None:
-        """
-        Save rate limit state to disk with atomic write.
-        Prevents data loss and ensures persistence across restarts.
-        """
-        try:
-            self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        for key, tat, violations, total in rows:
+            shard = self._shard(key)
+            shard.buckets[key] = _Bucket(tat=tat, violations=violations, total=total)
+        for shard in self._shards:
+            shard.sweep_at = max(64, 2 * len(shard.buckets))
+        logger.info("Loaded rate limit state for %s users", len(rows))
 
-            # Prepare data for serialization
-            data = {
-                "requests": {str(k): v for k, v in self.requests.items()},
-                "violations": {str(k): v for k, v in self.violations.items()},
-                "timestamp": time.time(),
-            }
+    def _migrate_json_state(self, legacy_path: Path) -> None:
+        """Replay a legacy sliding-window ``rate_limits.json`` into GCRA buckets."""
+        try:
+            with open(legacy_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Skipping unreadable legacy rate limit file %s: %s", legacy_path, e)
+            return
 
-            # Atomic write pattern (same as knowledge base)
-            temp_fd, temp_path = tempfile.mkstemp(
-                dir=self.persist_path.parent, prefix=".rate_limits_tmp_", suffix=".json"
-            )
+        now = time.time()
+        interval = self.window / self.max_requests
+        violations = data.get("violations", {})
+        for key, stamps in data.get("requests", {}).items():
+            tat = 0.0
+            for ts in sorted(t for t in stamps if now - t < self.window):
+                tat = max(tat, ts) + interval
+            if tat > now or violations.get(key):
+                shard = self._shard(key)
+                shard.buckets[key] = _Bucket(
+                    tat=tat, violations=violations.get(key, 0), total=len(stamps)
+                )
+                shard.dirty.add(key)
+        self._dirty = True
+        self._save_state()
+        legacy_path.rename(legacy_path.with_suffix(".json.migrated"))
+        logger.info("Migrated legacy rate limit state from %s", legacy_path)
 
+    def _save_state(self) -> None:
+        """
+        Write buckets changed since the last flush to SQLite in one transaction.
+        Unchanged buckets are never rewritten.
+        """
+        with self._persist_lock:
+            upserts = []
+            for shard in self._shards:
+                with shard.lock:
+                    for key in shard.dirty:
+                        b = shard.buckets.get(key)
+                        if b is not None:
+                            upserts.append((key, b.tat, b.violations, b.total))
+                    shard.dirty.clear()
+            resets = list(self._reset_keys)
+            self._reset_keys.clear()
+            if not upserts and not resets:
+                return
             try:
-                with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                    f.flush()
-                    os.fsync(f.fileno())
-
-                # Atomic rename
-                shutil.move(temp_path, self.persist_path)
-
-            except OSError:
-                if Path(temp_path).exists():
-                    Path(temp_path).unlink()
-                raise
-
-        except Exception as e:
-            logger.error("Failed to save rate limit state: %s", e)
+                conn = self._connect()
+                try:
+                    with conn:
+                        # Deletes first: a key reset and then hit again must survive
+                        conn.executemany(
+                            "DELETE FROM buckets WHERE key = ?", [(k,) for k in resets]
+                        )
+                        conn.executemany(
+                            "INSERT INTO buckets (key, tat, violations, total) VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat, "
+                            "violations = excluded.violations, total = excluded.total",
+                            upserts,
+                        )
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.error("Failed to save rate limit state: %s", e)
+                # Keep the changes queued for the next flush
+                self._reset_keys.update(resets)
+                for key, *_ in upserts:
+                    shard = self._shard(key)
+                    with shard.lock:
+                        shard.dirty.add(key)
+                self._dirty = True
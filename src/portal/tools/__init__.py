@@ -1,75 +1,172 @@
 """Tool Registry — auto-discovery and management of agent tools."""
 
 import importlib
+import importlib.util
 import inspect
 import logging
-import pkgutil
 from datetime import UTC, datetime
 from importlib import metadata as importlib_metadata
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from portal.tools.manifest import ToolManifest, ToolManifestEntry, metadata_to_dict
+
 if TYPE_CHECKING:
     from portal.core.interfaces.tool import BaseTool
 
 logger = logging.getLogger(__name__)
 
 
+class LazyTool:
+    """Manifest stand-in for a tool whose module has not been imported yet.
+
+    Exposes the indexed ``metadata``; ``execute()`` imports the real tool
+    through the registry first.
+    """
+
+    def __init__(self, entry: ToolManifestEntry, registry: "ToolRegistry") -> None:
+        self.entry = entry
+        self.metadata = entry.to_metadata()
+        self._registry = registry
+
+    async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        tool = self._registry.get_tool(self.entry.name)
+        if tool is None:
+            return {"success": False, "error": f"Tool {self.entry.name} failed to load"}
+        return await tool.execute(parameters)
+
+
 class ToolRegistry:
-    """Registry for discovering, validating, and managing agent tools."""
+    """Registry for discovering, validating, and managing agent tools.
+
+    Discovery reads tool metadata from a ToolManifest instead of importing
+    tool modules. With ``lazy`` (the default) each tool is imported on its
+    first ``get_tool()``; until then ``tools`` holds a LazyTool.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, manifest_path: str | Path | None = None, lazy: bool = True) -> None:
         self.tools: dict[str, Any] = {}
         self.failed_tools: list[dict[str, str]] = []
+        self.manifest_path = manifest_path
+        self.lazy = lazy
 
     def discover_and_load(self) -> tuple[int, int]:
-        """Auto-discover internal tools and entry-point plugins. Returns (loaded, failed)."""
+        """Index internal tools and entry-point plugins. Returns (loaded, failed).
+
+        ``loaded`` counts indexed tools, whether or not they have been imported.
+        """
+        manifest = ToolManifest(self.manifest_path)
         tools_dir = Path(__file__).parent
-        internal = self._discover_internal_tools(tools_dir)
-        plugins = self._discover_entry_point_tools()
+        internal = self._discover_internal_tools(tools_dir, manifest)
+        plugins = self._discover_entry_point_tools(manifest)
+        manifest.save()
         loaded, failed = internal[0] + plugins[0], internal[1] + plugins[1]
         logger.info(
-            "Tool registry: %s loaded (%s internal, %s plugins), %s failed",
+            "Tool registry: %s indexed (%s internal, %s plugins), %s failed, "
+            "%s/%s manifest files cached",
             loaded,
             internal[0],
             plugins[0],
             failed,
+            manifest.hits,
+            manifest.hits + manifest.misses,
         )
         if failed:
             logger.warning("Failed tools: %s", [t["module"] for t in self.failed_tools])
+        if not self.lazy:
+            for name in list(self.tools):
+                self.get_tool(name)
         return loaded, failed
 
-    def _discover_internal_tools(self, tools_dir: Path) -> tuple[int, int]:
-        """Walk pkgutil packages under tools_dir and register all BaseTool subclasses."""
-        from portal.core.interfaces.tool import BaseTool
-
+    def _discover_internal_tools(
+        self, tools_dir: Path, manifest: ToolManifest, prefix: str = "portal.tools."
+    ) -> tuple[int, int]:
+        """Index the BaseTool subclasses of every module under tools_dir."""
         loaded = failed = 0
-        for _importer, modname, ispkg in pkgutil.walk_packages(
-            path=[str(tools_dir)], prefix="portal.tools."
-        ):
-            if ispkg or modname.endswith(("__init__", "base_tool")):
+        for file in sorted(tools_dir.rglob("*.py")):
+            parts = file.relative_to(tools_dir).with_suffix("").parts
+            modname = prefix + ".".join(parts)
+            if modname.endswith(("__init__", "base_tool")):
                 continue
             try:
-                module = importlib.import_module(modname)
-                tool_classes = [
-                    (name, obj)
-                    for name, obj in inspect.getmembers(module, inspect.isclass)
-                    if issubclass(obj, BaseTool)
-                    and obj is not BaseTool
-                    and obj.__module__ == modname
-                ]
-                for class_name, tool_class in tool_classes:
-                    try:
-                        self._register_tool_instance(tool_class(), class_name, modname)
-                        loaded += 1
-                    except Exception as e:
-                        failed += 1
-                        self._record_failure(modname, class_name, e)
+                entries, unresolved = manifest.scan(file, modname)
             except Exception as e:
                 failed += 1
                 self._record_failure(modname, "unknown", e)
+                continue
+            for entry in entries:
+                self._index(entry)
+                loaded += 1
+            for class_name in unresolved:
+                outcome = self._import_unresolved(manifest, modname, class_name, modname)
+                if outcome:
+                    loaded += 1
+                elif outcome is False:
+                    failed += 1
         return loaded, failed
 
+    def _index(self, entry: ToolManifestEntry) -> None:
+        """Register *entry* lazily unless its tool was already imported."""
+        current = self.tools.get(entry.name)
+        if current is None or isinstance(current, LazyTool):
+            self.tools[entry.name] = LazyTool(entry, self)
+
+    def _import_unresolved(
+        self,
+        manifest: ToolManifest,
+        module: str,
+        class_name: str,
+        source: str,
+        required: bool = False,
+    ) -> bool | None:
+        """Import a class the manifest could not read, register it and record it.
+
+        Returns True if it was registered, False if loading failed, and None if
+        the class is not a concrete BaseTool subclass (a failure when *required*).
+        """
+        from portal.core.interfaces.tool import BaseTool
+
+        try:
+            tool_class = getattr(importlib.import_module(module), class_name)
+            is_tool = (
+                inspect.isclass(tool_class)
+                and issubclass(tool_class, BaseTool)
+                and not inspect.isabstract(tool_class)
+            )
+            if not is_tool:
+                if required:
+                    raise TypeError(f"{class_name} is not a valid BaseTool subclass")
+                manifest.resolve(module, None, class_name)
+                return None
+            tool = tool_class()
+            self._register_tool_instance(tool, class_name, source)
+        except Exception as e:
+            self._record_failure(source, class_name, e)
+            return False
+        entry = ToolManifestEntry(
+            tool.metadata.name, module, class_name, source, metadata_to_dict(tool.metadata)
+        )
+        manifest.resolve(module, entry, class_name)
+        return True
+
+    def _load(self, entry: ToolManifestEntry) -> "BaseTool | None":
+        """Import and instantiate an indexed tool; on failure it is unregistered."""
+        from portal.core.interfaces.tool import BaseTool
+
+        try:
+            tool_class = getattr(importlib.import_module(entry.module), entry.class_name)
+            if not (inspect.isclass(tool_class) and issubclass(tool_class, BaseTool)):
+                raise TypeError(f"{entry.class_name} is not a valid BaseTool subclass")
+            tool = tool_class()
+            self._register_tool_instance(tool, entry.class_name, entry.source)
+        except Exception as e:
+            self.tools.pop(entry.name, None)
+            self._record_failure(entry.source, entry.class_name, e)
+            return None
+        if tool.metadata.name != entry.name:
+            self.tools.pop(entry.name, None)
+        return tool
+
     def _record_failure(self, module: str, class_name: str, exc: Exception) -> None:
         """Append a failure entry and log it."""
         msg = f"{type(exc).__name__} loading {class_name} from {module}: {exc}"
@@ -129,35 +226,54 @@ class ToolRegistry:
                     "Non-ToolParameter at index %s in %s (%s)", idx, class_name, module_path
                 )
 
-    def _discover_entry_point_tools(self) -> tuple[int, int]:
-        """Discover and load external plugin tools via Python entry_points."""
+    def _discover_entry_point_tools(self, manifest: ToolManifest) -> tuple[int, int]:
+        """Index external plugin tools declared via Python entry_points.
+
+        The plugin module's source is located with ``find_spec`` (which imports
+        only its parent packages) and scanned like an internal module. Plugins
+        the scan cannot confirm (dynamic metadata, an intermediate base class,
+        a re-exported class) are imported immediately.
+        """
         loaded = failed = 0
         try:
             # Use modern API (Python 3.10+)
             plugin_eps = importlib_metadata.entry_points(group="portal.tools")
             if not plugin_eps:
                 return 0, 0
-            from portal.core.interfaces.tool import BaseTool
-
             logger.info("Found %s plugin tool(s) via entry_points", len(plugin_eps))
             for ep in plugin_eps:
+                source = f"plugin:{ep.value}"
                 try:
-                    tool_class = ep.load()
-                    if not (inspect.isclass(tool_class) and issubclass(tool_class, BaseTool)):
-                        raise TypeError(f"{ep.name} is not a valid BaseTool subclass")
-                    self._register_tool_instance(tool_class(), ep.name, f"plugin:{ep.value}")
-                    loaded += 1
+                    spec = importlib.util.find_spec(ep.module)
+                    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+                        raise ModuleNotFoundError(f"No Python source for {ep.module}")
+                    file = Path(spec.origin)
+                    entries, unresolved = manifest.scan(file, ep.module, source)
                 except Exception as e:
                     failed += 1
-                    self._record_failure(f"plugin:{ep.value}", ep.name, e)
+                    self._record_failure(source, ep.name, e)
+                    continue
+                entry = next((e for e in entries if e.class_name == ep.attr), None)
+                if entry is not None:
+                    self._index(entry)
+                    loaded += 1
+                elif self._import_unresolved(manifest, ep.module, ep.attr, source, required=True):
+                    loaded += 1
+                else:
+                    failed += 1
         except Exception as e:
             logger.error("Error discovering entry_points: %s", e)
         return loaded, failed
 
     def get_tool(self, name: str) -> "BaseTool | None":
-        return self.tools.get(name)
+        """Return the tool called *name*, importing it on first use."""
+        tool = self.tools.get(name)
+        if isinstance(tool, LazyTool):
+            return self._load(tool.entry)
+        return tool
 
     def get_all_tools(self) -> list[Any]:
+        """Return every registered tool; unimported ones are LazyTool stand-ins."""
         return list(self.tools.values())
 
     def get_tool_list(self) -> list[dict[str, Any]]:
@@ -173,6 +289,7 @@ class ToolRegistry:
                     "requires_confirmation": md.requires_confirmation,
                     "version": md.version,
                     "async_capable": md.async_capable,
+                    "execution_mode": md.execution_mode.value,
                 }
             )
         return result
@@ -183,6 +300,7 @@ class ToolRegistry:
         return {
             "status": status,
             "total_tools": len(self.tools),
+            "imported_tools": sum(not isinstance(t, LazyTool) for t in self.tools.values()),
             "failed_loads": len(self.failed_tools),
             "timestamp": datetime.now(tz=UTC).isoformat(),
         }
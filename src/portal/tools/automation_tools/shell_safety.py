@@ -1,7 +1,9 @@
 """Shell Safety Tool - Secure command execution"""
 
 import asyncio
+import os
 import re
+import signal
 from typing import Any
 
 from portal.core.interfaces.tool import BaseTool, ToolCategory, ToolMetadata, ToolParameter
@@ -97,13 +99,18 @@ class ShellSafetyTool(BaseTool):
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=working_dir,
+                start_new_session=os.name == "posix",  # own process group, killed as a whole
             )
 
             try:
                 stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
             except TimeoutError:
-                process.kill()
+                await self._kill(process)
                 return self._error_response(f"Command timed out after {timeout}s")
+            except asyncio.CancelledError:
+                # Caller gave up (e.g. runtime timeout): don't leave the command running
+                await self._kill(process)
+                raise
 
             return self._success_response(
                 {
@@ -117,6 +124,19 @@ class ShellSafetyTool(BaseTool):
         except Exception as e:
             return self._error_response(str(e))
 
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        """Kill *process* and everything it started, then reap it."""
+        if process.returncode is None:
+            try:
+                if os.name == "posix":
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except ProcessLookupError:
+                pass
+        await asyncio.shield(process.wait())
+
     def _analyze_command(self, command: str) -> dict[str, Any]:
         """Analyze command for safety"""
         result: dict[str, Any] = {
@@ -1,9 +1,15 @@
-"""CSV Analyzer Tool - Data analysis for CSV files"""
+"""CSV Analyzer Tool - Data analysis for CSV files
+
+Files are profiled in chunks by ``tabular.profile_file`` and the profile is
+cached, so large files use bounded memory and repeat questions are instant.
+XLSX workbooks are accepted as well (``sheet_name`` selects the sheet).
+"""
 
 import os
 from typing import Any
 
 from portal.core.interfaces.tool import BaseTool, ToolCategory
+from portal.tools.data_tools.tabular import ProfileCache, profile_file
 
 
 class CSVAnalyzerTool(BaseTool):
@@ -11,15 +17,17 @@ class CSVAnalyzerTool(BaseTool):
 
     METADATA = {
         "name": "csv_analyzer",
-        "description": "Analyze CSV files - statistics, summaries, and insights",
+        "description": "Analyze CSV (or XLSX) files - statistics, summaries, and insights",
         "category": ToolCategory.DATA,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "cpu",
+        "timeout": 900,
         "parameters": [
             {
                 "name": "file_path",
                 "param_type": "string",
-                "description": "Path to CSV file",
+                "description": "Path to CSV or XLSX file",
                 "required": True,
             },
             {
@@ -29,56 +37,70 @@ class CSVAnalyzerTool(BaseTool):
                 "required": False,
                 "default": "summary",
             },
+            {
+                "name": "sheet_name",
+                "param_type": "string",
+                "description": "Sheet to analyze when the file is XLSX (default: first sheet)",
+                "required": False,
+            },
         ],
         "examples": ["Analyze data.csv and show statistics"],
     }
 
+    def __init__(self, cache_db_path: str | None = None) -> None:
+        super().__init__()
+        self.cache_db_path = cache_db_path
+        self._cache: ProfileCache | None = None
+
     async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Analyze CSV file"""
         try:
-            import pandas as pd
-
             file_path = parameters.get("file_path", "")
             analysis_type = parameters.get("analysis_type", "summary").lower()
 
             if not os.path.exists(file_path):
                 return self._error_response(f"File not found: {file_path}")
 
-            # Load CSV
-            df = pd.read_csv(file_path)
+            if self._cache is None:
+                self._cache = ProfileCache(self.cache_db_path)
+            profile = profile_file(file_path, parameters.get("sheet_name"), cache=self._cache)
+            columns = profile["profiles"]
 
             result = {
                 "file": file_path,
-                "rows": len(df),
-                "columns": len(df.columns),
-                "column_names": list(df.columns),
+                "rows": profile["rows"],
+                "columns": profile["columns"],
+                "column_names": profile["column_names"],
             }
 
             if analysis_type == "head":
-                result["preview"] = df.head(10).to_string()
-            if analysis_type == "statistics":
-                result["statistics"] = df.describe().to_string()
+                result["preview"] = profile["preview"]
+                result["sample"] = profile["sample"]
+            if analysis_type in ("statistics", "describe"):
+                result["statistics"] = {
+                    name: col["numeric"] for name, col in columns.items() if "numeric" in col
+                }
             if analysis_type == "describe":
-                result["dtypes"] = df.dtypes.to_string()
-                result["null_counts"] = df.isnull().sum().to_string()
-                result["statistics"] = df.describe().to_string()
+                result["dtypes"] = {name: col["dtype"] for name, col in columns.items()}
+                result["null_counts"] = {name: col["nulls"] for name, col in columns.items()}
+                result["top_values"] = {
+                    name: col["top_values"] for name, col in columns.items() if col["top_values"]
+                }
             if analysis_type not in ("head", "statistics", "describe"):
-                result["dtypes"] = {col: str(dtype) for col, dtype in df.dtypes.items()}
-                result["null_counts"] = df.isnull().sum().to_dict()
-                numeric_cols = df.select_dtypes(include=["number"]).columns
-                if len(numeric_cols) > 0:
+                result["dtypes"] = {name: col["dtype"] for name, col in columns.items()}
+                result["null_counts"] = {name: col["nulls"] for name, col in columns.items()}
+                numeric = [
+                    (name, col["numeric"]) for name, col in columns.items() if "numeric" in col
+                ]
+                if numeric:
                     result["numeric_summary"] = {
-                        col: {
-                            "mean": float(df[col].mean()),
-                            "min": float(df[col].min()),
-                            "max": float(df[col].max()),
-                        }
-                        for col in numeric_cols[:5]
+                        name: {"mean": stats["mean"], "min": stats["min"], "max": stats["max"]}
+                        for name, stats in numeric[:5]
                     }
 
-            return self._success_response(result)
+            return self._success_response(result, cached=profile["cached"])
 
         except ImportError:
-            return self._error_response("pandas not installed. Run: pip install pandas")
+            return self._error_response("openpyxl not installed. Run: pip install openpyxl")
         except Exception as e:
             return self._error_response(str(e))
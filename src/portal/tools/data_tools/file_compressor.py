@@ -18,6 +18,7 @@ class FileCompressorTool(BaseTool):
         "category": ToolCategory.UTILITY,
         "version": "1.0.0",
         "requires_confirmation": True,
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "action",
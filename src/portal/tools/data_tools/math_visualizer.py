@@ -66,6 +66,7 @@ class MathVisualizerTool(BaseTool):
         "category": ToolCategory.DATA,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "cpu",
         "parameters": [
             {
                 "name": "expression",
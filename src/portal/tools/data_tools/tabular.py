@@ -0,0 +1,689 @@
+"""
+Tabular Profiling - streaming column statistics for CSV and XLSX files
+
+``TabularSource`` reads a CSV or XLSX sheet (openpyxl read-only mode) as a
+header plus chunks of rows, so a file is never held in memory. When pandas is
+installed, CSV files are parsed by ``pd.read_csv(chunksize=...)`` and each
+chunk's statistics are computed with vectorised column operations; otherwise,
+and for files pandas cannot parse (ragged rows), the stdlib ``csv`` reader is
+used. ``TableProfiler`` folds the chunks into per-column statistics that use
+bounded memory however many rows there are:
+
+- counts, nulls and inferred type
+- mean/std/min/max (Welford)
+- approximate quantiles (a KLL-style compacting sketch)
+- approximate top-k values (space-saving counters)
+- a head preview plus a reservoir sample of rows
+
+``profile_file()`` caches the resulting profile in SQLite, keyed by path, size
+and modification time, so repeat questions about an unchanged file are
+answered without reading it again.
+"""
+
+import csv
+import datetime
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from portal.core.db import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    import pandas as pd
+
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+DEFAULT_CHUNK_ROWS = 10_000
+DEFAULT_TOP_K = 10
+DEFAULT_PREVIEW_ROWS = 5
+DEFAULT_PROFILE_CACHE_DB = "data/tabular_profiles.db"
+DEFAULT_PROFILE_CACHE_MAX_AGE = 30 * 24 * 3600.0  # seconds
+PROFILE_VERSION = 1  # bump when the profile format changes to invalidate cached rows
+
+EXCEL_SUFFIXES = {".xlsx", ".xlsm"}
+CSV_DELIMITERS = (",", ";", "\t", "|")
+NULL_STRINGS = {"", "na", "n/a", "nan", "null", "none"}
+MAX_TEXT_LENGTH = 200  # longer values are truncated before counting/sampling
+
+
+# ---------------------------------------------------------------------------
+# Incremental statistics
+# ---------------------------------------------------------------------------
+
+
+class RunningStats:
+    """Count, mean, variance, min and max in one pass (Welford's algorithm)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: list[float]) -> None:
+        """Merge a batch of values."""
+        if not values:
+            return
+        n = len(values)
+        mean = sum(values) / n
+        m2 = sum((x - mean) ** 2 for x in values)
+        self.merge(n, mean, m2, min(values), max(values))
+
+    def merge(self, n: int, mean: float, m2: float, lo: float, hi: float) -> None:
+        """Merge a batch's moments (Chan et al.'s parallel form of Welford's update)."""
+        if not n:
+            return
+        total = self.count + n
+        delta = mean - self.mean
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (as pandas reports it)."""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class QuantileSketch:
+    """Approximate quantiles in O(k log(n/k)) memory.
+
+    Values go into level 0. When a level holds ``k`` items it is sorted and
+    every other item (from a random offset) moves up a level with double the
+    weight. Rank error is roughly ``1/k`` of the count.
+    """
+
+    def __init__(self, k: int = 256, seed: int = 0) -> None:
+        self.k = k
+        self.levels: list[list[float]] = [[]]
+        self.count = 0
+        self._rng = random.Random(seed)
+
+    def update(self, values: list[float]) -> None:
+        self.count += len(values)
+        self.levels[0].extend(values)
+        if len(self.levels[0]) >= self.k:
+            self._compact()
+
+    def _compact(self) -> None:
+        for height, level in enumerate(self.levels):
+            if len(level) < self.k:
+                break
+            level.sort()
+            promoted = level[self._rng.randint(0, 1) :: 2]
+            self.levels[height] = []
+            if height + 1 == len(self.levels):
+                self.levels.append([])
+            self.levels[height + 1].extend(promoted)
+
+    def quantiles(self, qs: list[float]) -> list[float | None]:
+        weighted = sorted(
+            (x, 1 << height) for height, level in enumerate(self.levels) for x in level
+        )
+        if not weighted:
+            return [None] * len(qs)
+        total = sum(w for _, w in weighted)
+        results: list[float | None] = []
+        for q in qs:
+            target, seen = q * total, 0
+            value = weighted[-1][0]
+            for x, w in weighted:
+                seen += w
+                if seen >= target:
+                    value = x
+                    break
+            results.append(value)
+        return results
+
+
+class TopK:
+    """Approximate most frequent values with at most ``2 * capacity`` counters.
+
+    Exact while a column has fewer than ``2 * capacity`` distinct values.
+    Beyond that, the least frequent counters are pruned. A value admitted
+    after a prune starts from ``error`` (space-saving), so a count may
+    overstate its value by up to ``error``.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.error = 0
+
+    def update(self, values: list[str]) -> None:
+        self.update_counts(Counter(values).items())
+
+    def update_counts(self, items: Iterable[tuple[str, int]], dropped: int = 0) -> None:
+        """Merge pre-aggregated ``(value, count)`` pairs.
+
+        *dropped* is the largest count among values the caller left out,
+        which widens the error bound accordingly.
+        """
+        counts = self.counts
+        for value, n in items:
+            counts[value] = counts.get(value, self.error) + n
+        self.error += dropped
+        if len(counts) > 2 * self.capacity:
+            kept = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+            self.error = max(self.error, kept[self.capacity][1])
+            self.counts = dict(kept[: self.capacity])
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:k]
+
+
+class ColumnProfile:
+    """Streaming statistics for one column."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.kinds: dict[str, int] = {}
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch()
+        self.top = TopK()
+
+    def update(self, values: tuple[Any, ...]) -> None:
+        """Fold one chunk of this column's values."""
+        self.rows += len(values)
+        kinds = self.kinds
+        numbers: list[float] = []
+        counted: list[str] = []
+        for value in values:
+            if value is None:
+                self.nulls += 1
+                continue
+            if isinstance(value, str):
+                text = value.strip()
+                if text.lower() in NULL_STRINGS:
+                    self.nulls += 1
+                    continue
+                kind, number = _classify_text(text)
+            else:
+                kind, number = _classify(value)
+                text = _text(value)
+            kinds[kind] = kinds.get(kind, 0) + 1
+            if number is not None:
+                numbers.append(number)
+            if kind != "float":  # continuous values rarely repeat; not worth counting
+                counted.append(text[:MAX_TEXT_LENGTH])
+        self.stats.update(numbers)
+        self.sketch.update(numbers)
+        self.top.update(counted)
+
+    def update_series(self, series: "pd.Series") -> None:
+        """Fold one chunk of this column parsed by pandas, using vectorised operations.
+
+        Numeric columns are classified from their parsed values: a float
+        chunk whose values are all whole numbers (an integer column with
+        gaps) counts as integers.
+        """
+        self.rows += len(series)
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(
+            series.dtype
+        ):
+            self._update_numeric(series)
+        else:
+            self._update_text(series)
+
+    def _update_numeric(self, series: "pd.Series") -> None:
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        missing = np.isnan(values)
+        finite = np.isfinite(values)
+        numbers = values[finite]
+        whole = (numbers == np.floor(numbers)) & (np.abs(numbers) < 2**53)
+        if not pd.api.types.is_integer_dtype(series.dtype) and not whole.all():
+            whole[:] = False
+        n_missing, n_whole = int(missing.sum()), int(whole.sum())
+        self.nulls += n_missing
+        for kind, n in (
+            ("integer", n_whole),
+            ("float", len(numbers) - n_whole),
+            ("text", len(values) - n_missing - len(numbers)),  # +/-inf, as in _classify
+        ):
+            if n:
+                self.kinds[kind] = self.kinds.get(kind, 0) + n
+        self._add_numbers(numbers)
+        if pd.api.types.is_integer_dtype(series.dtype):
+            counts = series.value_counts()
+        else:
+            counts = pd.Series(numbers[whole].astype(np.int64)).value_counts()
+        self._add_counts(zip(counts.index.tolist(), counts.tolist(), strict=True))
+
+    def _update_text(self, series: "pd.Series") -> None:
+        # Classify each distinct value once and weight it by its count
+        counts = series.value_counts()
+        self.nulls += len(series) - int(counts.sum())
+        numbers: list[float] = []
+        weights: list[int] = []
+        counted: list[tuple[str, int]] = []
+        for value, n in zip(counts.index.tolist(), counts.tolist(), strict=True):
+            text = str(value).strip()
+            if text.lower() in NULL_STRINGS:
+                self.nulls += n
+                continue
+            kind, number = _classify_text(text)
+            self.kinds[kind] = self.kinds.get(kind, 0) + n
+            if number is not None:
+                numbers.append(number)
+                weights.append(n)
+            if kind != "float":
+                counted.append((text[:MAX_TEXT_LENGTH], n))
+        if numbers:
+            self._add_numbers(np.repeat(np.array(numbers), weights))
+        self._add_counts(counted)
+
+    def _add_numbers(self, numbers: "np.ndarray") -> None:
+        if not len(numbers):
+            return
+        mean = float(numbers.mean())
+        m2 = float(((numbers - mean) ** 2).sum())
+        self.stats.merge(len(numbers), mean, m2, float(numbers.min()), float(numbers.max()))
+        self.sketch.update(np.sort(numbers).tolist())  # pre-sorted: cheap compaction sorts
+
+    def _add_counts(self, pairs: Iterable[tuple[Any, int]]) -> None:
+        """Merge a chunk's ``(value, count)`` pairs, most frequent first, into the top-k.
+
+        Only the first ``2 * capacity`` pairs are merged; the next count
+        widens the error bound instead.
+        """
+        limit = 2 * self.top.capacity
+        kept = list(islice(pairs, limit + 1))
+        dropped = kept.pop()[1] if len(kept) > limit else 0
+        self.top.update_counts([(str(v), n) for v, n in kept], dropped)
+
+    @property
+    def dtype(self) -> str:
+        if not self.kinds:
+            return "empty"
+        if len(self.kinds) == 1:
+            return next(iter(self.kinds))
+        if set(self.kinds) == {"integer", "float"}:
+            return "float"
+        return "mixed"
+
+    def summary(self, top_k: int = DEFAULT_TOP_K) -> dict[str, Any]:
+        summary: dict[str, Any] = {
+            "dtype": self.dtype,
+            "count": self.rows - self.nulls,
+            "nulls": self.nulls,
+            "top_values": [{"value": v, "count": c} for v, c in self.top.top(top_k)],
+            "top_values_exact": self.top.error == 0,
+        }
+        if self.stats.count:
+            q25, q50, q75 = self.sketch.quantiles([0.25, 0.5, 0.75])
+            summary["numeric"] = {
+                "count": self.stats.count,
+                "mean": self.stats.mean,
+                "std": self.stats.std,
+                "min": self.stats.min,
+                "25%": q25,
+                "50%": q50,
+                "75%": q75,
+                "max": self.stats.max,
+            }
+        return summary
+
+
+def _classify(value: Any) -> tuple[str, float | None]:
+    """Return (kind, numeric value or None) for a typed, non-null cell."""
+    if isinstance(value, bool):
+        return "bool", None
+    if isinstance(value, int):
+        return "integer", float(value)
+    if isinstance(value, float):
+        return ("float", value) if math.isfinite(value) else ("text", None)
+    if isinstance(value, datetime.date | datetime.time):
+        return "datetime", None
+    return _classify_text(str(value).strip())
+
+
+def _classify_text(text: str) -> tuple[str, float | None]:
+    """Return (kind, numeric value or None) for a non-null CSV field."""
+    try:
+        number = float(text)
+    except ValueError:
+        return "text", None
+    if not math.isfinite(number):
+        return "text", None
+    return ("integer" if text.lstrip("+-").isdigit() else "float"), number
+
+
+def _text(value: Any) -> str:
+    text = value.isoformat() if isinstance(value, datetime.date) else str(value)
+    return text[:MAX_TEXT_LENGTH]
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+
+class TabularSource:
+    """A CSV file or XLSX sheet read as a header and chunks of rows."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        sheet_name: str | None = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> None:
+        self.path = Path(path).expanduser()
+        self.sheet_name = sheet_name
+        self.chunk_rows = chunk_rows
+        self.is_excel = self.path.suffix.lower() in EXCEL_SUFFIXES
+        self.columns: list[str] = []
+
+    def chunks(self) -> Iterator[list[list[Any]]]:
+        """Yield lists of up to ``chunk_rows`` rows; sets ``columns`` first."""
+        rows = self._excel_rows() if self.is_excel else self._csv_rows()
+        header = next(rows, None)
+        if header is None:
+            return
+        self.columns = self._column_names(header)
+        width = len(self.columns)
+        chunk: list[list[Any]] = []
+        for row in rows:
+            row = list(row[:width])
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+            chunk.append(row)
+            if len(chunk) >= self.chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def frames(self) -> Iterator["pd.DataFrame"]:
+        """Yield CSV chunks parsed by pandas, columns labelled by position.
+
+        Raises ``pd.errors.ParserError`` for rows with more fields than the
+        header; callers fall back to ``chunks()``.
+        """
+        with self.path.open(newline="", encoding="utf-8-sig", errors="replace") as f:
+            delimiter = self._delimiter(f.readline())
+            f.seek(0)
+            header = next(csv.reader(f, delimiter=delimiter), None)
+        if header is None:
+            return
+        self.columns = self._column_names(header)
+        null_values = sorted({v for n in NULL_STRINGS for v in (n, n.upper(), n.title())} | {"NaN"})
+        yield from pd.read_csv(
+            self.path,
+            sep=delimiter,
+            header=0,
+            names=list(range(len(self.columns))),
+            index_col=False,
+            chunksize=self.chunk_rows,
+            na_values=null_values,
+            keep_default_na=False,
+            skipinitialspace=True,
+            encoding="utf-8-sig",
+            encoding_errors="replace",
+        )
+
+    def _csv_rows(self) -> Iterator[list[str]]:
+        with self.path.open(newline="", encoding="utf-8-sig", errors="replace") as f:
+            delimiter = self._delimiter(f.readline())
+            f.seek(0)
+            yield from csv.reader(f, delimiter=delimiter)
+
+    @staticmethod
+    def _delimiter(header: str) -> str:
+        """Whichever candidate the header line uses most (comma on a tie)."""
+        return max(CSV_DELIMITERS, key=header.count)
+
+    @staticmethod
+    def _column_names(header: Iterable[Any]) -> list[str]:
+        return [str(c) if c not in (None, "") else f"column_{i + 1}" for i, c in enumerate(header)]
+
+    def _excel_rows(self) -> Iterator[tuple[Any, ...]]:
+        import openpyxl
+
+        wb = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            if self.sheet_name is not None and self.sheet_name not in wb.sheetnames:
+                raise ValueError(f"Sheet '{self.sheet_name}' not found")
+            ws = wb[self.sheet_name] if self.sheet_name is not None else wb.worksheets[0]
+            self.sheet_name = ws.title
+            yield from ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+
+class TableProfiler:
+    """Fold a TabularSource's chunks into a JSON-serialisable profile."""
+
+    def __init__(
+        self,
+        top_k: int = DEFAULT_TOP_K,
+        preview_rows: int = DEFAULT_PREVIEW_ROWS,
+        seed: int = 0,
+    ) -> None:
+        self.top_k = top_k
+        self.preview_rows = preview_rows
+        self.seed = seed
+
+    def profile(self, source: TabularSource) -> dict[str, Any]:
+        if PANDAS_AVAILABLE and not source.is_excel:
+            try:
+                return self._profile_frames(source)
+            except (pd.errors.ParserError, UnicodeError) as e:
+                logger.info(
+                    "pandas could not parse %s (%s); using the csv reader",
+                    source.path,
+                    str(e).strip(),
+                )
+        return self._profile_rows(source)
+
+    def _profile_rows(self, source: TabularSource) -> dict[str, Any]:
+        columns: list[ColumnProfile] = []
+        head: list[list[Any]] = []
+        sample = _Reservoir(self.preview_rows, random.Random(self.seed))
+        for chunk in source.chunks():
+            if not columns:
+                columns = [ColumnProfile(name) for name in source.columns]
+            for column, values in zip(columns, zip(*chunk, strict=True), strict=True):
+                column.update(values)
+            head.extend(chunk[: self.preview_rows - len(head)])
+            sample.extend(len(chunk), chunk.__getitem__)
+        return self._result(source, columns, head, sample)
+
+    def _profile_frames(self, source: TabularSource) -> dict[str, Any]:
+        columns: list[ColumnProfile] = []
+        head: list[list[Any]] = []
+        sample = _Reservoir(self.preview_rows, random.Random(self.seed))
+        for frame in source.frames():
+            if not columns:
+                columns = [ColumnProfile(name) for name in source.columns]
+            for column, label in zip(columns, frame.columns, strict=True):
+                column.update_series(frame[label])
+            head.extend(
+                _frame_row(frame, i) for i in range(min(self.preview_rows - len(head), len(frame)))
+            )
+            sample.extend(len(frame), lambda i, frame=frame: _frame_row(frame, i))
+        return self._result(source, columns, head, sample)
+
+    def _result(
+        self,
+        source: TabularSource,
+        columns: list[ColumnProfile],
+        head: list[list[Any]],
+        sample: "_Reservoir",
+    ) -> dict[str, Any]:
+        names = source.columns
+        return {
+            "file": str(source.path),
+            "sheet": source.sheet_name,
+            "rows": sample.seen,
+            "columns": len(names),
+            "column_names": names,
+            "profiles": {c.name: c.summary(self.top_k) for c in columns},
+            "preview": [_record(names, r) for r in head],
+            "sample": [_record(names, r) for r in sample.items],
+        }
+
+
+class _Reservoir:
+    """Uniform sample of a row stream (Li's algorithm L).
+
+    Draws random numbers only when a row is taken, about
+    ``size * log(rows / size)`` times, instead of once per row.
+    """
+
+    def __init__(self, size: int, rng: random.Random) -> None:
+        self.size = size
+        self.items: list[Any] = []
+        self.seen = 0
+        self._rng = rng
+        self._w = 1.0
+        self._next = 0  # index of the next row to take once the reservoir is full
+
+    def _advance(self) -> None:
+        self._w *= math.exp(math.log(1.0 - self._rng.random()) / self.size)
+        gap = 1.0 - self._w
+        skip = int(math.log(1.0 - self._rng.random()) / math.log(gap)) if 0 < gap < 1 else 0
+        self._next += skip + 1
+
+    def extend(self, n: int, row: Callable[[int], Any]) -> None:
+        """Offer *n* rows; ``row(i)`` returns the batch's i-th row when it is taken."""
+        start = self.seen
+        self.seen += n
+        if self.size <= 0:
+            return
+        i = 0
+        while len(self.items) < self.size and i < n:
+            self.items.append(row(i))
+            i += 1
+            if len(self.items) == self.size:
+                self._next = start + i - 1
+                self._advance()
+        if len(self.items) < self.size:
+            return
+        while self._next < self.seen:
+            self.items[self._rng.randrange(self.size)] = row(self._next - start)
+            self._advance()
+
+
+def _frame_row(frame: "pd.DataFrame", i: int) -> list[Any]:
+    row = []
+    for v in frame.iloc[i].tolist():
+        v = v.item() if isinstance(v, np.generic) else v
+        row.append(None if isinstance(v, float) and math.isnan(v) else v)
+    return row
+
+
+def _record(names: list[str], row: list[Any]) -> dict[str, Any]:
+    return {
+        name: v if v is None or isinstance(v, bool | int | float) else _text(v)
+        for name, v in zip(names, row, strict=True)
+    }
+
+
+class ProfileCache:
+    """SQLite cache of table profiles, one row per file and sheet.
+
+    A row is served only while the file's size and mtime are unchanged.
+    Profiling a changed file replaces its row, and ``put`` prunes rows
+    older than ``max_age`` seconds, so the table stays bounded.
+    """
+
+    def __init__(
+        self, db_path: str | Path | None = None, max_age: float = DEFAULT_PROFILE_CACHE_MAX_AGE
+    ) -> None:
+        self.db_path = Path(
+            db_path or os.getenv("PORTAL_TABULAR_CACHE_DB") or DEFAULT_PROFILE_CACHE_DB
+        )
+        self.max_age = max_age
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = ConnectionPool(self.db_path)
+        conn = self._pool.get()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_profiles (
+                path TEXT NOT NULL,
+                sheet TEXT NOT NULL,
+                stamp TEXT NOT NULL,
+                profile TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (path, sheet)
+            )
+            """
+        )
+        conn.commit()
+
+    @staticmethod
+    def key(path: Path, sheet_name: str | None) -> tuple[str, str, str]:
+        """``(path, sheet, stamp)``; the stamp changes whenever the file does."""
+        st = path.stat()
+        stamp = f"v{PROFILE_VERSION}|{st.st_size}|{st.st_mtime_ns}"
+        return str(path.resolve()), sheet_name or "", stamp
+
+    def get(self, key: tuple[str, str, str]) -> dict[str, Any] | None:
+        row = self._pool.get().execute(
+            "SELECT profile FROM file_profiles WHERE path = ? AND sheet = ? AND stamp = ?", key
+        )
+        found = row.fetchone()
+        return json.loads(found[0]) if found else None
+
+    def put(self, key: tuple[str, str, str], profile: dict[str, Any]) -> None:
+        now = time.time()
+        conn = self._pool.get()
+        conn.execute(
+            "INSERT OR REPLACE INTO file_profiles VALUES (?, ?, ?, ?, ?)",
+            (*key, json.dumps(profile, default=str), now),
+        )
+        conn.execute("DELETE FROM file_profiles WHERE created_at < ?", (now - self.max_age,))
+        conn.commit()
+
+
+def profile_file(
+    path: str | Path,
+    sheet_name: str | None = None,
+    cache: ProfileCache | None = None,
+    profiler: TableProfiler | None = None,
+) -> dict[str, Any]:
+    """Profile a CSV or XLSX file, reusing a cached profile if the file is unchanged.
+
+    The returned dict has ``cached`` set to whether it came from the cache.
+    """
+    source = TabularSource(path, sheet_name)
+    if cache:
+        key = ProfileCache.key(source.path, sheet_name)
+        cached = cache.get(key)
+        if cached is not None:
+            return {**cached, "cached": True}
+    started = time.perf_counter()
+    profile = (profiler or TableProfiler()).profile(source)
+    logger.info(
+        "Profiled %s: %s rows x %s columns in %.2fs",
+        source.path,
+        profile["rows"],
+        profile["columns"],
+        time.perf_counter() - started,
+    )
+    if cache:
+        cache.put(key, profile)
+    return {**profile, "cached": False}
@@ -16,6 +16,8 @@ class PythonEnvManagerTool(BaseTool):
         "category": ToolCategory.DEV,
         "version": "1.0.0",
         "requires_confirmation": True,
+        "execution_mode": "io",
+        "timeout": 600,
         "parameters": [
             {
                 "name": "action",
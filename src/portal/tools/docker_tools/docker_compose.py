@@ -20,6 +20,7 @@ class DockerComposeTool(BaseTool):
         "description": "Run Docker Compose commands (up, down, ps, logs)",
         "category": ToolCategory.DEV,
         "requires_confirmation": True,
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "action",
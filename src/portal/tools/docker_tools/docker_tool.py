@@ -31,6 +31,7 @@ class DockerTool(BaseTool):
         "description": "Manage Docker containers: list (ps), view logs, run, or stop containers",
         "category": ToolCategory.DEV,
         "requires_confirmation": False,  # set per-action in execute()
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "action",
@@ -12,11 +12,18 @@ Tools:
 - Metadata Extractor - Extract document metadata
 """
 
-from .document_metadata_extractor import DocumentMetadataExtractorTool
-from .excel_processor import ExcelProcessorTool
-from .pandoc_converter import PandocConverterTool
-from .powerpoint_processor import PowerPointProcessorTool
-from .word_processor import WordProcessorTool
+import importlib
+from typing import Any
+
+# Submodules are imported on first attribute access so that loading one tool
+# does not pull in the dependencies of its siblings.
+_EXPORTS = {
+    "DocumentMetadataExtractorTool": ".document_metadata_extractor",
+    "ExcelProcessorTool": ".excel_processor",
+    "PandocConverterTool": ".pandoc_converter",
+    "PowerPointProcessorTool": ".powerpoint_processor",
+    "WordProcessorTool": ".word_processor",
+}
 
 __all__ = [
     "WordProcessorTool",
@@ -25,3 +32,9 @@ __all__ = [
     "PandocConverterTool",
     "DocumentMetadataExtractorTool",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -47,6 +47,7 @@ class DocumentMetadataExtractorTool(BaseTool):
         "category": ToolCategory.UTILITY,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "file_path",
@@ -6,7 +6,7 @@ Comprehensive Excel (XLSX) file manipulation.
 
 Features:
 - Read/write XLSX files
-- Data analysis and statistics
+- Data analysis and statistics (streamed in chunks, see data_tools.tabular)
 - Formatting and styling
 - Formula creation
 - Multiple sheets
@@ -22,6 +22,7 @@ from pathlib import Path
 from typing import Any
 
 from portal.core.interfaces.tool import BaseTool, ToolCategory
+from portal.tools.data_tools.tabular import ProfileCache, profile_file
 
 try:
     import openpyxl  # noqa: F401
@@ -43,6 +44,7 @@ class ExcelProcessorTool(BaseTool):
 
     def __init__(self) -> None:
         super().__init__()
+        self._profile_cache: ProfileCache | None = None
 
     METADATA = {
         "name": "excel_processor",
@@ -50,6 +52,8 @@ class ExcelProcessorTool(BaseTool):
         "category": ToolCategory.DATA,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "cpu",
+        "timeout": 900,
         "parameters": [
             {
                 "name": "action",
@@ -66,7 +70,7 @@ class ExcelProcessorTool(BaseTool):
             {
                 "name": "sheet_name",
                 "param_type": "string",
-                "description": "Sheet name (default: Sheet1)",
+                "description": "Sheet name (default: Sheet1; analyze uses the first sheet)",
                 "required": False,
                 "default": "Sheet1",
             },
@@ -265,45 +269,53 @@ class ExcelProcessorTool(BaseTool):
     async def _analyze_excel(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Analyze Excel data"""
 
-        try:
-            import pandas as pd
-        except ImportError:
-            return self._error_response("pandas not installed. Install: pip install pandas")
-
         file_path = Path(parameters.get("file_path", "")).expanduser()
-        sheet_name = parameters.get("sheet_name", 0)  # Default to first sheet
+        sheet_name = parameters.get("sheet_name")  # Default to first sheet
 
         if not file_path.exists():
             return self._error_response(f"File not found: {file_path}")
 
         try:
-            # Load with pandas
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            # Stream the sheet in chunks; unchanged files come from the profile cache
+            if self._profile_cache is None:
+                self._profile_cache = ProfileCache()
+            profile = profile_file(file_path, sheet_name, cache=self._profile_cache)
+            columns = profile["profiles"]
 
-            # Compute statistics
             analysis = {
-                "shape": {"rows": len(df), "columns": len(df.columns)},
-                "columns": list(df.columns),
-                "data_types": df.dtypes.astype(str).to_dict(),
-                "missing_values": df.isnull().sum().to_dict(),
+                "shape": {"rows": profile["rows"], "columns": profile["columns"]},
+                "columns": profile["column_names"],
+                "data_types": {name: col["dtype"] for name, col in columns.items()},
+                "missing_values": {name: col["nulls"] for name, col in columns.items()},
                 "numeric_stats": {},
+                "top_values": {
+                    name: col["top_values"] for name, col in columns.items() if col["top_values"]
+                },
             }
 
-            # Numeric column statistics
-            numeric_cols = df.select_dtypes(include=["number"]).columns
-            for col in numeric_cols:
-                analysis["numeric_stats"][col] = {
-                    "mean": float(df[col].mean()),
-                    "median": float(df[col].median()),
-                    "std": float(df[col].std()),
-                    "min": float(df[col].min()),
-                    "max": float(df[col].max()),
-                }
+            # Numeric column statistics (quantiles are approximate)
+            for name, col in columns.items():
+                if "numeric" in col:
+                    stats = col["numeric"]
+                    analysis["numeric_stats"][name] = {
+                        "mean": stats["mean"],
+                        "median": stats["50%"],
+                        "std": stats["std"],
+                        "min": stats["min"],
+                        "max": stats["max"],
+                    }
 
             # Sample data
-            analysis["sample_rows"] = df.head(5).to_dict(orient="records")
+            analysis["sample_rows"] = profile["preview"]
 
-            return self._success_response(result=analysis, metadata={"analyzed_with": "pandas"})
+            return self._success_response(
+                result=analysis,
+                metadata={
+                    "analyzed_with": "streaming profile",
+                    "sheet": profile["sheet"],
+                    "cached": profile["cached"],
+                },
+            )
 
         except Exception as e:
             logger.error("Excel analysis error: %s", e)
@@ -79,6 +79,7 @@ class PandocConverterTool(BaseTool):
         "category": ToolCategory.UTILITY,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "input_file",
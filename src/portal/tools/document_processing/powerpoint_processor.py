@@ -64,6 +64,7 @@ class PowerPointProcessorTool(BaseTool):
         "category": ToolCategory.UTILITY,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "cpu",
         "parameters": [
             {
                 "name": "action",
@@ -51,6 +51,7 @@ class WordProcessorTool(BaseTool):
         "category": ToolCategory.UTILITY,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "cpu",
         "parameters": [
             {
                 "name": "action",
@@ -1,24 +1,121 @@
 """
 PDF OCR Tool - Extract text from PDFs using OCR
+
+Pages are processed independently: a page with an embedded text layer is read
+directly, and any other page is rasterized on its own (to a temporary PNG)
+and passed to tesseract. Up to ``workers`` pages are in flight at once, so
+memory stays flat regardless of document length. Rasterizing (pdftoppm) and
+OCR (tesseract) run as subprocesses, so a thread pool spreads them across
+cores. OCR results are cached in SQLite by file hash, page, language and DPI.
 """
 
+import hashlib
 import logging
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any
 
+from portal.core.db import ConnectionPool
 from portal.core.interfaces.tool import BaseTool, ToolCategory
 
 logger = logging.getLogger(__name__)
 
 try:
     import pytesseract
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     from PIL import Image  # noqa: F401
 
     OCR_AVAILABLE = True
 except ImportError:
     OCR_AVAILABLE = False
 
+DEFAULT_OCR_CACHE_DB = "data/ocr_cache.db"
+DEFAULT_OCR_WORKERS = max(os.cpu_count() or 1, 1)
+MIN_TEXT_LAYER_CHARS = 32  # fewer embedded characters than this and the page is OCR'd
+PAGE_BREAK = "\n\n--- Page Break ---\n\n"
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _text_layer(path: Path) -> tuple[int, list[str]]:
+    """Return (page count, embedded text per page); no text if pypdf is missing."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return int(pdfinfo_from_path(str(path))["Pages"]), []
+    reader = PdfReader(str(path))
+    texts = []
+    for page in reader.pages:
+        try:
+            texts.append(page.extract_text() or "")
+        except Exception as e:  # malformed content stream: fall back to OCR
+            logger.debug("Text extraction failed on %s: %s", path, e)
+            texts.append("")
+    return len(texts), texts
+
+
+def _ocr_page(path: Path, page: int, dpi: int, language: str) -> str:
+    """Rasterize one page (1-based) to a temporary PNG and OCR it."""
+    with tempfile.TemporaryDirectory(prefix="portal-ocr-") as tmp:
+        images = convert_from_path(
+            str(path),
+            dpi=dpi,
+            first_page=page,
+            last_page=page,
+            output_folder=tmp,
+            fmt="png",
+            paths_only=True,
+        )
+        return pytesseract.image_to_string(images[0], lang=language) if images else ""
+
+
+class OCRPageCache:
+    """SQLite cache of OCR output keyed by (file hash, page, language, dpi)."""
+
+    def __init__(self, db_path: str | Path | None = None) -> None:
+        self.db_path = Path(db_path or os.getenv("PORTAL_OCR_CACHE_DB") or DEFAULT_OCR_CACHE_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = ConnectionPool(self.db_path)
+        conn = self._pool.get()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_pages (
+                file_hash TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                dpi INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (file_hash, page, language, dpi)
+            )
+            """
+        )
+        conn.commit()
+
+    def get(self, file_hash: str, language: str, dpi: int) -> dict[int, str]:
+        rows = self._pool.get().execute(
+            "SELECT page, text FROM ocr_pages WHERE file_hash = ? AND language = ? AND dpi = ?",
+            (file_hash, language, dpi),
+        )
+        return dict(rows.fetchall())
+
+    def put(self, file_hash: str, page: int, language: str, dpi: int, text: str) -> None:
+        conn = self._pool.get()
+        conn.execute(
+            "INSERT OR REPLACE INTO ocr_pages VALUES (?, ?, ?, ?, ?, ?)",
+            (file_hash, page, language, dpi, text, time.time()),
+        )
+        conn.commit()
+
 
 class PDFOCRTool(BaseTool):
     """Extract text from PDFs using OCR"""
@@ -27,6 +124,8 @@ class PDFOCRTool(BaseTool):
         "name": "pdf_ocr",
         "description": "Extract text from PDF files using OCR",
         "category": ToolCategory.DATA,
+        "execution_mode": "io",
+        "timeout": 900,
         "parameters": [
             {
                 "name": "pdf_path",
@@ -46,9 +145,26 @@ class PDFOCRTool(BaseTool):
                 "description": "Image DPI for conversion (default: 300)",
                 "required": False,
             },
+            {
+                "name": "force_ocr",
+                "param_type": "bool",
+                "description": "OCR every page even if it has a text layer (default: false)",
+                "required": False,
+            },
         ],
     }
 
+    def __init__(self, cache_db_path: str | Path | None = None, workers: int | None = None):
+        super().__init__()
+        self.cache_db_path = cache_db_path
+        self.workers = max(workers or DEFAULT_OCR_WORKERS, 1)
+        self._cache: OCRPageCache | None = None
+
+    def _get_cache(self) -> OCRPageCache:
+        if self._cache is None:
+            self._cache = OCRPageCache(self.cache_db_path)
+        return self._cache
+
     async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """Perform OCR on PDF"""
 
@@ -58,34 +174,92 @@ class PDFOCRTool(BaseTool):
             )
 
         pdf_path = Path(parameters.get("pdf_path") or "")
-        language = parameters.get("language", "eng")
-        dpi = parameters.get("dpi", 300)
+        language = parameters.get("language") or "eng"
+        dpi = parameters.get("dpi") or 300
+        force_ocr = bool(parameters.get("force_ocr", False))
 
         if not pdf_path.exists():
             return self._error_response(f"PDF not found: {pdf_path}")
 
         try:
-            # Convert PDF to images
-            logger.info("Converting PDF to images: %s", pdf_path)
-            images = convert_from_path(str(pdf_path), dpi=dpi)
+            file_hash = _file_hash(pdf_path)
+            page_count, embedded = _text_layer(pdf_path)
+            texts: dict[int, str] = {}
+            if not force_ocr:
+                for page, text in enumerate(embedded, start=1):
+                    if len(text.strip()) >= MIN_TEXT_LAYER_CHARS:
+                        texts[page] = text
+            text_layer_pages = len(texts)
 
-            # OCR each page
-            text_pages = []
-            for i, image in enumerate(images):
-                logger.info("Processing page %s/%s", i + 1, len(images))
-                text = pytesseract.image_to_string(image, lang=language)
-                text_pages.append(text)
+            cache = self._get_cache()
+            cached = cache.get(file_hash, language, dpi)
+            pending = []
+            for page in range(1, page_count + 1):
+                if page in texts:
+                    continue
+                if page in cached:
+                    texts[page] = cached[page]
+                else:
+                    pending.append(page)
+            cached_pages = page_count - text_layer_pages - len(pending)
 
-            full_text = "\n\n--- Page Break ---\n\n".join(text_pages)
+            logger.info(
+                "OCR %s: %s pages (%s text layer, %s cached, %s to OCR)",
+                pdf_path,
+                page_count,
+                text_layer_pages,
+                cached_pages,
+                len(pending),
+            )
+            texts.update(self._ocr_pages(pdf_path, pending, dpi, language, file_hash, cache))
+
+            full_text = PAGE_BREAK.join(texts[page] for page in range(1, page_count + 1))
 
             return self._success_response(
                 result=full_text,
                 metadata={
-                    "pages": len(text_pages),
+                    "pages": page_count,
                     "characters": len(full_text),
                     "language": language,
+                    "ocr_pages": len(pending),
+                    "text_layer_pages": text_layer_pages,
+                    "cached_pages": cached_pages,
                 },
             )
 
         except Exception as e:
             return self._error_response(f"OCR failed: {str(e)}")
+
+    def _ocr_pages(
+        self,
+        pdf_path: Path,
+        pages: list[int],
+        dpi: int,
+        language: str,
+        file_hash: str,
+        cache: OCRPageCache,
+    ) -> dict[int, str]:
+        """OCR *pages* with at most ``workers`` in flight, caching each as it finishes."""
+        results: dict[int, str] = {}
+        queue = iter(pages)
+        if self.workers > 1:
+            # tesseract's own OpenMP threads would oversubscribe the cores
+            os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="portal-ocr") as pool:
+            running: dict[Future, int] = {}
+            for page in queue:
+                running[pool.submit(_ocr_page, pdf_path, page, dpi, language)] = page
+                if len(running) >= self.workers:
+                    break
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = running.pop(future)
+                    results[page] = future.result()
+                    cache.put(file_hash, page, language, dpi, results[page])
+                    next_page = next(queue, None)
+                    if next_page is not None:
+                        running[pool.submit(_ocr_page, pdf_path, next_page, dpi, language)] = (
+                            next_page
+                        )
+        return results
@@ -26,6 +26,7 @@ class GitTool(BaseTool):
         ),
         "category": ToolCategory.DEV,
         "requires_confirmation": False,  # set per-action in execute()
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "action",
@@ -9,10 +9,23 @@ Tools:
 - Local Knowledge - RAG-based document search
 """
 
-from .knowledge_base_sqlite import EnhancedKnowledgeTool
-from .local_knowledge import LocalKnowledgeTool
+import importlib
+from typing import Any
+
+# Submodules are imported on first attribute access so that loading one tool
+# does not pull in the dependencies of its siblings.
+_EXPORTS = {
+    "EnhancedKnowledgeTool": ".knowledge_base_sqlite",
+    "LocalKnowledgeTool": ".local_knowledge",
+}
 
 __all__ = [
     "EnhancedKnowledgeTool",
     "LocalKnowledgeTool",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,11 +6,13 @@ Replaces JSON-based knowledge storage with SQLite for better scalability.
 
 Features:
 - SQLite backend with full-text search (FTS5)
-- Efficient embedding storage with BLOB type
+- Documents split into overlapping chunks, embedded in batches
+- Chunk embeddings stored as float32 BLOBs and mirrored in a memory-mapped
+  numpy matrix (see vector_index.py) for single-pass cosine search
+- Hybrid ranking: cosine similarity blended with normalized FTS5 bm25 scores
 - Indexing for fast queries
 - Handles 1000+ documents efficiently
 - Automatic migration from JSON
-- Vector similarity search with numpy
 - Metadata filtering
 
 Performance:
@@ -30,6 +32,8 @@ import numpy as np
 
 from portal.core.interfaces.tool import BaseTool, ToolCategory
 
+from .vector_index import VectorIndex, chunk_text, to_blob
+
 logger = logging.getLogger(__name__)
 
 # Try to import sentence transformers
@@ -57,6 +61,10 @@ class EnhancedKnowledgeTool(BaseTool):
     # Class-level shared resources
     _db_path: Path | None = None
     _embeddings_model: Any | None = None
+    _vector_index: VectorIndex | None = None
+
+    # Weight of vector similarity vs. FTS5 relevance in the hybrid score
+    HYBRID_VECTOR_WEIGHT = 0.7
 
     def __init__(self, config: dict[str, Any] | None = None) -> None:
         """Initialize the knowledge base tool.
@@ -66,6 +74,9 @@ class EnhancedKnowledgeTool(BaseTool):
                 - embedding_model: str (default: all-MiniLM-L6-v2)
                 - knowledge_base_dir: str (default: data/knowledge)
                 - auto_download_embeddings: bool (default: True)
+                - chunk_size: int, characters per chunk (default: 1000)
+                - chunk_overlap: int, characters shared by adjacent chunks (default: 200)
+                - embedding_batch_size: int (default: 32)
         """
         super().__init__()
 
@@ -73,6 +84,9 @@ class EnhancedKnowledgeTool(BaseTool):
         embedding_model = (config or {}).get("embedding_model", "all-MiniLM-L6-v2")
         knowledge_base_dir = (config or {}).get("knowledge_base_dir", "data/knowledge")
         auto_download = (config or {}).get("auto_download_embeddings", True)
+        self.chunk_size = int((config or {}).get("chunk_size", 1000))
+        self.chunk_overlap = int((config or {}).get("chunk_overlap", 200))
+        self.embedding_batch_size = int((config or {}).get("embedding_batch_size", 32))
 
         # Initialize database path
         if EnhancedKnowledgeTool._db_path is None:
@@ -82,6 +96,8 @@ class EnhancedKnowledgeTool(BaseTool):
 
         # Initialize database schema
         self._init_database()
+        if EnhancedKnowledgeTool._vector_index is None:
+            EnhancedKnowledgeTool._vector_index = VectorIndex(EnhancedKnowledgeTool._db_path)
 
         # Load embeddings model (lazy load)
         if EMBEDDINGS_AVAILABLE and EnhancedKnowledgeTool._embeddings_model is None:
@@ -111,11 +127,12 @@ class EnhancedKnowledgeTool(BaseTool):
         "category": ToolCategory.KNOWLEDGE,
         "version": "2.0.0",
         "requires_confirmation": False,
+        "execution_mode": "io",  # embedding releases the GIL; VectorIndex locks its files
         "parameters": [
             {
                 "name": "action",
                 "param_type": "string",
-                "description": "Action: add, search, list, delete, stats, migrate",
+                "description": "Action: add, search, list, delete, stats, migrate, reindex",
                 "required": True,
             },
             {
@@ -206,9 +223,22 @@ class EnhancedKnowledgeTool(BaseTool):
                 END
             """)
 
+            # Overlapping chunks with float32 embeddings (one row per matrix row
+            # in the vector index)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    doc_id INTEGER NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    embedding BLOB
+                )
+            """)
+
             # Indexes for performance
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_source ON documents(source)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_added_at ON documents(added_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks(doc_id)")
 
             conn.commit()
 
@@ -219,22 +249,45 @@ class EnhancedKnowledgeTool(BaseTool):
         conn.row_factory = sqlite3.Row
         return conn
 
-    def _generate_embedding(self, text: str) -> bytes | None:
-        """Generate and serialize embedding"""
-        if not EMBEDDINGS_AVAILABLE or not EnhancedKnowledgeTool._embeddings_model:
+    def _embed_texts(self, texts: list[str]) -> np.ndarray | None:
+        """Embed *texts* in batches; returns a float32 matrix or None."""
+        if not texts or not EMBEDDINGS_AVAILABLE or not EnhancedKnowledgeTool._embeddings_model:
             return None
 
         try:
-            # Generate embedding
-            embedding = EnhancedKnowledgeTool._embeddings_model.encode([text[:1000]])[0]
-            # Serialize as JSON bytes (safe alternative to pickle)
-            return json.dumps(embedding.tolist()).encode("utf-8")
+            embeddings = EnhancedKnowledgeTool._embeddings_model.encode(
+                texts,
+                batch_size=self.embedding_batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+            return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
         except Exception as e:
             logger.error("Embedding generation failed: %s", e)
             return None
 
+    def _index_chunks(
+        self, conn: sqlite3.Connection, doc_id: int, content: str
+    ) -> tuple[list[int], np.ndarray | None]:
+        """Chunk *content*, embed all chunks in one batch, and store them for *doc_id*.
+
+        Returns the new chunk ids and their embeddings; the caller appends them
+        to the vector index once the transaction has committed.
+        """
+        chunks = chunk_text(content, self.chunk_size, self.chunk_overlap)
+        embeddings = self._embed_texts(chunks)
+        chunk_ids = []
+        for i, chunk in enumerate(chunks):
+            blob = to_blob(embeddings[i]) if embeddings is not None else None
+            cursor = conn.execute(
+                "INSERT INTO chunks (doc_id, chunk_index, content, embedding) VALUES (?, ?, ?, ?)",
+                (doc_id, i, chunk, blob),
+            )
+            chunk_ids.append(cursor.lastrowid)
+        return chunk_ids, embeddings
+
     def _deserialize_embedding(self, blob: bytes) -> np.ndarray | None:
-        """Deserialize embedding from blob"""
+        """Deserialize a legacy document-level embedding (JSON, or gated pickle)"""
         try:
             return np.array(json.loads(blob.decode("utf-8") if isinstance(blob, bytes) else blob))
         except (json.JSONDecodeError, UnicodeDecodeError):
@@ -296,9 +349,8 @@ class EnhancedKnowledgeTool(BaseTool):
         else:
             source = f"text_{datetime.now(tz=UTC).isoformat()}"
 
-        # Generate embedding (content is guaranteed non-None after the guards above)
+        # content is guaranteed non-None after the guards above
         assert content is not None
-        embedding_blob = self._generate_embedding(content)
 
         # Insert into database
         try:
@@ -307,21 +359,37 @@ class EnhancedKnowledgeTool(BaseTool):
 
                 now = datetime.now(tz=UTC).isoformat()
 
+                # INSERT OR REPLACE gives a re-added source a new id; drop its old chunks
+                replaced = cursor.execute(
+                    "SELECT id FROM documents WHERE source = ?", (source,)
+                ).fetchone()
+                if replaced:
+                    cursor.execute("DELETE FROM chunks WHERE doc_id = ?", (replaced["id"],))
+
                 cursor.execute(
                     """
                     INSERT OR REPLACE INTO documents
                     (source, content, embedding, metadata, added_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    VALUES (?, ?, NULL, ?, ?, ?)
                 """,
-                    (source, content, embedding_blob, json.dumps(metadata), now, now),
+                    (source, content, json.dumps(metadata), now, now),
                 )
 
                 doc_id = cursor.lastrowid
+                assert doc_id is not None
+                chunk_ids, embeddings = self._index_chunks(conn, doc_id, content)
                 conn.commit()
 
+            index = EnhancedKnowledgeTool._vector_index
+            if index is not None:
+                if replaced:
+                    index.mark_stale()
+                elif embeddings is not None:
+                    index.append(chunk_ids, embeddings)
+
             return self._success_response(
                 result={"doc_id": doc_id, "source": source},
-                metadata={"content_length": len(content)},
+                metadata={"content_length": len(content), "chunks": len(chunk_ids)},
             )
 
         except Exception as e:
@@ -337,31 +405,39 @@ class EnhancedKnowledgeTool(BaseTool):
         if not query:
             return self._error_response("Query required for search")
 
+        query_embedding = self._embed_texts([query])
+
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
 
-                # First try full-text search (fast)
-                cursor.execute(
-                    """
-                    SELECT d.id, d.source, d.content, d.metadata, d.added_at,
-                           bm25(documents_fts) as rank
-                    FROM documents_fts
-                    JOIN documents d ON documents_fts.rowid = d.id
-                    WHERE documents_fts MATCH ?
-                    ORDER BY rank
-                    LIMIT ?
-                """,
-                    (query, limit * 2),
-                )  # Get more for reranking
-
-                fts_results = cursor.fetchall()
-
-                # If embeddings available, rerank using similarity
-                if EMBEDDINGS_AVAILABLE and fts_results:
-                    final_results = self._rerank_with_embeddings(fts_results, query, limit, cursor)
+                # Full-text candidates; over-fetch so the hybrid ranking has room
+                try:
+                    cursor.execute(
+                        """
+                        SELECT d.id, bm25(documents_fts) as rank
+                        FROM documents_fts
+                        JOIN documents d ON documents_fts.rowid = d.id
+                        WHERE documents_fts MATCH ?
+                        ORDER BY rank
+                        LIMIT ?
+                    """,
+                        (query, limit * 4),
+                    )
+                    fts_ranks = {row["id"]: row["rank"] for row in cursor.fetchall()}
+                except sqlite3.OperationalError:
+                    # Free-form text is not always valid FTS5 syntax; vectors still apply
+                    if query_embedding is None:
+                        raise
+                    fts_ranks = {}
+
+                if query_embedding is not None:
+                    vector_scores = self._vector_search(conn, query_embedding[0], limit * 4)
+                    ranked_ids = self._hybrid_rank(fts_ranks, vector_scores)[:limit]
                 else:
-                    final_results = fts_results[:limit]
+                    ranked_ids = list(fts_ranks)[:limit]
+
+                final_results = self._fetch_documents(cursor, ranked_ids)
 
                 # Format results
                 documents = []
@@ -383,7 +459,7 @@ class EnhancedKnowledgeTool(BaseTool):
                     metadata={
                         "query": query,
                         "results_count": len(documents),
-                        "method": "fts5_vector" if EMBEDDINGS_AVAILABLE else "fts5",
+                        "method": "fts5_vector" if query_embedding is not None else "fts5",
                     },
                 )
 
@@ -391,27 +467,60 @@ class EnhancedKnowledgeTool(BaseTool):
             logger.error("Search failed: %s", e)
             return self._error_response(f"Search error: {e}")
 
-    def _rerank_with_embeddings(self, fts_results: list, query: str, limit: int, cursor) -> list:
-        """Rerank FTS results by cosine similarity to the query embedding."""
-        query_embedding = self._generate_embedding(query)  # type: ignore[arg-type]
-        if not query_embedding:
-            return fts_results[:limit]
-        query_vec = self._deserialize_embedding(query_embedding)
-        if query_vec is None:
-            return fts_results[:limit]
-        results_with_scores = []
-        for row in fts_results:
-            cursor.execute("SELECT embedding FROM documents WHERE id = ?", (row["id"],))
-            embedding_row = cursor.fetchone()
-            if embedding_row and embedding_row["embedding"]:
-                doc_vec = self._deserialize_embedding(embedding_row["embedding"])
-                if doc_vec is not None:
-                    similarity = np.dot(doc_vec, query_vec) / (
-                        np.linalg.norm(doc_vec) * np.linalg.norm(query_vec)
-                    )
-                    results_with_scores.append((row, similarity))
-        results_with_scores.sort(key=lambda x: x[1], reverse=True)
-        return [row for row, _ in results_with_scores[:limit]]
+    def _vector_search(
+        self, conn: sqlite3.Connection, query_vec: np.ndarray, k: int
+    ) -> dict[int, float]:
+        """Top-k chunk search in one matrix pass; returns best cosine score per document."""
+        index = EnhancedKnowledgeTool._vector_index
+        if index is None:
+            return {}
+        index.ensure_fresh(conn)
+        hits = index.search(query_vec, k)
+        if not hits:
+            return {}
+        chunk_scores = dict(hits)
+        placeholders = ",".join("?" * len(chunk_scores))
+        rows = conn.execute(
+            f"SELECT id, doc_id FROM chunks WHERE id IN ({placeholders})",  # noqa: S608
+            list(chunk_scores),
+        ).fetchall()
+        doc_scores: dict[int, float] = {}
+        for row in rows:
+            score = chunk_scores[row["id"]]
+            if score > doc_scores.get(row["doc_id"], -1.0):
+                doc_scores[row["doc_id"]] = score
+        return doc_scores
+
+    def _hybrid_rank(self, fts_ranks: dict[int, float], vector_scores: dict[int, float]) -> list:
+        """Blend cosine similarity with min-max normalized bm25 (lower bm25 is better)."""
+        fts_scores: dict[int, float] = {}
+        if fts_ranks:
+            best, worst = min(fts_ranks.values()), max(fts_ranks.values())
+            spread = worst - best
+            for doc_id, rank in fts_ranks.items():
+                fts_scores[doc_id] = (worst - rank) / spread if spread else 1.0
+
+        weight = self.HYBRID_VECTOR_WEIGHT
+        combined = {
+            doc_id: weight * vector_scores.get(doc_id, 0.0)
+            + (1 - weight) * fts_scores.get(doc_id, 0.0)
+            for doc_id in fts_scores.keys() | vector_scores.keys()
+        }
+        return sorted(combined, key=combined.__getitem__, reverse=True)
+
+    @staticmethod
+    def _fetch_documents(cursor: sqlite3.Cursor, doc_ids: list) -> list:
+        """Load document rows for *doc_ids* in one query, preserving their order."""
+        if not doc_ids:
+            return []
+        placeholders = ",".join("?" * len(doc_ids))
+        cursor.execute(
+            f"SELECT id, source, content, metadata, added_at FROM documents "  # noqa: S608
+            f"WHERE id IN ({placeholders})",
+            doc_ids,
+        )
+        rows = {row["id"]: row for row in cursor.fetchall()}
+        return [rows[doc_id] for doc_id in doc_ids if doc_id in rows]
 
     async def _list_documents(self, parameters: dict[str, Any]) -> dict[str, Any]:
         """List all documents"""
@@ -469,8 +578,12 @@ class EnhancedKnowledgeTool(BaseTool):
                 if cursor.rowcount == 0:
                     return self._error_response(f"Document {doc_id} not found")
 
+                cursor.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
                 conn.commit()
 
+            if EnhancedKnowledgeTool._vector_index is not None:
+                EnhancedKnowledgeTool._vector_index.mark_stale()
+
             return self._success_response(result={"deleted_id": doc_id})
 
         except Exception as e:
@@ -499,6 +612,10 @@ class EnhancedKnowledgeTool(BaseTool):
                     else 0
                 )
 
+                cursor.execute("SELECT COUNT(*) FROM chunks")
+                total_chunks = cursor.fetchone()[0]
+                index = EnhancedKnowledgeTool._vector_index
+
                 # Recent additions
                 cursor.execute("""
                     SELECT COUNT(*) FROM documents
@@ -512,6 +629,8 @@ class EnhancedKnowledgeTool(BaseTool):
                         "total_content_bytes": total_size,
                         "database_size_mb": db_size / (1024 * 1024),
                         "recent_additions_7d": recent_additions,
+                        "total_chunks": total_chunks,
+                        "indexed_vectors": index.size if index is not None else 0,
                         "embeddings_enabled": EMBEDDINGS_AVAILABLE,
                         "database_path": str(EnhancedKnowledgeTool._db_path),
                     }
@@ -570,6 +689,32 @@ class EnhancedKnowledgeTool(BaseTool):
             logger.error("JSON migration error: %s", e)
             return self._error_response(f"Migration error: {e}")
 
+    async def _reindex(self, parameters: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Re-chunk and re-embed every document, then rebuild the vector index.
+
+        Also migrates documents stored with legacy document-level embeddings.
+        """
+        try:
+            with self._get_connection() as conn:
+                documents = conn.execute("SELECT id, content FROM documents").fetchall()
+                conn.execute("DELETE FROM chunks")
+                total_chunks = 0
+                for doc in documents:
+                    chunk_ids, _ = self._index_chunks(conn, doc["id"], doc["content"])
+                    total_chunks += len(chunk_ids)
+                conn.execute("UPDATE documents SET embedding = NULL")
+                conn.commit()
+                if EnhancedKnowledgeTool._vector_index is not None:
+                    EnhancedKnowledgeTool._vector_index.rebuild(conn)
+
+            return self._success_response(
+                result={"documents": len(documents), "chunks": total_chunks}
+            )
+
+        except Exception as e:
+            logger.error("Reindex error: %s", e)
+            return self._error_response(f"Reindex error: {e}")
+
     _DISPATCH: dict[str, Any] = {
         "add": _add_document,
         "search": _search,
@@ -577,4 +722,5 @@ class EnhancedKnowledgeTool(BaseTool):
         "delete": _delete_document,
         "stats": _get_stats,
         "migrate": _migrate_from_json,
+        "reindex": _reindex,
     }
@@ -6,6 +6,7 @@ import logging
 import os
 import shutil
 import tempfile
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -28,6 +29,8 @@ class LocalKnowledgeTool(BaseTool):
     _documents: list[dict[str, Any]] = []
     _embeddings_model: Any | None = None
     _db_loaded: bool = False
+    # Calls run on worker threads; guards _documents and the JSON file
+    _lock = threading.RLock()
 
     # Use config from environment or fallback to default
     DB_PATH = Path(os.getenv("KNOWLEDGE_BASE_DIR", "data")) / "knowledge_base.json"
@@ -56,6 +59,7 @@ class LocalKnowledgeTool(BaseTool):
         "category": ToolCategory.KNOWLEDGE,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "io",  # embedding releases the GIL
         "parameters": [
             {
                 "name": "action",
@@ -134,9 +138,11 @@ class LocalKnowledgeTool(BaseTool):
     def _keyword_search(self, query: str, top_k: int) -> list[dict[str, Any]]:
         """Fallback keyword search when sentence-transformers is unavailable."""
         query_lower = query.lower()
+        with LocalKnowledgeTool._lock:
+            documents = list(LocalKnowledgeTool._documents)
         return [
             {"source": doc.get("source", "unknown"), "content": doc["content"][:500], "score": 1.0}
-            for doc in LocalKnowledgeTool._documents
+            for doc in documents
             if query_lower in doc["content"].lower()
         ][:top_k]
 
@@ -150,7 +156,8 @@ class LocalKnowledgeTool(BaseTool):
         model = LocalKnowledgeTool._embeddings_model
 
         query_vec = np.array(model.encode([query])[0])
-        valid_docs = [d for d in LocalKnowledgeTool._documents if d.get("embedding")]
+        with LocalKnowledgeTool._lock:
+            valid_docs = [d for d in LocalKnowledgeTool._documents if d.get("embedding")]
         if not valid_docs:
             return []
 
@@ -210,24 +217,21 @@ class LocalKnowledgeTool(BaseTool):
         # Generate embedding once at add time (not at search time!)
         embedding = self._get_embedding(content[:1000])
 
-        # Add to documents with cached embedding
-        LocalKnowledgeTool._documents.append(
-            {
-                "source": doc_path,
-                "content": content,
-                "embedding": embedding,  # CACHED for fast search!
-                "added_at": Path(doc_path).stat().st_mtime,
-            }
-        )
-
-        # Save to disk
-        self._save_db()
+        # Add to documents with cached embedding, and save to disk
+        with LocalKnowledgeTool._lock:
+            LocalKnowledgeTool._documents.append(
+                {
+                    "source": doc_path,
+                    "content": content,
+                    "embedding": embedding,  # CACHED for fast search!
+                    "added_at": Path(doc_path).stat().st_mtime,
+                }
+            )
+            self._save_db()
+            total = len(LocalKnowledgeTool._documents)
 
         return self._success_response(
-            {
-                "message": f"Added document: {doc_path}",
-                "total_documents": len(LocalKnowledgeTool._documents),
-            }
+            {"message": f"Added document: {doc_path}", "total_documents": total}
         )
 
     async def _add_content(self, content: str) -> dict[str, Any]:
@@ -235,39 +239,39 @@ class LocalKnowledgeTool(BaseTool):
         # Generate embedding once at add time (not at search time!)
         embedding = self._get_embedding(content[:1000])
 
-        LocalKnowledgeTool._documents.append(
-            {
-                "source": "direct_input",
-                "content": content,
-                "embedding": embedding,  # CACHED for fast search!
-                "added_at": None,
-            }
-        )
-
-        # Save to disk
-        self._save_db()
+        with LocalKnowledgeTool._lock:
+            LocalKnowledgeTool._documents.append(
+                {
+                    "source": "direct_input",
+                    "content": content,
+                    "embedding": embedding,  # CACHED for fast search!
+                    "added_at": None,
+                }
+            )
+            self._save_db()
+            total = len(LocalKnowledgeTool._documents)
 
-        return self._success_response(
-            {"message": "Content added", "total_documents": len(LocalKnowledgeTool._documents)}
-        )
+        return self._success_response({"message": "Content added", "total_documents": total})
 
     async def _list_documents(self) -> dict[str, Any]:
         """List all documents"""
-        docs = [
-            {"source": d.get("source", "unknown"), "length": len(d["content"])}
-            for d in LocalKnowledgeTool._documents
-        ]
+        with LocalKnowledgeTool._lock:
+            docs = [
+                {"source": d.get("source", "unknown"), "length": len(d["content"])}
+                for d in LocalKnowledgeTool._documents
+            ]
 
         return self._success_response({"total": len(docs), "documents": docs})
 
     async def _clear(self) -> dict[str, Any]:
         """Clear the knowledge base"""
-        count = len(LocalKnowledgeTool._documents)
-        LocalKnowledgeTool._documents = []
-        LocalKnowledgeTool._index = None
+        with LocalKnowledgeTool._lock:
+            count = len(LocalKnowledgeTool._documents)
+            LocalKnowledgeTool._documents = []
+            LocalKnowledgeTool._index = None
 
-        # Save the cleared state
-        self._save_db()
+            # Save the cleared state
+            self._save_db()
 
         return self._success_response({"message": f"Cleared {count} documents"})
 
@@ -288,6 +292,7 @@ class LocalKnowledgeTool(BaseTool):
         Uses atomic rename to prevent corruption if process crashes during write.
         Implements file locking to prevent concurrent write conflicts.
         Creates backup before write for recovery.
+        Callers hold ``_lock`` so the snapshot matches the in-memory list.
         """
         try:
             self.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,191 @@
+"""
+Vector Index - memory-mapped float32 embedding matrix
+=====================================================
+
+Chunk embeddings live twice: as float32 BLOBs in SQLite (source of truth)
+and as an append-only row-major matrix on disk that is memory-mapped for
+search. Each matrix row has a matching int64 chunk id in a sidecar file.
+
+Search is a single matrix-vector product over unit-normalized rows followed
+by a partial sort, instead of one SELECT plus one decode per candidate.
+Deletions mark the index stale; it is rebuilt from SQLite on next use.
+The index is shared by concurrent tool calls running on worker threads, so
+every file access goes through one lock.
+"""
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DTYPE = np.float32
+
+
+def to_blob(vector: np.ndarray) -> bytes:
+    """Serialize an embedding as raw float32 bytes."""
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    """Deserialize raw float32 bytes written by :func:`to_blob`."""
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE)
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length so a dot product is cosine similarity."""
+    matrix = np.asarray(matrix, dtype=EMBEDDING_DTYPE)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def chunk_text(text: str, size: int = 1000, overlap: int = 200) -> list[str]:
+    """Split *text* into ~*size*-character chunks that overlap by *overlap*.
+
+    Chunk ends snap back to the last whitespace in the window so words are
+    not cut in half, unless that would shrink the chunk below half its size.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= size:
+        return [text]
+
+    overlap = min(overlap, size // 2)
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            split = text.rfind(" ", start + size // 2, end)
+            if split != -1:
+                end = split
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+class VectorIndex:
+    """Append-only, memory-mapped matrix of unit-normalized chunk embeddings."""
+
+    def __init__(self, base_path: Path) -> None:
+        self.matrix_path = base_path.with_suffix(".vectors.f32")
+        self.ids_path = base_path.with_suffix(".vectors.ids")
+        self.dim: int | None = None
+        self._matrix: np.ndarray | None = None
+        self._ids: np.ndarray | None = None
+        self._stale = True
+        self._lock = threading.RLock()
+
+    @property
+    def size(self) -> int:
+        """Number of rows currently on disk."""
+        return self.ids_path.stat().st_size // 8 if self.ids_path.exists() else 0
+
+    def mark_stale(self) -> None:
+        """Force a rebuild from SQLite before the next search (after deletes)."""
+        self._stale = True
+
+    def append(self, chunk_ids: Iterable[int], vectors: np.ndarray) -> None:
+        """Append normalized *vectors* for *chunk_ids* to the on-disk matrix."""
+        ids = np.fromiter(chunk_ids, dtype=np.int64)
+        vectors = normalize_rows(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError("chunk_ids and vectors must have the same length")
+        if not len(ids):
+            return
+        with self._lock:
+            dim = self._load_dim()
+            if dim is not None and vectors.shape[1] != dim:
+                # Embedding model changed; the existing rows are unusable
+                logger.warning("Embedding dimension changed (%d -> %d)", dim, vectors.shape[1])
+                self._stale = True
+                return
+            self.dim = vectors.shape[1]
+            with open(self.matrix_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self.ids_path, "ab") as f:
+                f.write(ids.tobytes())
+            self._matrix = None  # remap on next search
+
+    def rebuild(self, conn: sqlite3.Connection) -> None:
+        """Rewrite the matrix from the float32 BLOBs stored in SQLite."""
+        with self._lock:
+            rows = conn.execute(
+                "SELECT id, embedding FROM chunks WHERE embedding IS NOT NULL ORDER BY id"
+            ).fetchall()
+            self.matrix_path.unlink(missing_ok=True)
+            self.ids_path.unlink(missing_ok=True)
+            self.dim = None
+            self._matrix = None
+            self._stale = False
+            if not rows:
+                return
+            # Keep only rows from the current embedding model (the newest dimension)
+            dim = len(rows[-1][1])
+            rows = [r for r in rows if len(r[1]) == dim]
+            matrix = np.vstack([from_blob(r[1]) for r in rows])
+            self.append((r[0] for r in rows), matrix)
+        logger.info("Rebuilt vector index with %d chunks", len(rows))
+
+    def ensure_fresh(self, conn: sqlite3.Connection) -> None:
+        """Rebuild if marked stale and out of step with SQLite (row count or newest id)."""
+        if not self._stale:
+            return
+        with self._lock:
+            count, max_id = conn.execute(
+                "SELECT COUNT(*), MAX(id) FROM chunks WHERE embedding IS NOT NULL"
+            ).fetchone()
+            _, ids = self._mapped()
+            disk_max = int(ids.max()) if len(ids) else None
+            if count != len(ids) or max_id != disk_max:
+                self.rebuild(conn)
+            else:
+                self._stale = False
+
+    def _load_dim(self) -> int | None:
+        if self.dim is None and self.size:
+            self.dim = self.matrix_path.stat().st_size // (4 * self.size)
+        return self.dim
+
+    def _mapped(self) -> tuple[np.ndarray, np.ndarray]:
+        n = self.size
+        if self._matrix is None or len(self._matrix) != n:
+            dim = self._load_dim()
+            if not n or not dim:
+                empty = np.empty((0, 0), dtype=EMBEDDING_DTYPE)
+                return empty, np.empty(0, dtype=np.int64)
+            self._matrix = np.memmap(
+                self.matrix_path, dtype=EMBEDDING_DTYPE, mode="r", shape=(n, dim)
+            )
+            self._ids = np.fromfile(self.ids_path, dtype=np.int64, count=n)
+        assert self._ids is not None
+        return self._matrix, self._ids
+
+    def search(self, query_vector: np.ndarray, k: int) -> list[tuple[int, float]]:
+        """Return up to *k* ``(chunk_id, cosine_similarity)`` pairs, best first."""
+        with self._lock:
+            # The mapping stays valid if a rebuild unlinks the file afterwards
+            matrix, ids = self._mapped()
+        if not len(ids) or k <= 0:
+            return []
+        query = normalize_rows(query_vector)[0]
+        if query.shape[0] != matrix.shape[1]:
+            logger.warning("Query embedding dimension does not match the index")
+            return []
+        scores = matrix @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
@@ -0,0 +1,280 @@
+"""Tool Manifest — index tool metadata from source without importing tool modules.
+
+Each tool module is parsed with ``ast``. A class that subclasses ``BaseTool``
+and whose ``METADATA`` is a literal dict (``ToolCategory``/``ExecutionMode``
+members allowed) is indexed directly from the source. Classes that build
+metadata in ``_get_metadata()``, or whose bases the AST cannot trace back to
+``BaseTool`` (an intermediate base imported from elsewhere), cannot be read
+statically; the registry imports those modules once and records the result
+here, including classes that turn out not to be tools.
+
+The index is cached as JSON, keyed by module name and validated against each
+file's SHA-256, so unchanged files are neither parsed nor imported on the next
+start. Keys carry no filesystem paths, so the cache survives a moved checkout.
+"""
+
+import ast
+import builtins
+import hashlib
+import json
+import logging
+import os
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from portal.core.interfaces.tool import ExecutionMode, ToolCategory, ToolMetadata, ToolParameter
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 3
+DEFAULT_MANIFEST_PATH = "data/tool_manifest.json"
+
+_ENUMS: dict[str, Any] = {"ToolCategory": ToolCategory, "ExecutionMode": ExecutionMode}
+
+
+@dataclass
+class ToolManifestEntry:
+    """One indexed tool: where its class lives and its metadata in JSON form."""
+
+    name: str
+    module: str
+    class_name: str
+    source: str  # module name, or "plugin:<entry point value>"
+    metadata: dict[str, Any]
+
+    def to_metadata(self) -> ToolMetadata:
+        return _metadata_from_dict(self.metadata)
+
+
+def _metadata_from_dict(md: dict[str, Any]) -> ToolMetadata:
+    return ToolMetadata(
+        name=md["name"],
+        description=md["description"],
+        category=ToolCategory(md["category"]),
+        version=md.get("version", "1.0.0"),
+        requires_confirmation=md.get("requires_confirmation", False),
+        async_capable=md.get("async_capable", True),
+        parameters=[ToolParameter(**p) for p in md.get("parameters", [])],
+        examples=md.get("examples", []),
+        execution_mode=ExecutionMode(md.get("execution_mode", "async")),
+        timeout=md.get("timeout"),
+    )
+
+
+def metadata_to_dict(metadata: ToolMetadata) -> dict[str, Any]:
+    """JSON-serialisable form of a ToolMetadata (inverse of ``to_metadata``)."""
+    data = asdict(metadata)
+    data["category"] = metadata.category.value
+    data["execution_mode"] = metadata.execution_mode.value
+    return data
+
+
+def _literal(node: ast.expr) -> Any:
+    """Evaluate a METADATA expression; raise ValueError if it is not static."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Dict):
+        if any(k is None for k in node.keys):
+            raise ValueError("dict unpacking")
+        return {_literal(k): _literal(v) for k, v in zip(node.keys, node.values, strict=True)}
+    if isinstance(node, ast.List | ast.Tuple):
+        return [_literal(e) for e in node.elts]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_literal(node.operand)
+    if (
+        isinstance(node, ast.Attribute)
+        and isinstance(node.value, ast.Name)
+        and node.value.id in _ENUMS
+    ):
+        return _ENUMS[node.value.id][node.attr].value
+    raise ValueError(f"non-literal {type(node).__name__}")
+
+
+_STDLIB = frozenset(sys.stdlib_module_names)
+
+
+class _ClassResolver:
+    """Decide from the AST alone whether each class in a module is a BaseTool subclass.
+
+    A base is a tool if it is ``BaseTool`` (under any import alias or attribute
+    path) or a tool class defined earlier in the module. Builtins and names
+    imported from the standard library are not. Anything else (an intermediate
+    base from another module, a computed base) cannot be decided statically.
+    """
+
+    def __init__(self, tree: ast.Module) -> None:
+        self.classes = {n.name: n for n in tree.body if isinstance(n, ast.ClassDef)}
+        self.imports: dict[str, tuple[str, str | None]] = {}  # alias -> (module, name)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    self.imports[alias.asname or alias.name] = (node.module or "", alias.name)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    root = alias.name.partition(".")[0]
+                    self.imports[alias.asname or root] = (alias.name, None)
+        self._verdicts: dict[str, bool | None] = {}
+
+    def is_tool(self, node: ast.ClassDef) -> bool | None:
+        """True for a tool class, False for any other class, None if undecidable."""
+        if node.name in self._verdicts:
+            return self._verdicts[node.name]
+        self._verdicts[node.name] = False  # guards against self-referential bases
+        verdicts = [self._base(base) for base in node.bases]
+        verdict = True if True in verdicts else (None if None in verdicts else False)
+        self._verdicts[node.name] = verdict
+        return verdict
+
+    def _base(self, base: ast.expr) -> bool | None:
+        if isinstance(base, ast.Name):
+            name = base.id
+            if name in self.classes:
+                return self.is_tool(self.classes[name])
+            if name in self.imports:
+                module, original = self.imports[name]
+                if original == "BaseTool":
+                    return True
+                return False if module.partition(".")[0] in _STDLIB else None
+            if name == "BaseTool":
+                return True
+            return False if hasattr(builtins, name) else None
+        if isinstance(base, ast.Attribute):
+            if base.attr == "BaseTool":
+                return True
+            root = base
+            while isinstance(root, ast.Attribute):
+                root = root.value
+            if isinstance(root, ast.Name) and root.id in self.imports:
+                module = self.imports[root.id][0]
+                if module.partition(".")[0] in _STDLIB:
+                    return False
+            return None
+        if isinstance(base, ast.Subscript):  # Generic[T], Protocol[...]
+            return self._base(base.value)
+        return None
+
+
+def scan_source(source: str | bytes) -> list[tuple[str, dict[str, Any] | None]]:
+    """Return ``(class_name, metadata)`` for each possible BaseTool subclass in *source*.
+
+    ``metadata`` is None when the class has no literal ``METADATA`` dict, or
+    when the AST cannot tell whether the class is a tool at all (for example,
+    it subclasses an intermediate base from another module). Such classes
+    must be imported to find out.
+    """
+    tree = ast.parse(source)
+    resolver = _ClassResolver(tree)
+    found: list[tuple[str, dict[str, Any] | None]] = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        verdict = resolver.is_tool(node)
+        if verdict is False:
+            continue
+        metadata = None
+        for stmt in node.body if verdict else ():
+            targets = stmt.targets if isinstance(stmt, ast.Assign) else []
+            if any(isinstance(t, ast.Name) and t.id == "METADATA" for t in targets):
+                try:
+                    metadata = _normalise(_literal(stmt.value))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.debug("METADATA of %s is not static: %s", node.name, e)
+        found.append((node.name, metadata))
+    return found
+
+
+def _normalise(raw: Any) -> dict[str, Any]:
+    """Fill defaults so a static METADATA dict matches ``metadata_to_dict`` output."""
+    if not isinstance(raw, dict):
+        raise TypeError("METADATA is not a dict")
+    return metadata_to_dict(_metadata_from_dict(raw))
+
+
+class ToolManifest:
+    """Hash-keyed, on-disk cache of scanned tool modules."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path or os.getenv("PORTAL_TOOL_MANIFEST") or DEFAULT_MANIFEST_PATH)
+        self._cached: dict[str, Any] = self._read()
+        self._files: dict[str, Any] = {}
+        self._dirty = False
+        self.hits = self.misses = 0
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable tool manifest %s: %s", self.path, e)
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def scan(
+        self, file: Path, module: str, source: str | None = None
+    ) -> tuple[list[ToolManifestEntry], list[str]]:
+        """Index *file*, returning (entries, class names that must be imported).
+
+        A cached result for the same file hash is returned without parsing.
+        """
+        content = file.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        cached = self._cached.get(module)
+        if cached and cached.get("sha256") == digest:
+            self.hits += 1
+            self._files[module] = cached
+            return [ToolManifestEntry(**e) for e in cached["tools"]], list(cached["unresolved"])
+
+        self.misses += 1
+        self._dirty = True
+        entries: list[ToolManifestEntry] = []
+        unresolved: list[str] = []
+        for class_name, metadata in scan_source(content):
+            if metadata is None:
+                unresolved.append(class_name)
+                continue
+            entries.append(
+                ToolManifestEntry(metadata["name"], module, class_name, source or module, metadata)
+            )
+        self._files[module] = {
+            "sha256": digest,
+            "tools": [asdict(e) for e in entries],
+            "unresolved": unresolved,
+        }
+        return entries, list(unresolved)
+
+    def resolve(self, module: str, entry: ToolManifestEntry | None, class_name: str) -> None:
+        """Record the outcome of importing *class_name*, which ``scan`` could not read.
+
+        *entry* is None when the class turned out not to be a tool.
+        """
+        record = self._files.get(module)
+        if record is None:
+            return
+        if class_name in record["unresolved"]:
+            record["unresolved"].remove(class_name)
+        elif entry is None or any(t["class_name"] == class_name for t in record["tools"]):
+            return
+        if entry is not None:
+            record["tools"].append(asdict(entry))
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the files scanned in this run; entries for removed files are dropped."""
+        if not self._dirty and self._files.keys() == self._cached.keys():
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps({"version": MANIFEST_VERSION, "files": self._files}, indent=1),
+                encoding="utf-8",
+            )
+            tmp.replace(self.path)
+            self._cached, self._dirty = dict(self._files), False
+        except OSError as e:
+            logger.warning("Could not write tool manifest %s: %s", self.path, e)
@@ -15,6 +15,8 @@ class AudioTranscribeTool(BaseTool):
         "category": ToolCategory.AUDIO,
         "version": "1.0.0",
         "requires_confirmation": False,
+        "execution_mode": "io",  # Whisper (torch) releases the GIL; keeps one cached model
+        "timeout": 900,
         "parameters": [
             {
                 "name": "audio_files",
@@ -25,6 +25,7 @@ class ProcessMonitorTool(BaseTool):
         "description": "Monitor and manage system processes",
         "category": ToolCategory.UTILITY,
         "requires_confirmation": False,
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "action",
@@ -24,6 +24,7 @@ class SystemStatsTool(BaseTool):
         "name": "system_stats",
         "description": "Get system resource usage (CPU, RAM, disk)",
         "category": ToolCategory.UTILITY,
+        "execution_mode": "io",
         "parameters": [
             {
                 "name": "detailed",
@@ -0,0 +1 @@
+# Offline load/latency benchmarks (fake Ollama/MLX backend, no GPU or network needed)
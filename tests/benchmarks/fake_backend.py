@@ -0,0 +1,273 @@
+"""
+Fake Ollama / MLX-LM server for offline benchmarks.
+
+Speaks enough of both APIs for Portal's backends, the LLM classifier and the
+proxy router:
+
+- Ollama: ``GET /api/tags``, ``POST /api/chat``, ``POST /api/generate`` (NDJSON streaming)
+- MLX-LM: ``GET /v1/models``, ``POST /v1/chat/completions`` (SSE streaming)
+
+Token timing is synthetic: the first token arrives after ``first_token_latency``
+seconds, the rest at ``tokens_per_second``. When a request offers ``tools``,
+every ``tool_call_every``-th such request answers with a tool call instead of
+text (until the conversation contains a tool result). Setting ``response_text``
+replaces the filler tokens with a fixed answer, e.g. a JSON plan for the
+orchestrator's planner.
+
+Requests whose last user message contains a ``[bench:<id>]`` marker are
+timestamped (``time.perf_counter``) on arrival and completion, so the load
+driver can split end-to-end latency into per-stage timings.
+"""
+
+import asyncio
+import itertools
+import json
+import re
+import socket
+import threading
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+BENCH_MARKER = re.compile(r"\[bench:([\w-]+)\]")
+
+
+@dataclass
+class FakeBackendConfig:
+    """Synthetic model behaviour."""
+
+    tokens_per_second: float = 200.0
+    first_token_latency: float = 0.02
+    response_tokens: int = 32
+    tool_call_every: int = 0  # 0 disables tool calls
+    tool_name: str = "get_current_time"
+    response_text: str = ""  # fixed answer instead of filler tokens
+    models: tuple[str, ...] = ("qwen2.5:7b", "qwen2.5:0.5b", "dolphin-llama3:8b")
+
+
+@dataclass
+class StageMark:
+    """Fake-backend timestamps for one marked request."""
+
+    arrived: float
+    first_token: float | None = None
+    finished: float | None = None
+
+
+@dataclass
+class FakeBackendState:
+    config: FakeBackendConfig
+    marks: dict[str, StageMark] = field(default_factory=dict)
+    requests: int = 0
+    _tool_counter: itertools.count = field(default_factory=lambda: itertools.count(1))
+
+    def wants_tool_call(self, payload: dict[str, Any]) -> bool:
+        if not self.config.tool_call_every or not payload.get("tools"):
+            return False
+        if any(m.get("role") == "tool" for m in payload.get("messages", [])):
+            return False
+        return next(self._tool_counter) % self.config.tool_call_every == 0
+
+
+def _last_user_text(payload: dict[str, Any]) -> str:
+    for msg in reversed(payload.get("messages") or []):
+        if msg.get("role") == "user":
+            content = msg.get("content", "")
+            return content if isinstance(content, str) else json.dumps(content)
+    return str(payload.get("prompt", ""))
+
+
+def _tokens(n: int) -> list[str]:
+    words = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit")
+    return [f"{words[i % len(words)]} " for i in range(n)]
+
+
+def build_fake_app(config: FakeBackendConfig | None = None) -> FastAPI:
+    """Return the fake server app; its state is exposed as ``app.state.bench``."""
+    state = FakeBackendState(config or FakeBackendConfig())
+    app = FastAPI()
+    app.state.bench = state
+
+    async def _token_stream(payload: dict[str, Any]) -> AsyncIterator[str | dict]:
+        """Yield text tokens on the configured schedule, or one tool-call dict."""
+        cfg = state.config
+        state.requests += 1
+        match = BENCH_MARKER.search(_last_user_text(payload))
+        mark = None
+        if match:
+            mark = state.marks[match.group(1)] = StageMark(arrived=time.perf_counter())
+
+        await asyncio.sleep(cfg.first_token_latency)
+        if mark:
+            mark.first_token = time.perf_counter()
+        if state.wants_tool_call(payload):
+            yield {"function": {"name": cfg.tool_name, "arguments": {}}}
+        else:
+            interval = 1.0 / cfg.tokens_per_second if cfg.tokens_per_second > 0 else 0.0
+            tokens = [cfg.response_text] if cfg.response_text else _tokens(cfg.response_tokens)
+            for i, token in enumerate(tokens):
+                if i and interval:
+                    await asyncio.sleep(interval)
+                yield token
+        if mark:
+            mark.finished = time.perf_counter()
+
+    def _ollama_chunk(payload: dict[str, Any], item: str | dict, chat: bool) -> dict[str, Any]:
+        base = {"model": payload.get("model", ""), "created_at": "", "done": False}
+        if not chat:
+            return {**base, "response": item if isinstance(item, str) else ""}
+        if isinstance(item, dict):
+            return {**base, "message": {"role": "assistant", "content": "", "tool_calls": [item]}}
+        return {**base, "message": {"role": "assistant", "content": item}}
+
+    def _ollama_done(payload: dict[str, Any], chat: bool, count: int) -> dict[str, Any]:
+        done = {
+            "model": payload.get("model", ""),
+            "created_at": "",
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": len(_last_user_text(payload).split()),
+            "eval_count": count,
+        }
+        if chat:
+            done["message"] = {"role": "assistant", "content": ""}
+        else:
+            done["response"] = ""
+        return done
+
+    async def _ollama(request: Request, chat: bool):
+        payload = await request.json()
+        if payload.get("stream", True):
+
+            async def ndjson() -> AsyncIterator[bytes]:
+                count = 0
+                async for item in _token_stream(payload):
+                    count += 1
+                    yield (json.dumps(_ollama_chunk(payload, item, chat)) + "\n").encode()
+                yield (json.dumps(_ollama_done(payload, chat, count)) + "\n").encode()
+
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+        text, tool_calls = [], []
+        async for item in _token_stream(payload):
+            (tool_calls if isinstance(item, dict) else text).append(item)
+        body = _ollama_done(payload, chat, len(text) + len(tool_calls))
+        if chat:
+            body["message"] = {"role": "assistant", "content": "".join(text)}
+            if tool_calls:
+                body["message"]["tool_calls"] = tool_calls
+        else:
+            body["response"] = "".join(text)
+        return JSONResponse(body)
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": m, "model": m, "size": 0} for m in state.config.models]}
+
+    @app.get("/api/version")
+    async def version():
+        return {"version": "0.0.0-fake"}
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        return await _ollama(request, chat=True)
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        return await _ollama(request, chat=False)
+
+    @app.get("/v1/models")
+    async def mlx_models():
+        return {
+            "object": "list",
+            "data": [{"id": m, "object": "model"} for m in state.config.models],
+        }
+
+    @app.post("/v1/chat/completions")
+    async def mlx_chat(request: Request):
+        payload = await request.json()
+        model = payload.get("model", "")
+        if payload.get("stream"):
+
+            async def sse() -> AsyncIterator[bytes]:
+                async for item in _token_stream(payload):
+                    delta = (
+                        {"tool_calls": [{"index": 0, "type": "function", **item}]}
+                        if isinstance(item, dict)
+                        else {"content": item}
+                    )
+                    chunk = {
+                        "object": "chat.completion.chunk",
+                        "model": model,
+                        "choices": [{"index": 0, "delta": delta}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n".encode()
+                yield b"data: [DONE]\n\n"
+
+            return StreamingResponse(sse(), media_type="text/event-stream")
+
+        text = [item async for item in _token_stream(payload) if isinstance(item, str)]
+        return {
+            "object": "chat.completion",
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(text)},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(text)},
+        }
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class BackgroundServer:
+    """Run an ASGI app with uvicorn on its own thread and event loop.
+
+    Keeping each server on its own loop stops the load driver from sharing a
+    scheduler with the code it is measuring.
+    """
+
+    def __init__(self, app: Any, port: int | None = None) -> None:
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(
+                app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="on"
+            )
+        )
+        self._thread = threading.Thread(
+            target=self._server.run, name=f"bench-server-{self.port}", daemon=True
+        )
+
+    def start(self, timeout: float = 15.0) -> "BackgroundServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"Server on port {self.port} failed to start")
+            time.sleep(0.02)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+    def __enter__(self) -> "BackgroundServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
@@ -0,0 +1,302 @@
+"""
+Load driver and latency statistics for the offline benchmarks.
+
+A scenario is a ``send(request_id) -> Sample`` coroutine run ``requests``
+times with at most ``concurrency`` in flight. Each prompt carries a
+``[bench:<id>]`` marker so the fake backend's timestamps can be joined to the
+client-side ones, which splits latency into stages:
+
+- ``dispatch``: client send → generation request reaches the backend
+  (auth, security, routing/classification, proxy forwarding)
+- ``generation``: backend arrival → backend sent its last token
+- ``relay``: backend's last token → client received the last byte
+- ``first_token_relay`` (streaming): backend's first token → client's first token
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from tests.benchmarks.fake_backend import BackgroundServer, FakeBackendState
+
+PROMPT = "Summarise the benefits of unit tests in one sentence."
+
+
+@dataclass
+class Sample:
+    ok: bool
+    latency: float
+    ttft: float | None = None
+    tokens: int = 0
+    stages: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear-interpolated percentile (``pct`` in 0-100); NaN for no data."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lo = int(rank)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    concurrency: int
+    samples: list[Sample]
+    wall_time: float
+
+    def summary(self) -> dict[str, Any]:
+        ok = [s for s in self.samples if s.ok]
+        latencies = [s.latency for s in ok]
+        ttfts = [s.ttft for s in ok if s.ttft is not None]
+        tokens = sum(s.tokens for s in ok)
+        stage_names = sorted({k for s in ok for k in s.stages})
+        return {
+            "scenario": self.name,
+            "concurrency": self.concurrency,
+            "requests": len(self.samples),
+            "errors": len(self.samples) - len(ok),
+            "latency_ms": {p: round(percentile(latencies, q) * 1000, 2) for p, q in _PCTS},
+            "ttft_ms": {p: round(percentile(ttfts, q) * 1000, 2) for p, q in _PCTS}
+            if ttfts
+            else None,
+            "throughput_rps": round(len(ok) / self.wall_time, 2) if self.wall_time else 0.0,
+            "tokens_per_second": round(tokens / self.wall_time, 1) if self.wall_time else 0.0,
+            "stages_p50_ms": {
+                name: round(
+                    statistics.median([s.stages[name] for s in ok if name in s.stages]) * 1000, 2
+                )
+                for name in stage_names
+            },
+            "first_error": next((s.error for s in self.samples if s.error), None),
+        }
+
+
+_PCTS = (("p50", 50), ("p95", 95), ("p99", 99))
+
+SendFn = Callable[[str], Awaitable[Sample]]
+
+
+async def run_load(name: str, send: SendFn, concurrency: int, requests: int) -> ScenarioResult:
+    """Issue *requests* calls of *send* with at most *concurrency* in flight."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> Sample:
+        async with sem:
+            try:
+                return await send(f"{name}-{concurrency}-{i}")
+            except Exception as e:
+                return Sample(ok=False, latency=0.0, error=f"{type(e).__name__}: {e}")
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(one(i) for i in range(requests)))
+    return ScenarioResult(name, concurrency, list(samples), time.perf_counter() - start)
+
+
+def _stages(state: FakeBackendState, rid: str, sent: float, first: float | None, end: float):
+    mark = state.marks.pop(rid, None)
+    if mark is None or mark.finished is None:
+        return {}
+    stages = {
+        "dispatch": mark.arrived - sent,
+        "generation": mark.finished - mark.arrived,
+        "relay": end - mark.finished,
+    }
+    if first is not None and mark.first_token is not None:
+        stages["first_token_relay"] = first - mark.first_token
+    return stages
+
+
+def openai_sender(
+    client: httpx.AsyncClient,
+    base_url: str,
+    state: FakeBackendState,
+    stream: bool,
+    model: str = "auto",
+) -> SendFn:
+    """Drive ``POST /v1/chat/completions`` (Portal's OpenAI-compatible API)."""
+
+    async def send(rid: str) -> Sample:
+        body = {
+            "model": model,
+            "stream": stream,
+            "messages": [{"role": "user", "content": f"[bench:{rid}] {PROMPT}"}],
+        }
+        sent = time.perf_counter()
+        first = None
+        tokens = 0
+        if stream:
+            async with client.stream("POST", f"{base_url}/v1/chat/completions", json=body) as resp:
+                if resp.status_code != 200:
+                    await resp.aread()
+                    return Sample(
+                        ok=False, latency=0.0, error=f"HTTP {resp.status_code}: {resp.text[:200]}"
+                    )
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data: ") or line == "data: [DONE]":
+                        continue
+                    chunk = json.loads(line[6:])
+                    if chunk.get("choices") and chunk["choices"][0].get("delta", {}).get("content"):
+                        tokens += 1
+                        if first is None:
+                            first = time.perf_counter()
+        else:
+            resp = await client.post(f"{base_url}/v1/chat/completions", json=body)
+            if resp.status_code != 200:
+                return Sample(
+                    ok=False, latency=0.0, error=f"HTTP {resp.status_code}: {resp.text[:200]}"
+                )
+            data = resp.json()
+            tokens = (data.get("usage") or {}).get("completion_tokens") or len(
+                data["choices"][0]["message"]["content"].split()
+            )
+        end = time.perf_counter()
+        return Sample(
+            ok=True,
+            latency=end - sent,
+            ttft=(first - sent) if first else None,
+            tokens=tokens,
+            stages=_stages(state, rid, sent, first, end),
+        )
+
+    return send
+
+
+def ollama_sender(
+    client: httpx.AsyncClient,
+    base_url: str,
+    state: FakeBackendState,
+    stream: bool,
+    model: str = "auto",
+) -> SendFn:
+    """Drive ``POST /api/chat`` (the proxy router, or the fake backend directly)."""
+
+    async def send(rid: str) -> Sample:
+        body = {
+            "model": model,
+            "stream": stream,
+            "messages": [{"role": "user", "content": f"[bench:{rid}] {PROMPT}"}],
+        }
+        sent = time.perf_counter()
+        first = None
+        tokens = 0
+        if stream:
+            async with client.stream("POST", f"{base_url}/api/chat", json=body) as resp:
+                if resp.status_code != 200:
+                    await resp.aread()
+                    return Sample(
+                        ok=False, latency=0.0, error=f"HTTP {resp.status_code}: {resp.text[:200]}"
+                    )
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    msg = json.loads(line).get("message") or {}
+                    if msg.get("content") or msg.get("tool_calls"):
+                        tokens += 1
+                        if first is None:
+                            first = time.perf_counter()
+        else:
+            resp = await client.post(f"{base_url}/api/chat", json=body)
+            if resp.status_code != 200:
+                return Sample(
+                    ok=False, latency=0.0, error=f"HTTP {resp.status_code}: {resp.text[:200]}"
+                )
+            tokens = resp.json().get("eval_count", 0)
+        end = time.perf_counter()
+        return Sample(
+            ok=True,
+            latency=end - sent,
+            ttft=(first - sent) if first else None,
+            tokens=tokens,
+            stages=_stages(state, rid, sent, first, end),
+        )
+
+    return send
+
+
+# ---------------------------------------------------------------------------
+# Systems under test
+# ---------------------------------------------------------------------------
+
+
+def start_web_stack(backend_url: str, workdir: Path) -> BackgroundServer:
+    """Start a real AgentCore + SecurityMiddleware + WebInterface against *backend_url*.
+
+    Relative ``data/`` paths (context DB, auth DB, rate limits) land in *workdir*.
+    No MCP registry is attached, so no external tool servers are contacted.
+    """
+    os.chdir(workdir)
+    os.environ.update(
+        {
+            "PORTAL_BACKENDS__OLLAMA_URL": backend_url,
+            "OLLAMA_HOST": backend_url,
+            "PORTAL_AUTH_DB": str(workdir / "auth.db"),
+            "RATE_LIMIT_DATA_DIR": str(workdir),
+        }
+    )
+    from portal.config.settings import Settings
+    from portal.core.agent_core import create_agent_core
+    from portal.interfaces.web.server import WebInterface
+    from portal.security.middleware import SecurityMiddleware
+    from portal.security.rate_limiter import RateLimiter
+
+    settings = Settings()
+    agent = create_agent_core(settings.to_agent_config())
+    secure = SecurityMiddleware(
+        agent,
+        rate_limiter=RateLimiter(max_requests=10**9, persist_path=workdir / "rate_limits.db"),
+    )
+    server = BackgroundServer(WebInterface(agent, settings, secure_agent=secure).app).start()
+    _wait_ready(f"{server.url}/health/ready")
+    return server
+
+
+def start_router_stack(backend_url: str) -> BackgroundServer:
+    """Start the proxy router (``routing/router.py``) in front of *backend_url*."""
+    import importlib
+
+    os.environ.update({"OLLAMA_HOST": backend_url, "ROUTER_TOKEN": ""})
+    import portal.routing.router as router
+
+    importlib.reload(router)  # re-read OLLAMA_HOST / ROUTER_TOKEN
+    return BackgroundServer(router.app).start()
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+async def warm_up(send: SendFn, attempts: int = 50) -> None:
+    """Retry until the target accepts requests (WebInterface returns 503 while warming up)."""
+    for i in range(attempts):
+        sample = await send(f"warmup-{i}")
+        if sample.ok:
+            return
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"Target never became ready: {sample.error}")
+
+
+def make_workdir() -> Path:
+    return Path(tempfile.mkdtemp(prefix="portal-bench-"))
@@ -0,0 +1,155 @@
+"""
+Offline load and latency benchmarks for Portal.
+
+Starts a fake Ollama/MLX backend, a real WebInterface (AgentCore +
+SecurityMiddleware) and the proxy router, each on its own thread, then drives
+them at the requested concurrency levels. Needs no models, GPU or network.
+
+Usage:
+    python -m tests.benchmarks.run_benchmarks
+    python -m tests.benchmarks.run_benchmarks --concurrency 1,8,32 --requests 200 \\
+        --tokens-per-second 50 --first-token-latency 0.2 --json results.json
+
+Scenarios:
+    direct-stream / direct   fake backend /api/chat (baseline: no Portal in the path)
+    web-stream / web         WebInterface POST /v1/chat/completions
+    proxy-stream / proxy     routing/router.py POST /api/chat
+
+Report columns are milliseconds; ``dispatch``/``generation``/``relay`` are
+p50 per-stage timings (see ``tests/benchmarks/harness.py``).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import Any
+
+import httpx
+
+from tests.benchmarks.fake_backend import BackgroundServer, FakeBackendConfig, build_fake_app
+from tests.benchmarks.harness import (
+    make_workdir,
+    ollama_sender,
+    openai_sender,
+    run_load,
+    start_router_stack,
+    start_web_stack,
+    warm_up,
+)
+
+ALL_SCENARIOS = ("direct-stream", "direct", "web-stream", "web", "proxy-stream", "proxy")
+
+
+async def run_benchmarks(
+    scenarios: list[str],
+    concurrency: list[int],
+    requests: int,
+    backend_config: FakeBackendConfig,
+) -> list[dict[str, Any]]:
+    """Start the stacks the *scenarios* need, run them, and return the summaries."""
+    cwd, env = os.getcwd(), dict(os.environ)
+    workdir = make_workdir()
+    backend_app = build_fake_app(backend_config)
+    state = backend_app.state.bench
+    servers: list[BackgroundServer] = []
+    try:
+        backend = BackgroundServer(backend_app).start()
+        servers.append(backend)
+        targets: dict[str, str] = {"direct": backend.url}
+        if any(s.startswith("web") for s in scenarios):
+            servers.append(start_web_stack(backend.url, workdir))
+            targets["web"] = servers[-1].url
+        if any(s.startswith("proxy") for s in scenarios):
+            servers.append(start_router_stack(backend.url))
+            targets["proxy"] = servers[-1].url
+
+        limits = httpx.Limits(max_connections=max(concurrency) * 2)
+        timeout = httpx.Timeout(120.0, connect=10.0)
+        results = []
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            for scenario in scenarios:
+                target, _, mode = scenario.partition("-")
+                sender = openai_sender if target == "web" else ollama_sender
+                send = sender(client, targets[target], state, stream=mode == "stream")
+                await warm_up(send)
+                for level in concurrency:
+                    result = await run_load(scenario, send, level, requests)
+                    results.append(result.summary())
+        return results
+    finally:
+        for server in reversed(servers):
+            server.stop()
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+
+
+def format_report(results: list[dict[str, Any]]) -> str:
+    header = (
+        f"{'scenario':<14}{'conc':>5}{'req':>6}{'err':>5}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'ttft50':>9}{'ttft95':>9}"
+        f"{'rps':>9}{'tok/s':>9}{'dispatch':>10}{'generation':>12}{'relay':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lat, ttft, stages = r["latency_ms"], r["ttft_ms"] or {}, r["stages_p50_ms"]
+        lines.append(
+            f"{r['scenario']:<14}{r['concurrency']:>5}{r['requests']:>6}{r['errors']:>5}"
+            f"{lat['p50']:>9.1f}{lat['p95']:>9.1f}{lat['p99']:>9.1f}"
+            f"{ttft.get('p50', float('nan')):>9.1f}{ttft.get('p95', float('nan')):>9.1f}"
+            f"{r['throughput_rps']:>9.1f}{r['tokens_per_second']:>9.1f}"
+            f"{stages.get('dispatch', float('nan')):>10.1f}"
+            f"{stages.get('generation', float('nan')):>12.1f}"
+            f"{stages.get('relay', float('nan')):>8.1f}"
+        )
+        if r["first_error"]:
+            lines.append(f"  first error: {r['first_error']}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--scenarios", default=",".join(ALL_SCENARIOS))
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated levels")
+    parser.add_argument("--requests", type=int, default=50, help="requests per level")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--first-token-latency", type=float, default=0.02, help="seconds")
+    parser.add_argument("--response-tokens", type=int, default=32)
+    parser.add_argument(
+        "--tool-call-every",
+        type=int,
+        default=0,
+        help="answer every Nth tool-enabled request with a tool call",
+    )
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(ALL_SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(level=logging.ERROR)
+    config = FakeBackendConfig(
+        tokens_per_second=args.tokens_per_second,
+        first_token_latency=args.first_token_latency,
+        response_tokens=args.response_tokens,
+        tool_call_every=args.tool_call_every,
+    )
+    results = asyncio.run(
+        run_benchmarks(
+            scenarios, [int(c) for c in args.concurrency.split(",")], args.requests, config
+        )
+    )
+    print(format_report(results))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Tests for the offline benchmark harness.
+
+The statistics tests run with the normal suite; the end-to-end smoke run is
+marked ``benchmark`` and deselected by default (``pytest -m benchmark``).
+"""
+
+import json
+import math
+import time
+
+import httpx
+import pytest
+
+from portal.core.orchestrator import TaskOrchestrator
+from portal.core.planner import TaskPlanner
+from tests.benchmarks.fake_backend import BackgroundServer, FakeBackendConfig, build_fake_app
+from tests.benchmarks.harness import Sample, ScenarioResult, ollama_sender, percentile, run_load
+from tests.benchmarks.run_benchmarks import run_benchmarks
+
+
+class TestStatistics:
+    def test_percentile_interpolates(self):
+        values = [1.0, 2.0, 3.0, 4.0]
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4.0
+
+    def test_percentile_empty_is_nan(self):
+        assert math.isnan(percentile([], 95))
+
+    def test_summary_excludes_failures(self):
+        samples = [
+            Sample(ok=True, latency=0.1, ttft=0.01, tokens=10, stages={"dispatch": 0.002}),
+            Sample(ok=True, latency=0.3, ttft=0.03, tokens=10, stages={"dispatch": 0.004}),
+            Sample(ok=False, latency=0.0, error="HTTP 500"),
+        ]
+        summary = ScenarioResult("web", 2, samples, wall_time=2.0).summary()
+        assert summary["requests"] == 3
+        assert summary["errors"] == 1
+        assert summary["latency_ms"]["p50"] == 200.0
+        assert summary["ttft_ms"]["p50"] == 20.0
+        assert summary["tokens_per_second"] == 10.0
+        assert summary["stages_p50_ms"] == {"dispatch": 3.0}
+        assert summary["first_error"] == "HTTP 500"
+
+
+@pytest.mark.benchmark
+class TestBenchmarkSmoke:
+    async def test_fake_backend_tool_calls_and_stage_marks(self):
+        app = build_fake_app(FakeBackendConfig(tool_call_every=1, first_token_latency=0.0))
+        with BackgroundServer(app) as server:
+            async with httpx.AsyncClient() as client:
+                resp = await client.post(
+                    f"{server.url}/api/chat",
+                    json={
+                        "model": "qwen2.5:7b",
+                        "stream": False,
+                        "tools": [{"type": "function", "function": {"name": "get_current_time"}}],
+                        "messages": [{"role": "user", "content": "[bench:t1] what time is it?"}],
+                    },
+                )
+        assert resp.json()["message"]["tool_calls"][0]["function"]["name"] == "get_current_time"
+        mark = app.state.bench.marks["t1"]
+        assert mark.arrived <= mark.first_token <= mark.finished
+
+    async def test_direct_load_reports_stages(self):
+        app = build_fake_app(FakeBackendConfig(response_tokens=4, tokens_per_second=1000))
+        with BackgroundServer(app) as server:
+            async with httpx.AsyncClient() as client:
+                send = ollama_sender(client, server.url, app.state.bench, stream=True)
+                result = await run_load("direct-stream", send, concurrency=4, requests=8)
+        summary = result.summary()
+        assert summary["errors"] == 0
+        assert summary["ttft_ms"]["p50"] > 0
+        assert {"dispatch", "generation", "relay"} <= set(summary["stages_p50_ms"])
+
+    async def test_full_stack_smoke(self):
+        results = await run_benchmarks(
+            ["web-stream", "web", "proxy-stream", "proxy"],
+            concurrency=[2],
+            requests=4,
+            backend_config=FakeBackendConfig(response_tokens=4, tokens_per_second=1000),
+        )
+        assert [r["scenario"] for r in results] == ["web-stream", "web", "proxy-stream", "proxy"]
+        for r in results:
+            assert r["errors"] == 0, r["first_error"]
+
+    async def test_planner_quality_and_cached_latency(self):
+        plan = {
+            "steps": [
+                {
+                    "type": "tool",
+                    "description": f"search {q}",
+                    "tool_name": "web_search",
+                    "tool_args": {"query": q},
+                    "depends_on": [],
+                }
+                for q in ("solar", "wind")
+            ]
+            + [{"type": "llm", "description": "write the doc", "depends_on": [0, 1]}]
+        }
+        config = FakeBackendConfig(first_token_latency=0.05, response_text=json.dumps(plan))
+        tools = [{"name": "web_search", "description": "Search the web"}]
+        app = build_fake_app(config)
+        with BackgroundServer(app) as server:
+            planner = TaskPlanner(ollama_host=server.url, model="qwen2.5:0.5b")
+            orch = TaskOrchestrator(planner=planner)
+            try:
+                start = time.perf_counter()
+                cold = await orch.build_plan_from_llm("Research solar and wind, then write", tools)
+                cold_s = time.perf_counter() - start
+                start = time.perf_counter()
+                warm = await orch.build_plan_from_llm(
+                    "research solar and wind,  then write.", tools
+                )
+                warm_s = time.perf_counter() - start
+            finally:
+                await planner.close()
+
+        assert len(cold.steps) == 3 and len(warm.steps) == 3
+        assert [cold.dependencies(s) for s in cold.steps] == [[], [], [0, 1]]
+        assert app.state.bench.requests == 1
+        assert warm_s < cold_s
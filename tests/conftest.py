@@ -25,6 +25,14 @@ def temp_dir():
     shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep the tool manifest and file caches out of the working tree's data/ directory."""
+    monkeypatch.setenv("PORTAL_TOOL_MANIFEST", str(tmp_path / "tool_manifest.json"))
+    monkeypatch.setenv("PORTAL_TABULAR_CACHE_DB", str(tmp_path / "tabular_profiles.db"))
+    monkeypatch.setenv("PORTAL_OCR_CACHE_DB", str(tmp_path / "ocr_pages.db"))
+
+
 @pytest.fixture
 def mock_file_system(temp_dir):
     """Mock file system with a test directory."""
@@ -0,0 +1,135 @@
+"""Tests for the resident model pool shared by the generation MCP servers"""
+
+import threading
+import time
+
+import pytest
+
+from portal_mcp.generation.model_pool import ResidentModelPool, estimate_model_mb
+
+
+class _StubModel:
+    """Stand-in for a TTS/MusicGen model: slow to load, cheap to run."""
+
+    def __init__(self, name: str, load_delay: float = 0.0):
+        time.sleep(load_delay)
+        self.name = name
+        self.calls = 0
+
+    def generate(self, text: str) -> str:
+        self.calls += 1
+        return f"{self.name}:{text}"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _loader(name: str, counter: list, delay: float = 0.0):
+    def load():
+        counter.append(name)
+        return _StubModel(name, delay)
+
+    return load
+
+
+class TestResidentModelPool:
+    def test_model_stays_resident_between_calls(self):
+        pool = ResidentModelPool(max_resident_mb=0, idle_timeout=0)
+        loads: list[str] = []
+        for _ in range(3):
+            with pool.use("tts", _loader("tts", loads)) as model:
+                model.generate("hi")
+        assert loads == ["tts"]
+        assert pool.stats()["hits"] == 2
+
+    def test_concurrent_callers_share_one_load(self):
+        pool = ResidentModelPool(max_resident_mb=0, idle_timeout=0)
+        loads: list[str] = []
+        seen: list[int] = []
+
+        def worker():
+            with pool.use("music", _loader("music", loads, delay=0.05)) as model:
+                seen.append(id(model))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert loads == ["music"]
+        assert len(set(seen)) == 1
+
+    def test_lru_eviction_over_budget(self):
+        pool = ResidentModelPool(max_resident_mb=250, idle_timeout=0)
+        loads: list[str] = []
+        unloaded: list[str] = []
+        for key in ("a", "b"):
+            with pool.use(
+                key, _loader(key, loads), size_mb=100, unloader=lambda m: unloaded.append(m.name)
+            ):
+                pass
+        with pool.use("a", _loader("a", loads), size_mb=100):  # "a" becomes most recent
+            pass
+        with pool.use("c", _loader("c", loads), size_mb=100):
+            pass
+
+        assert unloaded == ["b"]
+        assert set(pool.stats()["resident"]) == {"a", "c"}
+        assert pool.stats()["evictions"] == 1
+
+    def test_in_use_model_is_not_evicted(self):
+        pool = ResidentModelPool(max_resident_mb=150, idle_timeout=0)
+        loads: list[str] = []
+        with pool.use("a", _loader("a", loads), size_mb=100) as held:
+            with pool.use("b", _loader("b", loads), size_mb=100):
+                pass
+            assert held.generate("x") == "a:x"
+            # "b" could not displace the held model, so it is dropped once released
+            assert set(pool.stats()["resident"]) == {"a"}
+        assert set(pool.stats()["resident"]) == {"a"}
+
+    def test_idle_models_unloaded(self):
+        clock = _Clock()
+        pool = ResidentModelPool(max_resident_mb=0, idle_timeout=60, clock=clock)
+        pool._stop.set()  # drive eviction manually instead of via the reaper thread
+        loads: list[str] = []
+        with pool.use("a", _loader("a", loads)):
+            pass
+        clock.now = 30
+        with pool.use("b", _loader("b", loads)):
+            pass
+
+        clock.now = 70
+        assert pool.evict_idle() == ["a"]
+        assert set(pool.stats()["resident"]) == {"b"}
+
+        with pool.use("a", _loader("a", loads)):
+            pass
+        assert loads == ["a", "b", "a"]
+
+    def test_failed_load_is_not_cached(self):
+        pool = ResidentModelPool(max_resident_mb=0, idle_timeout=0)
+
+        def broken():
+            raise RuntimeError("checkpoint missing")
+
+        with pytest.raises(RuntimeError):
+            with pool.use("tts", broken):
+                pass
+        assert pool.stats()["resident"] == {}
+
+        loads: list[str] = []
+        with pool.use("tts", _loader("tts", loads)) as model:
+            assert model.name == "tts"
+
+    def test_estimate_model_mb_with_torch_module(self):
+        torch = pytest.importorskip("torch")
+        model = torch.nn.Linear(256, 1024)  # (256*1024 + 1024) float32 params
+        assert estimate_model_mb(model) == pytest.approx(1.0039, rel=1e-3)
+        assert estimate_model_mb(object()) == 0.0
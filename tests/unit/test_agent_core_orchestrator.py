@@ -1,4 +1,6 @@
 """Integration tests for AgentCore orchestrator wiring"""
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
 from portal.core.agent_core import AgentCore
@@ -63,3 +65,40 @@ class TestAgentCoreOrchestrator:
         """AgentCore should have orchestrator attribute"""
         assert hasattr(agent_core, "_orchestrator")
         assert agent_core._orchestrator is not None
+
+    # Planned tool steps run without a confirmation prompt
+    @pytest.mark.asyncio
+    async def test_call_tool_refuses_confirmation_tools(self, agent_core):
+        """A planned step naming a confirmation-gated tool is rejected, not run"""
+        from portal.core.exceptions import ToolExecutionError
+
+        tool = MagicMock()
+        tool.metadata.requires_confirmation = True
+        agent_core.tool_registry.get_tool = MagicMock(return_value=tool)
+        agent_core.tool_runtime.run = AsyncMock()
+
+        with pytest.raises(ToolExecutionError, match="requires confirmation"):
+            await agent_core._call_tool("shell_safety", {"command": "rm -rf /"})
+        agent_core.tool_runtime.run.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_planner_not_offered_confirmation_tools(self, agent_core):
+        """Only tools that run without confirmation reach the planner"""
+        agent_core.tool_registry.get_tool_list = MagicMock(
+            return_value=[
+                {"name": "web_search", "requires_confirmation": False},
+                {"name": "shell_safety", "requires_confirmation": True},
+            ]
+        )
+        agent_core._orchestrator.build_plan_from_llm = AsyncMock(
+            return_value=agent_core._orchestrator.build_plan("goal")
+        )
+        agent_core._orchestrator.execute = AsyncMock()
+        agent_core._save_message = AsyncMock()
+
+        await agent_core._handle_orchestrated_request(
+            "chat", "Step 1: x. Step 2: y", agent_core._normalize_interface("web"), {}, None, 0.0
+        )
+
+        tools = agent_core._orchestrator.build_plan_from_llm.await_args.args[1]
+        assert [t["name"] for t in tools] == ["web_search"]
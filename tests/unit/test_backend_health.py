@@ -0,0 +1,148 @@
+"""Tests for BackendHealthMonitor — cached readiness, adaptive intervals, invalidation."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from portal.routing.backend_health import BackendHealthMonitor
+from portal.routing.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def _backend(available=True) -> AsyncMock:
+    backend = AsyncMock()
+    backend.is_available.return_value = available
+    return backend
+
+
+class TestCachedReadiness:
+    @pytest.mark.asyncio
+    async def test_first_call_probes_then_uses_cache(self):
+        backend = _backend()
+        monitor = BackendHealthMonitor({"ollama": backend}, min_interval=30)
+        assert await monitor.is_available("ollama") is True
+        assert await monitor.is_available("ollama") is True
+        assert backend.is_available.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_backend_is_unavailable(self):
+        monitor = BackendHealthMonitor({})
+        assert await monitor.is_available("missing") is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_probe(self):
+        backend = _backend()
+
+        async def slow_probe():
+            await asyncio.sleep(0.05)
+            return True
+
+        backend.is_available.side_effect = slow_probe
+        monitor = BackendHealthMonitor({"ollama": backend})
+        results = await asyncio.gather(*(monitor.is_available("ollama") for _ in range(5)))
+        assert all(results)
+        assert backend.is_available.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_probe_exception_recorded_as_error(self):
+        backend = _backend()
+        backend.is_available.side_effect = RuntimeError("connection refused")
+        monitor = BackendHealthMonitor({"ollama": backend})
+        assert await monitor.is_available("ollama") is False
+        assert monitor.get_state("ollama").last_error == "connection refused"
+
+    @pytest.mark.asyncio
+    async def test_probe_timeout_marks_unavailable(self):
+        backend = _backend()
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        backend.is_available.side_effect = hang
+        monitor = BackendHealthMonitor({"ollama": backend}, probe_timeout=0.01)
+        assert await monitor.is_available("ollama") is False
+        assert "timed out" in monitor.get_state("ollama").last_error
+
+
+class TestAdaptiveInterval:
+    @pytest.mark.asyncio
+    async def test_interval_doubles_while_healthy_and_caps(self):
+        monitor = BackendHealthMonitor({"ollama": _backend()}, min_interval=1, max_interval=3)
+        await monitor.probe("ollama")
+        assert monitor.get_state("ollama").interval == 1
+        await monitor.probe("ollama")
+        assert monitor.get_state("ollama").interval == 2
+        await monitor.probe("ollama")
+        await monitor.probe("ollama")
+        assert monitor.get_state("ollama").interval == 3
+
+    @pytest.mark.asyncio
+    async def test_failure_resets_interval(self):
+        backend = _backend()
+        monitor = BackendHealthMonitor({"ollama": backend}, min_interval=1, max_interval=8)
+        for _ in range(3):
+            await monitor.probe("ollama")
+        assert monitor.get_state("ollama").interval == 4
+        backend.is_available.return_value = False
+        await monitor.probe("ollama")
+        state = monitor.get_state("ollama")
+        assert state.interval == 1 and state.consecutive_failures == 1
+
+
+class TestInvalidation:
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reprobe(self):
+        backend = _backend()
+        monitor = BackendHealthMonitor({"ollama": backend}, min_interval=30)
+        await monitor.is_available("ollama")
+        monitor.invalidate("ollama", "HTTP 500")
+        backend.is_available.return_value = False
+        assert await monitor.is_available("ollama") is False
+        assert backend.is_available.await_count == 2
+
+    def test_record_success_refreshes_without_probe(self):
+        backend = _backend()
+        monitor = BackendHealthMonitor({"ollama": backend}, min_interval=30)
+        monitor.record_success("ollama")
+        assert monitor.is_fresh("ollama")
+        assert monitor.get_state("ollama").available is True
+        backend.is_available.assert_not_called()
+
+
+class TestBackgroundLoop:
+    @pytest.mark.asyncio
+    async def test_loop_probes_and_stops(self):
+        backend = _backend()
+        monitor = BackendHealthMonitor({"ollama": backend}, min_interval=0.01, max_interval=0.02)
+        await monitor.start()
+        assert monitor.running
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        assert not monitor.running
+        assert backend.is_available.await_count >= 2
+        assert monitor.snapshot()["ollama"]["available"] is True
+
+
+class TestCircuitBreakerIntegration:
+    @pytest.mark.asyncio
+    async def test_passing_probe_half_opens_circuit_early(self):
+        monitor = BackendHealthMonitor({"ollama": _backend()})
+        cb = CircuitBreaker(failure_threshold=1, recovery_timeout=999, health_monitor=monitor)
+        cb.record_failure("ollama")
+        assert cb.should_allow_request("ollama")[0] is False
+        cb.last_failure_times["ollama"] = time.time() - cb.probe_recovery_delay - 1
+        await monitor.probe("ollama")
+        allowed, _ = cb.should_allow_request("ollama")
+        assert allowed and cb.states["ollama"] == CircuitState.HALF_OPEN
+
+    @pytest.mark.asyncio
+    async def test_probe_right_after_failure_does_not_half_open(self):
+        monitor = BackendHealthMonitor({"ollama": _backend()})
+        cb = CircuitBreaker(failure_threshold=1, recovery_timeout=999, health_monitor=monitor)
+        cb.record_failure("ollama")
+        monitor.invalidate("ollama", "model failed to load")
+        assert await monitor.is_available("ollama") is True  # server up, generation broken
+        allowed, reason = cb.should_allow_request("ollama")
+        assert allowed is False and reason.startswith("circuit_open_wait")
+        assert cb.states["ollama"] == CircuitState.OPEN
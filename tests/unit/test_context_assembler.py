@@ -0,0 +1,173 @@
+"""Unit tests for portal.core.context_assembler — token-budgeted prompt assembly."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from portal.core.context_assembler import (
+    ContextAssembler,
+    estimate_tokens,
+    message_tokens,
+    truncate_to_tokens,
+)
+from portal.core.context_manager import ContextManager
+
+
+@pytest.fixture()
+def ctx(tmp_path) -> ContextManager:
+    return ContextManager(db_path=tmp_path / "ctx.db", flush_interval=0)
+
+
+async def _history(ctx: ContextManager, turns: int, words: int = 40) -> list:
+    for i in range(turns):
+        role = "user" if i % 2 == 0 else "assistant"
+        await ctx.add_message("c1", role, f"turn{i} " + "word " * words, "web")
+    return await ctx.get_history("c1")
+
+
+def _total(messages: list[dict]) -> int:
+    return sum(message_tokens(m) for m in messages)
+
+
+# ---------------------------------------------------------------------------
+# Token estimates
+# ---------------------------------------------------------------------------
+
+
+def test_estimate_tokens_counts_words_and_punctuation() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hi you") == 2
+    assert estimate_tokens("hello, world!") == 6  # five-letter words count as 2
+    assert estimate_tokens("a" * 40) == 10
+
+
+def test_truncate_keeps_head_or_tail() -> None:
+    text = " ".join(f"w{i}" for i in range(200))
+    head = truncate_to_tokens(text, 20)
+    tail = truncate_to_tokens(text, 20, keep="tail")
+    assert head.startswith("w0 ") and estimate_tokens(head) <= 20
+    assert tail.endswith("w199") and estimate_tokens(tail) <= 20
+    assert truncate_to_tokens("short", 20) == "short"
+
+
+# ---------------------------------------------------------------------------
+# Assembly
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_no_window_sends_everything(ctx: ContextManager) -> None:
+    history = await _history(ctx, 4)
+    turn = [{"role": "user", "content": "now"}]
+    messages = await ContextAssembler(ctx).assemble("c1", "sys", history, turn, None)
+
+    assert messages[0] == {"role": "system", "content": "sys"}
+    assert len(messages) == 6
+    assert messages[-1] == turn[0]
+
+
+@pytest.mark.asyncio
+async def test_history_fits_budget_and_keeps_newest(ctx: ContextManager) -> None:
+    history = await _history(ctx, 30)
+    assembler = ContextAssembler(ctx, output_reserve=100)
+    turn = [{"role": "user", "content": "latest question"}]
+    messages = await assembler.assemble("c1", "sys", history, turn, 800, summarize=False)
+
+    assert _total(messages) <= assembler.input_budget(800)
+    assert messages[-1] == turn[0]
+    assert messages[-2]["content"].startswith("turn29 ")
+    assert await ctx.get_summary("c1") is None
+
+
+@pytest.mark.asyncio
+async def test_trimmed_history_folds_into_stored_summary(ctx: ContextManager) -> None:
+    history = await _history(ctx, 30)
+    prompts: list[str] = []
+
+    async def summarizer(prompt: str, max_tokens: int) -> str:
+        prompts.append(prompt)
+        return "the user counted turns"
+
+    assembler = ContextAssembler(ctx, summarizer=summarizer, output_reserve=100)
+    turn = [{"role": "user", "content": "q"}]
+    messages = await assembler.assemble("c1", "sys", history, turn, 800)
+
+    assert len(prompts) == 1 and "turn0 " in prompts[0]
+    assert "Summary of the earlier conversation:\nthe user counted turns" in messages[0]["content"]
+    assert _total(messages) <= assembler.input_budget(800)
+    stored = await ctx.get_summary("c1")
+    assert stored is not None and stored.summary == "the user counted turns"
+
+    # Summarized turns are skipped next time, and the low-water mark leaves
+    # room for the new turn without another summarization pass
+    await ctx.add_message("c1", "assistant", "reply " * 10, "web")
+    history = await ctx.get_history("c1")
+    messages = await assembler.assemble("c1", "sys", history, turn, 800)
+    assert len(prompts) == 1
+    assert not any(m["content"].startswith("turn0 ") for m in messages[1:])
+
+
+@pytest.mark.asyncio
+async def test_summarizer_failure_falls_back_to_extractive(ctx: ContextManager) -> None:
+    history = await _history(ctx, 30)
+
+    async def broken(prompt: str, max_tokens: int) -> str:
+        raise RuntimeError("model down")
+
+    assembler = ContextAssembler(ctx, summarizer=broken, output_reserve=100)
+    await assembler.assemble("c1", "sys", history, [{"role": "user", "content": "q"}], 800)
+
+    stored = await ctx.get_summary("c1")
+    # The newest dropped turns survive when the fallback summary is cut
+    assert stored is not None and "- assistant: turn" in stored.summary
+
+
+@pytest.mark.asyncio
+async def test_oversized_turn_is_truncated(ctx: ContextManager) -> None:
+    assembler = ContextAssembler(ctx, output_reserve=100)
+    turn = [
+        {"role": "user", "content": "memory " * 50 + "User message:\nwhat now?"},
+        {"role": "tool", "content": "[search] " + "result " * 2000},
+    ]
+    messages = await assembler.assemble("c1", "sys", [], turn, 800)
+
+    assert _total(messages) <= assembler.input_budget(800)
+    assert messages[1]["content"].endswith("what now?")
+    assert messages[2]["content"].startswith("[search] result")
+
+
+# ---------------------------------------------------------------------------
+# AgentCore wiring
+# ---------------------------------------------------------------------------
+
+
+def test_agent_core_uses_smallest_window_in_model_chain() -> None:
+    from portal.core.agent_core import AgentCore
+
+    core = MagicMock()
+    windows = {"big": MagicMock(context_window=32768), "small": MagicMock(context_window=8192)}
+    core.model_registry.get_model.side_effect = windows.get
+    decision = MagicMock(model_id="big", fallback_models=["small", "unknown"])
+
+    assert AgentCore._context_window(core, decision) == 8192
+    decision.fallback_models = []
+    decision.model_id = "unknown"
+    assert AgentCore._context_window(core, decision) is None
+
+
+@pytest.mark.asyncio
+async def test_agent_core_fetches_every_unsummarized_message(tmp_path) -> None:
+    from portal.core.agent_core import AgentCore
+    from portal.core.types import InterfaceType
+
+    ctx = ContextManager(max_context_messages=10, db_path=tmp_path / "ctx.db", flush_interval=0)
+    await _history(ctx, 30)
+    core = MagicMock(context_manager=ctx, history_fetch_limit=1000)
+    core.tool_registry.get_all_tools.return_value = []
+
+    _, _, history = await AgentCore._build_execution_context(core, "c1", InterfaceType.WEB, {})
+    assert len(history) == 30  # not cut to max_context_messages before it is summarized
+
+    await ctx.set_summary("c1", "first twenty", history[19].timestamp)
+    _, _, history = await AgentCore._build_execution_context(core, "c1", InterfaceType.WEB, {})
+    assert [m.content.split()[0] for m in history] == [f"turn{i}" for i in range(20, 30)]
@@ -236,3 +236,151 @@ class TestMessagePruning:
                 "SELECT COUNT(*) FROM conversations WHERE content = 'stale'"
             ).fetchone()
         assert row[0] == 0, "Stale message should have been pruned after _PRUNE_INTERVAL inserts"
+
+
+# ---------------------------------------------------------------------------
+# Hot-session cache and write-behind batching
+# ---------------------------------------------------------------------------
+
+
+def _db_count(ctx: ContextManager, chat_id: str) -> int:
+    import sqlite3
+
+    with sqlite3.connect(ctx.db_path) as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM conversations WHERE chat_id = ?", (chat_id,)
+        ).fetchone()[0]
+
+
+class TestWriteBehind:
+    @pytest.mark.asyncio
+    async def test_messages_visible_before_flush(self, tmp_path) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", flush_interval=60)
+        await ctx.get_history("c1")  # warm the cache
+        await ctx.add_message("c1", "user", "hello", "web")
+        assert _db_count(ctx, "c1") == 0
+        history = await ctx.get_history("c1")
+        assert [m.content for m in history] == ["hello"]
+        await ctx.close()
+
+    @pytest.mark.asyncio
+    async def test_uncached_read_flushes_pending(self, tmp_path) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", flush_interval=60)
+        await ctx.add_message("c1", "user", "hello", "web")
+        history = await ctx.get_history("c1")
+        assert [m.content for m in history] == ["hello"]
+        assert _db_count(ctx, "c1") == 1
+        await ctx.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_committed_in_one_transaction(self, tmp_path, monkeypatch) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", flush_interval=60)
+        batches = []
+        original = ctx._sync_add_messages
+
+        def spy(rows):
+            batches.append(len(rows))
+            original(rows)
+
+        monkeypatch.setattr(ctx, "_sync_add_messages", spy)
+        for i in range(5):
+            await ctx.add_message(f"c{i % 2}", "user", f"m{i}", "web")
+        await ctx.flush()
+        assert batches == [5]
+        assert _db_count(ctx, "c0") == 3 and _db_count(ctx, "c1") == 2
+        await ctx.close()
+
+    @pytest.mark.asyncio
+    async def test_background_flush_after_interval(self, tmp_path) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", flush_interval=0.01)
+        await ctx.add_message("c1", "user", "hello", "web")
+        await asyncio.sleep(0.1)
+        assert _db_count(ctx, "c1") == 1
+        await ctx.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_durably(self, tmp_path) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", flush_interval=60)
+        await ctx.add_message("c1", "user", "persist me", "web")
+        await ctx.close()
+
+        reopened = ContextManager(db_path=tmp_path / "wb.db")
+        history = await reopened.get_history("c1")
+        assert [m.content for m in history] == ["persist me"]
+
+    @pytest.mark.asyncio
+    async def test_cached_reads_skip_sqlite(self, tmp_path, monkeypatch) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", flush_interval=60)
+        await ctx.add_message("c1", "user", "hello", "web")
+        await ctx.get_history("c1")
+
+        def fail(*args):
+            raise AssertionError("SQLite read on a cached session")
+
+        monkeypatch.setattr(ctx, "_sync_get_history", fail)
+        await ctx.add_message("c1", "assistant", "hi", "web")
+        formatted = await ctx.get_formatted_history("c1")
+        assert [m["content"] for m in formatted] == ["hello", "hi"]
+        await ctx.close()
+
+    @pytest.mark.asyncio
+    async def test_session_cache_is_bounded(self, tmp_path) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", max_cached_sessions=2)
+        for chat_id in ("a", "b", "c"):
+            await ctx.get_history(chat_id)
+        assert list(ctx._sessions) == ["b", "c"]
+        await ctx.close()
+
+    @pytest.mark.asyncio
+    async def test_clear_drops_pending_messages(self, tmp_path) -> None:
+        ctx = ContextManager(db_path=tmp_path / "wb.db", flush_interval=60)
+        await ctx.add_message("c1", "user", "gone", "web")
+        await ctx.add_message("c2", "user", "kept", "web")
+        await ctx.clear_history("c1")
+        await ctx.flush()
+        assert _db_count(ctx, "c1") == 0 and _db_count(ctx, "c2") == 1
+        assert await ctx.get_history("c1") == []
+        await ctx.close()
+
+
+class TestConversationSummary:
+    @pytest.mark.asyncio
+    async def test_summary_round_trip_across_instances(self, tmp_path) -> None:
+        ctx = ContextManager(db_path=tmp_path / "ctx.db")
+        assert await ctx.get_summary("c1") is None
+        await ctx.set_summary("c1", "user likes tea", "2026-01-01T00:00:00+00:00")
+        await ctx.close()
+
+        reopened = ContextManager(db_path=tmp_path / "ctx.db")
+        summary = await reopened.get_summary("c1")
+        assert summary is not None
+        assert summary.summary == "user likes tea"
+        assert summary.through == "2026-01-01T00:00:00+00:00"
+
+    @pytest.mark.asyncio
+    async def test_clear_history_drops_summary(self, ctx: ContextManager) -> None:
+        await ctx.set_summary("c1", "old", "2026-01-01T00:00:00+00:00")
+        await ctx.clear_history("c1")
+        assert await ctx.get_summary("c1") is None
+
+    @pytest.mark.asyncio
+    async def test_history_since_reaches_past_the_context_window(self, ctx: ContextManager) -> None:
+        for i in range(25):
+            await ctx.add_message("c1", "user", f"m{i}", "web")
+        everything = await ctx.get_history_since("c1", None, 100)
+        assert len(everything) == 25 > ctx.max_context_messages
+
+        after = everything[4].timestamp
+        assert [m.content for m in await ctx.get_history_since("c1", after, 100)] == [
+            f"m{i}" for i in range(5, 25)
+        ]
+        assert len(await ctx.get_history_since("c1", after, 3)) == 3
+
+        await ctx.get_history("c1")  # caches the newest ten
+        recent = everything[20].timestamp
+        assert [m.content for m in await ctx.get_history_since("c1", recent, 100)] == [
+            "m21",
+            "m22",
+            "m23",
+            "m24",
+        ]
@@ -10,6 +10,7 @@ Tests for:
 import asyncio
 import importlib.util
 import json
+import sqlite3
 import time
 
 import pytest
@@ -296,7 +297,7 @@ class TestDataIntegrityIntegration:
         """Test rate limiter performs well under load"""
         from portal.security.rate_limiter import RateLimiter
 
-        persist_path = tmp_path / "load_test.json"
+        persist_path = tmp_path / "load_test.db"
         limiter = RateLimiter(max_requests=100, window_seconds=60, persist_path=persist_path)
 
         for user_id in range(10):
@@ -305,10 +306,10 @@ class TestDataIntegrityIntegration:
 
         limiter._flush_if_dirty()
         assert persist_path.exists()
-        with open(persist_path) as f:
-            data = json.load(f)
-            assert "requests" in data
-            assert "violations" in data
+        with sqlite3.connect(persist_path) as conn:
+            rows = conn.execute("SELECT key, total, violations FROM buckets").fetchall()
+        assert len(rows) == 10
+        assert all(total == 5 and violations == 0 for _, total, violations in rows)
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@ from collections import deque
 
 import pytest
 
-from portal.core.event_bus import Event, EventBus, EventEmitter, EventType
+from portal.core.event_bus import Event, EventBus, EventEmitter, EventType, OverflowPolicy
 
 
 class TestEventBus:
@@ -110,6 +110,132 @@ class TestEventBus:
         bus.unsubscribe(EventType.PROCESSING_STARTED, other_handler)
 
 
+class TestEventBusQueues:
+    @pytest.mark.asyncio
+    async def test_publish_does_not_wait_for_slow_subscriber(self):
+        bus = EventBus()
+        release = asyncio.Event()
+        events = []
+
+        async def slow_handler(event):
+            await release.wait()
+            events.append(event)
+
+        bus.subscribe(EventType.PROCESSING_STARTED, slow_handler)
+        await asyncio.wait_for(bus.publish(EventType.PROCESSING_STARTED, "c1", {}), timeout=0.5)
+        assert events == []
+
+        release.set()
+        assert await bus.drain(timeout=1.0)
+        assert len(events) == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest_events(self):
+        bus = EventBus(queue_size=2)
+        release = asyncio.Event()
+        seen = []
+
+        async def handler(event):
+            await release.wait()
+            seen.append(event.data["n"])
+
+        bus.subscribe(EventType.TOOL_PROGRESS, handler)
+        for n in range(5):
+            await bus.publish(EventType.TOOL_PROGRESS, "c1", {"n": n})
+            await asyncio.sleep(0)  # let the worker pick up the first event
+        release.set()
+        await bus.drain(timeout=1.0)
+
+        assert seen == [0, 3, 4]
+        assert bus.stats()[0]["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_block_policy_applies_backpressure(self):
+        bus = EventBus()
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        bus.subscribe(EventType.TOOL_PROGRESS, handler, queue_size=1, overflow_policy="block")
+        await bus.publish(EventType.TOOL_PROGRESS, "c1", {})
+        await asyncio.sleep(0)
+        await bus.publish(EventType.TOOL_PROGRESS, "c1", {})
+
+        blocked = asyncio.create_task(bus.publish(EventType.TOOL_PROGRESS, "c1", {}))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        release.set()
+        await asyncio.wait_for(blocked, timeout=1.0)
+        await bus.drain(timeout=1.0)
+        assert bus.stats()[0]["delivered"] == 3 and bus.stats()[0]["dropped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sample_policy_thins_a_backlog(self):
+        bus = EventBus(queue_size=10, overflow_policy=OverflowPolicy.SAMPLE, sample_every=5)
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        bus.subscribe(EventType.TOOL_PROGRESS, handler)
+        for n in range(50):
+            await bus.publish(EventType.TOOL_PROGRESS, "c1", {"n": n})
+        stats = bus.stats()[0]
+
+        assert stats["queued"] <= 10
+        assert stats["dropped"] == 50 - stats["queued"]
+        release.set()
+        await bus.drain(timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_stats_report_lag_and_failures(self):
+        bus = EventBus()
+
+        async def slow(event):
+            await asyncio.sleep(0.02)
+
+        async def broken(event):
+            raise RuntimeError("boom")
+
+        bus.subscribe(EventType.MODEL_COMPLETED, slow)
+        bus.subscribe(EventType.MODEL_COMPLETED, broken)
+        for _ in range(3):
+            await bus.publish(EventType.MODEL_COMPLETED, "c1", {})
+        await bus.drain(timeout=1.0)
+
+        slow_stats, broken_stats = bus.stats()
+        assert slow_stats["delivered"] == 3 and slow_stats["max_lag"] >= 0.02
+        assert broken_stats["failed"] == 3 and broken_stats["delivered"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sync_callbacks_are_supported(self):
+        bus = EventBus()
+        events = []
+        bus.subscribe(EventType.PROCESSING_STARTED, events.append)
+        await bus.publish(EventType.PROCESSING_STARTED, "c1", {})
+        await bus.drain(timeout=1.0)
+        assert len(events) == 1
+
+    @pytest.mark.asyncio
+    async def test_close_delivers_queued_events_and_stops_workers(self):
+        bus = EventBus()
+        events = []
+
+        async def handler(event):
+            await asyncio.sleep(0.01)
+            events.append(event)
+
+        bus.subscribe(EventType.PROCESSING_COMPLETED, handler)
+        for _ in range(3):
+            await bus.publish(EventType.PROCESSING_COMPLETED, "c1", {})
+        await bus.close()
+
+        assert len(events) == 3
+        assert bus._subscribers[EventType.PROCESSING_COMPLETED][0].worker is None
+
+
 class TestEventBusHistory:
     @pytest.mark.asyncio
     async def test_event_history_evicts_oldest(self):
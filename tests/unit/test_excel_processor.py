@@ -198,33 +198,38 @@ class TestAnalyzeExcel:
     async def test_analyze_success(self, temp_dir):
         xlsx_file = temp_dir / "test.xlsx"
         xlsx_file.write_bytes(b"PK")
-        mock_df = MagicMock()
-        mock_df.__len__ = lambda self: 5
-        mock_df.columns = ["name", "value"]
-        mock_df.dtypes.astype.return_value.to_dict.return_value = {
-            "name": "object",
-            "value": "float64",
+        profile = {
+            "rows": 5,
+            "columns": 2,
+            "column_names": ["name", "value"],
+            "sheet": "Sheet1",
+            "cached": False,
+            "preview": [{"name": "A", "value": 10}],
+            "profiles": {
+                "name": {"dtype": "text", "nulls": 0, "top_values": [{"value": "A", "count": 5}]},
+                "value": {
+                    "dtype": "float",
+                    "nulls": 1,
+                    "top_values": [],
+                    "numeric": {"mean": 10.0, "50%": 9.0, "std": 2.0, "min": 5.0, "max": 15.0},
+                },
+            },
         }
-        mock_df.isnull.return_value.sum.return_value.to_dict.return_value = {"name": 0, "value": 1}
-        mock_numeric = MagicMock(columns=["value"])
-        mock_df.select_dtypes.return_value = mock_numeric
-        mock_col = MagicMock()
-        mock_col.mean.return_value = 10.0
-        mock_col.median.return_value = 9.0
-        mock_col.std.return_value = 2.0
-        mock_col.min.return_value = 5.0
-        mock_col.max.return_value = 15.0
-        mock_df.__getitem__ = MagicMock(return_value=mock_col)
-        mock_df.head.return_value.to_dict.return_value = [{"name": "A", "value": 10}]
-        with patch("pandas.read_excel", return_value=mock_df):
+        with patch(
+            "portal.tools.document_processing.excel_processor.profile_file", return_value=profile
+        ):
             result = await _make_tool().execute({"action": "analyze", "file_path": str(xlsx_file)})
         assert result["success"] is True
         assert result["result"]["shape"]["rows"] == 5
+        assert result["result"]["numeric_stats"]["value"]["median"] == 9.0
 
     @pytest.mark.asyncio
     async def test_analyze_exception(self, temp_dir):
         (temp_dir / "test.xlsx").write_bytes(b"PK")
-        with patch("pandas.read_excel", side_effect=RuntimeError("bad file")):
+        with patch(
+            "portal.tools.document_processing.excel_processor.profile_file",
+            side_effect=RuntimeError("bad file"),
+        ):
             result = await _make_tool().execute(
                 {"action": "analyze", "file_path": str(temp_dir / "test.xlsx")}
             )
@@ -143,6 +143,31 @@ class TestExecute:
         result = await engine.execute("hello")
         assert result.success and result.fallbacks_used == 0
 
+    @pytest.mark.asyncio
+    async def test_supplied_routing_decision_skips_router(self):
+        engine = _build_engine()
+        model = _make_model("m1")
+        engine.registry.register(model)
+        engine.router.route = AsyncMock()
+        engine.backends["ollama"].is_available.return_value = True
+        engine.backends["ollama"].generate.return_value = _make_gen_result()
+        decision = _make_routing_decision("m1", model)
+        result = await engine.execute("hello", routing_decision=decision)
+        assert result.success and result.routing_decision is decision
+        engine.router.route.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_availability_cached_across_requests(self):
+        engine = _build_engine()
+        model = _make_model("m1")
+        engine.registry.register(model)
+        engine.router.route = AsyncMock(return_value=_make_routing_decision("m1", model))
+        engine.backends["ollama"].is_available.return_value = True
+        engine.backends["ollama"].generate.return_value = _make_gen_result()
+        await engine.execute("hello")
+        await engine.execute("hello again")
+        assert engine.backends["ollama"].is_available.await_count == 1
+
     @pytest.mark.asyncio
     async def test_fallback_on_backend_failure(self):
         engine = _build_engine()
@@ -210,3 +210,19 @@ class TestShutdown:
 
         await rt.shutdown()
         assert rt.context.accepting_work is False
+
+    @pytest.mark.asyncio
+    async def test_shutdown_flushes_conversation_store(self):
+        """Buffered context messages are flushed once in-flight tasks drain."""
+        rt = Runtime()
+        agent_core = MagicMock()
+        agent_core.context_manager.flush = AsyncMock()
+        rt.context = RuntimeContext(
+            settings=MagicMock(),
+            agent_core=agent_core,
+            secure_agent=AsyncMock(),
+        )
+        rt._initialized = True
+
+        await rt.shutdown()
+        agent_core.context_manager.flush.assert_awaited_once()
@@ -5,18 +5,22 @@ Covers:
 - LLMCategory enum
 - LLMClassification dataclass
 - LLMClassifier: is_available(), classify(), _fallback_to_regex(), stream_classify()
+- LLMClassifier verdict cache: normalization, LRU bound, SQLite persistence, single-flight
 - create_classifier() factory function
 """
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from portal.routing.llm_classifier import (
+    UNPARSED_CONFIDENCE,
     LLMCategory,
     LLMClassification,
     LLMClassifier,
     create_classifier,
+    normalize_query,
 )
 
 
@@ -76,7 +80,7 @@ class TestLLMClassifier:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.get.return_value = mock_response
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             result = await classifier.is_available()
 
@@ -88,7 +92,7 @@ class TestLLMClassifier:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.get.side_effect = Exception("Connection refused")
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             result = await classifier.is_available()
 
@@ -128,7 +132,7 @@ class TestLLMClassifier:
         with patch("httpx.AsyncClient") as mock_client:
             mock_instance = AsyncMock()
             mock_instance.post.side_effect = Exception("Network error")
-            mock_client.return_value.__aenter__.return_value = mock_instance
+            mock_client.return_value = mock_instance
 
             result = await classifier.classify("test query")
 
@@ -157,6 +161,108 @@ class TestLLMClassifier:
         assert result.category == LLMCategory.GENERAL
 
 
+def _llm_response(text: str) -> MagicMock:
+    resp = MagicMock()
+    resp.json.return_value = {"response": text}
+    resp.raise_for_status = MagicMock()
+    return resp
+
+
+class TestClassificationCache:
+    """Tests for the LLM verdict cache and shared client."""
+
+    def _classifier(self, **kwargs) -> tuple[LLMClassifier, AsyncMock]:
+        classifier = LLMClassifier(**kwargs)
+        classifier._llm_available = True
+        client = AsyncMock()
+        client.is_closed = False
+        client.post.return_value = _llm_response("code")
+        classifier._client = client
+        return classifier, client
+
+    def test_normalize_query(self):
+        assert normalize_query("  Write a   Python script!  ") == "write a python script"
+        assert normalize_query("Hello?") == normalize_query("hello")
+
+    @pytest.mark.asyncio
+    async def test_near_repeat_queries_hit_cache(self):
+        classifier, client = self._classifier()
+        first = await classifier.classify("Write a Python script")
+        second = await classifier.classify("write a python  script.")
+        assert first.category == second.category == LLMCategory.CODE
+        assert client.post.await_count == 1
+        assert classifier.cache_hits == 1 and classifier.cache_misses == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded(self):
+        classifier, client = self._classifier(cache_size=2)
+        for query in ("a one", "b two", "c three"):
+            await classifier.classify(query)
+        assert len(classifier._cache) == 2
+        await classifier.classify("a one")
+        assert client.post.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_queries_share_one_call(self):
+        classifier, client = self._classifier()
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return _llm_response("reasoning")
+
+        client.post.side_effect = slow_post
+        results = await asyncio.gather(*(classifier.classify("Why is 2+2=4?") for _ in range(5)))
+        assert all(r.category == LLMCategory.REASONING for r in results)
+        assert client.post.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_llm_call_is_not_cached(self):
+        classifier, client = self._classifier()
+        client.post.side_effect = Exception("Network error")
+        result = await classifier.classify("write a python function to debug the code")
+        assert result.reasoning == "regex_fallback"
+        assert not classifier._cache
+
+    @pytest.mark.asyncio
+    async def test_unparseable_reply_is_low_confidence_and_not_cached(self, tmp_path):
+        classifier, client = self._classifier(cache_db_path=tmp_path / "classifier_cache.db")
+        client.post.return_value = _llm_response("I think this is about code")
+        result = await classifier.classify("write a python script")
+        assert result.category == LLMCategory.GENERAL
+        assert result.confidence == UNPARSED_CONFIDENCE < 0.9
+        assert not classifier._cache
+
+        client.post.return_value = _llm_response("code")
+        assert (await classifier.classify("write a python script")).category == LLMCategory.CODE
+        assert client.post.await_count == 2
+        await classifier.close()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_cache_survives_restart(self, tmp_path):
+        db_path = tmp_path / "classifier_cache.db"
+        classifier, client = self._classifier(cache_db_path=db_path)
+        await classifier.classify("Write a Python script")
+        await classifier.close()
+
+        restarted, restarted_client = self._classifier(cache_db_path=db_path)
+        result = await restarted.classify("write a python script")
+        assert result.category == LLMCategory.CODE
+        restarted_client.post.assert_not_called()
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_key_includes_model(self, tmp_path):
+        db_path = tmp_path / "classifier_cache.db"
+        classifier, _ = self._classifier(cache_db_path=db_path)
+        await classifier.classify("Write a Python script")
+        await classifier.close()
+
+        other, other_client = self._classifier(cache_db_path=db_path, model="llama3:8b")
+        await other.classify("Write a Python script")
+        other_client.post.assert_awaited_once()
+        await other.close()
+
+
 class TestCreateClassifier:
     """Tests for create_classifier factory function."""
 
@@ -190,6 +296,15 @@ class TestCreateClassifier:
         assert classifier.ollama_host == "http://custom:11434"
         assert classifier.model == "llama3:8b"
 
+    def test_create_classifier_cache_db_from_env(self, tmp_path, monkeypatch):
+        """ROUTING_CLASSIFIER_CACHE_DB enables the persistent cache."""
+        db_path = tmp_path / "cache.db"
+        monkeypatch.setenv("ROUTING_CLASSIFIER_CACHE_DB", str(db_path))
+        classifier = create_classifier()
+
+        assert classifier.cache_db_path == db_path
+        assert db_path.exists()
+
 
 class TestLLMCategoryNewValues:
     """Tests for newly added LLMCategory values."""
@@ -6,7 +6,9 @@ Uses unittest.mock to avoid real network calls.
 
 from __future__ import annotations
 
+import asyncio
 import pickle
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -183,6 +185,132 @@ class TestMCPRegistryListTools:
         await registry.close()
 
 
+class TestMCPRegistryDiscovery:
+    """Tests for concurrent discovery, per-server deadlines and the tool cache."""
+
+    @staticmethod
+    def _slow_fetch(delays: dict[str, float], calls: list[str] | None = None):
+        async def fetch(server_name):
+            if calls is not None:
+                calls.append(server_name)
+            await asyncio.sleep(delays.get(server_name, 0))
+            return [{"name": f"{server_name}_tool"}]
+
+        return fetch
+
+    async def _registry(self, *names, **kwargs) -> MCPRegistry:
+        registry = MCPRegistry(**kwargs)
+        for name in names:
+            await registry.register(name, f"http://{name}:9000", transport="streamable-http")
+        return registry
+
+    @pytest.mark.asyncio
+    async def test_discover_fans_out_concurrently(self):
+        """Total discovery time is bounded by the slowest server, not the sum."""
+        registry = await self._registry("a", "b", "c")
+        delays = {"a": 0.1, "b": 0.1, "c": 0.1}
+        with patch.object(registry, "_fetch_tools", side_effect=self._slow_fetch(delays)):
+            start = time.perf_counter()
+            result = await registry.discover_tools()
+            elapsed = time.perf_counter() - start
+
+        assert result == {n: [{"name": f"{n}_tool"}] for n in ("a", "b", "c")}
+        assert elapsed < 0.25
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_server_reported_as_partial(self):
+        """A server missing the deadline maps to None while the others are returned."""
+        registry = await self._registry("fast", "slow")
+        delays = {"slow": 0.3}
+        with patch.object(registry, "_fetch_tools", side_effect=self._slow_fetch(delays)):
+            result = await registry.discover_tools(timeout=0.05)
+            assert result == {"fast": [{"name": "fast_tool"}], "slow": None}
+
+            # The slow fetch keeps running in the background and fills the cache
+            await asyncio.sleep(0.35)
+            assert registry.get_cached_tools("slow") == [{"name": "slow_tool"}]
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_list_cached_within_ttl(self):
+        """list_tools does not refetch while the cached entry is fresh."""
+        registry = await self._registry("svc", tool_cache_ttl=60)
+        calls: list[str] = []
+        with patch.object(registry, "_fetch_tools", side_effect=self._slow_fetch({}, calls)):
+            await registry.list_tools("svc")
+            await registry.list_tools("svc")
+            await registry.discover_tools()
+        assert calls == ["svc"]
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self):
+        """A stale entry is returned at once and refreshed in the background."""
+        registry = await self._registry("svc", tool_cache_ttl=60)
+        registry._tool_cache["svc"] = (time.monotonic() - 120, [{"name": "old"}])
+        calls: list[str] = []
+        with patch.object(registry, "_fetch_tools", side_effect=self._slow_fetch({}, calls)):
+            assert await registry.list_tools("svc") == [{"name": "old"}]
+            await asyncio.sleep(0.01)
+        assert calls == ["svc"]
+        assert registry.get_cached_tools("svc") == [{"name": "svc_tool"}]
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_discovery_falls_back_to_stale_cache(self):
+        registry = await self._registry("svc", tool_cache_ttl=60)
+        registry._tool_cache["svc"] = (time.monotonic() - 120, [{"name": "old"}])
+        with patch.object(registry, "_fetch_tools", AsyncMock(side_effect=httpx.ConnectError("x"))):
+            assert await registry.discover_tools() == {"svc": [{"name": "old"}]}
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_error_status_keeps_stale_tools(self):
+        """A 503 from /tools is a failed fetch, not an empty tool list."""
+        registry = await self._registry("svc", tool_cache_ttl=60)
+        registry._tool_cache["svc"] = (time.monotonic() - 120, [{"name": "old"}])
+        unavailable = httpx.Response(503, request=httpx.Request("GET", "http://svc:9000/tools"))
+        with patch.object(registry, "_request", AsyncMock(return_value=unavailable)):
+            assert await registry.discover_tools() == {"svc": [{"name": "old"}]}
+            with pytest.raises(httpx.HTTPStatusError):
+                await registry._fetch_and_cache_tools("svc")
+        assert registry._tool_cache["svc"][1] == [{"name": "old"}]
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_register_invalidates_cached_tools(self):
+        registry = await self._registry("svc")
+        registry._tool_cache["svc"] = (time.monotonic(), [{"name": "old"}])
+        await registry.register("svc", "http://moved:9000")
+        assert registry.get_cached_tools("svc") is None
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_health_checks_run_concurrently_with_deadline(self):
+        """A hung server is reported degraded without delaying the healthy ones."""
+        registry = await self._registry("ok", "hung", discovery_timeout=0.1)
+        ok_resp = MagicMock(status_code=200)
+
+        async def fake_request(method, url, **kwargs):
+            if "hung" in url:
+                await asyncio.sleep(5)
+            return ok_resp
+
+        with patch.object(registry, "_request", side_effect=fake_request):
+            start = time.perf_counter()
+            detailed = await registry.health_check_all_detailed()
+            summary = await registry.health_check_all()
+            elapsed = time.perf_counter() - start
+
+        assert detailed["ok"]["status"] == "healthy"
+        assert detailed["hung"]["status"] == "degraded"
+        assert detailed["hung"]["error_type"] == "timeout"
+        assert summary == {"ok": True, "hung": False}
+        assert elapsed < 1.0
+        await registry.close()
+
+
 class TestMCPRegistryRetryLogic:
     """Tests for _request() retry behaviour."""
 
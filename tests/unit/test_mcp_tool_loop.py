@@ -31,7 +31,8 @@ def _make_core_with_mcp(config=None):
     mock_prompt_manager.build_system_prompt.return_value = "You are a helpful assistant."
 
     mock_context_manager = AsyncMock()
-    mock_context_manager.get_history.return_value = []
+    mock_context_manager.get_summary.return_value = None
+    mock_context_manager.get_history_since.return_value = []
     mock_context_manager.add_message = AsyncMock()
 
     mock_event_bus = AsyncMock()
@@ -162,6 +163,36 @@ async def test_mcp_loop_respects_max_rounds():
     assert len(tool_results) == 2
 
 
+@pytest.mark.asyncio
+async def test_mcp_loop_routes_once_across_rounds():
+    """Every round of the tool loop reuses the single routing decision."""
+    core = _make_core_with_mcp(config={"mcp_tool_max_rounds": 2})
+
+    seen_decisions = []
+
+    async def always_tool_call(**kwargs):
+        seen_decisions.append(kwargs.get("routing_decision"))
+        m = MagicMock()
+        m.success = True
+        m.tool_calls = [{"tool": "echo", "arguments": {}}]
+        return m
+
+    core.execution_engine.execute = always_tool_call
+    core.mcp_registry.call_tool = AsyncMock(return_value={"ok": True})
+
+    await core._run_execution_with_mcp_loop(
+        query="loop",
+        system_prompt="",
+        available_tools=[],
+        chat_id="test",
+        trace_id="t1",
+    )
+
+    core.router.route.assert_awaited_once()
+    assert len(seen_decisions) == 3
+    assert all(d is core.router.route.return_value for d in seen_decisions)
+
+
 @pytest.mark.asyncio
 async def test_mcp_loop_no_mcp_registry_skips_tools():
     """Without an MCP registry, tool calls are not dispatched."""
@@ -189,7 +220,8 @@ async def test_mcp_loop_no_mcp_registry_skips_tools():
     mock_prompt_manager = MagicMock()
     mock_prompt_manager.build_system_prompt.return_value = ""
     mock_context_manager = AsyncMock()
-    mock_context_manager.get_history.return_value = []
+    mock_context_manager.get_summary.return_value = None
+    mock_context_manager.get_history_since.return_value = []
     mock_event_bus = AsyncMock()
     mock_event_bus.publish = AsyncMock()
 
@@ -256,7 +288,8 @@ def _make_core_for_context_preservation():
     engine = MagicMock(spec=ExecutionEngine)
     event_bus = EventBus()
     context = MagicMock(spec=ContextManager)
-    context.get_history = AsyncMock(return_value=[])
+    context.get_summary = AsyncMock(return_value=None)
+    context.get_history_since = AsyncMock(return_value=[])
     context.get_formatted_history = AsyncMock(return_value=[])
     context.add_message = AsyncMock()
     prompt_mgr = MagicMock(spec=PromptManager)
@@ -293,12 +326,14 @@ async def test_mcp_loop_preserves_context_on_final_execution():
     """
     from portal.routing.execution_engine import ExecutionResult
     from portal.routing.intelligent_router import RoutingDecision, TaskClassification
+    from portal.routing.task_classifier import TaskCategory
 
     core, engine = _make_core_for_context_preservation()
 
     classification = MagicMock(spec=TaskClassification)
     classification.complexity = MagicMock()
     classification.complexity.value = "simple"
+    classification.category = TaskCategory.TOOL_USE
 
     decision = MagicMock(spec=RoutingDecision)
     decision.model_id = "test-model"
@@ -335,3 +370,54 @@ async def test_mcp_loop_preserves_context_on_final_execution():
     )
 
     assert len(tool_results) == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatch_runs_tool_calls_concurrently_in_order():
+    """Independent tool calls from one turn overlap; results keep request order."""
+    import asyncio
+
+    core = _make_core_with_mcp()
+
+    async def slow_call(server, tool, arguments):
+        await asyncio.sleep(0.1)
+        return {"query": arguments["q"]}
+
+    core.mcp_registry.call_tool = AsyncMock(side_effect=slow_call)
+    calls = [{"tool": "web_search", "arguments": {"q": str(i)}} for i in range(3)]
+    calls.append({"tool": "read_file", "arguments": {"q": "3"}})
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await core._dispatch_mcp_tools(calls, "chat", "t1")
+
+    assert loop.time() - start < 0.3
+    assert [r["result"]["query"] for r in results] == ["0", "1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_chats_do_not_share_tool_limits():
+    """Two chats' high-risk calls overlap: limits and serialization are per turn."""
+    import asyncio
+
+    core = _make_core_with_mcp({"mcp_tool_max_rounds": 3, "mcp_tool_max_concurrency": 1})
+    assert core.hitl_middleware is None
+    active = peak = 0
+
+    async def slow_call(server, tool, arguments):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.1)
+        active -= 1
+        return {"ok": True}
+
+    core.mcp_registry.call_tool = AsyncMock(side_effect=slow_call)
+    calls = [{"tool": "bash", "arguments": {"command": "ls"}}, {"tool": "web_fetch"}]
+
+    await asyncio.gather(
+        core._dispatch_mcp_tools(calls, "chat-a", "t1"),
+        core._dispatch_mcp_tools(calls, "chat-b", "t2"),
+    )
+
+    assert peak == 2
@@ -282,3 +282,106 @@ class TestMemoryPruning:
                 "SELECT COUNT(*) FROM memories WHERE content = 'stale memory'"
             ).fetchone()
         assert row[0] == 0, "Stale memory should have been pruned after _PRUNE_INTERVAL inserts"
+
+
+# ---------------------------------------------------------------------------
+# Ranked retrieval (FTS5, embeddings, recency/importance, result cache)
+# ---------------------------------------------------------------------------
+
+
+class TestRankedRetrieval:
+    """Retrieval ranks by relevance, recency and importance through indexed lookups."""
+
+    def test_fts_index_exists(self, mm: MemoryManager) -> None:
+        with sqlite3.connect(mm.db_path) as conn:
+            row = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name='memories_fts'"
+            ).fetchone()
+        assert row is not None
+
+    @pytest.mark.asyncio
+    async def test_relevant_memory_outranks_recent_one(self, mm: MemoryManager) -> None:
+        await mm.add_message("u1", "my favourite database is postgres")
+        for i in range(5):
+            await mm.add_message("u1", f"small talk {i}")
+        items = await mm.retrieve("u1", "which database do I like?", limit=3)
+        assert items[0].text == "my favourite database is postgres"
+        assert items[0].score > items[1].score
+
+    @pytest.mark.asyncio
+    async def test_fts_operators_in_query_are_literal(self, mm: MemoryManager) -> None:
+        await mm.add_message("u1", "NOT a problem")
+        items = await mm.retrieve("u1", 'NOT AND "OR * (near)', limit=3)
+        assert [s.text for s in items] == ["NOT a problem"]
+
+    @pytest.mark.asyncio
+    async def test_importance_and_recency_break_ties(self, mm: MemoryManager) -> None:
+        with sqlite3.connect(mm.db_path) as conn:
+            conn.execute(
+                "INSERT INTO memories (user_id, content, created_at) "
+                "VALUES ('u1', 'deadline is friday', datetime('now', '-60 days'))"
+            )
+            conn.commit()
+        await mm.add_message("u1", "deadline is monday")
+        await mm.add_message("u1", "deadline is tuesday", importance=1.0)
+        items = await mm.retrieve("u1", "deadline", limit=3)
+        assert [s.text for s in items] == [
+            "deadline is tuesday",
+            "deadline is monday",
+            "deadline is friday",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_existing_database_is_indexed_on_open(self, tmp_path: Path) -> None:
+        db = tmp_path / "legacy.db"
+        with sqlite3.connect(db) as conn:
+            conn.execute(
+                "CREATE TABLE memories (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "user_id TEXT NOT NULL, content TEXT NOT NULL, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.execute("INSERT INTO memories (user_id, content) VALUES ('u1', 'legacy fact')")
+            for i in range(5):
+                conn.execute("INSERT INTO memories (user_id, content) VALUES ('u1', ?)", (f"x{i}",))
+            conn.commit()
+        items = await MemoryManager(db_path=db).retrieve("u1", "fact", limit=1)
+        assert [s.text for s in items] == ["legacy fact"]
+
+    @pytest.mark.asyncio
+    async def test_embeddings_find_matches_without_shared_words(self, tmp_path: Path) -> None:
+        vocab = {"car": 0, "automobile": 0, "vehicle": 0, "banana": 1, "fruit": 1}
+
+        def embedder(texts: list[str]) -> list[list[float]]:
+            vectors = []
+            for text in texts:
+                vec = [0.0, 0.0, 0.1]
+                for word in text.lower().split():
+                    if word in vocab:
+                        vec[vocab[word]] += 1.0
+                vectors.append(vec)
+            return vectors
+
+        mm = MemoryManager(db_path=tmp_path / "vec.db", embedder=embedder)
+        await mm.add_message("u1", "I drive an automobile")
+        await mm.add_message("u1", "I like banana bread")
+        items = await mm.retrieve("u1", "car", limit=2)
+        assert items[0].text == "I drive an automobile"
+
+    @pytest.mark.asyncio
+    async def test_results_cached_until_user_writes(self, mm: MemoryManager) -> None:
+        await mm.add_message("u1", "cached fact")
+        first = await mm.retrieve("u1", "fact")
+        with sqlite3.connect(mm.db_path) as conn:
+            conn.execute("DELETE FROM memories")
+            conn.commit()
+        assert await mm.retrieve("u1", "  Fact!") == first
+
+        await mm.add_message("u1", "new fact")
+        assert [s.text for s in await mm.retrieve("u1", "fact")] == ["new fact"]
+
+    @pytest.mark.asyncio
+    async def test_other_users_writes_keep_cache(self, mm: MemoryManager) -> None:
+        await mm.add_message("u1", "cached fact")
+        await mm.retrieve("u1", "fact")
+        await mm.add_message("u2", "unrelated")
+        assert ("fact", 5) in mm._cache["u1"]
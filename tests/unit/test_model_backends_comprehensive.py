@@ -9,6 +9,7 @@ from portal.routing.model_backends import (
     BaseHTTPBackend,
     GenerationResult,
     OllamaBackend,
+    ToolCallChunk,
 )
 
 
@@ -194,6 +195,36 @@ class TestOllamaStream:
             tokens = [t async for t in backend.generate_stream("hi", "test-model")]
         assert tokens == ["ok"]
 
+    @pytest.mark.asyncio
+    async def test_tool_calls_yielded_when_tools_offered(self):
+        backend = OllamaBackend()
+        call = {"function": {"name": "calc", "arguments": {"expr": "1+1"}}}
+        lines = [
+            json.dumps({"message": {"content": "Let me check"}}).encode(),
+            json.dumps({"message": {"content": "", "tool_calls": [call]}}).encode(),
+            json.dumps({"message": {"content": ""}, "done": True}).encode(),
+        ]
+        tools = [{"type": "function", "function": {"name": "calc"}}]
+        with patch.object(
+            backend, "_get_session", return_value=_FakeSession(_FakeResponse(200, lines=lines))
+        ):
+            chunks = [c async for c in backend.generate_stream("hi", "test-model", tools=tools)]
+        assert chunks[0] == "Let me check"
+        assert isinstance(chunks[1], ToolCallChunk)
+        assert chunks[1].tool_calls[0]["tool"] == "calc"
+        assert chunks[1].tool_calls[0]["arguments"] == {"expr": "1+1"}
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_ignored_without_tools(self):
+        backend = OllamaBackend()
+        call = {"function": {"name": "calc", "arguments": {}}}
+        lines = [json.dumps({"message": {"content": "hi", "tool_calls": [call]}}).encode()]
+        with patch.object(
+            backend, "_get_session", return_value=_FakeSession(_FakeResponse(200, lines=lines))
+        ):
+            chunks = [c async for c in backend.generate_stream("hi", "test-model")]
+        assert chunks == ["hi"]
+
     @pytest.mark.asyncio
     async def test_exception_propagates(self):
         """Unhandled exceptions from _get_session now propagate out of generate_stream."""
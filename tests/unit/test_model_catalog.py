@@ -0,0 +1,165 @@
+"""Unit tests for ModelCatalog — cached /v1/models listing, change detection, ETags."""
+
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from portal.interfaces.web.model_catalog import ModelCatalog, etag_matches
+
+
+def _persona(slug: str, name: str) -> str:
+    return f"name: {name}\nslug: {slug}\ncategory: test\nsystem_prompt: You are {name}.\n"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def sources(tmp_path):
+    rules = tmp_path / "router_rules.json"
+    rules.write_text(
+        json.dumps(
+            {
+                "workspaces": {
+                    "_comment_personas": "annotation, not a workspace",
+                    "auto": {"model": "qwen2.5:7b"},
+                    "auto-coding": {"model": "qwen2.5-coder:7b"},
+                }
+            }
+        )
+    )
+    personas = tmp_path / "personas"
+    personas.mkdir()
+    (personas / "reviewer.yaml").write_text(_persona("reviewer", "Code Reviewer"))
+    return rules, personas
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def catalog(sources, clock):
+    rules, personas = sources
+    return ModelCatalog(rules, personas, check_interval=5.0, clock=clock)
+
+
+def _touch(path, content: str) -> None:
+    """Rewrite *path* and bump its mtime so the change is visible at any fs resolution."""
+    st = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestModelCatalog:
+    def test_lists_workspaces_then_personas(self, catalog):
+        snap = catalog.snapshot()
+        assert [(m["id"], m["owned_by"]) for m in snap.models] == [
+            ("auto", "portal-workspace"),
+            ("auto-coding", "portal-workspace"),
+            ("Code Reviewer", "portal-persona"),
+        ]
+        assert [p["slug"] for p in snap.personas] == ["reviewer"]
+        assert snap.version == 1
+
+    def test_falls_back_to_auto_when_empty(self, tmp_path, clock):
+        catalog = ModelCatalog(tmp_path / "missing.json", tmp_path / "none", clock=clock)
+        assert [m["id"] for m in catalog.snapshot().models] == ["auto"]
+
+    def test_served_from_memory_between_checks(self, catalog, monkeypatch):
+        first = catalog.snapshot()
+        monkeypatch.setattr(catalog, "_source_fingerprint", MagicMock(side_effect=AssertionError))
+        assert catalog.snapshot() is first
+
+    def test_unchanged_sources_are_not_reparsed(self, catalog, clock, monkeypatch):
+        first = catalog.snapshot()
+        build = MagicMock(side_effect=AssertionError("rebuilt"))
+        monkeypatch.setattr(catalog, "_build", build)
+        clock.now += 10
+        assert catalog.snapshot() is first
+
+    def test_new_persona_bumps_version_and_etag(self, catalog, sources, clock):
+        first = catalog.snapshot()
+        (sources[1] / "analyst.yaml").write_text(_persona("analyst", "Data Analyst"))
+        clock.now += 10
+        second = catalog.snapshot()
+        assert second.version == 2
+        assert second.etag != first.etag
+        assert "Data Analyst" in [m["id"] for m in second.models]
+
+    def test_rules_change_detected(self, catalog, sources, clock):
+        first = catalog.snapshot()
+        _touch(sources[0], json.dumps({"workspaces": {"auto-research": {}}}))
+        clock.now += 10
+        ids = [m["id"] for m in catalog.snapshot().models]
+        assert "auto-research" in ids and "auto" not in ids
+        assert catalog.snapshot().etag != first.etag
+
+    def test_touch_without_content_change_keeps_etag(self, catalog, sources, clock):
+        first = catalog.snapshot()
+        _touch(sources[1] / "reviewer.yaml", _persona("reviewer", "Code Reviewer"))
+        clock.now += 10
+        assert catalog.snapshot() is first
+
+    def test_invalidate_forces_check(self, catalog, sources):
+        first = catalog.snapshot()
+        (sources[1] / "analyst.yaml").write_text(_persona("analyst", "Data Analyst"))
+        catalog.invalidate()
+        assert catalog.snapshot().version == first.version + 1
+
+
+class TestEtagMatches:
+    def test_matching(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+
+    def test_not_matching(self):
+        assert not etag_matches(None, '"abc"')
+        assert not etag_matches('"abd"', '"abc"')
+
+
+class TestModelsEndpoint:
+    @pytest.fixture
+    def client(self, catalog):
+        from portal.interfaces.web.server import WebInterface
+
+        agent = MagicMock()
+        agent.mcp_registry = None
+        config = MagicMock()
+        config.security.web_api_key = ""
+        iface = WebInterface(agent_core=agent, config=config, secure_agent=MagicMock())
+        iface.model_catalog = catalog
+        return TestClient(iface.app)
+
+    def test_models_carry_etag_and_honour_if_none_match(self, client):
+        resp = client.get("/v1/models")
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        assert resp.json()["data"][0]["id"] == "auto"
+
+        cached = client.get("/v1/models", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+
+    def test_stale_etag_gets_full_body(self, client):
+        resp = client.get("/v1/models", headers={"If-None-Match": '"stale"'})
+        assert resp.status_code == 200
+        assert resp.json()["object"] == "list"
+
+    def test_personas_endpoint_uses_catalogue(self, client):
+        resp = client.get("/v1/personas")
+        assert resp.status_code == 200
+        assert [p["slug"] for p in resp.json()["data"]] == ["reviewer"]
+        assert "etag" in resp.headers
@@ -0,0 +1,208 @@
+"""Tests for portal.routing.model_performance — decayed latency/error estimates."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from portal.routing.execution_engine import ExecutionEngine
+from portal.routing.intelligent_router import IntelligentRouter
+from portal.routing.model_backends import GenerationResult
+from portal.routing.model_performance import DecayingAverage, ModelPerformanceTracker
+from portal.routing.model_registry import ModelMetadata, ModelRegistry, SpeedClass
+from portal.routing.task_classifier import TaskCategory, TaskClassification, TaskComplexity
+
+
+def _model(model_id: str, backend: str = "ollama", **kwargs) -> ModelMetadata:
+    return ModelMetadata(
+        model_id=model_id,
+        backend=backend,
+        display_name=model_id,
+        parameters="7B",
+        quantization="Q4_K_M",
+        **kwargs,
+    )
+
+
+# ---------------------------------------------------------------------------
+# DecayingAverage
+# ---------------------------------------------------------------------------
+
+
+def test_decaying_average_weights_by_elapsed_time() -> None:
+    avg = DecayingAverage(half_life=10.0)
+    avg.update(100.0, now=0.0)
+    avg.update(0.0, now=0.0)  # same instant: minimum weight only
+    assert avg.value == pytest.approx(90.0)
+
+    avg.update(0.0, now=10.0)  # one half-life later: half the weight
+    assert avg.value == pytest.approx(45.0)
+
+
+# ---------------------------------------------------------------------------
+# ModelPerformanceTracker
+# ---------------------------------------------------------------------------
+
+
+def test_static_figures_until_min_samples() -> None:
+    tracker = ModelPerformanceTracker(min_samples=3)
+    fast = _model("fast", speed_class=SpeedClass.FAST)
+    static = tracker.expected_latency(fast)
+
+    tracker.record_success("fast", "ollama", duration_ms=10_000, tokens=10, ttft_ms=2_000)
+    assert tracker.expected_latency(fast) == static
+    assert not tracker.has_observations("fast")
+
+    for _ in range(2):
+        tracker.record_success("fast", "ollama", duration_ms=10_000, tokens=10, ttft_ms=2_000)
+    assert tracker.has_observations("fast")
+    assert tracker.expected_latency(fast) > static
+
+
+def test_throughput_excludes_time_to_first_token() -> None:
+    tracker = ModelPerformanceTracker(min_samples=1)
+    tracker.record_success("m", "ollama", duration_ms=3_000, tokens=100, ttft_ms=1_000)
+    stats = tracker.snapshot()["models"]["m"]
+    assert stats["tokens_per_second"] == 50.0
+    assert stats["ttft_ms"] == 1000.0
+
+
+def test_errors_raise_latency_and_mark_backend_degraded() -> None:
+    tracker = ModelPerformanceTracker(min_samples=2, shed_error_rate=0.5)
+    model = _model("m")
+    tracker.record_success("m", "ollama", duration_ms=1_000, tokens=50)
+    tracker.record_success("m", "ollama", duration_ms=1_000, tokens=50)
+    healthy = tracker.expected_latency(model)
+
+    for _ in range(5):
+        tracker.record_failure("m", "ollama")
+
+    assert tracker.error_rate("m") > 0.5
+    assert tracker.expected_latency(model) > healthy
+    assert tracker.is_degraded("ollama")
+
+
+def test_error_rate_fades_while_idle() -> None:
+    tracker = ModelPerformanceTracker(half_life=10.0, min_samples=1)
+    with patch("portal.routing.model_performance.time.monotonic", return_value=0.0):
+        for _ in range(5):
+            tracker.record_failure("m", "mlx")
+        assert tracker.is_degraded("mlx")
+    with patch("portal.routing.model_performance.time.monotonic", return_value=100.0):
+        assert not tracker.is_degraded("mlx")
+
+
+def test_ttft_spike_over_baseline_marks_backend_degraded() -> None:
+    tracker = ModelPerformanceTracker(half_life=10.0, min_samples=1, degraded_ttft_ratio=3.0)
+    clock = [0.0]
+    with patch("portal.routing.model_performance.time.monotonic", side_effect=lambda: clock[0]):
+        for _ in range(20):
+            clock[0] += 1
+            tracker.record_success("m", "ollama", duration_ms=1_000, tokens=50, ttft_ms=100)
+        assert not tracker.is_degraded("ollama")
+        for _ in range(5):
+            clock[0] += 5
+            tracker.record_success("m", "ollama", duration_ms=3_000, tokens=50, ttft_ms=2_000)
+        assert tracker.is_degraded("ollama")
+
+
+# ---------------------------------------------------------------------------
+# IntelligentRouter with live numbers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def simple_classification() -> TaskClassification:
+    return TaskClassification(
+        complexity=TaskComplexity.SIMPLE,
+        category=TaskCategory.GENERAL,
+        estimated_tokens=100,
+        requires_reasoning=False,
+        requires_code=False,
+        requires_math=False,
+        is_multi_turn=False,
+        confidence=0.9,
+    )
+
+
+def _router(*models: ModelMetadata) -> IntelligentRouter:
+    reg = ModelRegistry.__new__(ModelRegistry)
+    reg.models = {}
+    for m in models:
+        reg.register(m)
+    return IntelligentRouter(
+        reg, performance=ModelPerformanceTracker(min_samples=2), llm_classifier=MagicMock()
+    )
+
+
+def _observe(router: IntelligentRouter, model_id: str, backend: str, tps: float, n: int = 3):
+    for _ in range(n):
+        router.performance.record_success(
+            model_id, backend, duration_ms=1_000 + 100_000 / tps, tokens=100, ttft_ms=1_000
+        )
+
+
+def test_speed_routing_follows_observed_throughput(simple_classification) -> None:
+    router = _router(
+        _model("nominal_fast", speed_class=SpeedClass.ULTRA_FAST),
+        _model("nominal_slow", speed_class=SpeedClass.SLOW),
+    )
+    assert router._route_speed(simple_classification).model_id == "nominal_fast"
+
+    _observe(router, "nominal_fast", "ollama", tps=5)
+    _observe(router, "nominal_slow", "ollama", tps=80)
+    assert router._route_speed(simple_classification).model_id == "nominal_slow"
+
+
+def test_fallback_chain_puts_degraded_backends_last(simple_classification) -> None:
+    primary = _model("primary")
+    router = _router(
+        primary,
+        _model("mlx_best", backend="mlx", general_quality=0.95),
+        _model("ollama_ok", general_quality=0.6),
+    )
+    assert router._build_fallback_chain(primary, simple_classification)[0] == "mlx_best"
+
+    for _ in range(4):
+        router.performance.record_failure("mlx_best", "mlx")
+    assert router._build_fallback_chain(primary, simple_classification) == [
+        "ollama_ok",
+        "mlx_best",
+    ]
+
+
+def test_shed_load_moves_primary_off_degraded_backend() -> None:
+    degraded = _model("mlx_model", backend="mlx")
+    router = _router(degraded, _model("ollama_model"))
+    for _ in range(4):
+        router.performance.record_failure("mlx_model", "mlx")
+
+    model, fallbacks = router._shed_load(degraded, ["ollama_model"])
+    assert model.model_id == "ollama_model"
+    assert fallbacks == ["mlx_model"]
+
+
+# ---------------------------------------------------------------------------
+# ExecutionEngine feeds the router's tracker
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_execution_engine_records_into_router_tracker() -> None:
+    router = _router(_model("m"))
+    engine = ExecutionEngine(router.registry, router, config={"circuit_breaker_enabled": False})
+    backend = AsyncMock()
+    backend.is_available.return_value = True
+    backend.generate.return_value = GenerationResult(
+        text="hi", tokens_generated=40, time_ms=1_500, model_id="m", success=True, ttft_ms=500
+    )
+    engine.backends = {"ollama": backend}
+    engine.health_monitor.backends = engine.backends
+
+    decision = MagicMock(model_id="m", fallback_models=[])
+    for _ in range(2):
+        result = await engine.execute("hi", routing_decision=decision)
+        assert result.success
+
+    assert engine.performance is router.performance
+    stats = engine.get_performance_stats()["models"]["m"]
+    assert stats["samples"] == 2 and stats["tokens_per_second"] == 40.0
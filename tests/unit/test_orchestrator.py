@@ -1,5 +1,8 @@
 """Unit tests for portal.core.orchestrator — multi-step task orchestration."""
 
+import asyncio
+import time
+
 import pytest
 
 from portal.core.orchestrator import MAX_STEPS, StepType, TaskOrchestrator, TaskPlan, TaskStep
@@ -159,6 +162,34 @@ async def test_execute_multi_step_plan() -> None:
     assert "Orchestration complete" in result
 
 
+@pytest.mark.asyncio
+async def test_llm_template_with_other_braces() -> None:
+    calls: list[str] = []
+
+    async def fake_llm(prompt: str) -> str:
+        calls.append(prompt)
+        return "first result"
+
+    orch = TaskOrchestrator(llm_executor=fake_llm)
+    plan = orch.build_plan(
+        "braces",
+        steps=[
+            {"type": "llm", "description": "step 1", "llm_prompt_template": "do step 1"},
+            {
+                "type": "llm",
+                "description": 'emit {"a": 1}',
+                "llm_prompt_template": 'emit {"a": 1} using {step_1} and {context}',
+                "depends_on": [0],
+            },
+        ],
+    )
+    await orch.execute(plan)
+
+    assert not any(step.error for step in plan.steps)
+    assert calls[1].startswith('emit {"a": 1} using {step_1} and ')
+    assert "first result" in calls[1]
+
+
 @pytest.mark.asyncio
 async def test_execute_tool_step() -> None:
     async def fake_tool(name: str, args: dict) -> dict:
@@ -242,3 +273,156 @@ async def test_execute_context_accumulated_across_steps() -> None:
     # Third step prompt should contain accumulated context from steps A and B
     assert len(received_prompts) == 3
     assert "step A" in received_prompts[2] or "result" in received_prompts[2]
+
+
+# ---------------------------------------------------------------------------
+# Dependency graph tests
+# ---------------------------------------------------------------------------
+
+
+def test_build_plan_rejects_dependency_cycle() -> None:
+    orch = TaskOrchestrator()
+    with pytest.raises(ValueError, match="cycle"):
+        orch.build_plan(
+            "cyclic",
+            steps=[
+                {"type": "llm", "description": "a", "depends_on": [1]},
+                {"type": "llm", "description": "b", "depends_on": [0]},
+            ],
+        )
+
+
+def test_build_plan_rejects_unknown_dependency() -> None:
+    orch = TaskOrchestrator()
+    with pytest.raises(ValueError, match="invalid dependencies"):
+        orch.build_plan("bad", steps=[{"type": "llm", "description": "a", "depends_on": [5]}])
+
+
+def test_default_dependencies_form_linear_chain() -> None:
+    plan = TaskOrchestrator().build_plan(
+        "chain", steps=[{"type": "llm", "description": f"s{i}"} for i in range(3)]
+    )
+    assert [plan.dependencies(s) for s in plan.steps] == [[], [0], [0, 1]]
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def slow_tool(name: str, args: dict) -> dict:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return {"success": True, "result": f"{name}:{args['q']}"}
+
+    prompts: list[str] = []
+
+    async def fake_llm(prompt: str) -> str:
+        prompts.append(prompt)
+        return "report"
+
+    orch = TaskOrchestrator(llm_executor=fake_llm, tool_executor=slow_tool)
+    plan = orch.build_plan(
+        "research",
+        steps=[
+            {
+                "type": "tool",
+                "description": f"search {q}",
+                "tool_name": "search",
+                "tool_args": {"q": q},
+                "depends_on": [],
+            }
+            for q in ("a", "b", "c")
+        ]
+        + [{"type": "llm", "description": "combine", "llm_prompt_template": "Use {context}"}],
+    )
+    start = time.perf_counter()
+    await orch.execute(plan)
+
+    assert peak == 3
+    assert time.perf_counter() - start < 0.14  # critical path, not sum of steps
+    assert plan.is_complete and not plan.failed_steps
+    assert all(f"search:{q}" in prompts[0] for q in ("a", "b", "c"))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_budget_is_respected() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def slow_llm(prompt: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "ok"
+
+    orch = TaskOrchestrator(llm_executor=slow_llm, max_parallel_steps=2)
+    plan = orch.build_plan(
+        "fan out",
+        steps=[{"type": "llm", "description": f"s{i}", "depends_on": []} for i in range(5)],
+    )
+    await orch.execute(plan)
+
+    assert peak == 2
+    assert plan.is_complete
+
+
+@pytest.mark.asyncio
+async def test_tool_args_receive_dependency_output() -> None:
+    seen: list[dict] = []
+
+    async def fake_tool(name: str, args: dict) -> dict:
+        seen.append(args)
+        return {"success": True, "result": "https://example.com" if name == "search" else "page"}
+
+    orch = TaskOrchestrator(tool_executor=fake_tool)
+    plan = orch.build_plan(
+        "search then fetch",
+        steps=[
+            {"type": "tool", "description": "search", "tool_name": "search", "tool_args": {}},
+            {
+                "type": "tool",
+                "description": "fetch",
+                "tool_name": "fetch",
+                "tool_args": {"url": "{step_1}"},
+            },
+        ],
+    )
+    await orch.execute(plan)
+
+    assert seen[1] == {"url": "https://example.com"}
+    assert plan.steps[1].tool_args == {"url": "{step_1}"}
+
+
+@pytest.mark.asyncio
+async def test_failure_skips_downstream_but_not_siblings() -> None:
+    calls: list[str] = []
+
+    async def fake_tool(name: str, args: dict) -> dict:
+        calls.append(name)
+        if name == "broken":
+            return {"success": False, "error": "boom"}
+        return {"success": True, "result": name}
+
+    orch = TaskOrchestrator(tool_executor=fake_tool)
+    plan = orch.build_plan(
+        "partial failure",
+        steps=[
+            {"type": "tool", "description": "broken", "tool_name": "broken", "depends_on": []},
+            {"type": "tool", "description": "sibling", "tool_name": "ok", "depends_on": []},
+            {"type": "tool", "description": "child", "tool_name": "child", "depends_on": [0]},
+            {"type": "tool", "description": "grandchild", "tool_name": "gc", "depends_on": [2]},
+        ],
+    )
+    result = await orch.execute(plan)
+
+    assert sorted(calls) == ["broken", "ok"]
+    assert plan.steps[1].result == "ok"
+    assert plan.steps[2].skipped and plan.steps[3].skipped
+    assert plan.is_complete
+    assert "Orchestration complete" in result
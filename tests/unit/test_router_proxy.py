@@ -0,0 +1,123 @@
+"""
+Tests for the router.py proxy transport — pooled upstream client, single body
+parse, and raw NDJSON pass-through.
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture()
+def router_mod():
+    with patch.dict(os.environ, {"ROUTER_TOKEN": ""}, clear=False):
+        import importlib
+
+        import portal.routing.router as mod
+
+        importlib.reload(mod)
+        yield mod
+        mod._upstream = None
+
+
+def _install_upstream(mod, handler):
+    seen: list[httpx.Request] = []
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        resp = await handler(request)
+        if isinstance(resp.stream, httpx.ByteStream):
+            # Real transports hand back an unread stream, not pre-loaded content
+            resp = httpx.Response(
+                resp.status_code, headers=resp.headers, stream=httpx.ByteStream(resp.content)
+            )
+        return resp
+
+    mod._upstream = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    return seen
+
+
+class TestProxyTransport:
+    def test_upstream_client_is_shared(self, router_mod):
+        async def handler(request):
+            return httpx.Response(200, json={"models": [{"name": "m"}]})
+
+        seen = _install_upstream(router_mod, handler)
+        client = router_mod._upstream
+        http = TestClient(router_mod.app)
+        assert http.get("/health").json()["model_count"] == 1
+        http.get("/api/tags")
+        http.post("/api/show", json={"name": "m"})
+        assert len(seen) == 3
+        assert router_mod._get_upstream() is client
+
+    def test_explicit_model_body_forwarded_unchanged(self, router_mod):
+        async def handler(request):
+            return httpx.Response(200, json={"done": True})
+
+        seen = _install_upstream(router_mod, handler)
+        raw = b'{"model": "llama3",  "stream": false, "messages": [{"role": "user", "content": "hi"}]}'
+        resp = TestClient(router_mod.app).post("/api/chat", content=raw)
+        assert resp.json() == {"done": True}
+        assert seen[0].content == raw
+
+    def test_body_parsed_once_and_model_rewritten(self, router_mod):
+        async def handler(request):
+            return httpx.Response(200, json={"done": True})
+
+        seen = _install_upstream(router_mod, handler)
+        body = {
+            "model": "auto",
+            "stream": False,
+            "messages": [{"role": "user", "content": "@model:qwen3 hi"}],
+        }
+        real_loads = json.loads
+        with patch.object(router_mod.json, "loads", side_effect=real_loads) as loads:
+            TestClient(router_mod.app).post("/api/chat", json=body)
+        assert loads.call_count == 1
+        assert real_loads(seen[0].content)["model"] == "qwen3"
+
+    def test_stream_relays_ndjson_chunks(self, router_mod):
+        chunks = [
+            b'{"message":{"content":"He"}}\n',
+            b'{"message":{"content":"llo"}}\n',
+            b'{"done":true}\n',
+        ]
+
+        async def body():
+            for c in chunks:
+                yield c
+
+        async def handler(request):
+            return httpx.Response(
+                200, headers={"content-type": "application/x-ndjson"}, content=body()
+            )
+
+        _install_upstream(router_mod, handler)
+        payload = {"model": "llama3", "messages": [{"role": "user", "content": "hi"}]}
+        with TestClient(router_mod.app).stream("POST", "/api/chat", json=payload) as resp:
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "application/x-ndjson"
+            assert b"".join(resp.iter_raw()) == b"".join(chunks)
+
+    def test_upstream_status_propagates_on_stream(self, router_mod):
+        async def handler(request):
+            return httpx.Response(404, json={"error": "model not found"})
+
+        _install_upstream(router_mod, handler)
+        resp = TestClient(router_mod.app).post(
+            "/api/generate", json={"model": "missing", "prompt": "hi"}
+        )
+        assert resp.status_code == 404
+        assert resp.json() == {"error": "model not found"}
+
+    def test_lifespan_closes_client(self, router_mod):
+        with TestClient(router_mod.app):
+            client = router_mod._upstream
+            assert client is not None and not client.is_closed
+        assert client.is_closed
+        assert router_mod._upstream is None
@@ -205,3 +205,88 @@ class TestRateLimiter:
         for i in range(3):
             allowed, _ = await limiter.check_limit(user_id)
             assert allowed, f"Request {i + 1} was incorrectly blocked"
+
+    @pytest.mark.asyncio
+    async def test_bucket_refills_continuously(self, tmp_path, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("portal.security.rate_limiter.time.time", lambda: clock[0])
+        limiter = RateLimiter(max_requests=3, window_seconds=60, persist_path=tmp_path / "rl.db")
+
+        for _ in range(3):
+            assert (await limiter.check_limit("u"))[0]
+        allowed, msg = await limiter.check_limit("u")
+        assert not allowed
+        assert "wait 20 seconds" in msg
+
+        clock[0] += 20  # one token back (60s / 3 requests)
+        assert (await limiter.check_limit("u"))[0]
+        assert not (await limiter.check_limit("u"))[0]
+        assert limiter.get_stats("u")["violations"] == 2
+
+    @pytest.mark.asyncio
+    async def test_scoped_limit_uses_separate_bucket(self, tmp_path):
+        limiter = RateLimiter(max_requests=1, window_seconds=60, persist_path=tmp_path / "rl.db")
+        assert (await limiter.check_limit("u"))[0]
+        assert not (await limiter.check_limit("u"))[0]
+        for _ in range(5):
+            assert (await limiter.check_limit("u", limit=5, window=60, scope="ws-a"))[0]
+        assert not (await limiter.check_limit("u", limit=5, window=60, scope="ws-a"))[0]
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_only_changed_buckets(self, tmp_path):
+        db = tmp_path / "rl.db"
+        limiter = RateLimiter(max_requests=5, window_seconds=60, persist_path=db)
+        await limiter.check_limit("a")
+        await limiter.check_limit("b")
+        limiter._flush_if_dirty()
+
+        import sqlite3
+
+        with sqlite3.connect(db) as conn:
+            conn.execute("UPDATE buckets SET total = 99 WHERE key = 'a'")
+        await limiter.check_limit("b")
+        limiter._flush_if_dirty()
+
+        with sqlite3.connect(db) as conn:
+            totals = dict(conn.execute("SELECT key, total FROM buckets").fetchall())
+        assert totals == {"a": 99, "b": 2}  # "a" was not rewritten
+
+    @pytest.mark.asyncio
+    async def test_reset_user_survives_restart(self, tmp_path):
+        db = tmp_path / "rl.db"
+        limiter = RateLimiter(max_requests=1, window_seconds=60, persist_path=db)
+        await limiter.check_limit("u")
+        limiter._flush_if_dirty()
+        limiter.reset_user("u")
+
+        reloaded = RateLimiter(max_requests=1, window_seconds=60, persist_path=db)
+        assert (await reloaded.check_limit("u"))[0]
+
+    @pytest.mark.asyncio
+    async def test_expired_buckets_swept_lazily(self, tmp_path, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("portal.security.rate_limiter.time.time", lambda: clock[0])
+        limiter = RateLimiter(
+            max_requests=10, window_seconds=60, persist_path=tmp_path / "rl.db", shards=1
+        )
+        for i in range(63):
+            await limiter.check_limit(f"old-{i}")
+        clock[0] += 61
+        await limiter.check_limit("new")  # 64th bucket triggers a sweep of the shard
+        assert list(limiter._shards[0].buckets) == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_json_state(self, tmp_path):
+        import json
+        import time
+
+        now = time.time()
+        legacy = tmp_path / "rate_limits.json"
+        legacy.write_text(json.dumps({"requests": {"u": [now - 1, now - 2]}, "violations": {}}))
+
+        limiter = RateLimiter(
+            max_requests=2, window_seconds=60, persist_path=tmp_path / "rate_limits.db"
+        )
+        assert not (await limiter.check_limit("u"))[0]
+        assert not legacy.exists()
+        assert (tmp_path / "rate_limits.json.migrated").exists()
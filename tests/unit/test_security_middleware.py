@@ -325,3 +325,31 @@ async def test_custom_max_message_length():
     )
     with pytest.raises(ValidationError, match="maximum length"):
         await mw.process_message("chat1", "x" * 21, "web")
+
+
+@pytest.mark.asyncio
+async def test_workspace_rate_limit_overrides_default(tmp_path):
+    """A workspace ACL rate_limit replaces the global limit for that workspace."""
+    from portal.core.exceptions import RateLimitError
+    from portal.routing.workspace_registry import WorkspaceRegistry
+    from portal.security.rate_limiter import RateLimiter
+
+    core = AsyncMock()
+    core.process_message = AsyncMock(return_value=MagicMock(success=True, warnings=[]))
+    registry = WorkspaceRegistry({"burst": {"model": "m", "acl": {"rate_limit": 3}}})
+    mw = SecurityMiddleware(
+        agent_core=core,
+        rate_limiter=RateLimiter(max_requests=1, persist_path=tmp_path / "rl.db"),
+        enable_input_sanitization=False,
+        workspace_registry=registry,
+    )
+    ctx = {"user_id": "u1"}
+
+    for _ in range(3):
+        await mw.process_message("c", "hi", "web", user_context=ctx, workspace_id="burst")
+    with pytest.raises(RateLimitError):
+        await mw.process_message("c", "hi", "web", user_context=ctx, workspace_id="burst")
+
+    await mw.process_message("c", "hi", "web", user_context=ctx, workspace_id="other")
+    with pytest.raises(RateLimitError):
+        await mw.process_message("c", "hi", "web", user_context=ctx, workspace_id="other")
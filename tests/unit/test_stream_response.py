@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from portal.core.types import IncomingMessage
+from portal.routing.model_backends import ToolCallChunk
 
 
 def _make_agent_core(config=None):
@@ -22,13 +23,18 @@ def _make_agent_core(config=None):
 
     mock_router = MagicMock()
     mock_router.strategy = MagicMock(value="auto")
+    mock_routing_decision = MagicMock()
+    mock_routing_decision.model_id = "test-model"
+    mock_routing_decision.classification.complexity = MagicMock(value="simple")
+    mock_router.route = AsyncMock(return_value=mock_routing_decision)
 
     mock_execution_engine = MagicMock()
     mock_prompt_manager = MagicMock()
     mock_prompt_manager.build_system_prompt.return_value = "You are a helpful assistant."
 
     mock_context_manager = AsyncMock()
-    mock_context_manager.get_history.return_value = []
+    mock_context_manager.get_summary.return_value = None
+    mock_context_manager.get_history_since.return_value = []
     mock_context_manager.add_message = AsyncMock()
 
     mock_event_bus = AsyncMock()
@@ -51,6 +57,11 @@ def _make_agent_core(config=None):
     return core
 
 
+def _set_tool_schemas(core, schemas):
+    """Pin the schemas the provider hands out, bypassing discovery."""
+    core.tool_schema_provider.get_schemas = MagicMock(return_value=schemas)
+
+
 @pytest.mark.asyncio
 async def test_stream_response_yields_tokens():
     """stream_response yields tokens from execution engine."""
@@ -101,6 +112,114 @@ async def test_stream_response_saves_to_context():
     assert content == "Hello world"
 
 
+@pytest.mark.asyncio
+async def test_stream_response_routes_once_and_reuses_decision():
+    """Streamed tool rounds and the final stream share one routing decision."""
+    core = _make_agent_core()
+    core.mcp_registry = AsyncMock()
+    core.mcp_registry.call_tool = AsyncMock(return_value={"ok": True})
+    _set_tool_schemas(core, [{"type": "function", "function": {"name": "echo"}}])
+    stream_calls = []
+
+    async def fake_stream(**kwargs):
+        stream_calls.append(kwargs)
+        if len(stream_calls) == 1:
+            yield ToolCallChunk(tool_calls=[{"tool": "echo", "arguments": {}}])
+        else:
+            yield "done"
+
+    core.execution_engine.generate_stream = fake_stream
+
+    incoming = IncomingMessage(id="test-r", text="hi", model="auto")
+    tokens = [t async for t in core.stream_response(incoming)]
+
+    assert tokens == ["done"]
+    core.router.route.assert_awaited_once()
+    decision = core.router.route.return_value
+    assert len(stream_calls) == 2
+    assert all(call["routing_decision"] is decision for call in stream_calls)
+
+
+@pytest.mark.asyncio
+async def test_stream_response_without_tool_calls_generates_once():
+    """When the model answers directly, there is exactly one generation and no execute()."""
+    core = _make_agent_core()
+    core.mcp_registry = AsyncMock()
+    core.execution_engine.execute = AsyncMock()
+    _set_tool_schemas(core, [{"type": "function", "function": {"name": "echo"}}])
+    stream_calls = []
+
+    async def fake_stream(**kwargs):
+        stream_calls.append(kwargs)
+        for token in ["Hello", " world"]:
+            yield token
+
+    core.execution_engine.generate_stream = fake_stream
+
+    incoming = IncomingMessage(id="test-s", text="hi", model="auto")
+    tokens = [t async for t in core.stream_response(incoming)]
+
+    assert tokens == ["Hello", " world"]
+    assert len(stream_calls) == 1
+    core.execution_engine.execute.assert_not_called()
+    core.mcp_registry.call_tool.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_response_tool_round_feeds_results_back():
+    """Tool calls in the stream are dispatched and their results sent to the next round."""
+    core = _make_agent_core(config={"mcp_tool_max_rounds": 2})
+    core.mcp_registry = AsyncMock()
+    core.mcp_registry.call_tool = AsyncMock(return_value={"temp": 21})
+    stream_calls = []
+
+    async def fake_stream(**kwargs):
+        stream_calls.append(kwargs)
+        if len(stream_calls) == 1:
+            yield "Checking... "
+            yield ToolCallChunk(tool_calls=[{"tool": "weather", "arguments": {"city": "Oslo"}}])
+        else:
+            yield "It is 21C."
+
+    core.execution_engine.generate_stream = fake_stream
+    _set_tool_schemas(core, [{"type": "function", "function": {"name": "weather"}}])
+
+    incoming = IncomingMessage(id="test-t", text="weather in Oslo?", model="auto")
+    tokens = [t async for t in core.stream_response(incoming)]
+
+    assert tokens == ["Checking... ", "It is 21C."]
+    core.mcp_registry.call_tool.assert_awaited_once_with("core", "weather", {"city": "Oslo"})
+    assert stream_calls[0]["tools"] == core.get_tool_schemas()
+    second_round = stream_calls[1]["messages"]
+    assert second_round[-1]["role"] == "tool"
+    assert "weather" in second_round[-1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_stream_response_final_round_offers_no_tools():
+    """After mcp_tool_max_rounds tool rounds the stream is generated without tools."""
+    core = _make_agent_core(config={"mcp_tool_max_rounds": 1})
+    core.mcp_registry = AsyncMock()
+    core.mcp_registry.call_tool = AsyncMock(return_value={"ok": True})
+    _set_tool_schemas(core, [{"type": "function", "function": {"name": "echo"}}])
+    stream_calls = []
+
+    async def fake_stream(**kwargs):
+        stream_calls.append(kwargs)
+        if kwargs["tools"]:
+            yield ToolCallChunk(tool_calls=[{"tool": "echo", "arguments": {}}])
+        else:
+            yield "final"
+
+    core.execution_engine.generate_stream = fake_stream
+
+    incoming = IncomingMessage(id="test-u", text="loop", model="auto")
+    tokens = [t async for t in core.stream_response(incoming)]
+
+    assert tokens == ["final"]
+    assert [bool(c["tools"]) for c in stream_calls] == [True, False]
+
+
 @pytest.mark.asyncio
 async def test_stream_response_empty_yields_nothing():
     """An empty stream doesn't crash and yields no tokens."""
@@ -84,8 +84,7 @@ class TestStreamSecurityGate:
         limiter = RateLimiter(max_requests=2, window_seconds=60)
 
         # Clear any existing state for this test user to ensure isolation
-        limiter.requests.clear()
-        limiter.violations.clear()
+        limiter.reset_user("test-user")
 
         # Consume both available slots
         allowed1, _ = await limiter.check_limit("test-user")
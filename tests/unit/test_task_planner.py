@@ -0,0 +1,194 @@
+"""Unit tests for portal.core.planner — LLM plan generation, validation and caching."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from portal.core.orchestrator import StepType, TaskOrchestrator
+from portal.core.planner import TaskPlanner, create_planner, validate_plan_steps
+
+TOOLS = [
+    {"name": "web_search", "description": "Search the web"},
+    {"name": "create_document", "description": "Write a Word document"},
+]
+
+GOOD_PLAN = {
+    "steps": [
+        {
+            "type": "tool",
+            "description": "search",
+            "tool_name": "web_search",
+            "tool_args": {"query": "solar"},
+            "depends_on": [],
+        },
+        {"type": "llm", "description": "draft", "depends_on": [0]},
+        {
+            "type": "tool",
+            "description": "write doc",
+            "tool_name": "create_document",
+            "tool_args": {"content": "{step_2}"},
+            "depends_on": [1],
+        },
+    ]
+}
+
+
+def _planner_with(responses: list[object], delay: float = 0.0) -> tuple[TaskPlanner, list[dict]]:
+    """Return a planner whose pooled client answers /api/generate from *responses*."""
+    requests: list[dict] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        if delay:
+            await asyncio.sleep(delay)
+        body = responses[min(len(requests), len(responses)) - 1]
+        text = body if isinstance(body, str) else json.dumps(body)
+        return httpx.Response(200, json={"response": text, "done": True})
+
+    planner = TaskPlanner(model="planner-test")
+    planner._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return planner, requests
+
+
+# ---------------------------------------------------------------------------
+# validate_plan_steps
+# ---------------------------------------------------------------------------
+
+
+def test_validate_accepts_well_formed_plan() -> None:
+    steps = validate_plan_steps(GOOD_PLAN, ["web_search", "create_document"])
+    assert [s["type"] for s in steps] == ["tool", "llm", "tool"]
+    assert "{context}" in steps[1]["llm_prompt_template"]
+    assert steps[2]["depends_on"] == [1]
+
+
+@pytest.mark.parametrize(
+    "raw, match",
+    [
+        ({"steps": []}, "no steps"),
+        ("not a plan", "no steps"),
+        ({"steps": [{"type": "shell"}]}, "unknown type"),
+        ({"steps": [{"type": "tool", "tool_name": "rm_rf"}]}, "unknown tool"),
+        ({"steps": [{"type": "llm", "depends_on": [0]}]}, "earlier step"),
+        ({"steps": [{"type": "llm"}] * 9}, "max"),
+    ],
+)
+def test_validate_rejects_bad_plans(raw: object, match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        validate_plan_steps(raw, ["web_search"])
+
+
+def test_validate_rejects_confirmation_tools() -> None:
+    raw = {"steps": [{"type": "tool", "tool_name": "shell_safety", "tool_args": {}}]}
+    with pytest.raises(ValueError, match="requires confirmation"):
+        validate_plan_steps(raw, ["shell_safety", "web_search"], {"shell_safety"})
+
+
+# ---------------------------------------------------------------------------
+# TaskPlanner
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_plan_lists_tools_and_requests_json() -> None:
+    planner, requests = _planner_with([GOOD_PLAN])
+    steps = await planner.plan("Research solar then write a doc", TOOLS)
+
+    assert steps is not None and len(steps) == 3
+    assert requests[0]["format"] == "json"
+    assert requests[0]["model"] == "planner-test"
+    assert "web_search: Search the web" in requests[0]["prompt"]
+
+
+@pytest.mark.asyncio
+async def test_plan_cached_on_normalized_request() -> None:
+    planner, requests = _planner_with([GOOD_PLAN])
+    first = await planner.plan("Research solar, then write a doc!", TOOLS)
+    first[0]["tool_args"]["query"] = "mutated"
+    second = await planner.plan("research solar, then  write a doc", TOOLS)
+
+    assert len(requests) == 1
+    assert planner.cache_hits == 1 and planner.cache_misses == 1
+    assert second[0]["tool_args"] == {"query": "solar"}
+
+
+@pytest.mark.asyncio
+async def test_plan_cache_keyed_on_tool_set() -> None:
+    planner, requests = _planner_with([GOOD_PLAN])
+    await planner.plan("research then write", TOOLS)
+    await planner.plan("research then write", [*TOOLS, {"name": "fetch", "description": ""}])
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_plan_returns_none_and_is_not_cached() -> None:
+    bad = {"steps": [{"type": "tool", "tool_name": "unknown_tool"}]}
+    planner, requests = _planner_with([bad, GOOD_PLAN])
+
+    assert await planner.plan("research then write", TOOLS) is None
+    assert await planner.plan("research then write", TOOLS) is not None
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_planner_proposing_shell_safety_is_rejected() -> None:
+    shell_plan = {
+        "steps": [
+            {"type": "tool", "tool_name": "shell_safety", "tool_args": {"command": "rm -rf /"}}
+        ]
+    }
+    planner, requests = _planner_with([shell_plan])
+    tools = [*TOOLS, {"name": "shell_safety", "description": "Run", "requires_confirmation": True}]
+
+    assert await planner.plan("clean up then report", tools) is None
+    assert "shell_safety" not in requests[0]["prompt"]
+    assert not planner._cache
+
+
+@pytest.mark.asyncio
+async def test_non_json_output_returns_none() -> None:
+    planner, _ = _planner_with(["sure! here is a plan"])
+    assert await planner.plan("research then write", TOOLS) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_call() -> None:
+    planner, requests = _planner_with([GOOD_PLAN], delay=0.02)
+    results = await asyncio.gather(*(planner.plan("research then write", TOOLS) for _ in range(5)))
+
+    assert len(requests) == 1
+    assert all(r == results[0] for r in results)
+
+
+def test_create_planner_model_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ROUTING_LLM_MODEL", "router-model")
+    assert create_planner().model == "router-model"
+    monkeypatch.setenv("ORCHESTRATOR_PLANNER_MODEL", "planner-model")
+    assert create_planner().model == "planner-model"
+    assert create_planner(model="explicit").model == "explicit"
+
+
+# ---------------------------------------------------------------------------
+# TaskOrchestrator.build_plan_from_llm
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_build_plan_from_llm_uses_generated_steps() -> None:
+    planner, _ = _planner_with([GOOD_PLAN])
+    plan = await TaskOrchestrator(planner=planner).build_plan_from_llm("goal", TOOLS)
+
+    assert [s.step_type for s in plan.steps] == [StepType.TOOL, StepType.LLM, StepType.TOOL]
+    assert plan.dependencies(plan.steps[2]) == [1]
+
+
+@pytest.mark.asyncio
+async def test_build_plan_from_llm_falls_back_to_single_step() -> None:
+    planner, _ = _planner_with(["garbage"])
+    plan = await TaskOrchestrator(planner=planner).build_plan_from_llm("goal", TOOLS)
+    assert len(plan.steps) == 1 and plan.steps[0].llm_prompt_template == "goal"
+
+    plan = await TaskOrchestrator().build_plan_from_llm("goal", TOOLS)
+    assert len(plan.steps) == 1
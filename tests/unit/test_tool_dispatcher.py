@@ -0,0 +1,95 @@
+"""Tests for ToolCallScheduler — concurrent dispatch, caps, timeouts, ordering."""
+
+import asyncio
+import time
+
+import pytest
+
+from portal.core.tool_dispatcher import ToolCallScheduler
+
+
+def _job(name, delay=0.0, tracker=None, result=None):
+    async def run():
+        if tracker is not None:
+            tracker["active"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["active"])
+        try:
+            await asyncio.sleep(delay)
+            return {"tool": name, "result": result if result is not None else name}
+        finally:
+            if tracker is not None:
+                tracker["active"] -= 1
+
+    return name, run
+
+
+class TestToolCallScheduler:
+    @pytest.mark.asyncio
+    async def test_runs_independent_calls_concurrently(self):
+        scheduler = ToolCallScheduler(max_concurrency=4, per_tool_concurrency=4)
+        start = time.perf_counter()
+        results = await scheduler.run([_job("web_search", 0.1) for _ in range(4)])
+        assert time.perf_counter() - start < 0.3
+        assert len(results) == 4
+
+    @pytest.mark.asyncio
+    async def test_results_keep_submission_order(self):
+        scheduler = ToolCallScheduler()
+        jobs = [_job("a", 0.06, result=1), _job("b", 0.0, result=2), _job("c", 0.03, result=3)]
+        results = await scheduler.run(jobs)
+        assert [r["result"] for r in results] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_global_cap(self):
+        tracker = {"active": 0, "peak": 0}
+        scheduler = ToolCallScheduler(max_concurrency=2, per_tool_concurrency=10)
+        await scheduler.run([_job(f"t{i}", 0.02, tracker) for i in range(6)])
+        assert tracker["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_per_tool_cap(self):
+        tracker = {"active": 0, "peak": 0}
+        scheduler = ToolCallScheduler(max_concurrency=10, per_tool_concurrency=1)
+        await scheduler.run([_job("read_file", 0.02, tracker) for _ in range(3)])
+        assert tracker["peak"] == 1
+
+    @pytest.mark.asyncio
+    async def test_serialized_tools_never_overlap(self):
+        tracker = {"active": 0, "peak": 0}
+        scheduler = ToolCallScheduler(max_concurrency=10, serialized_tools={"bash"})
+        await scheduler.run([_job("bash", 0.02, tracker) for _ in range(3)])
+        assert tracker["peak"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_error_without_cancelling_siblings(self):
+        scheduler = ToolCallScheduler(call_timeout=0.05)
+        results = await scheduler.run([_job("slow", 1.0), _job("fast", 0.0)])
+        assert "timed out" in results[0]["error"]
+        assert results[1]["result"] == "fast"
+
+    @pytest.mark.asyncio
+    async def test_exception_becomes_error_result(self):
+        async def boom():
+            raise RuntimeError("server down")
+
+        scheduler = ToolCallScheduler()
+        results = await scheduler.run([("broken", boom), _job("ok")])
+        assert results[0] == {"tool": "broken", "result": None, "error": "server down"}
+        assert results[1]["result"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_limits_are_scoped_to_one_run(self):
+        tracker = {"active": 0, "peak": 0}
+        scheduler = ToolCallScheduler(max_concurrency=1, serialized_tools={"bash"})
+        await asyncio.gather(
+            scheduler.run([_job("bash", 0.05, tracker), _job("bash", 0.05, tracker)]),
+            scheduler.run([_job("bash", 0.05, tracker), _job("bash", 0.05, tracker)]),
+        )
+        assert tracker["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_serialization_can_be_disabled_per_run(self):
+        tracker = {"active": 0, "peak": 0}
+        scheduler = ToolCallScheduler(max_concurrency=10, serialized_tools={"bash"})
+        await scheduler.run([_job("bash", 0.02, tracker) for _ in range(3)], serialized_tools=())
+        assert tracker["peak"] == 2  # still bounded by per_tool_concurrency
@@ -0,0 +1,225 @@
+"""Tests for manifest-driven, lazy tool loading in ToolRegistry."""
+
+import json
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from portal.core.interfaces.tool import ExecutionMode, ToolCategory
+from portal.tools import LazyTool, ToolRegistry
+from portal.tools.manifest import ToolManifest, scan_source
+
+STATIC_TOOL = """
+from portal.core.interfaces.tool import BaseTool, ToolCategory
+
+LOADS = []
+LOADS.append(1)
+
+
+class EchoTool(BaseTool):
+    METADATA = {
+        "name": "echo",
+        "description": "Echo text back",
+        "category": ToolCategory.UTILITY,
+        "execution_mode": "io",
+        "timeout": 5,
+        "parameters": [
+            {"name": "text", "param_type": "string", "description": "Text", "required": True},
+        ],
+    }
+
+    async def execute(self, parameters):
+        return self._success_response(parameters["text"])
+"""
+
+DYNAMIC_TOOL = """
+from portal.core.interfaces.tool import BaseTool, ToolCategory, ToolMetadata
+
+
+class ClockTool(BaseTool):
+    def _get_metadata(self):
+        return ToolMetadata(name="clock", description="Time", category=ToolCategory.UTILITY)
+
+    async def execute(self, parameters):
+        return self._success_response("noon")
+"""
+
+
+AUDITED_BASE = """
+from portal.core.interfaces.tool import BaseTool as _Base
+
+
+class AuditedTool(_Base):
+    audited = True
+"""
+
+PLUGIN_TOOL = """
+from lazy_tools_pkg.audited import AuditedTool
+from portal.core.interfaces.tool import ToolCategory
+
+
+class PingTool(AuditedTool):
+    METADATA = {"name": "ping", "description": "Ping", "category": ToolCategory.UTILITY}
+
+    async def execute(self, parameters):
+        return self._success_response("pong")
+"""
+
+
+@pytest.fixture
+def tool_pkg(tmp_path, monkeypatch):
+    """A throwaway tools package on sys.path, removed from sys.modules afterwards."""
+    pkg = tmp_path / "lazy_tools_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "echo.py").write_text(STATIC_TOOL)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    for name in [m for m in sys.modules if m.startswith("lazy_tools_pkg")]:
+        del sys.modules[name]
+
+
+def _discover(pkg: Path, manifest_path: Path) -> tuple[ToolRegistry, ToolManifest]:
+    registry = ToolRegistry(manifest_path=manifest_path)
+    manifest = ToolManifest(manifest_path)
+    registry._discover_internal_tools(pkg, manifest, prefix="lazy_tools_pkg.")
+    manifest.save()
+    return registry, manifest
+
+
+# ---------------------------------------------------------------------------
+# Static scanning
+# ---------------------------------------------------------------------------
+
+
+def test_scan_source_reads_literal_metadata() -> None:
+    [(class_name, metadata)] = scan_source(STATIC_TOOL)
+    assert class_name == "EchoTool"
+    assert metadata["category"] == "utility"
+    assert metadata["execution_mode"] == "io"
+    assert metadata["parameters"][0]["name"] == "text"
+    assert metadata["version"] == "1.0.0"  # defaults filled in
+
+
+def test_scan_source_flags_dynamic_metadata() -> None:
+    assert scan_source(DYNAMIC_TOOL) == [("ClockTool", None)]
+
+
+# ---------------------------------------------------------------------------
+# Lazy registry
+# ---------------------------------------------------------------------------
+
+
+def test_discovery_indexes_without_importing(tool_pkg, tmp_path) -> None:
+    registry, _ = _discover(tool_pkg, tmp_path / "manifest.json")
+
+    assert "lazy_tools_pkg.echo" not in sys.modules
+    stub = registry.tools["echo"]
+    assert isinstance(stub, LazyTool)
+    assert stub.metadata.category is ToolCategory.UTILITY
+    assert stub.metadata.execution_mode is ExecutionMode.IO
+    assert registry.get_tool_list()[0]["name"] == "echo"
+
+
+@pytest.mark.asyncio
+async def test_get_tool_imports_once_on_first_use(tool_pkg, tmp_path) -> None:
+    registry, _ = _discover(tool_pkg, tmp_path / "manifest.json")
+
+    tool = registry.get_tool("echo")
+    assert type(tool).__name__ == "EchoTool"
+    assert registry.get_tool("echo") is tool
+    assert sys.modules["lazy_tools_pkg.echo"].LOADS == [1]
+    assert (await tool.execute({"text": "hi"}))["result"] == "hi"
+    assert registry.health_check()["imported_tools"] == 1
+
+
+def test_manifest_cache_reused_until_file_changes(tool_pkg, tmp_path) -> None:
+    path = tmp_path / "manifest.json"
+    _, first = _discover(tool_pkg, path)
+    assert (first.hits, first.misses) == (0, 1)  # __init__.py is not scanned
+
+    _, second = _discover(tool_pkg, path)
+    assert second.misses == 0
+
+    (tool_pkg / "echo.py").write_text(STATIC_TOOL.replace("Echo text back", "Echo it"))
+    registry, third = _discover(tool_pkg, path)
+    assert third.misses == 1
+    assert registry.tools["echo"].metadata.description == "Echo it"
+
+
+def test_manifest_keys_are_modules_and_survive_a_move(tool_pkg, tmp_path) -> None:
+    path = tmp_path / "manifest.json"
+    _discover(tool_pkg, path)
+    assert list(json.loads(path.read_text())["files"]) == ["lazy_tools_pkg.echo"]
+
+    moved = tool_pkg.rename(tmp_path / "elsewhere")
+    _, manifest = _discover(moved, path)
+    assert (manifest.hits, manifest.misses) == (1, 0)
+
+
+def test_dynamic_metadata_imported_once_then_cached(tool_pkg, tmp_path) -> None:
+    (tool_pkg / "clock.py").write_text(DYNAMIC_TOOL)
+    path = tmp_path / "manifest.json"
+
+    registry, _ = _discover(tool_pkg, path)
+    assert not isinstance(registry.tools["clock"], LazyTool)
+
+    del sys.modules["lazy_tools_pkg.clock"]
+    registry, _ = _discover(tool_pkg, path)
+    assert isinstance(registry.tools["clock"], LazyTool)
+    assert "lazy_tools_pkg.clock" not in sys.modules
+
+
+def test_failed_import_unregisters_tool(tool_pkg, tmp_path) -> None:
+    (tool_pkg / "broken.py").write_text(
+        "import not_installed_dependency_xyz\n" + STATIC_TOOL.replace('"echo"', '"broken"')
+    )
+    registry, _ = _discover(tool_pkg, tmp_path / "manifest.json")
+    assert "broken" in registry.tools
+
+    assert registry.get_tool("broken") is None
+    assert "broken" not in registry.tools
+    assert registry.failed_tools[0]["type"] == "ModuleNotFoundError"
+
+
+def test_scan_source_follows_aliases_and_local_bases() -> None:
+    assert scan_source(AUDITED_BASE) == [("AuditedTool", None)]
+    local = STATIC_TOOL + "\n\nclass LoudEchoTool(EchoTool):\n    pass\n"
+    assert [name for name, _ in scan_source(local)] == ["EchoTool", "LoudEchoTool"]
+    assert scan_source("import enum\n\nclass Mode(enum.Enum):\n    A = 1\n") == []
+    assert scan_source(PLUGIN_TOOL) == [("PingTool", None)]  # base is in another module
+
+
+def test_internal_tool_with_imported_base_is_loaded(tool_pkg, tmp_path) -> None:
+    (tool_pkg / "audited.py").write_text(AUDITED_BASE)
+    (tool_pkg / "ping.py").write_text(PLUGIN_TOOL)
+    (tool_pkg / "models.py").write_text(
+        "from pydantic import BaseModel\n\n\nclass Row(BaseModel):\n    x: int = 0\n"
+    )
+
+    registry, _ = _discover(tool_pkg, tmp_path / "manifest.json")
+    assert type(registry.tools["ping"]).__name__ == "PingTool"
+    assert registry.failed_tools == []  # the abstract base and the non-tool class are skipped
+
+    for name in [m for m in sys.modules if m.startswith("lazy_tools_pkg.")]:
+        del sys.modules[name]
+    registry, _ = _discover(tool_pkg, tmp_path / "manifest.json")
+    assert isinstance(registry.tools["ping"], LazyTool)
+    assert "lazy_tools_pkg.models" not in sys.modules  # non-tool verdict was cached
+
+
+def test_plugin_with_intermediate_base_class(tool_pkg, tmp_path) -> None:
+    (tool_pkg / "audited.py").write_text(AUDITED_BASE)
+    (tool_pkg / "plugin.py").write_text(PLUGIN_TOOL)
+    eps = [EntryPoint("ping", "lazy_tools_pkg.plugin:PingTool", "portal.tools")]
+    registry = ToolRegistry(manifest_path=tmp_path / "manifest.json")
+
+    with patch("portal.tools.importlib_metadata.entry_points", return_value=eps):
+        manifest = ToolManifest(registry.manifest_path)
+        assert registry._discover_entry_point_tools(manifest) == (1, 0)
+
+    assert registry.failed_tools == []
+    assert registry.get_tool("ping").audited is True
@@ -0,0 +1,249 @@
+"""Tests for ToolRuntime — execution-mode dispatch, bounded pools, timeouts, cancellation."""
+
+import asyncio
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from portal.core.exceptions import ToolExecutionError
+from portal.core.interfaces.tool import BaseTool, ExecutionMode, ToolCategory
+from portal.core.tool_runtime import ToolRuntime
+from portal.tools.manifest import scan_source
+
+TOOLS_DIR = Path(__file__).resolve().parents[2] / "src" / "portal" / "tools"
+
+
+def _metadata(name: str, mode: str, timeout: float | None = None) -> dict[str, Any]:
+    return {
+        "name": name,
+        "description": name,
+        "category": ToolCategory.UTILITY,
+        "execution_mode": mode,
+        "timeout": timeout,
+    }
+
+
+class BlockingIOTool(BaseTool):
+    METADATA = _metadata("blocking_io", "io")
+
+    async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        time.sleep(parameters.get("seconds", 0.2))  # blocking call inside async def
+        return self._success_response(threading.current_thread().name)
+
+
+class TimeoutParamTool(BaseTool):
+    METADATA = {
+        **_metadata("timeout_param", "io"),
+        "parameters": [
+            {"name": "timeout", "param_type": "int", "description": "Seconds", "required": False}
+        ],
+    }
+
+    async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        return self._success_response(None)
+
+
+class SlowAwaitingTool(BaseTool):
+    METADATA = _metadata("slow_awaiting", "io", timeout=0.1)
+    cancelled = threading.Event()
+
+    async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            SlowAwaitingTool.cancelled.set()
+            raise
+        return self._success_response()
+
+
+class ProcessTool(BaseTool):
+    METADATA = _metadata("process_tool", "cpu")
+
+    async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        return self._success_response({"pid": os.getpid(), "total": sum(range(parameters["n"]))})
+
+
+class AsyncTool(BaseTool):
+    METADATA = _metadata("async_tool", "async")
+
+    async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
+        return self._success_response(threading.current_thread().name)
+
+
+def test_metadata_reads_execution_mode_and_timeout() -> None:
+    assert BlockingIOTool().metadata.execution_mode is ExecutionMode.IO
+    assert SlowAwaitingTool().metadata.timeout == 0.1
+    assert ProcessTool().metadata.execution_mode is ExecutionMode.CPU
+
+
+@pytest.mark.asyncio
+async def test_async_tool_runs_on_event_loop() -> None:
+    result = await ToolRuntime().run(AsyncTool(), {})
+    assert result["result"] == threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_io_tool_does_not_block_event_loop() -> None:
+    runtime = ToolRuntime()
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    result = await runtime.run(BlockingIOTool(), {"seconds": 0.2})
+    ticking.cancel()
+    runtime.shutdown()
+
+    assert result["result"].startswith("portal-tool")
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_full_pool_rejects_instead_of_queueing() -> None:
+    runtime = ToolRuntime(io_workers=1, queue_size=0)
+    first = asyncio.create_task(runtime.run(BlockingIOTool(), {"seconds": 0.2}))
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(ToolExecutionError, match="Too many io-bound"):
+        await runtime.run(BlockingIOTool(), {"seconds": 0})
+    assert (await first)["success"]
+    runtime.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_raises_and_cancels_thread_call() -> None:
+    runtime = ToolRuntime()
+    SlowAwaitingTool.cancelled.clear()
+
+    start = time.perf_counter()
+    with pytest.raises(ToolExecutionError, match="timed out after 0.1s"):
+        await runtime.run(SlowAwaitingTool(), {})
+    assert time.perf_counter() - start < 1.0
+    assert await asyncio.to_thread(SlowAwaitingTool.cancelled.wait, 1.0)
+    runtime.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cpu_tool_runs_in_worker_process() -> None:
+    runtime = ToolRuntime(cpu_workers=1)
+    result = await runtime.run(ProcessTool(), {"n": 1000})
+    runtime.shutdown()
+
+    assert result["result"]["total"] == sum(range(1000))
+    assert result["result"]["pid"] != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_cpu_tool_not_importable_falls_back_to_thread() -> None:
+    class LocalCpuTool(BaseTool):
+        METADATA = _metadata("local_cpu", "cpu")
+
+        async def execute(self, parameters: dict[str, Any]) -> dict[str, Any]:
+            return self._success_response(os.getpid())
+
+    runtime = ToolRuntime()
+    result = await runtime.run(LocalCpuTool(), {})
+    runtime.shutdown()
+    assert result["result"] == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_async_tool_has_no_default_timeout() -> None:
+    runtime = ToolRuntime(default_timeout=0.05)
+    assert runtime._timeout(AsyncTool().metadata, ExecutionMode.ASYNC, {}) is None
+    assert runtime._timeout(BlockingIOTool().metadata, ExecutionMode.IO, {}) == 0.05
+
+
+def test_call_timeout_argument_raises_limit_up_to_max() -> None:
+    runtime = ToolRuntime(default_timeout=120, max_timeout=600)
+    metadata = TimeoutParamTool().metadata
+    assert runtime._timeout(metadata, ExecutionMode.IO, {"timeout": 300}) == 300
+    assert runtime._timeout(metadata, ExecutionMode.IO, {"timeout": 5}) == 120
+    assert runtime._timeout(metadata, ExecutionMode.IO, {"timeout": "soon"}) == 120
+    assert runtime._timeout(metadata, ExecutionMode.IO, {"timeout": 1e9}) == 600
+
+
+def test_timeout_argument_ignored_without_declared_parameter() -> None:
+    runtime = ToolRuntime(default_timeout=120)
+    metadata = BlockingIOTool().metadata
+    assert runtime._timeout(metadata, ExecutionMode.IO, {"timeout": 300}) == 120
+
+
+@pytest.mark.asyncio
+async def test_cancelled_shell_command_is_killed() -> None:
+    from portal.tools.automation_tools.shell_safety import ShellSafetyTool
+
+    spawned = []
+    real_spawn = asyncio.create_subprocess_shell
+
+    async def spawn(*args, **kwargs):
+        spawned.append(await real_spawn(*args, **kwargs))
+        return spawned[-1]
+
+    with patch("asyncio.create_subprocess_shell", spawn):
+        task = asyncio.create_task(ShellSafetyTool().execute({"command": "sleep 30"}))
+        while not spawned:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert spawned[0].returncode is not None
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "media_tools/audio_transcriber.py",
+        "dev_tools/python_env_manager.py",
+        "system_tools/system_stats.py",
+        "system_tools/process_monitor.py",
+        "knowledge/local_knowledge.py",
+        "knowledge/knowledge_base_sqlite.py",
+    ],
+)
+def test_blocking_tools_declare_pool_execution(path: str) -> None:
+    [(_, metadata)] = scan_source((TOOLS_DIR / path).read_text())
+    assert metadata["execution_mode"] != ExecutionMode.ASYNC.value
+
+
+@pytest.mark.asyncio
+async def test_blocking_subprocess_tool_keeps_loop_responsive(tmp_path: Path) -> None:
+    from portal.tools.dev_tools.python_env_manager import PythonEnvManagerTool
+
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "bin" / "python").touch()
+
+    def slow_run(args, **kwargs):
+        time.sleep(0.2)
+        return subprocess.CompletedProcess(args, 0, stdout="Python 3.12\n", stderr="")
+
+    runtime = ToolRuntime()
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    with patch("portal.tools.dev_tools.python_env_manager.subprocess.run", slow_run):
+        result = await runtime.run(
+            PythonEnvManagerTool(), {"action": "info", "env_path": str(tmp_path)}
+        )
+    ticking.cancel()
+    runtime.shutdown()
+
+    assert result["result"]["python_version"] == "Python 3.12"
+    assert ticks >= 5
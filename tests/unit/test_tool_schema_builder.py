@@ -1,6 +1,9 @@
 """Tests for portal.core.tool_schema_builder."""
 
-from unittest.mock import MagicMock
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
 
 
 class TestToolSchemaBuilder:
@@ -182,3 +185,96 @@ class TestToolSchemaBuilderIntegration:
         # Should return a valid schema, not crash
         assert result is not None
         assert result["function"]["name"] == "minimal_tool"
+
+
+class TestToolSchemaProvider:
+    """ToolSchemaProvider: no I/O on the request path, background refresh, versioning."""
+
+    @staticmethod
+    def _mcp_registry(tools_by_server):
+        registry = MagicMock()
+        registry.list_servers.return_value = list(tools_by_server)
+        registry.get_cached_tools.side_effect = lambda name: None
+        registry.discover_tools = AsyncMock(return_value=dict(tools_by_server))
+        return registry
+
+    @staticmethod
+    def _names(schemas):
+        return [s["function"]["name"] for s in schemas]
+
+    def test_first_call_uses_cached_tools_only(self):
+        """Without a running loop, get_schemas returns cached data and never blocks."""
+        from portal.core.tool_schema_builder import ToolSchemaProvider
+
+        registry = self._mcp_registry({"core": [{"name": "read_file"}]})
+        registry.get_cached_tools.side_effect = lambda name: [{"name": "cached_tool"}]
+        provider = ToolSchemaProvider(mcp_registry=registry, refresh_interval=0)
+
+        assert self._names(provider.get_schemas()) == ["cached_tool"]
+        assert provider.version == 1
+        registry.discover_tools.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_refresh_runs_in_background_and_bumps_version(self):
+        """A stale snapshot is served while new MCP tools are discovered in the background."""
+        from portal.core.tool_schema_builder import ToolSchemaProvider
+
+        registry = self._mcp_registry({"core": [{"name": "read_file"}]})
+        provider = ToolSchemaProvider(mcp_registry=registry, refresh_interval=0)
+
+        assert provider.get_schemas() == []  # nothing cached yet; refresh scheduled
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert self._names(provider.get_schemas()) == ["read_file"]
+        assert provider.version == 2
+
+        # A server that comes up later appears on the next refresh
+        registry.discover_tools.return_value = {
+            "core": [{"name": "read_file"}],
+            "video": [{"name": "generate_video"}],
+        }
+        await provider.refresh()
+        assert self._names(provider.get_schemas()) == ["read_file", "generate_video"]
+        assert provider.version == 3
+        await provider.stop()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_refresh_keeps_version(self):
+        from portal.core.tool_schema_builder import ToolSchemaProvider
+
+        registry = self._mcp_registry({"core": [{"name": "read_file"}]})
+        provider = ToolSchemaProvider(mcp_registry=registry, refresh_interval=60)
+        first = await provider.refresh()
+        second = await provider.refresh()
+        assert second.version == first.version
+        assert second.schemas is first.schemas
+
+    @pytest.mark.asyncio
+    async def test_fresh_snapshot_does_not_refresh(self):
+        from portal.core.tool_schema_builder import ToolSchemaProvider
+
+        registry = self._mcp_registry({"core": [{"name": "read_file"}]})
+        provider = ToolSchemaProvider(mcp_registry=registry, refresh_interval=60)
+        await provider.refresh()
+        provider.get_schemas()
+        provider.get_schemas()
+        await asyncio.sleep(0)
+        assert registry.discover_tools.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_previous_snapshot(self):
+        from portal.core.tool_schema_builder import ToolSchemaProvider
+
+        registry = self._mcp_registry({"core": [{"name": "read_file"}]})
+        provider = ToolSchemaProvider(mcp_registry=registry, refresh_interval=0)
+        await provider.refresh()
+        registry.discover_tools.side_effect = RuntimeError("boom")
+        provider.get_schemas()
+        await asyncio.sleep(0)
+        assert self._names(provider.get_schemas()) == ["read_file"]
+
+    def test_mcp_registry_has_no_blocking_sync_wrapper(self):
+        """The run_until_complete-based list_tools_sync is gone for good."""
+        from portal.protocols.mcp.mcp_registry import MCPRegistry
+
+        assert not hasattr(MCPRegistry, "list_tools_sync")
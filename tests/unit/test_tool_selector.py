@@ -0,0 +1,96 @@
+"""Unit tests for ToolSelector — per-request relevance filtering of tool schemas."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from portal.core.tool_selector import ToolSelector, tokenize
+
+
+def _schema(name: str, description: str, *params: str) -> dict:
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {
+                "type": "object",
+                "properties": {p: {"type": "string"} for p in params},
+            },
+        },
+    }
+
+
+SCHEMAS = [
+    _schema("generate_image", "Generate an image with FLUX via ComfyUI", "prompt"),
+    _schema("get_current_time", "Get the current date and time"),
+    _schema("web_fetch", "Fetch a web page by URL", "url"),
+    _schema("read_file", "Read a file from disk", "path"),
+    _schema("generate_music", "Generate music from a text description"),
+    _schema("text_to_speech", "Convert text to speech audio"),
+    _schema("run_python", "Execute python code in a sandbox", "code"),
+    _schema("create_word_document", "Create a Word docx document"),
+    _schema("calculator", "Evaluate a math expression", "expression"),
+]
+
+
+def _names(schemas: list[dict]) -> list[str]:
+    return [s["function"]["name"] for s in schemas]
+
+
+class TestTokenize:
+    def test_drops_stopwords_and_stems(self):
+        assert tokenize("Generating the images for my_files") == ["generat", "imag", "file"]
+
+
+class TestToolSelector:
+    def test_keeps_best_match_first(self):
+        selected = ToolSelector(top_k=3).select(SCHEMAS, "what time is it?", "question")
+        assert _names(selected)[0] == "get_current_time"
+        assert len(selected) <= 3
+
+    def test_category_hints_rank_tools(self):
+        selected = ToolSelector(top_k=2).select(SCHEMAS, "a cat on a sofa", "image_gen")
+        assert _names(selected)[0] == "generate_image"
+
+    def test_unrelated_query_attaches_nothing(self):
+        assert ToolSelector(top_k=3).select(SCHEMAS, "hi there", "greeting") == []
+
+    def test_pinned_tools_always_attached(self):
+        selector = ToolSelector(top_k=1, pinned=["calculator"])
+        selected = selector.select(SCHEMAS, "run this python code", "code")
+        assert _names(selected) == ["calculator", "run_python"]
+
+    def test_disabled_or_small_sets_pass_through(self):
+        assert ToolSelector(top_k=0).select(SCHEMAS, "hi") is SCHEMAS
+        assert ToolSelector(top_k=20).select(SCHEMAS, "hi") is SCHEMAS
+
+    def test_tool_metadata_examples_are_searchable(self):
+        tool = SimpleNamespace(
+            metadata=SimpleNamespace(
+                name="calculator", category=SimpleNamespace(value="utility"), examples=["sqrt 2"]
+            )
+        )
+        registry = MagicMock()
+        registry.get_all_tools.return_value = [tool]
+        selected = ToolSelector(top_k=2).select(SCHEMAS, "sqrt of 49", tool_registry=registry)
+        assert _names(selected) == ["calculator"]
+
+    def test_index_reused_for_same_version(self, monkeypatch):
+        selector = ToolSelector(top_k=2)
+        selector.select(SCHEMAS, "fetch a url", version=1)
+        build = MagicMock(side_effect=AssertionError("re-indexed"))
+        monkeypatch.setattr(selector, "_build_index", build)
+        assert _names(selector.select(SCHEMAS, "fetch a url", version=1)) == ["web_fetch"]
+
+    def test_embedder_blends_semantic_similarity(self):
+        def embed(texts: list[str]) -> list[list[float]]:
+            # "melody" has no lexical overlap; the fake embedding maps it to music
+            return [[1.0, 0.0] if ("music" in t or "melody" in t) else [0.0, 1.0] for t in texts]
+
+        selected = ToolSelector(top_k=1, embedder=embed).select(SCHEMAS, "hum a melody")
+        assert _names(selected) == ["generate_music"]
+
+    def test_failing_embedder_falls_back_to_lexical(self):
+        embed = MagicMock(side_effect=RuntimeError("model missing"))
+        selected = ToolSelector(top_k=2, embedder=embed).select(SCHEMAS, "fetch this url")
+        assert _names(selected) == ["web_fetch"]
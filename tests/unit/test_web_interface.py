@@ -121,6 +121,25 @@ class TestRequestIdHeader:
         assert resp.headers.get("x-request-id") == custom_id
 
 
+class TestToolsEndpointPartialResults:
+    """/tools lists what responded in time and names the MCP servers that did not."""
+
+    def test_unavailable_servers_reported(self) -> None:
+        from fastapi.testclient import TestClient
+
+        iface = _make_interface()
+        iface.agent_core.get_tool_list = MagicMock(return_value=[])
+        iface.agent_core.mcp_registry = MagicMock()
+        iface.agent_core.mcp_registry.discover_tools = AsyncMock(
+            return_value={"core": [{"name": "read_file", "description": "Read"}], "video": None}
+        )
+        with TestClient(iface.app) as client:
+            body = client.get("/tools").json()
+
+        assert [t["source"] for t in body["data"]] == ["mcp:core"]
+        assert body["unavailable"] == ["video"]
+
+
 class TestVersionNotHardcoded:
     """R4: FastAPI app version must come from portal.__version__, not be hardcoded."""
 
@@ -3,6 +3,9 @@ Unit tests for Document Processing tools
 """
 
 import importlib.util
+import threading
+import time
+from contextlib import ExitStack
 from unittest.mock import Mock, patch
 
 import pytest
@@ -224,3 +227,79 @@ class TestPDFOCRTool:
         )
 
         assert "success" in result
+
+
+@pytest.mark.unit
+class TestPDFOCRPipeline:
+    """Page-level OCR pipeline with the rasterizer and tesseract mocked out"""
+
+    @pytest.fixture
+    def pdf_file(self, temp_dir):
+        pdf = temp_dir / "scan.pdf"
+        pdf.write_bytes(b"%PDF-1.4 scanned")
+        return pdf
+
+    @staticmethod
+    def _patched(text_layer, ocr):
+        stack = ExitStack()
+        module = "portal.tools.document_tools.pdf_ocr"
+        stack.enter_context(patch(f"{module}.OCR_AVAILABLE", True))
+        stack.enter_context(patch(f"{module}._text_layer", return_value=text_layer))
+        stack.enter_context(patch(f"{module}._ocr_page", side_effect=ocr))
+        return stack
+
+    @pytest.mark.asyncio
+    async def test_skips_text_layer_pages_and_keeps_order(self, pdf_file, temp_dir):
+        embedded = ["x" * 40, "", "y" * 40, ""]
+        ocr = Mock(side_effect=lambda path, page, dpi, lang: f"ocr {page}")
+        tool = PDFOCRTool(cache_db_path=temp_dir / "ocr.db", workers=2)
+
+        with self._patched((4, embedded), ocr):
+            result = await tool.execute({"pdf_path": str(pdf_file)})
+
+        assert result["success"]
+        assert result["result"].split("\n\n--- Page Break ---\n\n") == [
+            "x" * 40,
+            "ocr 2",
+            "y" * 40,
+            "ocr 4",
+        ]
+        assert sorted(call.args[1] for call in ocr.call_args_list) == [2, 4]
+        assert result["metadata"]["text_layer_pages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_pages_are_not_ocred_again(self, pdf_file, temp_dir):
+        ocr = Mock(side_effect=lambda path, page, dpi, lang: f"ocr {page}")
+        tool = PDFOCRTool(cache_db_path=temp_dir / "ocr.db", workers=2)
+
+        with self._patched((3, []), ocr):
+            first = await tool.execute({"pdf_path": str(pdf_file)})
+            second = await tool.execute({"pdf_path": str(pdf_file)})
+            other_dpi = await tool.execute({"pdf_path": str(pdf_file), "dpi": 150})
+
+        assert first["result"] == second["result"]
+        assert second["metadata"]["cached_pages"] == 3
+        assert other_dpi["metadata"]["ocr_pages"] == 3
+        assert ocr.call_count == 6
+
+    @pytest.mark.asyncio
+    async def test_pages_run_in_parallel_within_worker_bound(self, pdf_file, temp_dir):
+        lock = threading.Lock()
+        running = peak = 0
+
+        def ocr(path, page, dpi, lang):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return str(page)
+
+        tool = PDFOCRTool(cache_db_path=temp_dir / "ocr.db", workers=3)
+        with self._patched((12, []), ocr):
+            result = await tool.execute({"pdf_path": str(pdf_file), "force_ocr": True})
+
+        assert result["metadata"]["ocr_pages"] == 12
+        assert 1 < peak <= 3
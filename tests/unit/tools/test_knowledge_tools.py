@@ -0,0 +1,177 @@
+"""
+Unit tests for Knowledge tools — vector index, chunking, hybrid search
+"""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from portal.tools.knowledge import knowledge_base_sqlite  # noqa: E402
+from portal.tools.knowledge.knowledge_base_sqlite import EnhancedKnowledgeTool  # noqa: E402
+from portal.tools.knowledge.vector_index import (  # noqa: E402
+    VectorIndex,
+    chunk_text,
+    from_blob,
+    to_blob,
+)
+
+_VOCAB = ["python", "code", "cooking", "recipe", "pasta", "garden", "plant", "soil"]
+
+
+class _FakeEmbedder:
+    """Bag-of-words embedder over a tiny vocabulary; records batch sizes."""
+
+    def __init__(self):
+        self.batches: list[int] = []
+
+    def encode(self, texts, **kwargs):
+        self.batches.append(len(texts))
+        rows = []
+        for text in texts:
+            words = text.lower().split()
+            rows.append([words.count(w) + 0.01 for w in _VOCAB])
+        return np.array(rows, dtype=np.float32)
+
+
+@pytest.fixture
+def kb(tmp_path, monkeypatch):
+    monkeypatch.setattr(EnhancedKnowledgeTool, "_db_path", None)
+    monkeypatch.setattr(EnhancedKnowledgeTool, "_vector_index", None)
+    monkeypatch.setattr(knowledge_base_sqlite, "EMBEDDINGS_AVAILABLE", False)
+    tool = EnhancedKnowledgeTool(
+        {"knowledge_base_dir": str(tmp_path), "chunk_size": 60, "chunk_overlap": 15}
+    )
+    embedder = _FakeEmbedder()
+    monkeypatch.setattr(knowledge_base_sqlite, "EMBEDDINGS_AVAILABLE", True)
+    monkeypatch.setattr(EnhancedKnowledgeTool, "_embeddings_model", embedder)
+    return tool, embedder
+
+
+@pytest.mark.unit
+class TestChunkText:
+    def test_short_text_single_chunk(self):
+        assert chunk_text("hello world", size=100) == ["hello world"]
+
+    def test_empty_text(self):
+        assert chunk_text("   ") == []
+
+    def test_chunks_overlap_and_cover_text(self):
+        text = " ".join(f"word{i}" for i in range(200))
+        chunks = chunk_text(text, size=100, overlap=30)
+        assert len(chunks) > 1
+        assert all(len(c) <= 100 for c in chunks)
+        assert chunks[0].split()[-1] in chunks[1]
+        assert chunks[-1].endswith("word199")
+
+
+@pytest.mark.unit
+class TestVectorIndex:
+    def test_blob_roundtrip(self):
+        vec = np.array([0.5, -1.25, 3.0], dtype=np.float32)
+        np.testing.assert_array_equal(from_blob(to_blob(vec)), vec)
+
+    def test_append_and_search(self, tmp_path):
+        index = VectorIndex(tmp_path / "kb.db")
+        index.append([10, 11, 12], np.array([[1, 0], [0, 1], [1, 1]], dtype=np.float32))
+        hits = index.search(np.array([1.0, 0.1]), k=2)
+        assert [h[0] for h in hits] == [10, 12]
+        assert hits[0][1] > hits[1][1]
+
+    def test_incremental_append_remaps(self, tmp_path):
+        index = VectorIndex(tmp_path / "kb.db")
+        index.append([1], np.array([[1.0, 0.0]]))
+        assert index.search(np.array([0.0, 1.0]), k=1)[0][0] == 1
+        index.append([2], np.array([[0.0, 1.0]]))
+        assert index.size == 2
+        assert index.search(np.array([0.0, 1.0]), k=1)[0][0] == 2
+
+    def test_index_persists_across_instances(self, tmp_path):
+        VectorIndex(tmp_path / "kb.db").append([7], np.array([[0.2, 0.9]]))
+        reopened = VectorIndex(tmp_path / "kb.db")
+        assert reopened.search(np.array([0.0, 1.0]), k=5) == [(7, pytest.approx(0.976, 1e-3))]
+
+    def test_rebuild_from_sqlite(self, tmp_path):
+        conn = sqlite3.connect(tmp_path / "kb.db")
+        conn.execute("CREATE TABLE chunks (id INTEGER PRIMARY KEY, embedding BLOB)")
+        conn.execute("INSERT INTO chunks VALUES (3, ?)", (to_blob(np.array([0.0, 1.0])),))
+        conn.execute("INSERT INTO chunks VALUES (4, NULL)")
+        index = VectorIndex(tmp_path / "kb.db")
+        index.append([99], np.array([[1.0, 0.0]]))  # out of step with SQLite
+        index.ensure_fresh(conn)
+        assert index.size == 1
+        assert index.search(np.array([0.0, 1.0]), k=5)[0][0] == 3
+
+    def test_concurrent_appends_keep_ids_aligned(self, tmp_path):
+        index = VectorIndex(tmp_path / "kb.db")
+        dim = 64
+
+        def add(i):
+            # Each id's vector points along its own axis
+            ids = list(range(i * 4, i * 4 + 4))
+            index.append(ids, np.eye(dim, dtype=np.float32)[ids])
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(add, range(dim // 4)))
+
+        assert index.size == dim
+        for chunk_id in range(dim):
+            assert index.search(np.eye(dim)[chunk_id], k=1)[0][0] == chunk_id
+
+
+@pytest.mark.unit
+class TestEnhancedKnowledgeSearch:
+    @pytest.mark.asyncio
+    async def test_add_chunks_and_embeds_in_one_batch(self, kb):
+        tool, embedder = kb
+        content = "python code " * 20
+        result = await tool.execute({"action": "add", "content": content})
+        assert result["success"]
+        assert result["metadata"]["chunks"] > 1
+        assert embedder.batches == [result["metadata"]["chunks"]]
+        assert EnhancedKnowledgeTool._vector_index.size == result["metadata"]["chunks"]
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_ranks_semantic_match_first(self, kb):
+        tool, _ = kb
+        await tool.execute({"action": "add", "content": "pasta recipe cooking at home"})
+        await tool.execute({"action": "add", "content": "garden plant soil care"})
+        await tool.execute({"action": "add", "content": "python code review notes"})
+
+        result = await tool.execute({"action": "search", "query": "plant soil", "limit": 2})
+        assert result["success"]
+        assert result["metadata"]["method"] == "fts5_vector"
+        assert "garden" in result["result"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_vector_only_match_without_fts_hit(self, kb):
+        tool, _ = kb
+        await tool.execute({"action": "add", "content": "garden plant soil care"})
+        # No shared token with the document, so FTS5 returns nothing
+        result = await tool.execute({"action": "search", "query": "plants", "limit": 3})
+        assert result["success"]
+        assert len(result["result"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_document_from_vector_results(self, kb):
+        tool, _ = kb
+        added = await tool.execute({"action": "add", "content": "garden plant soil"})
+        await tool.execute({"action": "add", "content": "pasta recipe"})
+        await tool.execute({"action": "delete", "doc_id": added["result"]["doc_id"]})
+
+        result = await tool.execute({"action": "search", "query": "garden", "limit": 5})
+        assert all("garden" not in doc["content"] for doc in result["result"])
+        assert EnhancedKnowledgeTool._vector_index.size == 1
+
+    @pytest.mark.asyncio
+    async def test_reindex_rebuilds_chunks(self, kb):
+        tool, _ = kb
+        await tool.execute({"action": "add", "content": "garden plant soil"})
+        await tool.execute({"action": "add", "content": "python code"})
+        result = await tool.execute({"action": "reindex"})
+        assert result["success"]
+        assert result["result"] == {"documents": 2, "chunks": 2}
+        stats = await tool.execute({"action": "stats"})
+        assert stats["result"]["indexed_vectors"] == 2
@@ -0,0 +1,183 @@
+"""
+Unit tests for the streaming tabular profiler shared by csv_analyzer and excel_processor
+"""
+
+import random
+import statistics
+import time
+from unittest.mock import patch
+
+import pytest
+
+from portal.tools.data_tools.csv_analyzer import CSVAnalyzerTool
+from portal.tools.data_tools.tabular import (
+    ProfileCache,
+    QuantileSketch,
+    RunningStats,
+    TableProfiler,
+    TabularSource,
+    TopK,
+    profile_file,
+)
+
+
+@pytest.fixture
+def sales_csv(temp_dir):
+    rng = random.Random(7)
+    lines = ["region,amount,units,comment"]
+    for i in range(5000):
+        region = ["north", "south", "east", "west"][i % 4] if i % 10 else "north"
+        comment = "" if i % 5 == 0 else f"order {i}"
+        lines.append(f"{region},{rng.uniform(0, 1000):.2f},{rng.randint(1, 20)},{comment}")
+    path = temp_dir / "sales.csv"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.mark.unit
+class TestIncrementalStatistics:
+    def test_running_stats_match_batch_statistics(self):
+        rng = random.Random(1)
+        values = [rng.gauss(50, 10) for _ in range(3000)]
+        stats = RunningStats()
+        for start in range(0, len(values), 700):
+            stats.update(values[start : start + 700])
+
+        assert stats.count == 3000
+        assert stats.mean == pytest.approx(statistics.fmean(values))
+        assert stats.std == pytest.approx(statistics.stdev(values))
+        assert (stats.min, stats.max) == (min(values), max(values))
+
+    def test_quantile_sketch_is_close_and_bounded(self):
+        sketch = QuantileSketch(k=128)
+        for start in range(0, 100_000, 1000):
+            sketch.update([float(x) for x in range(start, start + 1000)])
+
+        q25, q50, q99 = sketch.quantiles([0.25, 0.5, 0.99])
+        assert q25 == pytest.approx(25_000, abs=2_000)
+        assert q50 == pytest.approx(50_000, abs=2_000)
+        assert q99 == pytest.approx(99_000, abs=2_000)
+        assert sum(len(level) for level in sketch.levels) < 5_000
+
+    def test_top_k_exact_for_low_cardinality_and_bounded_otherwise(self):
+        top = TopK(capacity=8)
+        top.update(["a"] * 50 + ["b"] * 30 + ["c"] * 5)
+        assert top.top(2) == [("a", 50), ("b", 30)]
+        assert top.error == 0
+
+        top.update([f"rare{i}" for i in range(100)] + ["a"] * 10)
+        assert top.top(1)[0][0] == "a"
+        assert len(top.counts) <= 16 and top.error > 0
+
+
+@pytest.mark.unit
+class TestTableProfiler:
+    def test_profile_types_nulls_and_top_values(self, sales_csv):
+        profile = TableProfiler().profile(TabularSource(sales_csv, chunk_rows=512))
+
+        assert profile["rows"] == 5000
+        assert profile["column_names"] == ["region", "amount", "units", "comment"]
+        cols = profile["profiles"]
+        assert cols["region"]["dtype"] == "text"
+        assert cols["region"]["top_values"][0]["value"] == "north"
+        assert cols["units"]["dtype"] == "integer"
+        assert 1 <= cols["units"]["numeric"]["min"] <= cols["units"]["numeric"]["max"] <= 20
+        assert cols["amount"]["dtype"] == "float"
+        assert cols["amount"]["numeric"]["50%"] == pytest.approx(500, abs=50)
+        assert cols["comment"]["nulls"] == 1000
+
+    def test_preview_is_head_and_sample_is_bounded(self, sales_csv):
+        profile = TableProfiler(preview_rows=3).profile(TabularSource(sales_csv, chunk_rows=100))
+        head = [line.split(",")[2] for line in sales_csv.read_text().splitlines()[1:4]]
+        assert [str(row["units"]) for row in profile["preview"]] == head
+        assert len(profile["sample"]) == 3
+
+    def test_semicolon_dialect_and_ragged_rows(self, temp_dir):
+        path = temp_dir / "euro.csv"
+        path.write_text("a;b;c\n1;2;3\n4;5\n6;7;8;9\n")
+        profile = TableProfiler().profile(TabularSource(path))
+
+        assert profile["column_names"] == ["a", "b", "c"]
+        assert profile["profiles"]["c"]["nulls"] == 1
+        assert profile["profiles"]["a"]["numeric"]["max"] == 6
+
+    def test_pandas_chunks_match_the_csv_reader(self, sales_csv):
+        pytest.importorskip("pandas")
+        profiler = TableProfiler()
+        fast = profiler._profile_frames(TabularSource(sales_csv, chunk_rows=700))
+        slow = profiler._profile_rows(TabularSource(sales_csv, chunk_rows=700))
+
+        assert fast["rows"] == slow["rows"] == 5000
+        assert [str(row["units"]) for row in fast["preview"]] == [
+            row["units"] for row in slow["preview"]
+        ]
+        for name, col in slow["profiles"].items():
+            other = fast["profiles"][name]
+            assert (other["dtype"], other["nulls"]) == (col["dtype"], col["nulls"])
+            assert other["top_values"][:2] == col["top_values"][:2]
+            if "numeric" in col:
+                assert other["numeric"]["mean"] == pytest.approx(col["numeric"]["mean"])
+                assert other["numeric"]["std"] == pytest.approx(col["numeric"]["std"])
+
+    def test_ragged_rows_fall_back_to_the_csv_reader(self, temp_dir):
+        pytest.importorskip("pandas")
+        path = temp_dir / "ragged.csv"
+        path.write_text("a,b\n1,2\n3,4,5\n")
+        profiler = TableProfiler()
+        with patch.object(profiler, "_profile_rows", wraps=profiler._profile_rows) as rows:
+            profile = profiler.profile(TabularSource(path))
+
+        rows.assert_called_once()
+        assert profile["rows"] == 2
+
+
+@pytest.mark.unit
+class TestProfileCache:
+    def test_repeat_profile_served_from_cache_until_file_changes(self, sales_csv, temp_dir):
+        cache = ProfileCache(temp_dir / "profiles.db")
+        first = profile_file(sales_csv, cache=cache)
+        with patch.object(TableProfiler, "profile", side_effect=AssertionError("re-read")):
+            second = profile_file(sales_csv, cache=cache)
+
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert second["profiles"] == first["profiles"]
+
+        sales_csv.write_text("region,amount\nnorth,1\n")
+        third = profile_file(sales_csv, cache=cache)
+        assert third["cached"] is False and third["rows"] == 1
+
+    def test_changed_file_replaces_its_row_and_old_rows_are_pruned(self, sales_csv, temp_dir):
+        cache = ProfileCache(temp_dir / "profiles.db", max_age=60)
+        profile_file(sales_csv, cache=cache)
+        sales_csv.write_text("region,amount\nnorth,1\n")
+        profile_file(sales_csv, cache=cache)
+
+        def count():
+            return cache._pool.get().execute("SELECT COUNT(*) FROM file_profiles").fetchone()[0]
+
+        assert count() == 1
+
+        other = temp_dir / "other.csv"
+        other.write_text("a\n1\n")
+        with patch("portal.tools.data_tools.tabular.time.time", return_value=time.time() + 120):
+            profile_file(other, cache=cache)
+        assert count() == 1
+        assert cache.get(ProfileCache.key(other, None)) is not None
+
+
+@pytest.mark.unit
+class TestCSVAnalyzerStreaming:
+    @pytest.mark.asyncio
+    async def test_describe_without_pandas(self, sales_csv, temp_dir):
+        tool = CSVAnalyzerTool(cache_db_path=str(temp_dir / "profiles.db"))
+        result = await tool.execute({"file_path": str(sales_csv), "analysis_type": "describe"})
+
+        assert result["success"] is True
+        assert result["result"]["rows"] == 5000
+        assert result["result"]["dtypes"]["units"] == "integer"
+        assert set(result["result"]["statistics"]) == {"amount", "units"}
+        assert result["cached"] is False
+
+        again = await tool.execute({"file_path": str(sales_csv), "analysis_type": "summary"})
+        assert again["cached"] is True
+        assert again["result"]["numeric_summary"]["units"]["max"] <= 20